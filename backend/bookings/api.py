@@ -7,7 +7,6 @@ from datetime import datetime, time, timedelta
 from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
 
 from django.conf import settings
-from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
@@ -25,6 +24,7 @@ from listings.services import compute_booking_totals
 from notifications import tasks as notification_tasks
 from payments.ledger import log_transaction
 from payments.models import PaymentSetupIntent, Transaction
+from payments.receipts import queue_booking_pdf_prerender
 from payments.stripe_api import (
     StripeConfigurationError,
     StripePaymentError,
@@ -39,12 +39,12 @@ from payments.stripe_api import (
 from payments_cancellation_policy import compute_refund_amounts
 from payments_refunds import apply_cancellation_settlement, get_platform_ledger_user
 from storage.s3 import booking_object_key, guess_content_type, presign_put, public_url
-from storage.tasks import scan_and_finalize_booking_photo
+from storage.tasks import queue_booking_photo_scan
 from storage.validators import coerce_int, max_bytes_for_content_type, validate_image_limits
 
-from .cache import bookings_cache_key, bookings_cache_timeout, invalidate_bookings_cache_for_users
+from .availability import get_blocked_ranges, get_blocked_ranges_bulk, public_ranges
+from .cache import MY_BOOKINGS_CACHE, bookings_cache_key, invalidate_bookings_cache_for_users
 from .domain import (
-    ACTIVE_BOOKING_STATUSES,
     assert_can_cancel,
     assert_can_complete,
     assert_can_confirm,
@@ -61,6 +61,7 @@ from .tasks import authorize_deposit_for_start_day
 
 logger = logging.getLogger(__name__)
 _CENT = Decimal("0.01")
+MAX_BULK_AVAILABILITY_LISTINGS = 100
 
 
 def _quantize_money(value: Decimal) -> Decimal:
@@ -117,21 +118,12 @@ def _booking_days(booking: Booking, totals: dict[str, object]) -> int:
 
 def _pricing_breakdown(booking: Booking) -> dict[str, Decimal | int | dict[str, str]]:
     totals = _ensure_booking_totals(booking)
-    rental_subtotal = _decimal_from_value(totals.get("rental_subtotal"))
-    renter_fee_val = totals.get(
-        "renter_fee_total",
-        totals.get("renter_fee", totals.get("service_fee", "0")),
-    )
-    renter_fee = _decimal_from_value(renter_fee_val)
-    owner_payout = _decimal_from_value(totals.get("owner_payout"))
-    owner_fee_val = totals.get("owner_fee_total", totals.get("owner_fee", "0"))
-    owner_fee = _decimal_from_value(owner_fee_val)
-    platform_total_default = renter_fee + owner_fee
-    platform_fee_total = _decimal_from_value(
-        totals.get("platform_fee_total"),
-        platform_total_default,
-    )
-    damage_deposit = _decimal_from_value(totals.get("damage_deposit"))
+    rental_subtotal = _decimal_from_value(booking.rental_subtotal)
+    renter_fee = _decimal_from_value(booking.renter_fee_total)
+    owner_payout = _decimal_from_value(booking.owner_payout)
+    owner_fee = _decimal_from_value(booking.owner_fee_total)
+    platform_fee_total = _decimal_from_value(booking.platform_fee_total, renter_fee + owner_fee)
+    damage_deposit = _decimal_from_value(booking.damage_deposit)
     days = _booking_days(booking, totals)
     days_decimal = Decimal(days)
     if days_decimal > 0:
@@ -257,22 +249,16 @@ class BookingViewSet(viewsets.ModelViewSet):
         if not user_id:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
 
-        cache_key = bookings_cache_key(user_id, request.query_params)
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return Response(cached)
-
-        queryset = self.filter_queryset(self.get_queryset())
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
-        else:
-            serializer = self.get_serializer(queryset, many=True)
-            response = Response(serializer.data)
+        def build():
+            queryset = self.filter_queryset(self.get_queryset())
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                serializer = self.get_serializer(page, many=True)
+                return self.get_paginated_response(serializer.data).data
+            return self.get_serializer(queryset, many=True).data
 
-        cache.set(cache_key, response.data, timeout=bookings_cache_timeout())
-        return response
+        cache_key = bookings_cache_key(user_id, request.query_params)
+        return Response(MY_BOOKINGS_CACHE.get_or_build(cache_key, build))
 
     @action(detail=False, methods=["get"], url_path="pending-requests-count")
     def pending_requests_count(self, request, *args, **kwargs):
@@ -307,7 +293,16 @@ class BookingViewSet(viewsets.ModelViewSet):
         permission_classes=[permissions.AllowAny],
     )
     def availability(self, request, *args, **kwargs):
-        """Return booked [start, end) ranges for a listing."""
+        """
+        Return booked [start, end) ranges for a listing.
+
+        ``?listings=1,2,3`` returns ``{listing_id: ranges}`` for up to
+        ``MAX_BULK_AVAILABILITY_LISTINGS`` active listings in one request.
+        """
+        bulk_param = request.query_params.get("listings")
+        if bulk_param is not None:
+            return self._bulk_availability(bulk_param)
+
         listing_param = request.query_params.get("listing")
         if not listing_param:
             return Response(
@@ -326,22 +321,48 @@ class BookingViewSet(viewsets.ModelViewSet):
             Listing.objects.filter(is_active=True, is_deleted=False),
             pk=listing_id,
         )
+        payload = public_ranges(get_blocked_ranges(listing.pk))
+        return Response(payload, status=status.HTTP_200_OK)
 
-        ranges = (
-            Booking.objects.filter(
-                listing=listing,
-                status__in=ACTIVE_BOOKING_STATUSES,
+    def _bulk_availability(self, bulk_param: str) -> Response:
+        try:
+            listing_ids = list(
+                dict.fromkeys(int(part) for part in bulk_param.split(",") if part.strip())
+            )
+        except ValueError:
+            return Response(
+                {"detail": "listings must be a comma-separated list of integers."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not listing_ids:
+            return Response(
+                {"detail": "listings query parameter is required."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(listing_ids) > MAX_BULK_AVAILABILITY_LISTINGS:
+            return Response(
+                {
+                    "detail": (
+                        f"At most {MAX_BULK_AVAILABILITY_LISTINGS} listings can be "
+                        "requested at once."
+                    )
+                },
+                status=status.HTTP_400_BAD_REQUEST,
             )
-            .order_by("start_date", "end_date")
-            .values("start_date", "end_date")
+
+        visible_ids = list(
+            Listing.objects.filter(
+                pk__in=listing_ids,
+                is_active=True,
+                is_deleted=False,
+            ).values_list("id", flat=True)
         )
-        payload = [
-            {
-                "start_date": item["start_date"].isoformat(),
-                "end_date": item["end_date"].isoformat(),
-            }
-            for item in ranges
-        ]
+        ranges = get_blocked_ranges_bulk(visible_ids)
+        payload = {
+            str(listing_id): public_ranges(ranges[listing_id])
+            for listing_id in listing_ids
+            if listing_id in ranges
+        }
         return Response(payload, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["post"], url_path="confirm")
@@ -915,8 +936,6 @@ class BookingViewSet(viewsets.ModelViewSet):
             )
         width = coerce_int(request.data.get("width"))
         height = coerce_int(request.data.get("height"))
-        original_size = coerce_int(request.data.get("original_size"))
-        compressed_size = coerce_int(request.data.get("compressed_size"))
 
         max_bytes = max_bytes_for_content_type(content_type) or getattr(
             settings, "S3_MAX_UPLOAD_BYTES", None
@@ -954,22 +973,11 @@ class BookingViewSet(viewsets.ModelViewSet):
         photo.height = height
         photo.save()
 
-        meta = {
-            "etag": etag,
-            "filename": filename,
-            "content_type": content_type,
-            "size": size_int,
-            "role": BookingPhoto.Role.BEFORE,
-            "width": width,
-            "height": height,
-            "original_size": original_size,
-            "compressed_size": compressed_size,
-        }
-        scan_and_finalize_booking_photo.delay(
+        queue_booking_photo_scan(
+            booking.id,
             key=key,
-            booking_id=booking.id,
-            uploaded_by_id=request.user.id,
-            meta=meta,
+            original_size=coerce_int(request.data.get("original_size")),
+            compressed_size=coerce_int(request.data.get("compressed_size")),
         )
 
         if not booking.before_photos_uploaded_at:
@@ -1106,8 +1114,6 @@ class BookingViewSet(viewsets.ModelViewSet):
             )
         width = coerce_int(request.data.get("width"))
         height = coerce_int(request.data.get("height"))
-        original_size = coerce_int(request.data.get("original_size"))
-        compressed_size = coerce_int(request.data.get("compressed_size"))
 
         max_bytes = max_bytes_for_content_type(content_type) or getattr(
             settings, "S3_MAX_UPLOAD_BYTES", None
@@ -1145,22 +1151,11 @@ class BookingViewSet(viewsets.ModelViewSet):
         photo.height = height
         photo.save()
 
-        meta = {
-            "etag": etag,
-            "filename": filename,
-            "content_type": content_type,
-            "size": size_int,
-            "role": BookingPhoto.Role.AFTER,
-            "width": width,
-            "height": height,
-            "original_size": original_size,
-            "compressed_size": compressed_size,
-        }
-        scan_and_finalize_booking_photo.delay(
+        queue_booking_photo_scan(
+            booking.id,
             key=key,
-            booking_id=booking.id,
-            uploaded_by_id=request.user.id,
-            meta=meta,
+            original_size=coerce_int(request.data.get("original_size")),
+            compressed_size=coerce_int(request.data.get("compressed_size")),
         )
 
         return Response({"status": "queued", "key": key}, status=status.HTTP_202_ACCEPTED)
@@ -1339,6 +1334,7 @@ class BookingViewSet(viewsets.ModelViewSet):
                 )
 
         _schedule_deposit_authorization(booking)
+        queue_booking_pdf_prerender(booking.id)
         try:
             notification_tasks.send_booking_payment_receipt_email.delay(
                 booking.renter_id,
@@ -0,0 +1,141 @@
+"""Materialized availability calendar for listings.
+
+Each listing with blocking bookings owns a ``ListingAvailability`` row holding the
+sorted ``[start_date, end_date)`` ranges of its confirmed/paid bookings. The row is
+rewritten under a row lock by ``bookings.signals`` inside the same transaction as the
+booking save, so the public availability endpoint, conflict checks and bulk lookups for
+search pages read one primary-key row per listing instead of scanning ``Booking``.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Iterable
+
+from django.db import transaction
+
+from .models import Booking, ListingAvailability
+
+# Statuses that block dates for availability and conflict detection.
+# Plain requested bookings remain allowed to overlap.
+ACTIVE_BOOKING_STATUSES = (
+    Booking.Status.CONFIRMED,
+    Booking.Status.PAID,
+)
+
+# Booking fields whose changes can move a listing's blocked ranges.
+AVAILABILITY_SOURCE_FIELDS = frozenset(
+    {"status", "start_date", "end_date", "listing", "listing_id"}
+)
+
+
+def _blocking_ranges_by_listing(listing_ids: Iterable[int]) -> dict[int, list[dict[str, Any]]]:
+    ids = list(listing_ids)
+    ranges: dict[int, list[dict[str, Any]]] = {listing_id: [] for listing_id in ids}
+    if not ids:
+        return ranges
+    rows = (
+        Booking.objects.filter(listing_id__in=ids, status__in=ACTIVE_BOOKING_STATUSES)
+        .order_by("listing_id", "start_date", "end_date", "id")
+        .values_list("listing_id", "id", "start_date", "end_date")
+    )
+    for listing_id, booking_id, start_date, end_date in rows:
+        ranges[listing_id].append(
+            {
+                "booking_id": booking_id,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+            }
+        )
+    return ranges
+
+
+def sync_listing_availability(listing_id: int, *, create: bool = True) -> list[dict[str, Any]]:
+    """
+    Recompute and store the blocked ranges for one listing.
+
+    The calendar row is locked before the bookings are read, so concurrent transitions on
+    the same listing recompute one after another and the later one sees the earlier commit.
+    """
+    with transaction.atomic():
+        if create:
+            ListingAvailability.objects.get_or_create(listing_id=listing_id)
+        row = ListingAvailability.objects.select_for_update().filter(listing_id=listing_id).first()
+        ranges = _blocking_ranges_by_listing([listing_id])[listing_id]
+        if row is not None:
+            row.blocked_ranges = ranges
+            row.save(update_fields=["blocked_ranges", "updated_at"])
+    return ranges
+
+
+def rebuild_listing_availability(*, batch_size: int = 500) -> int:
+    """Rewrite the calendar for every listing that has or had blocking bookings."""
+    listing_ids = set(
+        Booking.objects.filter(status__in=ACTIVE_BOOKING_STATUSES)
+        .values_list("listing_id", flat=True)
+        .distinct()
+    )
+    listing_ids.update(ListingAvailability.objects.values_list("listing_id", flat=True))
+    ordered = sorted(listing_ids)
+    for offset in range(0, len(ordered), batch_size):
+        chunk = ordered[offset : offset + batch_size]
+        ranges = _blocking_ranges_by_listing(chunk)
+        existing = ListingAvailability.objects.in_bulk(chunk)
+        to_create = []
+        to_update = []
+        for listing_id in chunk:
+            row = existing.get(listing_id)
+            if row is None:
+                to_create.append(
+                    ListingAvailability(listing_id=listing_id, blocked_ranges=ranges[listing_id])
+                )
+            else:
+                row.blocked_ranges = ranges[listing_id]
+                to_update.append(row)
+        ListingAvailability.objects.bulk_create(to_create, ignore_conflicts=True)
+        ListingAvailability.objects.bulk_update(to_update, ["blocked_ranges"])
+    return len(ordered)
+
+
+def get_blocked_ranges_bulk(listing_ids: Iterable[int]) -> dict[int, list[dict[str, Any]]]:
+    """
+    Return ``{listing_id: ranges}`` for several listings in one query.
+
+    Listings without a calendar row have never had a blocking booking and get ``[]``.
+    """
+    ids = list(dict.fromkeys(int(listing_id) for listing_id in listing_ids))
+    found = dict(
+        ListingAvailability.objects.filter(listing_id__in=ids).values_list(
+            "listing_id", "blocked_ranges"
+        )
+    )
+    return {listing_id: list(found.get(listing_id) or []) for listing_id in ids}
+
+
+def get_blocked_ranges(listing_id: int) -> list[dict[str, Any]]:
+    return get_blocked_ranges_bulk([listing_id])[int(listing_id)]
+
+
+def public_ranges(ranges: Iterable[dict[str, Any]]) -> list[dict[str, str]]:
+    """Strip internal booking ids before returning ranges to anonymous clients."""
+    return [{"start_date": item["start_date"], "end_date": item["end_date"]} for item in ranges]
+
+
+def has_conflict(
+    listing_id: int,
+    start_date: date,
+    end_date: date,
+    *,
+    exclude_booking_id: int | None = None,
+) -> bool:
+    """True if ``[start_date, end_date)`` overlaps a blocked range on the listing."""
+    start = start_date.isoformat()
+    end = end_date.isoformat()
+    for item in get_blocked_ranges(listing_id):
+        if exclude_booking_id is not None and item.get("booking_id") == exclude_booking_id:
+            continue
+        if item["start_date"] >= end:
+            break
+        if item["end_date"] > start:
+            return True
+    return False
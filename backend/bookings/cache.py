@@ -7,6 +7,8 @@ from django.conf import settings
 from django.core.cache import cache
 from django.http import QueryDict
 
+from core.cache import EndpointCache
+
 BOOKINGS_CACHE_VERSION_KEY = "bookings:my:version:{user_id}"
 
 
@@ -54,3 +56,6 @@ def invalidate_bookings_cache_for_users(user_ids: Iterable[int | None]) -> None:
 
 def bookings_cache_timeout() -> int:
     return getattr(settings, "CACHE_TTL_RECENT_RENTALS", 120)
+
+
+MY_BOOKINGS_CACHE = EndpointCache("bookings.my", ttl=bookings_cache_timeout)
@@ -26,17 +26,11 @@ from payments.stripe_api import (
     transfer_earnings_to_platform,
 )
 
+from .availability import has_conflict
 from .models import Booking, BookingPhoto
 
 logger = logging.getLogger(__name__)
 
-# Statuses that block dates for availability and conflict detection.
-# Plain requested bookings remain allowed to overlap.
-ACTIVE_BOOKING_STATUSES = (
-    Booking.Status.CONFIRMED,
-    Booking.Status.PAID,
-)
-
 CancelActor = Literal["renter", "owner", "system", "no_show"]
 
 
@@ -72,12 +66,8 @@ def ensure_no_conflict(
     *,
     exclude_booking_id: Optional[int] = None,
 ) -> None:
-    """Ensure there are no overlapping bookings for the listing."""
-    qs = Booking.objects.filter(listing=listing, status__in=ACTIVE_BOOKING_STATUSES)
-    if exclude_booking_id is not None:
-        qs = qs.exclude(pk=exclude_booking_id)
-    conflicts = qs.filter(start_date__lt=end_date, end_date__gt=start_date)
-    if conflicts.exists():
+    """Ensure there are no overlapping bookings for the listing (via its availability calendar)."""
+    if has_conflict(listing.pk, start_date, end_date, exclude_booking_id=exclude_booking_id):
         raise ValidationError(
             {"non_field_errors": ["Requested dates are not available for this listing."]}
         )
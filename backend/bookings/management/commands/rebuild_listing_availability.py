@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from bookings.availability import rebuild_listing_availability
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialized listing availability calendars from the Booking table."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of listings rewritten per batch.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be greater than 0.")
+
+        total = rebuild_listing_availability(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Availability calendars rebuilt: {total}"))
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BLOCKING_STATUSES = ("confirmed", "paid")
+
+
+def backfill_listing_availability(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    ListingAvailability = apps.get_model("bookings", "ListingAvailability")
+    ranges_by_listing: dict[int, list[dict]] = {}
+    rows = (
+        Booking.objects.filter(status__in=BLOCKING_STATUSES)
+        .order_by("listing_id", "start_date", "end_date", "id")
+        .values_list("listing_id", "id", "start_date", "end_date")
+    )
+    for listing_id, booking_id, start_date, end_date in rows.iterator(chunk_size=2000):
+        ranges_by_listing.setdefault(listing_id, []).append(
+            {
+                "booking_id": booking_id,
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+            }
+        )
+    ListingAvailability.objects.bulk_create(
+        [
+            ListingAvailability(listing_id=listing_id, blocked_ranges=ranges)
+            for listing_id, ranges in ranges_by_listing.items()
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0013_booking_owner_statement_s3_key"),
+        ("listings", "0011_listing_coordinates"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ListingAvailability",
+            fields=[
+                (
+                    "listing",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="availability_calendar",
+                        serialize=False,
+                        to="listings.listing",
+                    ),
+                ),
+                (
+                    "blocked_ranges",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="Sorted [start, end) ranges of confirmed/paid bookings.",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_listing_availability, migrations.RunPython.noop),
+    ]
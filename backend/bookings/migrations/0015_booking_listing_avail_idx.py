@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0014_listingavailability"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["listing", "status", "start_date", "end_date"],
+                name="booking_listing_avail_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,206 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:30
+
+from decimal import Decimal, InvalidOperation
+
+from django.db import migrations, models
+
+BACKFILL_CHUNK_SIZE = 1000
+
+# Frozen copy of bookings.models.BOOKING_MONEY_FIELDS.
+MONEY_FIELDS = {
+    "rental_subtotal": ("rental_subtotal",),
+    "renter_fee_total": ("renter_fee_total", "renter_fee", "service_fee"),
+    "renter_fee_gst": ("renter_fee_gst",),
+    "owner_fee_base": ("owner_fee_base", "owner_fee"),
+    "owner_fee_gst": ("owner_fee_gst",),
+    "owner_fee_total": ("owner_fee_total", "owner_fee"),
+    "platform_fee_total": ("platform_fee_total", "platform_fee"),
+    "owner_payout": ("owner_payout",),
+    "damage_deposit": ("damage_deposit",),
+    "total_charge": ("total_charge",),
+}
+
+
+def _money(totals, keys):
+    if not isinstance(totals, dict):
+        return None
+    for key in keys:
+        value = totals.get(key)
+        if value in (None, ""):
+            continue
+        try:
+            return Decimal(str(value)).quantize(Decimal("0.01"))
+        except (InvalidOperation, TypeError, ValueError):
+            return None
+    return None
+
+
+def backfill_money_columns(apps, schema_editor):
+    Booking = apps.get_model("bookings", "Booking")
+    last_id = 0
+    while True:
+        chunk = list(
+            Booking.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "totals")[:BACKFILL_CHUNK_SIZE]
+        )
+        if not chunk:
+            return
+        for booking in chunk:
+            for field, keys in MONEY_FIELDS.items():
+                setattr(booking, field, _money(booking.totals, keys))
+        Booking.objects.bulk_update(chunk, list(MONEY_FIELDS))
+        last_id = chunk[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0015_booking_listing_avail_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="booking",
+            name="rental_subtotal",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                editable=False,
+                help_text="Copy of totals['rental_subtotal'].",
+                max_digits=10,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="booking",
+            name="renter_fee_total",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                editable=False,
+                help_text="Copy of totals['renter_fee_total'] (incl. GST).",
+                max_digits=10,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="booking",
+            name="renter_fee_gst",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                editable=False,
+                help_text="Copy of totals['renter_fee_gst'].",
+                max_digits=10,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="booking",
+            name="owner_fee_base",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                editable=False,
+                help_text="Copy of totals['owner_fee_base'] (before GST).",
+                max_digits=10,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="booking",
+            name="owner_fee_gst",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                editable=False,
+                help_text="Copy of totals['owner_fee_gst'].",
+                max_digits=10,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="booking",
+            name="owner_fee_total",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                editable=False,
+                help_text="Copy of totals['owner_fee_total'] (incl. GST).",
+                max_digits=10,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="booking",
+            name="platform_fee_total",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                editable=False,
+                help_text="Copy of totals['platform_fee_total'].",
+                max_digits=10,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="booking",
+            name="owner_payout",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                editable=False,
+                help_text="Copy of totals['owner_payout'].",
+                max_digits=10,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="booking",
+            name="damage_deposit",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                editable=False,
+                help_text="Copy of totals['damage_deposit'].",
+                max_digits=10,
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="booking",
+            name="total_charge",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                editable=False,
+                help_text="Copy of totals['total_charge'].",
+                max_digits=10,
+                null=True,
+            ),
+        ),
+        migrations.RunPython(backfill_money_columns, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["status", "created_at"],
+                include=[
+                    "total_charge",
+                    "damage_deposit",
+                    "rental_subtotal",
+                    "renter_fee_total",
+                    "platform_fee_total",
+                ],
+                name="booking_status_created_money",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="booking",
+            index=models.Index(
+                fields=["status", "paid_at"],
+                include=["owner", "owner_fee_base", "owner_fee_gst"],
+                name="booking_status_paid_fees",
+            ),
+        ),
+    ]
@@ -2,12 +2,55 @@
 
 from __future__ import annotations
 
+from decimal import Decimal, InvalidOperation
+
 from django.conf import settings
 from django.db import models
 from django.utils import timezone
 
 from listings.models import Listing
 
+# Typed copies of the money values in ``Booking.totals`` so reports can aggregate in SQL.
+# Each column reads the first key present in ``totals`` (older bookings used shorter keys).
+BOOKING_MONEY_FIELDS: dict[str, tuple[str, ...]] = {
+    "rental_subtotal": ("rental_subtotal",),
+    "renter_fee_total": ("renter_fee_total", "renter_fee", "service_fee"),
+    "renter_fee_gst": ("renter_fee_gst",),
+    "owner_fee_base": ("owner_fee_base", "owner_fee"),
+    "owner_fee_gst": ("owner_fee_gst",),
+    "owner_fee_total": ("owner_fee_total", "owner_fee"),
+    "platform_fee_total": ("platform_fee_total", "platform_fee"),
+    "owner_payout": ("owner_payout",),
+    "damage_deposit": ("damage_deposit",),
+    "total_charge": ("total_charge",),
+}
+
+
+def money_from_totals(totals: object, keys: tuple[str, ...]) -> Decimal | None:
+    """Return the first parseable amount among ``keys`` in a ``totals`` dict."""
+    if not isinstance(totals, dict):
+        return None
+    for key in keys:
+        value = totals.get(key)
+        if value in (None, ""):
+            continue
+        try:
+            return Decimal(str(value)).quantize(Decimal("0.01"))
+        except (InvalidOperation, TypeError, ValueError):
+            return None
+    return None
+
+
+def _money_field(help_text: str) -> models.DecimalField:
+    return models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text=help_text,
+    )
+
 
 class Booking(models.Model):
     """Represents a booking request/reservation for a listing."""
@@ -81,6 +124,16 @@ class Booking(models.Model):
         help_text="When True, automatic deposit release is blocked while a dispute is active.",
     )
     totals = models.JSONField(default=dict, blank=True)
+    rental_subtotal = _money_field("Copy of totals['rental_subtotal'].")
+    renter_fee_total = _money_field("Copy of totals['renter_fee_total'] (incl. GST).")
+    renter_fee_gst = _money_field("Copy of totals['renter_fee_gst'].")
+    owner_fee_base = _money_field("Copy of totals['owner_fee_base'] (before GST).")
+    owner_fee_gst = _money_field("Copy of totals['owner_fee_gst'].")
+    owner_fee_total = _money_field("Copy of totals['owner_fee_total'] (incl. GST).")
+    platform_fee_total = _money_field("Copy of totals['platform_fee_total'].")
+    owner_payout = _money_field("Copy of totals['owner_payout'].")
+    damage_deposit = _money_field("Copy of totals['damage_deposit'].")
+    total_charge = _money_field("Copy of totals['total_charge'].")
     canceled_by = models.CharField(
         max_length=16,
         choices=CanceledBy.choices,
@@ -160,14 +213,49 @@ class Booking(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["listing", "start_date", "end_date"]),
+            models.Index(
+                fields=["listing", "status", "start_date", "end_date"],
+                name="booking_listing_avail_idx",
+            ),
             models.Index(fields=["renter", "status"]),
             models.Index(fields=["owner", "status"]),
+            # Covering indexes (PostgreSQL) for the GMV / platform fee and owner fee SUMs.
+            models.Index(
+                fields=["status", "created_at"],
+                include=[
+                    "total_charge",
+                    "damage_deposit",
+                    "rental_subtotal",
+                    "renter_fee_total",
+                    "platform_fee_total",
+                ],
+                name="booking_status_created_money",
+            ),
+            models.Index(
+                fields=["status", "paid_at"],
+                include=["owner", "owner_fee_base", "owner_fee_gst"],
+                name="booking_status_paid_fees",
+            ),
         ]
 
     def __str__(self) -> str:
         """Return a human-readable representation."""
         return f"Booking #{self.pk} for {self.listing_id} ({self.status})"
 
+    def save(self, *args, **kwargs):
+        """Keep the typed money columns in step with ``totals`` on every save."""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "totals" in update_fields:
+            self.sync_money_fields()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, *BOOKING_MONEY_FIELDS}
+        super().save(*args, **kwargs)
+
+    def sync_money_fields(self) -> None:
+        """Copy the money values in ``totals`` onto their decimal columns."""
+        for field, keys in BOOKING_MONEY_FIELDS.items():
+            setattr(self, field, money_from_totals(self.totals, keys))
+
     @property
     def days(self) -> int:
         """Return the count of booked days."""
@@ -259,3 +347,23 @@ class BookingPhoto(models.Model):
 
     def __str__(self) -> str:
         return f"BookingPhoto {self.pk} for booking {self.booking_id}"
+
+
+class ListingAvailability(models.Model):
+    """Materialized blocked date ranges for a listing, maintained by ``bookings.signals``."""
+
+    listing = models.OneToOneField(
+        Listing,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="availability_calendar",
+    )
+    blocked_ranges = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Sorted [start, end) ranges of confirmed/paid bookings.",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"Availability for listing {self.listing_id}"
@@ -1,8 +1,15 @@
 from __future__ import annotations
 
-from django.db.models.signals import post_delete, post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from listings.cache import invalidate_feed_for_availability_change
+
+from .availability import (
+    ACTIVE_BOOKING_STATUSES,
+    AVAILABILITY_SOURCE_FIELDS,
+    sync_listing_availability,
+)
 from .cache import invalidate_bookings_cache_for_users
 from .models import Booking
 
@@ -11,3 +18,66 @@ from .models import Booking
 @receiver(post_delete, sender=Booking, dispatch_uid="bookings_cache_invalidate_on_delete")
 def _invalidate_booking_cache(sender, instance: Booking, **kwargs):
     invalidate_bookings_cache_for_users([instance.owner_id, instance.renter_id])
+
+
+# Fields whose pre-save values are snapshotted; other apps add theirs through
+# ``register_snapshot_fields`` so a single SELECT serves every pre_save consumer.
+_snapshot_fields: set[str] = set(AVAILABILITY_SOURCE_FIELDS)
+
+
+def register_snapshot_fields(fields) -> None:
+    _snapshot_fields.update(fields)
+
+
+def booking_snapshot(instance: Booking) -> dict | None:
+    """Column values of ``instance`` as stored before the save in progress, if captured."""
+    return getattr(instance, "_pre_save_snapshot", None)
+
+
+@receiver(pre_save, sender=Booking, dispatch_uid="booking_snapshot_before_save")
+def _capture_snapshot(sender, instance: Booking, raw=False, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    skip = (
+        raw
+        or not instance.pk
+        or (update_fields and not _snapshot_fields.intersection(update_fields))
+    )
+    columns = {Booking._meta.get_field(name).attname for name in _snapshot_fields}
+    instance._pre_save_snapshot = (
+        None if skip else Booking.objects.filter(pk=instance.pk).values(*columns).first()
+    )
+
+
+@receiver(post_save, sender=Booking, dispatch_uid="booking_availability_sync_on_save")
+def _sync_availability_on_booking_save(sender, instance: Booking, created, raw=False, **kwargs):
+    if raw:
+        return
+    update_fields = kwargs.get("update_fields")
+    if update_fields and not AVAILABILITY_SOURCE_FIELDS.intersection(update_fields):
+        return
+    after = (instance.listing_id, instance.status, instance.start_date, instance.end_date)
+    snapshot = booking_snapshot(instance)
+    before = (
+        None
+        if snapshot is None
+        else tuple(snapshot[field] for field in ("listing_id", "status", "start_date", "end_date"))
+    )
+    was_blocking = before is not None and before[1] in ACTIVE_BOOKING_STATUSES
+    if before == after or (not was_blocking and instance.status not in ACTIVE_BOOKING_STATUSES):
+        return
+    # Runs inside the caller's transaction, so a rolled-back transition never
+    # leaves the calendar out of step with the Booking rows.
+    sync_listing_availability(instance.listing_id)
+    invalidate_feed_for_availability_change(instance.listing_id)
+    if before is not None and before[0] != instance.listing_id:
+        sync_listing_availability(before[0])
+        invalidate_feed_for_availability_change(before[0])
+
+
+@receiver(post_delete, sender=Booking, dispatch_uid="booking_availability_sync_on_delete")
+def _sync_availability_on_booking_delete(sender, instance: Booking, **kwargs):
+    if instance.status not in ACTIVE_BOOKING_STATUSES:
+        return
+    # Never create a row here: the delete may be a cascade from the listing itself.
+    sync_listing_availability(instance.listing_id, create=False)
+    invalidate_feed_for_availability_change(instance.listing_id)
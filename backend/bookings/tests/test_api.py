@@ -642,13 +642,12 @@ def test_before_photos_complete_creates_photo_and_schedules_scan(
 
     monkeypatch.setattr(bookings_api, "public_url", lambda key: f"https://cdn.example/{key}")
 
-    queued = {}
-
-    class _StubTask:
-        def delay(self, **kwargs):
-            queued.update(kwargs)
-
-    monkeypatch.setattr(bookings_api, "scan_and_finalize_booking_photo", _StubTask())
+    queued = []
+    monkeypatch.setattr(
+        bookings_api,
+        "queue_booking_photo_scan",
+        lambda booking_id, **kwargs: queued.append(booking_id),
+    )
 
     payload = {
         "key": "uploads/bookings/manual/before.jpg",
@@ -668,10 +667,7 @@ def test_before_photos_complete_creates_photo_and_schedules_scan(
     assert photo.url == f"https://cdn.example/{payload['key']}"
     assert photo.status == BookingPhoto.Status.PENDING
     assert photo.av_status == BookingPhoto.AVStatus.PENDING
-    assert queued["key"] == payload["key"]
-    assert queued["booking_id"] == booking.id
-    assert queued["uploaded_by_id"] == renter_user.id
-    assert queued["meta"]["role"] == BookingPhoto.Role.BEFORE
+    assert queued == [booking.id]
     booking.refresh_from_db()
     assert booking.before_photos_uploaded_at is not None
 
@@ -0,0 +1,142 @@
+"""Tests for the materialized listing availability calendar."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from bookings.availability import (
+    get_blocked_ranges,
+    get_blocked_ranges_bulk,
+    rebuild_listing_availability,
+)
+from bookings.domain import ensure_no_conflict
+from bookings.models import Booking, ListingAvailability
+from listings.models import Listing
+
+pytestmark = pytest.mark.django_db
+
+
+def future(days: int) -> date:
+    return date.today() + timedelta(days=days)
+
+
+def _dates(ranges):
+    return [(item["start_date"], item["end_date"]) for item in ranges]
+
+
+def test_requested_booking_does_not_create_calendar_row(listing, booking_factory):
+    booking_factory(start_date=future(3), end_date=future(5))
+
+    assert not ListingAvailability.objects.filter(listing=listing).exists()
+    assert get_blocked_ranges(listing.id) == []
+
+
+def test_status_transitions_update_calendar(listing, booking_factory):
+    booking = booking_factory(start_date=future(3), end_date=future(5))
+
+    booking.status = Booking.Status.CONFIRMED
+    booking.save(update_fields=["status", "updated_at"])
+    assert _dates(get_blocked_ranges(listing.id)) == [
+        (future(3).isoformat(), future(5).isoformat())
+    ]
+
+    booking.status = Booking.Status.PAID
+    booking.save(update_fields=["status"])
+    assert len(get_blocked_ranges(listing.id)) == 1
+
+    booking.status = Booking.Status.CANCELED
+    booking.save(update_fields=["status"])
+    assert get_blocked_ranges(listing.id) == []
+
+
+def test_date_changes_and_deletes_update_calendar(listing, booking_factory):
+    booking = booking_factory(
+        start_date=future(3), end_date=future(5), status=Booking.Status.CONFIRMED
+    )
+    booking.start_date = future(6)
+    booking.end_date = future(8)
+    booking.save()
+    assert _dates(get_blocked_ranges(listing.id)) == [
+        (future(6).isoformat(), future(8).isoformat())
+    ]
+
+    booking.delete()
+    assert get_blocked_ranges(listing.id) == []
+
+
+def test_conflict_check_uses_calendar(listing, booking_factory):
+    booking = booking_factory(
+        start_date=future(3), end_date=future(5), status=Booking.Status.CONFIRMED
+    )
+
+    with pytest.raises(ValidationError):
+        ensure_no_conflict(listing, future(4), future(6))
+    ensure_no_conflict(listing, future(5), future(7))
+    ensure_no_conflict(listing, future(4), future(6), exclude_booking_id=booking.id)
+
+
+def test_rebuild_repairs_rows_written_behind_signals(listing, booking_factory):
+    booking = booking_factory(
+        start_date=future(3), end_date=future(5), status=Booking.Status.CONFIRMED
+    )
+    Booking.objects.filter(pk=booking.pk).update(status=Booking.Status.CANCELED)
+    assert len(get_blocked_ranges(listing.id)) == 1
+
+    assert rebuild_listing_availability() == 1
+    assert get_blocked_ranges(listing.id) == []
+
+
+def test_listing_delete_cascades_through_calendar(listing, booking_factory):
+    booking_factory(start_date=future(3), end_date=future(5), status=Booking.Status.PAID)
+
+    listing.delete()
+    assert not ListingAvailability.objects.exists()
+
+
+def test_bulk_lookup_returns_every_requested_listing(listing, other_user, booking_factory):
+    other_listing = Listing.objects.create(
+        owner=other_user,
+        title="Ladder",
+        description="Extension ladder",
+        daily_price_cad=Decimal("12.00"),
+        replacement_value_cad=Decimal("300.00"),
+        damage_deposit_cad=Decimal("40.00"),
+        city="Calgary",
+        is_active=True,
+        is_available=True,
+    )
+    booking_factory(start_date=future(3), end_date=future(5), status=Booking.Status.PAID)
+
+    ranges = get_blocked_ranges_bulk([listing.id, other_listing.id])
+    assert len(ranges[listing.id]) == 1
+    assert ranges[other_listing.id] == []
+
+
+def test_bulk_availability_endpoint(listing, other_user, booking_factory):
+    hidden = Listing.objects.create(
+        owner=other_user,
+        title="Hidden",
+        description="Inactive listing",
+        daily_price_cad=Decimal("12.00"),
+        replacement_value_cad=Decimal("300.00"),
+        damage_deposit_cad=Decimal("40.00"),
+        city="Calgary",
+        is_active=False,
+        is_available=True,
+    )
+    booking_factory(start_date=future(3), end_date=future(5), status=Booking.Status.CONFIRMED)
+
+    client = APIClient()
+    resp = client.get(f"/api/bookings/availability/?listings={listing.id},{hidden.id}")
+    assert resp.status_code == 200
+    assert resp.data == {
+        str(listing.id): [{"start_date": future(3).isoformat(), "end_date": future(5).isoformat()}]
+    }
+
+    resp = client.get("/api/bookings/availability/?listings=1,abc")
+    assert resp.status_code == 400
@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+import pytest
+
+from bookings.models import Booking
+
+pytestmark = pytest.mark.django_db
+
+
+def test_money_columns_follow_totals_on_create(booking_factory):
+    booking = booking_factory(
+        totals={
+            "rental_subtotal": "90.00",
+            "renter_fee_total": "9.45",
+            "renter_fee_gst": "0.45",
+            "owner_fee_base": "4.50",
+            "owner_fee_gst": "0.23",
+            "owner_fee_total": "4.73",
+            "platform_fee_total": "14.18",
+            "owner_payout": "85.27",
+            "damage_deposit": "250.00",
+            "total_charge": "349.45",
+        }
+    )
+
+    booking.refresh_from_db()
+    assert booking.total_charge == Decimal("349.45")
+    assert booking.owner_fee_base == Decimal("4.50")
+    assert booking.platform_fee_total == Decimal("14.18")
+    assert booking.owner_payout == Decimal("85.27")
+    assert booking.damage_deposit == Decimal("250.00")
+
+
+def test_money_columns_resync_only_when_totals_saved(booking_factory):
+    booking = booking_factory(totals={"total_charge": "100.00"})
+
+    booking.totals = {"total_charge": "120.00", "renter_fee": "5.00", "owner_fee": "2.50"}
+    booking.status = Booking.Status.CONFIRMED
+    booking.save(update_fields=["status"])
+    booking.refresh_from_db()
+    assert booking.total_charge == Decimal("100.00")
+
+    booking.totals = {"total_charge": "120.00", "renter_fee": "5.00", "owner_fee": "2.50"}
+    booking.save(update_fields=["totals"])
+    booking.refresh_from_db()
+    assert booking.total_charge == Decimal("120.00")
+    # Legacy keys fill the typed columns too.
+    assert booking.renter_fee_total == Decimal("5.00")
+    assert booking.owner_fee_base == Decimal("2.50")
+    assert booking.owner_payout is None
+
+
+def test_unparseable_totals_leave_columns_empty(booking_factory):
+    booking = booking_factory(totals={"total_charge": "n/a"})
+
+    booking.refresh_from_db()
+    assert booking.total_charge is None
@@ -217,13 +217,12 @@ def test_after_photos_complete_queues_scan(booking_factory, renter_user, monkeyp
 
     monkeypatch.setattr(bookings_api, "public_url", lambda key: f"https://cdn.test/{key}")
 
-    queued = {}
-
-    class _StubTask:
-        def delay(self, **kwargs):
-            queued.update(kwargs)
-
-    monkeypatch.setattr(bookings_api, "scan_and_finalize_booking_photo", _StubTask())
+    queued = []
+    monkeypatch.setattr(
+        bookings_api,
+        "queue_booking_photo_scan",
+        lambda booking_id, **kwargs: queued.append((booking_id, kwargs)),
+    )
 
     payload = {
         "key": booking_object_key(booking.id, renter_user.id, "after.png"),
@@ -231,6 +230,7 @@ def test_after_photos_complete_queues_scan(booking_factory, renter_user, monkeyp
         "filename": "after.png",
         "content_type": "image/png",
         "size": 4096,
+        "original_size": 9000,
     }
     resp = client.post(
         f"/api/bookings/{booking.id}/after-photos/complete/",
@@ -240,12 +240,14 @@ def test_after_photos_complete_queues_scan(booking_factory, renter_user, monkeyp
 
     assert resp.status_code == 202, resp.data
     assert resp.data["status"] == "queued"
-    assert queued["key"] == payload["key"]
-    assert queued["booking_id"] == booking.id
-    assert queued["uploaded_by_id"] == renter_user.id
-    assert queued["meta"]["role"] == BookingPhoto.Role.AFTER
-    assert queued["meta"]["etag"] == payload["etag"]
+    assert queued == [
+        (
+            booking.id,
+            {"key": payload["key"], "original_size": 9000, "compressed_size": None},
+        )
+    ]
     photo = BookingPhoto.objects.get(booking=booking, s3_key=payload["key"])
+    assert photo.etag == "etag-after"
     assert photo.role == BookingPhoto.Role.AFTER
     assert photo.url == f"https://cdn.test/{payload['key']}"
     assert photo.status == BookingPhoto.Status.PENDING
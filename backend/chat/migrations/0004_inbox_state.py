@@ -0,0 +1,94 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BACKFILL_CHUNK_SIZE = 500
+
+
+def backfill_inbox_state(apps, schema_editor):
+    """Frozen copy of chat.models.rebuild_inbox_state for existing conversations."""
+    Conversation = apps.get_model("chat", "Conversation")
+    Message = apps.get_model("chat", "Message")
+    ConversationReadState = apps.get_model("chat", "ConversationReadState")
+
+    last_id = 0
+    while True:
+        conversations = list(
+            Conversation.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "owner_id", "renter_id")[:BACKFILL_CHUNK_SIZE]
+        )
+        if not conversations:
+            return
+        ids = [conv.id for conv in conversations]
+
+        for conv in conversations:
+            last = (
+                Message.objects.filter(conversation_id=conv.id)
+                .order_by("-created_at", "-id")
+                .values_list("id", "created_at")
+                .first()
+            )
+            if last:
+                conv.last_message_id, conv.last_message_at = last
+        Conversation.objects.bulk_update(conversations, ["last_message", "last_message_at"])
+
+        states = {
+            (state.conversation_id, state.user_id): state
+            for state in ConversationReadState.objects.filter(conversation_id__in=ids)
+        }
+        to_create = []
+        for conv in conversations:
+            for user_id in (conv.owner_id, conv.renter_id):
+                state = states.get((conv.id, user_id))
+                unread = Message.objects.filter(
+                    conversation_id=conv.id,
+                    id__gt=(state.last_read_message_id or 0) if state else 0,
+                ).exclude(sender_id=user_id)
+                if state is not None:
+                    state.unread_count = unread.count()
+                elif unread.exists():
+                    to_create.append(
+                        ConversationReadState(
+                            conversation_id=conv.id, user_id=user_id, unread_count=unread.count()
+                        )
+                    )
+        ConversationReadState.objects.bulk_update(list(states.values()), ["unread_count"])
+        ConversationReadState.objects.bulk_create(to_create, ignore_conflicts=True)
+        last_id = ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("chat", "0003_conversation_listing_alter_conversation_booking_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="conversation",
+            name="last_message",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="chat.message",
+            ),
+        ),
+        migrations.AddField(
+            model_name="conversation",
+            name="last_message_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="conversationreadstate",
+            name="unread_count",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Messages from others after last_read_message; kept current on write.",
+            ),
+        ),
+        migrations.RunPython(backfill_inbox_state, migrations.RunPython.noop),
+    ]
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Tuple
+from typing import TYPE_CHECKING, Iterable, Tuple
 
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from core.redis import push_event
@@ -47,6 +49,15 @@ class Conversation(models.Model):
     )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(default=timezone.now)
+    # Denormalized inbox pointer, maintained by create_user_message/create_system_message.
+    last_message = models.ForeignKey(
+        "chat.Message",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    last_message_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ["-created_at"]
@@ -151,6 +162,10 @@ class ConversationReadState(models.Model):
         related_name="+",
     )
     last_read_at = models.DateTimeField(null=True, blank=True)
+    unread_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Messages from others after last_read_message; kept current on write.",
+    )
 
     class Meta:
         unique_together = ("conversation", "user")
@@ -274,6 +289,49 @@ def _push_chat_event_for_conversation(conv: Conversation, msg: Message) -> None:
     push_event(conv.renter_id, "chat:new_message", payload)
 
 
+def _unread_messages(conversation_id, user_id, after_id=0):
+    """Messages in the conversation not sent by ``user_id`` with an id above ``after_id``."""
+    return Message.objects.filter(conversation_id=conversation_id, id__gt=after_id).exclude(
+        sender_id=user_id
+    )
+
+
+def _count_subquery(queryset) -> Coalesce:
+    counted = (
+        queryset.order_by().values("conversation_id").annotate(total=Count("id")).values("total")
+    )
+    return Coalesce(Subquery(counted[:1]), 0)
+
+
+def _record_message(conv: Conversation, msg: Message) -> None:
+    """Point the conversation at ``msg`` and count it as unread for everyone but its sender."""
+    is_newer = (
+        Q(last_message_at__isnull=True)
+        | Q(last_message_at__lt=msg.created_at)
+        | Q(last_message_at=msg.created_at, last_message_id__lt=msg.id)
+    )
+    if Conversation.objects.filter(is_newer, pk=conv.pk).update(
+        last_message=msg, last_message_at=msg.created_at
+    ):
+        conv.last_message = msg
+        conv.last_message_at = msg.created_at
+
+    for user_id in {conv.owner_id, conv.renter_id} - {msg.sender_id}:
+        states = ConversationReadState.objects.filter(conversation_id=conv.id, user_id=user_id)
+        if states.update(unread_count=F("unread_count") + 1):
+            continue
+        try:
+            with transaction.atomic():
+                ConversationReadState.objects.create(
+                    conversation_id=conv.id,
+                    user_id=user_id,
+                    unread_count=_unread_messages(conv.id, user_id).count(),
+                )
+        except IntegrityError:
+            # The participant opened the conversation between our update and insert.
+            states.update(unread_count=F("unread_count") + 1)
+
+
 def create_system_message(
     booking: "Booking",
     system_kind: str,
@@ -282,17 +340,19 @@ def create_system_message(
     close_chat: bool = False,
 ) -> Tuple[Conversation, Message]:
     """Create a system-generated chat entry for the booking."""
-    conv = get_or_create_booking_conversation(booking)
-    if close_chat and conv.is_active:
-        conv.is_active = False
-        conv.save(update_fields=["is_active"])
-    msg = Message.objects.create(
-        conversation=conv,
-        sender=None,
-        message_type=Message.MESSAGE_TYPE_SYSTEM,
-        system_kind=system_kind,
-        text=text,
-    )
+    with transaction.atomic():
+        conv = get_or_create_booking_conversation(booking)
+        if close_chat and conv.is_active:
+            conv.is_active = False
+            conv.save(update_fields=["is_active"])
+        msg = Message.objects.create(
+            conversation=conv,
+            sender=None,
+            message_type=Message.MESSAGE_TYPE_SYSTEM,
+            system_kind=system_kind,
+            text=text,
+        )
+        _record_message(conv, msg)
     _push_chat_event_for_conversation(conv, msg)
     return conv, msg
 
@@ -303,12 +363,14 @@ def create_user_message(
     text: str,
 ) -> Message:
     """Create a user-authored chat message and emit events."""
-    msg = Message.objects.create(
-        conversation=conversation,
-        sender=sender,
-        message_type=Message.MESSAGE_TYPE_USER,
-        text=text,
-    )
+    with transaction.atomic():
+        msg = Message.objects.create(
+            conversation=conversation,
+            sender=sender,
+            message_type=Message.MESSAGE_TYPE_USER,
+            text=text,
+        )
+        _record_message(conversation, msg)
     _push_chat_event_for_conversation(conversation, msg)
     return msg
 
@@ -321,21 +383,32 @@ def mark_conversation_read(
         return None
 
     last_message = conversation.messages.order_by("-id").first()
-    state, _ = ConversationReadState.objects.get_or_create(
+    now = timezone.now()
+    state, created = ConversationReadState.objects.get_or_create(
         conversation=conversation,
         user=user,
-        defaults={"last_read_at": timezone.now(), "last_read_message": last_message},
+        defaults={"last_read_at": now, "last_read_message": last_message},
     )
-    if last_message and state.last_read_message_id == last_message.id:
+    if created:
+        return state
+    if last_message and state.last_read_message_id == last_message.id and not state.unread_count:
         return state
 
+    fields = {}
     if last_message:
-        state.last_read_message = last_message
-        state.last_read_at = timezone.now()
-        state.save(update_fields=["last_read_message", "last_read_at"])
+        fields.update(last_read_message=last_message, last_read_at=now)
     elif not state.last_read_at:
-        state.last_read_at = timezone.now()
-        state.save(update_fields=["last_read_at"])
+        fields["last_read_at"] = now
+    # Recount in the UPDATE itself so a message committed after ``last_message`` was read
+    # stays unread instead of being zeroed by a concurrent increment.
+    after_id = last_message.id if last_message else 0
+    ConversationReadState.objects.filter(pk=state.pk).update(
+        unread_count=_count_subquery(_unread_messages(conversation.id, user.id, after_id)),
+        **fields,
+    )
+    for field, value in fields.items():
+        setattr(state, field, value)
+    state.unread_count = 0
     return state
 
 
@@ -345,13 +418,84 @@ def get_unread_message_count(conversation: Conversation, user: "User") -> int:
         return 0
     state = getattr(conversation, "_read_state", None)
     if state is None:
-        try:
-            state = conversation.read_states.get(user=user)
-        except ConversationReadState.DoesNotExist:
-            state = None
-    last_read_id = state.last_read_message_id if state else None
-
-    qs = conversation.messages.exclude(sender=user)
-    if last_read_id:
-        qs = qs.filter(id__gt=last_read_id)
-    return qs.count()
+        state = conversation.read_states.filter(user=user).first()
+    return state.unread_count if state else 0
+
+
+def rebuild_inbox_state(conversation_ids: Iterable[int], *, dry_run: bool = False) -> list[int]:
+    """
+    Recompute ``last_message``/``last_message_at`` and per-participant unread counters.
+
+    Repairs drift from messages written outside ``create_user_message`` /
+    ``create_system_message`` (fixtures, shell, deletes). Returns the ids of conversations
+    whose stored state was wrong; with ``dry_run`` nothing is written.
+    """
+    ids = list(conversation_ids)
+    latest = Message.objects.filter(conversation=OuterRef("pk")).order_by("-created_at", "-id")
+    conversations = list(
+        Conversation.objects.filter(id__in=ids).annotate(
+            actual_last_id=Subquery(latest.values("id")[:1]),
+            actual_last_at=Subquery(latest.values("created_at")[:1]),
+        )
+    )
+    mismatched: set[int] = set()
+    stale_conversations = []
+    for conv in conversations:
+        if (conv.last_message_id, conv.last_message_at) != (
+            conv.actual_last_id,
+            conv.actual_last_at,
+        ):
+            conv.last_message_id = conv.actual_last_id
+            conv.last_message_at = conv.actual_last_at
+            stale_conversations.append(conv)
+            mismatched.add(conv.id)
+
+    unread = _count_subquery(
+        Message.objects.filter(
+            conversation_id=OuterRef("conversation_id"),
+            id__gt=Coalesce(OuterRef("last_read_message_id"), 0),
+        ).exclude(sender_id=OuterRef("user_id"))
+    )
+    states = list(
+        ConversationReadState.objects.filter(conversation_id__in=ids).annotate(actual_unread=unread)
+    )
+    stale_states = []
+    for state in states:
+        if state.unread_count != state.actual_unread:
+            state.unread_count = state.actual_unread
+            stale_states.append(state)
+            mismatched.add(state.conversation_id)
+
+    # Participants who never opened the conversation: everything from others is unread.
+    seen = {(state.conversation_id, state.user_id) for state in states}
+    sent = {}
+    for conv_id, sender_id, total in (
+        Message.objects.filter(conversation_id__in=ids)
+        .values("conversation_id", "sender_id")
+        .annotate(total=Count("id"))
+        .values_list("conversation_id", "sender_id", "total")
+    ):
+        sent.setdefault(conv_id, {})[sender_id] = total
+    missing_states = []
+    for conv in conversations:
+        by_sender = sent.get(conv.id, {})
+        for user_id in (conv.owner_id, conv.renter_id):
+            if (conv.id, user_id) in seen:
+                continue
+            count = sum(by_sender.values()) - by_sender.get(user_id, 0)
+            if count:
+                missing_states.append(
+                    ConversationReadState(
+                        conversation_id=conv.id, user_id=user_id, unread_count=count
+                    )
+                )
+                mismatched.add(conv.id)
+
+    if not dry_run:
+        with transaction.atomic():
+            Conversation.objects.bulk_update(
+                stale_conversations, ["last_message", "last_message_at"]
+            )
+            ConversationReadState.objects.bulk_update(stale_states, ["unread_count"])
+            ConversationReadState.objects.bulk_create(missing_states, ignore_conflicts=True)
+    return sorted(mismatched)
@@ -102,11 +102,8 @@ class ConversationSerializer(ConversationParticipantMixin, serializers.ModelSeri
         return getattr(listing, "title", "") if listing else ""
 
     def _get_last_message(self, obj: Conversation) -> Message | None:
-        if hasattr(obj, "_last_message_cache"):
-            return obj._last_message_cache  # type: ignore[attr-defined]
-        msg = obj.messages.order_by("-created_at").first()
-        obj._last_message_cache = msg  # type: ignore[attr-defined]
-        return msg
+        # Denormalized on the conversation; the list view select_related()s it.
+        return obj.last_message if obj.last_message_id else None
 
     def get_last_message(self, obj: Conversation):
         msg = self._get_last_message(obj)
@@ -130,8 +127,7 @@ class ConversationSerializer(ConversationParticipantMixin, serializers.ModelSeri
         }
 
     def get_last_message_at(self, obj: Conversation):
-        msg = self._get_last_message(obj)
-        return msg.created_at if msg else None
+        return obj.last_message_at
 
     def get_unread_count(self, obj: Conversation) -> int:
         cached = getattr(obj, "_unread_count", None)
@@ -189,6 +185,7 @@ class ConversationDetailSerializer(ConversationParticipantMixin, serializers.Mod
     listing_title = serializers.SerializerMethodField()
     listing_primary_photo_url = serializers.SerializerMethodField()
     messages = serializers.SerializerMethodField()
+    has_earlier_messages = serializers.SerializerMethodField()
     other_party_name = serializers.SerializerMethodField()
     other_party_avatar_url = serializers.SerializerMethodField()
     other_party_identity_verified = serializers.SerializerMethodField()
@@ -206,6 +203,7 @@ class ConversationDetailSerializer(ConversationParticipantMixin, serializers.Mod
             "other_party_avatar_url",
             "other_party_identity_verified",
             "messages",
+            "has_earlier_messages",
         ]
 
     def _get_listing(self, obj: Conversation):
@@ -236,14 +234,21 @@ class ConversationDetailSerializer(ConversationParticipantMixin, serializers.Mod
         return photo.url if photo else None
 
     def get_messages(self, obj: Conversation):
+        # Views pass a page of history in context["messages"]; default to all of it.
+        messages = self.context.get("messages")
+        if messages is None:
+            messages = list(obj.messages.all())
         serializer = MessageSerializer(
-            obj.messages.all(),
+            messages,
             many=True,
             read_only=True,
             context=self.context,
         )
         return serializer.data
 
+    def get_has_earlier_messages(self, obj: Conversation) -> bool:
+        return bool(self.context.get("has_earlier_messages", False))
+
 
 class SendMessageSerializer(serializers.Serializer):
     """Validate incoming chat messages."""
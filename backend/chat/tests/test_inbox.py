@@ -0,0 +1,134 @@
+"""Tests for the denormalized chat inbox (last message + unread counters)."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from bookings.models import Booking
+from chat.models import (
+    Conversation,
+    ConversationReadState,
+    Message,
+    create_system_message,
+    create_user_message,
+    mark_conversation_read,
+    rebuild_inbox_state,
+)
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+def _client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+def _conversation(owner, renter, listing):
+    return Conversation.objects.create(owner=owner, renter=renter, listing=listing)
+
+
+def _unread(conv, user):
+    state = ConversationReadState.objects.filter(conversation=conv, user=user).first()
+    return state.unread_count if state else 0
+
+
+def test_helpers_maintain_last_message_and_unread_counts(booking_factory, owner_user, renter_user):
+    booking = booking_factory(
+        start_date=date.today(),
+        end_date=date.today() + timedelta(days=1),
+        status=Booking.Status.CONFIRMED,
+    )
+    conv, _ = create_system_message(booking, Message.SYSTEM_REQUEST_APPROVED, "Approved")
+    create_user_message(conv, renter_user, "Hi!")
+    second = create_user_message(conv, renter_user, "Still there?")
+
+    conv.refresh_from_db()
+    assert conv.last_message_id == second.id
+    assert conv.last_message_at == second.created_at
+    assert _unread(conv, owner_user) == 3
+    assert _unread(conv, renter_user) == 1  # only the system message
+
+    mark_conversation_read(conv, owner_user)
+    assert _unread(conv, owner_user) == 0
+    reply = create_user_message(conv, owner_user, "Yes")
+    assert _unread(conv, renter_user) == 2
+
+    resp = _client(renter_user).get("/api/chats/")
+    assert resp.status_code == 200, resp.data
+    row = resp.data[0]
+    assert row["unread_count"] == 2
+    assert row["last_message"]["id"] == reply.id
+    assert row["last_message"]["is_read"] is False
+
+
+def test_inbox_query_count_does_not_grow_with_conversations(owner_user, listing):
+    renters = [
+        User.objects.create_user(username=f"inbox-renter-{i}", password="testpass")
+        for i in range(5)
+    ]
+    conversations = [_conversation(owner_user, renter, listing) for renter in renters]
+    create_user_message(conversations[0], renters[0], "First")
+
+    client = _client(owner_user)
+    with CaptureQueriesContext(connection) as one:
+        client.get("/api/chats/")
+    for conv, renter in zip(conversations, renters):
+        create_user_message(conv, renter, "Ping")
+    with CaptureQueriesContext(connection) as many:
+        resp = client.get("/api/chats/")
+
+    assert len(many) == len(one)
+    assert [row["unread_count"] for row in resp.data] == [1, 1, 1, 1, 2]
+
+
+def test_inbox_cursor_pages_by_most_recent_message(owner_user, listing):
+    renters = [
+        User.objects.create_user(username=f"cursor-renter-{i}", password="testpass")
+        for i in range(3)
+    ]
+    conversations = [_conversation(owner_user, renter, listing) for renter in renters]
+    create_user_message(conversations[1], renters[1], "older")
+    create_user_message(conversations[0], renters[0], "newer")
+    client = _client(owner_user)
+
+    first = client.get("/api/chats/?cursor=&page_size=2")
+    assert first.status_code == 200, first.data
+    assert [row["id"] for row in first.data["results"]] == [
+        conversations[0].id,
+        conversations[1].id,
+    ]
+    assert first.data["has_next"] is True
+
+    second = client.get(f"/api/chats/?cursor={first.data['next_cursor']}&page_size=2")
+    assert [row["id"] for row in second.data["results"]] == [conversations[2].id]
+    assert second.data["has_next"] is False
+    assert second.data["next_cursor"] is None
+
+    assert client.get("/api/chats/?cursor=bogus").status_code == 400
+
+
+def test_rebuild_inbox_state_repairs_messages_written_directly(owner_user, renter_user, listing):
+    conv = _conversation(owner_user, renter_user, listing)
+    create_user_message(conv, owner_user, "Welcome")
+    # Writes that bypass the helpers leave the inbox stale.
+    direct = Message.objects.create(conversation=conv, sender=renter_user, text="Direct")
+
+    assert rebuild_inbox_state([conv.id], dry_run=True) == [conv.id]
+    conv.refresh_from_db()
+    assert conv.last_message_id != direct.id
+
+    rebuild_inbox_state([conv.id])
+    conv.refresh_from_db()
+    assert conv.last_message_id == direct.id
+    assert _unread(conv, owner_user) == 1
+    assert _unread(conv, renter_user) == 1
+    assert rebuild_inbox_state([conv.id]) == []
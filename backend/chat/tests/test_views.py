@@ -58,3 +58,73 @@ def test_message_is_not_marked_read_until_other_user_views(
     follow_up_resp = owner_client.get(f"/api/chats/{conversation.id}/")
     assert follow_up_resp.status_code == 200
     assert follow_up_resp.data["messages"][-1]["is_read"] is True
+
+
+def _conversation_with_messages(booking_factory, owner_user, renter_user, count):
+    booking = booking_factory(
+        start_date=date.today(),
+        end_date=date.today() + timedelta(days=1),
+        status=Booking.Status.CONFIRMED,
+    )
+    conversation = Conversation.objects.create(
+        booking=booking, owner=owner_user, renter=renter_user
+    )
+    messages = [
+        Message.objects.create(
+            conversation=conversation,
+            sender=owner_user if i % 2 else renter_user,
+            text=f"message {i}",
+        )
+        for i in range(count)
+    ]
+    return conversation, messages
+
+
+def test_chat_detail_pages_history_backwards(booking_factory, owner_user, renter_user):
+    conversation, messages = _conversation_with_messages(
+        booking_factory, owner_user, renter_user, 5
+    )
+    client = auth(owner_user)
+
+    latest = client.get(f"/api/chats/{conversation.id}/?limit=2")
+    assert latest.status_code == 200, latest.data
+    assert [m["id"] for m in latest.data["messages"]] == [messages[3].id, messages[4].id]
+    assert latest.data["has_earlier_messages"] is True
+
+    earlier = client.get(
+        f"/api/chats/{conversation.id}/messages/?before_id={messages[3].id}&limit=3"
+    )
+    assert earlier.status_code == 200, earlier.data
+    assert [m["id"] for m in earlier.data["messages"]] == [m.id for m in messages[:3]]
+    assert earlier.data["has_more"] is False
+
+    full = client.get(f"/api/chats/{conversation.id}/")
+    assert len(full.data["messages"]) == 5
+    assert full.data["has_earlier_messages"] is False
+
+
+def test_chat_messages_after_id_returns_only_new_messages_with_read_flags(
+    booking_factory, owner_user, renter_user
+):
+    conversation, messages = _conversation_with_messages(
+        booking_factory, owner_user, renter_user, 2
+    )
+    owner_client = auth(owner_user)
+    owner_client.get(f"/api/chats/{conversation.id}/?limit=50")
+
+    reply = Message.objects.create(conversation=conversation, sender=owner_user, text="Reply")
+    delta = owner_client.get(f"/api/chats/{conversation.id}/messages/?after_id={messages[-1].id}")
+    assert delta.status_code == 200, delta.data
+    assert [m["id"] for m in delta.data["messages"]] == [reply.id]
+    assert delta.data["messages"][0]["is_read"] is False
+    assert delta.data["has_more"] is False
+
+    auth(renter_user).get(f"/api/chats/{conversation.id}/messages/?after_id={reply.id}")
+    refreshed = owner_client.get(
+        f"/api/chats/{conversation.id}/messages/?after_id={messages[-1].id}"
+    )
+    assert refreshed.data["messages"][0]["is_read"] is True
+    assert refreshed.data["other_last_read_message_id"] == reply.id
+
+    bad = owner_client.get(f"/api/chats/{conversation.id}/messages/?after_id=1&before_id=2")
+    assert bad.status_code == 400
@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
-from django.db.models import Q
+from django.db.models import F, Q
 from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
@@ -15,7 +16,6 @@ from chat.models import (
     ConversationReadState,
     create_user_message,
     get_or_create_listing_conversation,
-    get_unread_message_count,
     mark_conversation_read,
 )
 from chat.serializers import (
@@ -24,6 +24,7 @@ from chat.serializers import (
     MessageSerializer,
     SendMessageSerializer,
 )
+from core.cursors import decode_cursor, encode_cursor
 from listings.models import Listing
 
 
@@ -36,61 +37,188 @@ def _get_user_conversation_or_404(user, pk: int) -> Conversation:
             "listing",
             "owner",
             "renter",
-        ).prefetch_related("messages"),
+        ),
         Q(owner=user) | Q(renter=user),
         pk=pk,
     )
 
 
+def _read_context(request, conv: Conversation) -> dict:
+    """Mark ``conv`` read for the viewer and return both read pointers as serializer context."""
+    read_state = mark_conversation_read(conv, request.user)
+    other_user_id = conv.owner_id if request.user.id == conv.renter_id else conv.renter_id
+    other_read_state = None
+    if other_user_id:
+        other_read_state = ConversationReadState.objects.filter(
+            conversation=conv,
+            user_id=other_user_id,
+        ).first()
+    return {"request": request, "read_state": read_state, "other_read_state": other_read_state}
+
+
+CHAT_HISTORY_PAGE_SIZE = 50
+CHAT_HISTORY_MAX_PAGE_SIZE = 200
+
+
+def _parse_message_id(value: str | None) -> int | None:
+    if value in (None, ""):
+        return None
+    parsed = int(value)
+    if parsed < 0:
+        raise ValueError("message ids must be positive.")
+    return parsed
+
+
+def _parse_history_limit(value: str | None) -> int | None:
+    if value in (None, ""):
+        return None
+    parsed = int(value)
+    if parsed <= 0:
+        raise ValueError("limit must be greater than zero.")
+    return min(parsed, CHAT_HISTORY_MAX_PAGE_SIZE)
+
+
+def _history_page(conv: Conversation, *, before_id: int | None, limit: int):
+    """Return the ``limit`` messages before ``before_id`` (oldest first) and whether more exist."""
+    qs = conv.messages.order_by("-id")
+    if before_id is not None:
+        qs = qs.filter(id__lt=before_id)
+    rows = list(qs[: limit + 1])
+    return rows[:limit][::-1], len(rows) > limit
+
+
+INBOX_PAGE_SIZE = 30
+INBOX_MAX_PAGE_SIZE = 100
+INBOX_ORDERING = (F("last_message_at").desc(nulls_last=True), "-id")
+
+
+def _encode_inbox_cursor(conv: Conversation) -> str:
+    position = {
+        "t": conv.last_message_at.isoformat() if conv.last_message_at else None,
+        "i": conv.id,
+    }
+    return encode_cursor(position)
+
+
+def _decode_inbox_cursor(token: str) -> Q:
+    """Return the filter selecting conversations after ``token`` in ``INBOX_ORDERING``."""
+    position = decode_cursor(token)
+    try:
+        conv_id = int(position["i"])
+        raw_at = position["t"]
+        last_message_at = parse_datetime(raw_at) if raw_at is not None else None
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("cursor is invalid.")
+    if raw_at is not None and last_message_at is None:
+        raise ValueError("cursor is invalid.")
+    if last_message_at is None:
+        return Q(last_message_at__isnull=True, id__lt=conv_id)
+    return (
+        Q(last_message_at__lt=last_message_at)
+        | Q(last_message_at=last_message_at, id__lt=conv_id)
+        | Q(last_message_at__isnull=True)
+    )
+
+
+def _parse_inbox_page_size(value: str | None) -> int:
+    try:
+        size = int(value) if value not in (None, "") else INBOX_PAGE_SIZE
+    except (TypeError, ValueError):
+        size = INBOX_PAGE_SIZE
+    if size <= 0:
+        size = INBOX_PAGE_SIZE
+    return min(size, INBOX_MAX_PAGE_SIZE)
+
+
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def chat_list(request):
-    """Return all conversations for the authenticated user."""
+    """
+    Return the authenticated user's conversations, most recent message first.
+
+    Unread counts and the last message come from the denormalized inbox columns, so the
+    list costs two queries regardless of size. Send ``cursor`` (empty for the first page,
+    then ``next_cursor``) with optional ``page_size`` for a paginated response; without it
+    every conversation is returned as a plain list.
+    """
     user = request.user
-    qs = list(
-        Conversation.objects.filter(Q(owner=user) | Q(renter=user)).select_related(
+    qs = (
+        Conversation.objects.filter(Q(owner=user) | Q(renter=user))
+        .select_related(
             "booking",
             "booking__listing",
             "listing",
             "owner",
+            "owner__payout_account",
             "renter",
+            "renter__payout_account",
+            "last_message",
         )
+        .order_by(*INBOX_ORDERING)
     )
+
+    paginated = "cursor" in request.query_params
+    has_next = False
+    if paginated:
+        page_size = _parse_inbox_page_size(request.query_params.get("page_size"))
+        token = request.query_params.get("cursor") or ""
+        if token:
+            try:
+                qs = qs.filter(_decode_inbox_cursor(token))
+            except ValueError:
+                return Response({"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+        conversations = list(qs[: page_size + 1])
+        has_next = len(conversations) > page_size
+        conversations = conversations[:page_size]
+    else:
+        conversations = list(qs)
+
     states = {
         state.conversation_id: state
         for state in ConversationReadState.objects.filter(
-            user=user, conversation__in=[conv.id for conv in qs]
+            user=user, conversation__in=[conv.id for conv in conversations]
         )
     }
-    for conv in qs:
+    for conv in conversations:
         conv._read_state = states.get(conv.id)
-        conv._unread_count = get_unread_message_count(conv, user)
+        conv._unread_count = conv._read_state.unread_count if conv._read_state else 0
 
-    serializer = ConversationSerializer(qs, many=True, context={"request": request})
-    return Response(serializer.data)
+    serializer = ConversationSerializer(conversations, many=True, context={"request": request})
+    if not paginated:
+        return Response(serializer.data)
+    return Response(
+        {
+            "results": serializer.data,
+            "next_cursor": _encode_inbox_cursor(conversations[-1]) if has_next else None,
+            "has_next": has_next,
+        }
+    )
 
 
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def chat_detail(request, pk: int):
-    """Return the full conversation history."""
+    """
+    Return the conversation with its message history.
+
+    With ``limit`` and/or ``before_id`` only that page of history (oldest first) is returned,
+    plus ``has_earlier_messages``; without them the full history is returned as before.
+    """
     conv = _get_user_conversation_or_404(request.user, pk)
-    read_state = mark_conversation_read(conv, request.user)
-    other_user_id = conv.owner_id if request.user.id == conv.renter_id else conv.renter_id
-    other_read_state = None
-    if other_user_id:
-        other_read_state = ConversationReadState.objects.filter(
-            conversation=conv,
-            user_id=other_user_id,
-        ).first()
-    serializer = ConversationDetailSerializer(
-        conv,
-        context={
-            "request": request,
-            "read_state": read_state,
-            "other_read_state": other_read_state,
-        },
-    )
+    try:
+        before_id = _parse_message_id(request.query_params.get("before_id"))
+        limit = _parse_history_limit(request.query_params.get("limit"))
+    except ValueError:
+        return Response(
+            {"detail": "Invalid pagination parameters."}, status=status.HTTP_400_BAD_REQUEST
+        )
+    context = _read_context(request, conv)
+    if before_id is not None or limit is not None:
+        messages, has_earlier = _history_page(
+            conv, before_id=before_id, limit=limit or CHAT_HISTORY_PAGE_SIZE
+        )
+        context.update(messages=messages, has_earlier_messages=has_earlier)
+    serializer = ConversationDetailSerializer(conv, context=context)
     return Response(serializer.data)
 
 
@@ -124,31 +252,67 @@ def chat_start_for_listing(request):
 
     conv = get_or_create_listing_conversation(listing, renter=user)
 
-    read_state = mark_conversation_read(conv, user)
-    other_user_id = conv.owner_id if user.id == conv.renter_id else conv.renter_id
-    other_read_state = None
-    if other_user_id:
-        other_read_state = ConversationReadState.objects.filter(
-            conversation=conv,
-            user_id=other_user_id,
-        ).first()
-
-    serializer = ConversationDetailSerializer(
-        conv,
-        context={
-            "request": request,
-            "read_state": read_state,
-            "other_read_state": other_read_state,
-        },
-    )
+    context = _read_context(request, conv)
+    messages, has_earlier = _history_page(conv, before_id=None, limit=CHAT_HISTORY_PAGE_SIZE)
+    context.update(messages=messages, has_earlier_messages=has_earlier)
+    serializer = ConversationDetailSerializer(conv, context=context)
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-@api_view(["POST"])
+@api_view(["GET", "POST"])
 @permission_classes([IsAuthenticated])
-def chat_send_message(request, pk: int):
-    """Create a user-authored chat entry."""
+def chat_messages(request, pk: int):
+    """
+    GET: a page of history (``before_id``, ``limit``) or the messages after ``after_id``.
+    POST: create a user-authored chat entry.
+    """
     conv = _get_user_conversation_or_404(request.user, pk)
+    if request.method == "GET":
+        return _list_messages(request, conv)
+    return _send_message(request, conv)
+
+
+def _list_messages(request, conv: Conversation) -> Response:
+    """
+    Incremental sync for an open conversation.
+
+    ``after_id`` returns messages newer than the client's last seen id (oldest first);
+    otherwise ``before_id``/``limit`` page backwards through history. ``has_more`` says
+    whether another request in the same direction would return rows.
+    ``other_last_read_message_id`` lets the client refresh read flags on messages it holds.
+    """
+    params = request.query_params
+    try:
+        after_id = _parse_message_id(params.get("after_id"))
+        before_id = _parse_message_id(params.get("before_id"))
+        limit = _parse_history_limit(params.get("limit")) or CHAT_HISTORY_PAGE_SIZE
+        if after_id is not None and before_id is not None:
+            raise ValueError("after_id and before_id are mutually exclusive.")
+    except ValueError:
+        return Response(
+            {"detail": "Invalid pagination parameters."}, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    context = _read_context(request, conv)
+    if after_id is not None:
+        rows = list(conv.messages.filter(id__gt=after_id).order_by("id")[: limit + 1])
+        messages, has_more = rows[:limit], len(rows) > limit
+    else:
+        messages, has_more = _history_page(conv, before_id=before_id, limit=limit)
+
+    serializer = MessageSerializer(messages, many=True, context=context)
+    other_read_state = context["other_read_state"]
+    return Response(
+        {
+            "messages": serializer.data,
+            "has_more": has_more,
+            "other_last_read_message_id": getattr(other_read_state, "last_read_message_id", None),
+        }
+    )
+
+
+def _send_message(request, conv: Conversation) -> Response:
+    """Create a user-authored chat entry."""
     booking = conv.booking
 
     if not conv.is_active:
@@ -0,0 +1,12 @@
+"""Helpers shared by the ``benchmark_*`` management commands."""
+
+from __future__ import annotations
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples`` (0.0 when there are none)."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
@@ -0,0 +1,195 @@
+"""Stale-while-revalidate, single-flight caching for read-heavy API endpoints.
+
+Each cached endpoint owns an ``EndpointCache``. Entries are stored with a jittered
+"fresh" deadline and kept around for an extra stale window:
+
+* fresh entry        -> served as-is (``hits``)
+* stale entry        -> one request takes the rebuild lock and refreshes the entry,
+                        everyone else keeps getting the stale copy (``stale``)
+* missing entry      -> one request rebuilds; concurrent requests for the same key wait
+                        briefly for that result instead of recomputing it (``coalesced``)
+
+The rebuild lock is a ``cache.add`` on the default cache, i.e. ``SET NX PX`` on Redis,
+so coalescing works across processes. Counters live in the cache too and are surfaced
+by the operator health endpoint.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+import uuid
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+
+ENDPOINT_CACHE_STATS_PREFIX = "cache:endpoint:stats"
+ENDPOINT_CACHE_LOCK_PREFIX = "cache:endpoint:lock"
+ENDPOINT_CACHE_COUNTERS = ("hits", "stale", "misses", "coalesced", "evictions", "rebuilds")
+
+_ENTRY_MARKER = "swr"
+_POLL_INTERVAL_SECONDS = 0.05
+
+_registry: dict[str, "EndpointCache"] = {}
+
+
+def _now() -> float:
+    return time.time()
+
+
+def stale_window_seconds() -> int:
+    return max(int(getattr(settings, "CACHE_STALE_WHILE_REVALIDATE_SECONDS", 60)), 0)
+
+
+def ttl_jitter() -> float:
+    return min(max(float(getattr(settings, "CACHE_TTL_JITTER", 0.1)), 0.0), 0.5)
+
+
+def lock_timeout_seconds() -> int:
+    return max(int(getattr(settings, "CACHE_REBUILD_LOCK_TIMEOUT_SECONDS", 10)), 1)
+
+
+def lock_wait_seconds() -> float:
+    return max(float(getattr(settings, "CACHE_REBUILD_LOCK_WAIT_SECONDS", 2.0)), 0.0)
+
+
+def jittered_ttl(ttl: float) -> float:
+    """Shorten ``ttl`` by up to ``CACHE_TTL_JITTER`` so keys written together expire apart."""
+    return ttl * (1.0 - random.uniform(0.0, ttl_jitter()))
+
+
+class EndpointCache:
+    """
+    Cache for one endpoint's response payloads.
+
+    ``ttl`` is a callable so per-endpoint TTL settings are read at request time.
+    """
+
+    def __init__(self, endpoint: str, *, ttl: Callable[[], int]):
+        self.endpoint = endpoint
+        self._ttl = ttl
+        _registry[endpoint] = self
+
+    def get_or_build(
+        self,
+        key: str,
+        build: Callable[[], Any],
+        *,
+        validate: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """
+        Return the cached value for ``key``, calling ``build()`` at most once per key
+        across concurrent requests when it is missing or stale.
+
+        ``validate`` lets callers with their own invalidation scheme reject an entry;
+        rejected entries are dropped and rebuilt rather than served stale.
+        """
+        entry = self._load(key, validate)
+        if entry is not None:
+            if entry["fresh_until"] > _now():
+                self._record("hits")
+                return entry["value"]
+            token = self._acquire_lock(key)
+            if token is None:
+                self._record("stale")
+                return entry["value"]
+            return self._rebuild(key, build, token)
+
+        self._record("misses")
+        token = self._acquire_lock(key)
+        if token is None:
+            waited = self._wait_for_rebuild(key, validate)
+            if waited is not None:
+                self._record("coalesced")
+                return waited["value"]
+            # The lock holder is slow or died; build without blocking on it further.
+        return self._rebuild(key, build, token)
+
+    def _load(self, key: str, validate: Callable[[Any], bool] | None) -> dict[str, Any] | None:
+        entry = cache.get(key)
+        if not isinstance(entry, dict) or entry.get(_ENTRY_MARKER) != 1:
+            return None
+        if validate is not None and not validate(entry["value"]):
+            cache.delete(key)
+            self._record("evictions")
+            return None
+        return entry
+
+    def _rebuild(self, key: str, build: Callable[[], Any], token: str | None) -> Any:
+        try:
+            value = build()
+            self.store(key, value)
+            self._record("rebuilds")
+            return value
+        finally:
+            if token is not None:
+                self._release_lock(key, token)
+
+    def store(self, key: str, value: Any) -> None:
+        fresh_for = jittered_ttl(max(self._ttl(), 1))
+        entry = {_ENTRY_MARKER: 1, "value": value, "fresh_until": _now() + fresh_for}
+        cache.set(key, entry, timeout=int(fresh_for) + stale_window_seconds() + 1)
+
+    def _wait_for_rebuild(
+        self, key: str, validate: Callable[[Any], bool] | None
+    ) -> dict[str, Any] | None:
+        deadline = time.monotonic() + lock_wait_seconds()
+        lock_key = self._lock_key(key)
+        while time.monotonic() < deadline:
+            time.sleep(_POLL_INTERVAL_SECONDS)
+            entry = self._load(key, validate)
+            if entry is not None:
+                return entry
+            if cache.get(lock_key) is None:
+                # The holder gave up (e.g. its build raised); stop waiting.
+                return self._load(key, validate)
+        return None
+
+    def _lock_key(self, key: str) -> str:
+        return f"{ENDPOINT_CACHE_LOCK_PREFIX}:{key}"
+
+    def _acquire_lock(self, key: str) -> str | None:
+        token = uuid.uuid4().hex
+        if cache.add(self._lock_key(key), token, timeout=lock_timeout_seconds()):
+            return token
+        return None
+
+    def _release_lock(self, key: str, token: str) -> None:
+        lock_key = self._lock_key(key)
+        if cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+    def _stat_key(self, counter: str) -> str:
+        return f"{ENDPOINT_CACHE_STATS_PREFIX}:{self.endpoint}:{counter}"
+
+    def _record(self, counter: str) -> None:
+        key = self._stat_key(counter)
+        try:
+            cache.incr(key)
+        except ValueError:
+            if not cache.add(key, 1, timeout=None):
+                cache.incr(key)
+
+    def stats(self) -> dict[str, Any]:
+        keys = [self._stat_key(counter) for counter in ENDPOINT_CACHE_COUNTERS]
+        found = cache.get_many(keys)
+        stats: dict[str, Any] = {
+            counter: int(found.get(key) or 0) for counter, key in zip(ENDPOINT_CACHE_COUNTERS, keys)
+        }
+        served = stats["hits"] + stats["stale"]
+        lookups = served + stats["misses"]
+        stats["hit_rate"] = round(served / lookups, 4) if lookups else None
+        return stats
+
+    def reset_stats(self) -> None:
+        cache.delete_many([self._stat_key(counter) for counter in ENDPOINT_CACHE_COUNTERS])
+
+
+def get_endpoint_cache(endpoint: str) -> EndpointCache | None:
+    return _registry.get(endpoint)
+
+
+def endpoint_cache_stats() -> dict[str, dict[str, Any]]:
+    """Counters for every registered endpoint cache, keyed by endpoint name."""
+    return {name: _registry[name].stats() for name in sorted(_registry)}
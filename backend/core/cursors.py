@@ -0,0 +1,33 @@
+"""Opaque cursor tokens for keyset-paginated endpoints.
+
+A cursor is the sort key of the last row a client has seen, serialized as compact JSON
+and base64url-encoded without padding. Each endpoint decides which fields go into the
+position and how to turn them back into a ``WHERE`` clause.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token cannot be decoded."""
+
+
+def encode_cursor(position: dict[str, Any]) -> str:
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> dict[str, Any]:
+    """Return the position encoded in ``token``; raises ``InvalidCursor`` on bad input."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except ValueError as exc:
+        raise InvalidCursor("cursor is invalid.") from exc
+    if not isinstance(position, dict):
+        raise InvalidCursor("cursor is invalid.")
+    return position
@@ -0,0 +1,322 @@
+"""Per-process asyncio hub that multiplexes users' Redis event streams.
+
+WebSocket connections used to run their own blocking ``XREAD`` in an executor thread, so open
+sockets per worker were capped by the thread pool and each held a Redis connection. The hub
+instead runs ``EVENTS_HUB_READERS`` reader tasks on the worker's event loop. Users are sharded
+across readers by id; each reader keeps one ``XREAD`` in flight that covers the stream of every
+subscribed user in its shard and fans entries out to per-connection queues.
+
+* ``subscribe`` resolves ``$`` to the stream's current last id before registering, so events
+  written while a reader is blocked are never lost. It then wakes the reader by appending to a
+  private wake-up stream included in every ``XREAD``, so new streams are read immediately.
+* Backpressure: each subscription buffers at most ``EVENTS_HUB_QUEUE_SIZE`` batches. Readers
+  never wait on a client; when a queue is full the subscription is marked overflowed and
+  ``Subscription.get`` raises ``SubscriptionOverflow`` so the caller can drop the connection.
+* Reconnecting clients subscribe from their last seen id; ``resume_cursor`` first reports a
+  gap when ``push_event``'s ``maxlen`` trim has already dropped part of that history. A
+  subscriber starting behind a stream's shared cursor rewinds it, and entries from an ``XREAD``
+  issued before the rewind are discarded for that stream and read again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Set, Tuple
+
+import redis.asyncio as aioredis
+from django.conf import settings
+from redis.exceptions import ResponseError
+
+from core.redis import _user_stream_key, decode_stream_entries
+
+logger = logging.getLogger(__name__)
+
+WAKE_STREAM_PREFIX = "events:hub:wake"
+WAKE_STREAM_TTL_SECONDS = 3600
+READ_ERROR_BACKOFF_SECONDS = 1.0
+STREAM_ID_RE = re.compile(r"^\d+(-\d+)?$")
+
+
+class SubscriptionOverflow(Exception):
+    """Raised once a subscriber has fallen more than its queue size behind."""
+
+
+def stream_id_key(entry_id: str) -> Tuple[int, int]:
+    """Sortable form of a Redis stream id (``"<ms>-<seq>"``)."""
+    millis, _, seq = str(entry_id).partition("-")
+    return int(millis), int(seq or 0)
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+class Subscription:
+    """One connection's feed of a user's events, as a bounded queue of batches."""
+
+    def __init__(self, user_id: int, cursor: str, maxsize: int) -> None:
+        self.user_id = user_id
+        # Last stream id handed to the queue; older entries are never delivered again.
+        self.cursor = cursor
+        self.overflowed = False
+        self._queue: asyncio.Queue[List[Dict[str, Any]]] = asyncio.Queue(maxsize=maxsize)
+
+    def offer(self, events: List[Dict[str, Any]]) -> bool:
+        """Queue the events newer than ``cursor`` without waiting; False if this overflowed."""
+        if self.overflowed:
+            return True
+        after = stream_id_key(self.cursor)
+        fresh = [event for event in events if stream_id_key(event["id"]) > after]
+        if not fresh:
+            return True
+        try:
+            self._queue.put_nowait(fresh)
+        except asyncio.QueueFull:
+            self.overflowed = True
+            return False
+        self.cursor = fresh[-1]["id"]
+        return True
+
+    async def get(self) -> List[Dict[str, Any]]:
+        """Wait for the next batch of events."""
+        if self.overflowed:
+            raise SubscriptionOverflow(f"user {self.user_id} fell behind")
+        return await self._queue.get()
+
+
+class _ShardReader:
+    """Reads every subscribed stream in one shard with a single blocking ``XREAD``."""
+
+    def __init__(self, hub: "EventHub", index: int) -> None:
+        self.hub = hub
+        self.wake_key = f"{WAKE_STREAM_PREFIX}:{hub.instance_id}:{index}"
+        # Tracked rather than "$" so a wake-up sent before our XREAD reaches Redis still counts.
+        self.wake_cursor = "0-0"
+        self.cursors: Dict[str, str] = {}
+        self.subscribers: Dict[str, Set[Subscription]] = {}
+        self.blocked = False
+        self.wake_pending = False
+        self._has_streams = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def add(self, key: str, subscription: Subscription) -> None:
+        self.subscribers.setdefault(key, set()).add(subscription)
+        current = self.cursors.get(key)
+        if current is not None and stream_id_key(current) <= stream_id_key(subscription.cursor):
+            return
+        # New stream, or a subscriber starting behind the shared cursor: rewind so the next
+        # XREAD covers it. Subscribers already ahead filter out the repeats.
+        self.cursors[key] = subscription.cursor
+        self._has_streams.set()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"event-hub:{self.wake_key}")
+        elif self.blocked and not self.wake_pending:
+            self.wake_pending = True
+            self.hub._spawn(self.hub._wake(self.wake_key))
+
+    def remove(self, key: str, subscription: Subscription) -> None:
+        subscribers = self.subscribers.get(key)
+        if subscribers is None:
+            return
+        subscribers.discard(subscription)
+        if not subscribers:
+            # The stream drops out of the read set on the next XREAD.
+            del self.subscribers[key]
+            self.cursors.pop(key, None)
+
+    async def _run(self) -> None:
+        client = self.hub.client
+        while True:
+            if not self.cursors:
+                self._has_streams.clear()
+                await self._has_streams.wait()
+                continue
+            issued = dict(self.cursors)
+            streams = {**issued, self.wake_key: self.wake_cursor}
+            self.blocked = True
+            try:
+                records = await client.xread(
+                    streams, count=self.hub.read_count, block=self.hub.block_ms
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning(
+                    "events_hub: XREAD failed for %s streams", len(streams), exc_info=True
+                )
+                await asyncio.sleep(READ_ERROR_BACKOFF_SECONDS)
+                continue
+            finally:
+                self.blocked = False
+                self.wake_pending = False
+            self._dispatch(records, issued)
+
+    def _dispatch(self, records, issued: Dict[str, str]) -> None:
+        if not records:
+            return
+        items = records.items() if isinstance(records, dict) else records
+        for raw_key, entries in items:
+            key = _text(raw_key)
+            if key == self.wake_key:
+                if entries:
+                    self.wake_cursor = _text(entries[-1][0])
+                continue
+            current = self.cursors.get(key)
+            if current is None:
+                # Every subscriber left while the read was in flight.
+                continue
+            if current != issued.get(key):
+                # A subscriber rewound the cursor while the read was in flight. These entries
+                # start after the old cursor, so delivering them would skip the rewound range;
+                # the next XREAD reads it again from the new cursor.
+                continue
+            last_id, events = decode_stream_entries(entries, current)
+            if stream_id_key(last_id) > stream_id_key(current):
+                self.cursors[key] = last_id
+            for subscription in list(self.subscribers.get(key, ())):
+                if not subscription.offer(events):
+                    self.hub.overflow_count += 1
+
+    def cancel(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+class EventHub:
+    """Fan-out of per-user Redis streams to any number of in-process subscribers."""
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        readers: int = 4,
+        block_ms: int = 25_000,
+        read_count: int = 100,
+        queue_size: int = 64,
+    ) -> None:
+        self.client = client
+        self.instance_id = uuid.uuid4().hex
+        self.block_ms = max(int(block_ms), 1)
+        self.read_count = read_count
+        self.queue_size = queue_size
+        self.overflow_count = 0
+        self._readers = [_ShardReader(self, index) for index in range(max(int(readers), 1))]
+        self._background: Set[asyncio.Task] = set()
+
+    @classmethod
+    def from_settings(cls) -> "EventHub":
+        url = getattr(settings, "REDIS_URL", None)
+        if not url:
+            raise RuntimeError("REDIS_URL is not configured")
+        return cls(
+            aioredis.Redis.from_url(url),
+            readers=getattr(settings, "EVENTS_HUB_READERS", 4),
+            block_ms=getattr(settings, "EVENTS_HUB_BLOCK_MS", 25_000),
+            read_count=getattr(settings, "EVENTS_HUB_READ_COUNT", 100),
+            queue_size=getattr(settings, "EVENTS_HUB_QUEUE_SIZE", 64),
+        )
+
+    def _reader_for(self, user_id: int) -> _ShardReader:
+        return self._readers[int(user_id) % len(self._readers)]
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _wake(self, wake_key: str) -> None:
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                pipe.xadd(wake_key, {"w": "1"}, maxlen=1)
+                pipe.expire(wake_key, WAKE_STREAM_TTL_SECONDS)
+                await pipe.execute()
+        except Exception:
+            logger.warning("events_hub: failed to wake reader %s", wake_key, exc_info=True)
+
+    async def stream_tail(self, user_id: int) -> str:
+        """Id of the newest entry in the user's stream ("0-0" when empty)."""
+        entries = await self.client.xrevrange(_user_stream_key(user_id), count=1)
+        return _text(entries[0][0]) if entries else "0-0"
+
+    async def resume_cursor(self, user_id: int, cursor: str) -> Tuple[str, bool]:
+        """
+        Check that the user's stream still holds every entry after a client's ``cursor``.
+
+        Returns ``(cursor, gap)``. ``gap`` is True when entries after ``cursor`` were trimmed
+        by ``push_event``'s ``maxlen``, or the cursor is malformed or ahead of the stream.
+        The returned cursor is then the stream's last id: the client refreshes its state once
+        and streams on from there, instead of replaying a partial history.
+        """
+        key = _user_stream_key(user_id)
+        try:
+            info = await self.client.xinfo_stream(key)
+        except ResponseError:
+            # No such key: nothing has been pushed since Redis last lost its data.
+            info = {}
+        last_id = _text(info.get("last-generated-id") or "0-0")
+        if not STREAM_ID_RE.match(cursor or ""):
+            return last_id, True
+        position = stream_id_key(cursor)
+        if position > stream_id_key(last_id):
+            return last_id, True
+        max_deleted = info.get("max-deleted-entry-id")
+        if max_deleted is not None:
+            trimmed = position < stream_id_key(_text(max_deleted))
+        else:
+            # Redis < 7 does not report deletions; anything before the first entry may be gone.
+            first_entry = info.get("first-entry")
+            trimmed = bool(first_entry) and position < stream_id_key(_text(first_entry[0]))
+        return (last_id, True) if trimmed else (cursor, False)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int, cursor: str = "$") -> AsyncIterator[Subscription]:
+        """
+        Receive the user's events newer than ``cursor`` until the context exits.
+
+        ``"$"`` means events written from now on.
+        """
+        if cursor == "$":
+            cursor = await self.stream_tail(user_id)
+        subscription = Subscription(user_id, cursor, self.queue_size)
+        key = _user_stream_key(user_id)
+        reader = self._reader_for(user_id)
+        reader.add(key, subscription)
+        try:
+            yield subscription
+        finally:
+            reader.remove(key, subscription)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "streams": sum(len(reader.cursors) for reader in self._readers),
+            "subscriptions": sum(
+                len(subscribers)
+                for reader in self._readers
+                for subscribers in reader.subscribers.values()
+            ),
+            "overflows": self.overflow_count,
+        }
+
+    async def close(self) -> None:
+        for reader in self._readers:
+            reader.cancel()
+        await self.client.aclose()
+
+
+_hub: Optional[EventHub] = None
+_hub_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_event_hub() -> EventHub:
+    """Return the hub for the running event loop, creating it on first use."""
+    global _hub, _hub_loop
+    loop = asyncio.get_running_loop()
+    if _hub is None or _hub_loop is not loop:
+        _hub = EventHub.from_settings()
+        _hub_loop = loop
+    return _hub
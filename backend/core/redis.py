@@ -97,6 +97,16 @@ def read_user_events(
         return cursor, []
 
     _, entries = records[0]
+    return decode_stream_entries(entries, cursor)
+
+
+def decode_stream_entries(entries, cursor: str) -> Tuple[str, List[Dict[str, Any]]]:
+    """
+    Decode raw XREAD/XRANGE entries for one stream.
+
+    Returns (last_id, events) in the same shape as ``read_user_events``; ``last_id`` is
+    ``cursor`` when ``entries`` is empty.
+    """
     events: List[Dict[str, Any]] = []
     last_id = cursor
 
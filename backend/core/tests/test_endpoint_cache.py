@@ -0,0 +1,149 @@
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from core import cache as endpoint_cache_module
+from core.cache import EndpointCache, endpoint_cache_stats, jittered_ttl
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = {"value": 1_000_000.0}
+    monkeypatch.setattr(endpoint_cache_module, "_now", lambda: now["value"])
+    return now
+
+
+def _counting_builder(value="fresh"):
+    calls = []
+
+    def build():
+        calls.append(1)
+        return f"{value}-{len(calls)}"
+
+    return build, calls
+
+
+@override_settings(CACHE_TTL_JITTER=0)
+def test_fresh_entry_is_served_without_rebuilding(clock):
+    endpoint = EndpointCache("tests.fresh", ttl=lambda: 60)
+    build, calls = _counting_builder()
+
+    assert endpoint.get_or_build("k", build) == "fresh-1"
+    clock["value"] += 30
+    assert endpoint.get_or_build("k", build) == "fresh-1"
+
+    assert len(calls) == 1
+    stats = endpoint.stats()
+    assert (stats["hits"], stats["misses"], stats["rebuilds"]) == (1, 1, 1)
+
+
+@override_settings(CACHE_TTL_JITTER=0)
+def test_stale_entry_is_served_while_another_request_holds_the_lock(clock):
+    endpoint = EndpointCache("tests.stale", ttl=lambda: 60)
+    build, calls = _counting_builder()
+    endpoint.get_or_build("k", build)
+    clock["value"] += 61
+
+    assert endpoint._acquire_lock("k") is not None
+    assert endpoint.get_or_build("k", build) == "fresh-1"
+    assert len(calls) == 1
+    assert endpoint.stats()["stale"] == 1
+
+
+@override_settings(CACHE_TTL_JITTER=0)
+def test_stale_entry_is_refreshed_by_the_lock_holder(clock):
+    endpoint = EndpointCache("tests.refresh", ttl=lambda: 60)
+    build, calls = _counting_builder()
+    endpoint.get_or_build("k", build)
+    clock["value"] += 61
+
+    assert endpoint.get_or_build("k", build) == "fresh-2"
+    assert endpoint.get_or_build("k", build) == "fresh-2"
+    assert len(calls) == 2
+    assert cache.get("cache:endpoint:lock:k") is None
+
+
+@override_settings(CACHE_REBUILD_LOCK_WAIT_SECONDS=5)
+def test_concurrent_misses_share_a_single_rebuild():
+    endpoint = EndpointCache("tests.single_flight", ttl=lambda: 60)
+    calls = []
+
+    def slow_build():
+        calls.append(1)
+        time.sleep(0.2)
+        return "built"
+
+    barrier = threading.Barrier(5)
+    results = []
+
+    def worker():
+        barrier.wait()
+        results.append(endpoint.get_or_build("hot", slow_build))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["built"] * 5
+    assert len(calls) == 1
+    stats = endpoint.stats()
+    assert stats["misses"] == 5
+    assert stats["coalesced"] == 4
+
+
+def test_failed_build_releases_the_lock():
+    endpoint = EndpointCache("tests.failure", ttl=lambda: 60)
+
+    def broken():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        endpoint.get_or_build("k", broken)
+    assert cache.get("cache:endpoint:lock:k") is None
+    assert endpoint.get_or_build("k", lambda: "ok") == "ok"
+
+
+def test_rejected_entries_are_evicted_not_served_stale():
+    endpoint = EndpointCache("tests.validate", ttl=lambda: 60)
+    build, calls = _counting_builder()
+    endpoint.get_or_build("k", build)
+
+    assert endpoint.get_or_build("k", build, validate=lambda value: False) == "fresh-2"
+    assert len(calls) == 2
+    assert endpoint.stats()["evictions"] == 1
+
+
+def test_legacy_raw_values_are_treated_as_misses():
+    endpoint = EndpointCache("tests.legacy", ttl=lambda: 60)
+    cache.set("k", {"results": []})
+
+    assert endpoint.get_or_build("k", lambda: "rebuilt") == "rebuilt"
+
+
+@override_settings(CACHE_TTL_JITTER=0.2)
+def test_jittered_ttl_stays_within_bounds():
+    values = [jittered_ttl(100) for _ in range(200)]
+    assert all(80 <= value <= 100 for value in values)
+    assert len(set(values)) > 1
+
+
+def test_stats_are_reported_per_endpoint():
+    endpoint = EndpointCache("tests.stats", ttl=lambda: 60)
+    endpoint.get_or_build("k", lambda: 1)
+    endpoint.get_or_build("k", lambda: 1)
+
+    stats = endpoint_cache_stats()
+    assert stats["tests.stats"]["hits"] == 1
+    assert stats["tests.stats"]["hit_rate"] == 0.5
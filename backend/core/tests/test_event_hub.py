@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+from redis.exceptions import ResponseError
+
+from core import ws_events
+from core.event_hub import EventHub, SubscriptionOverflow
+
+
+class FakeStreamClient:
+    """In-memory stand-in for the redis.asyncio stream commands the hub uses."""
+
+    def __init__(self):
+        self.streams: dict[str, list] = {}
+        self.xread_calls: list[dict] = []
+        self.max_deleted: dict[str, bytes] = {}
+        self._seq = 0
+        self._changed = asyncio.Event()
+
+    async def xadd(self, key, fields, maxlen=None, approximate=False):
+        self._seq += 1
+        entry_id = f"{self._seq}-0"
+        entries = self.streams.setdefault(key, [])
+        entries.append(
+            (entry_id.encode(), {k.encode(): str(v).encode() for k, v in fields.items()})
+        )
+        if maxlen and len(entries) > maxlen:
+            self.max_deleted[key] = entries[-maxlen - 1][0]
+            del entries[:-maxlen]
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+        return entry_id.encode()
+
+    async def expire(self, key, seconds):
+        return True
+
+    async def xinfo_stream(self, key):
+        if key not in self.streams:
+            raise ResponseError("no such key")
+        entries = self.streams[key]
+        return {
+            "length": len(entries),
+            "first-entry": entries[0] if entries else None,
+            "last-generated-id": entries[-1][0] if entries else b"0-0",
+            "max-deleted-entry-id": self.max_deleted.get(key, b"0-0"),
+        }
+
+    async def xrevrange(self, key, count=None):
+        return list(reversed(self.streams.get(key, [])))[:count]
+
+    async def xread(self, streams, count=None, block=None):
+        self.xread_calls.append(dict(streams))
+        while True:
+            found = []
+            for key, cursor in streams.items():
+                after = tuple(int(part) for part in cursor.split("-"))
+                entries = [
+                    (entry_id, fields)
+                    for entry_id, fields in self.streams.get(key, [])
+                    if tuple(int(part) for part in entry_id.decode().split("-")) > after
+                ]
+                if entries:
+                    found.append((key.encode(), entries[:count]))
+            if found:
+                return found
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=block / 1000)
+            except asyncio.TimeoutError:
+                return []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def aclose(self):
+        return None
+
+
+class FakePipeline:
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def xadd(self, *args, **kwargs):
+        self.calls.append(self.client.xadd(*args, **kwargs))
+
+    def expire(self, *args, **kwargs):
+        self.calls.append(self.client.expire(*args, **kwargs))
+
+    async def execute(self):
+        return [await call for call in self.calls]
+
+
+async def _push(client, user_id, event_type, maxlen=None, **payload):
+    data = {"type": event_type, "payload": json.dumps(payload)}
+    return (await client.xadd(f"events:user:{user_id}", data, maxlen=maxlen)).decode()
+
+
+async def _wait_until(predicate, timeout=1.0):
+    async def poll():
+        while not predicate():
+            await asyncio.sleep(0.005)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+def test_hub_reads_all_subscribed_users_in_one_xread():
+    async def scenario():
+        client = FakeStreamClient()
+        hub = EventHub(client, readers=1, block_ms=50)
+        user_keys = {"events:user:1", "events:user:2", "events:user:3"}
+        await _push(client, 1, "chat:new_message", stale=True)
+        async with (
+            hub.subscribe(1) as first,
+            hub.subscribe(2) as second,
+            hub.subscribe(3) as third,
+        ):
+            await _wait_until(lambda: any(user_keys <= set(call) for call in client.xread_calls))
+            first_id = await _push(client, 1, "chat:new_message", text="hi")
+            await _push(client, 2, "booking:status_changed", booking_id=7)
+            first_batch = await asyncio.wait_for(first.get(), 1)
+            second_batch = await asyncio.wait_for(second.get(), 1)
+            assert hub.stats()["subscriptions"] == 3
+            assert third._queue.empty()
+        await hub.close()
+        return first_batch, first_id, second_batch
+
+    first_batch, first_id, second_batch = asyncio.run(scenario())
+
+    # Events already in the stream when subscribing with "$" are not replayed.
+    assert first_batch == [{"id": first_id, "type": "chat:new_message", "payload": {"text": "hi"}}]
+    assert [event["payload"] for event in second_batch] == [{"booking_id": 7}]
+
+
+def test_subscription_added_during_blocking_read_is_woken():
+    async def scenario():
+        client = FakeStreamClient()
+        hub = EventHub(client, readers=1, block_ms=60_000)
+        reader = hub._readers[0]
+        async with hub.subscribe(1):
+            await _wait_until(lambda: reader.blocked and client.xread_calls)
+            async with hub.subscribe(2) as late:
+                await _push(client, 2, "chat:new_message", text="late")
+                batch = await asyncio.wait_for(late.get(), 1)
+        await hub.close()
+        return batch
+
+    # Without the wake-up stream this would wait out the 60 second XREAD.
+    assert asyncio.run(scenario())[0]["payload"] == {"text": "late"}
+
+
+def test_slow_subscriber_overflows_without_blocking_others():
+    async def scenario():
+        client = FakeStreamClient()
+        hub = EventHub(client, readers=1, block_ms=50, queue_size=1)
+        async with hub.subscribe(1) as slow, hub.subscribe(1) as fast:
+            await _push(client, 1, "chat:new_message", n=1)
+            received = [await asyncio.wait_for(fast.get(), 1)]
+            await _push(client, 1, "chat:new_message", n=2)
+            received.append(await asyncio.wait_for(fast.get(), 1))
+            with pytest.raises(SubscriptionOverflow):
+                await slow.get()
+        await hub.close()
+        return hub, received
+
+    hub, received = asyncio.run(scenario())
+    assert [batch[0]["payload"] for batch in received] == [{"n": 1}, {"n": 2}]
+    assert hub.overflow_count == 1
+
+
+def test_ws_stream_sends_hub_batches_and_closes_slow_consumers(monkeypatch):
+    async def scenario():
+        client = FakeStreamClient()
+        hub = EventHub(client, readers=1, block_ms=50, queue_size=1)
+        monkeypatch.setattr(ws_events, "get_event_hub", lambda: hub)
+        frames = []
+        release = asyncio.Event()
+
+        async def send(message):
+            frames.append(message)
+            if message["type"] == "websocket.send" and json.loads(message["text"])["events"]:
+                await release.wait()
+
+        stop_event = asyncio.Event()
+        task = asyncio.create_task(ws_events._stream_events(5, send, stop_event))
+        await _wait_until(lambda: hub.stats()["subscriptions"] == 1)
+        await _push(client, 5, "chat:new_message", n=1)
+        await _wait_until(lambda: len(frames) == 2)
+        # The client stalls on the first frame while two more batches arrive.
+        (subscription,) = hub._readers[0].subscribers["events:user:5"]
+        await _push(client, 5, "chat:new_message", n=2)
+        await _wait_until(lambda: subscription._queue.full())
+        await _push(client, 5, "chat:new_message", n=3)
+        await _wait_until(lambda: hub.overflow_count)
+        release.set()
+        await asyncio.wait_for(task, 1)
+        await hub.close()
+        return frames, stop_event, hub
+
+    frames, stop_event, hub = asyncio.run(scenario())
+    # The opening frame hands the client a resumable cursor before any event arrives.
+    assert json.loads(frames[0]["text"]) == {"cursor": "0-0", "events": [], "gap": False}
+    first = json.loads(frames[1]["text"])
+    assert first["cursor"] == first["events"][0]["id"]
+    assert first["events"][0]["payload"] == {"n": 1}
+    assert frames[-1] == {"type": "websocket.close", "code": ws_events.SLOW_CONSUMER_CLOSE_CODE}
+    assert stop_event.is_set()
+    assert hub.stats()["subscriptions"] == 0
+
+
+def test_resume_cursor_reports_trimmed_history():
+    async def scenario():
+        client = FakeStreamClient()
+        hub = EventHub(client, readers=1, block_ms=50)
+        ids = [await _push(client, 1, "chat:new_message", maxlen=2, n=n) for n in range(3)]
+        results = {
+            "missing_stream": await hub.resume_cursor(2, "5-0"),
+            "kept": await hub.resume_cursor(1, ids[0]),
+            "trimmed": await hub.resume_cursor(1, "0-0"),
+            "ahead": await hub.resume_cursor(1, "999-0"),
+            "malformed": await hub.resume_cursor(1, "bogus"),
+        }
+        await hub.close()
+        return ids, results
+
+    ids, results = asyncio.run(scenario())
+    # Everything after ids[0] is still in the stream, so no refresh is needed.
+    assert results["kept"] == (ids[0], False)
+    assert results["trimmed"] == (ids[-1], True)
+    assert results["ahead"] == (ids[-1], True)
+    assert results["malformed"] == (ids[-1], True)
+    assert results["missing_stream"] == ("0-0", True)
+
+
+def test_ws_stream_replays_from_cursor_or_signals_gap(monkeypatch):
+    async def stream(client, cursor, expected_frames):
+        hub = EventHub(client, readers=1, block_ms=50)
+        monkeypatch.setattr(ws_events, "get_event_hub", lambda: hub)
+        frames = []
+
+        async def send(message):
+            frames.append(json.loads(message["text"]))
+
+        task = asyncio.create_task(
+            ws_events._stream_events(1, send, asyncio.Event(), cursor=cursor)
+        )
+        await _wait_until(lambda: len(frames) >= expected_frames)
+        task.cancel()
+        await hub.close()
+        return frames
+
+    async def scenario():
+        client = FakeStreamClient()
+        ids = [await _push(client, 1, "chat:new_message", maxlen=2, n=n) for n in range(3)]
+        replayed = await stream(client, ids[0], 2)
+        gapped = await stream(client, "0-0", 1)
+        return ids, replayed, gapped
+
+    ids, replayed, gapped = asyncio.run(scenario())
+    assert replayed[0] == {"cursor": ids[0], "events": [], "gap": False}
+    assert [event["id"] for event in replayed[1]["events"]] == ids[1:]
+    assert gapped == [{"cursor": ids[-1], "events": [], "gap": True}]
+
+
+def test_resume_during_inflight_read_does_not_skip_rewound_events():
+    async def scenario():
+        client = FakeStreamClient()
+        hub = EventHub(client, readers=1, block_ms=60_000)
+        reader = hub._readers[0]
+        ids = [await _push(client, 1, "chat:new_message", n=n) for n in range(3)]
+        async with hub.subscribe(1) as first:
+            await _wait_until(lambda: reader.blocked and client.xread_calls)
+            # The XREAD in flight was issued from ids[-1]; a second tab resumes from ids[0] and
+            # an event lands before the reader has been woken for the rewind.
+            async with hub.subscribe(1, ids[0]) as resumed:
+                new_id = await _push(client, 1, "chat:new_message", n=3)
+                received = []
+                while not received or received[-1] != new_id:
+                    received.extend(e["id"] for e in await asyncio.wait_for(resumed.get(), 1))
+                first_batch = await asyncio.wait_for(first.get(), 1)
+        await hub.close()
+        return ids, new_id, received, first_batch
+
+    ids, new_id, received, first_batch = asyncio.run(scenario())
+    assert received == [*ids[1:], new_id]
+    assert [event["id"] for event in first_batch] == [new_id]
@@ -1,14 +1,63 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager
+
 import pytest
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 
+import views_events
+
 pytestmark = pytest.mark.django_db
 
 User = get_user_model()
 
 
+class FakeSubscription:
+    def __init__(self, cursor, batches=()):
+        self.cursor = cursor
+        self._batches = list(batches)
+
+    async def get(self):
+        if self._batches:
+            return self._batches.pop(0)
+        await asyncio.sleep(3600)
+
+
+class FakeHub:
+    def __init__(self, tail="10-0"):
+        self.tail = tail
+        self.trimmed = set()
+        self.subscriptions = []
+
+    async def resume_cursor(self, user_id, cursor):
+        return (self.tail, True) if cursor in self.trimmed else (cursor, False)
+
+    @asynccontextmanager
+    async def subscribe(self, user_id, cursor="$"):
+        self.subscriptions.append({"user_id": user_id, "cursor": cursor})
+        yield FakeSubscription(self.tail if cursor == "$" else cursor)
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    fake = FakeHub()
+    monkeypatch.setattr(views_events, "get_event_hub", lambda: fake)
+    return fake
+
+
+def _capture_collect(monkeypatch, events):
+    captured = {}
+
+    async def fake_collect(subscription, *, timeout, max_events, linger):
+        captured.update({"timeout": timeout, "max_events": max_events, "linger": linger})
+        return events
+
+    monkeypatch.setattr(views_events, "_collect_events", fake_collect)
+    return captured
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -28,90 +77,91 @@ def test_events_stream_requires_authentication(api_client):
     assert resp.status_code == 401
 
 
-def test_events_stream_returns_empty_payload(api_client, user, monkeypatch):
-    captured = {}
-
-    def fake_read_user_events(*, user_id, cursor, block_ms, count):
-        captured.update(
-            {
-                "user_id": user_id,
-                "cursor": cursor,
-                "block_ms": block_ms,
-                "count": count,
-            }
-        )
-        return "10-0", []
-
-    monkeypatch.setattr("views_events.read_user_events", fake_read_user_events)
+def test_events_stream_returns_empty_payload(api_client, user, hub, monkeypatch):
+    captured = _capture_collect(monkeypatch, [])
     api_client.force_authenticate(user=user)
 
     resp = api_client.get("/api/events/stream/")
 
     assert resp.status_code == 200
-    assert resp.data["cursor"] == "10-0"
-    assert resp.data["events"] == []
-    assert resp.data["now"]
-    assert captured == {
-        "user_id": user.id,
-        "cursor": "$",
-        "block_ms": 25000,
-        "count": 100,
-    }
-
-
-def test_events_stream_returns_events(api_client, user, monkeypatch):
+    body = resp.json()
+    # "$" comes back as the stream's current id so the next poll cannot miss events.
+    assert body["cursor"] == "10-0"
+    assert body["events"] == []
+    assert body["now"]
+    assert hub.subscriptions == [{"user_id": user.id, "cursor": "$"}]
+    assert captured == {"timeout": 25.0, "max_events": 100, "linger": 0.25}
+
+
+def test_events_stream_returns_events(api_client, user, hub, monkeypatch):
     expected_events = [
         {"id": "1-0", "type": "chat:new_message", "payload": {"foo": "bar"}},
         {"id": "2-0", "type": "booking:status_changed", "payload": {"booking_id": 9}},
     ]
+    captured = _capture_collect(monkeypatch, expected_events)
+    api_client.force_authenticate(user=user)
+
+    resp = api_client.get("/api/events/stream/?cursor=0-0&timeout=5&max_events=10&linger_ms=50")
 
-    recorded = {}
+    assert resp.status_code == 200
+    assert resp.json()["cursor"] == "2-0"
+    assert resp.json()["events"] == expected_events
+    assert hub.subscriptions == [{"user_id": user.id, "cursor": "0-0"}]
+    assert captured == {"timeout": 5.0, "max_events": 10, "linger": 0.05}
 
-    def fake_read_user_events(*, user_id, cursor, block_ms, count):
-        recorded.update(
-            {
-                "user_id": user_id,
-                "cursor": cursor,
-                "block_ms": block_ms,
-                "count": count,
-            }
-        )
-        return "2-0", expected_events
 
-    monkeypatch.setattr("views_events.read_user_events", fake_read_user_events)
+def test_events_stream_invalid_timeout_uses_default(api_client, user, hub, monkeypatch):
+    captured = _capture_collect(monkeypatch, [])
     api_client.force_authenticate(user=user)
 
-    resp = api_client.get("/api/events/stream/?cursor=0-0&timeout=5")
+    resp = api_client.get("/api/events/stream/?timeout=abc")
 
     assert resp.status_code == 200
-    assert resp.data["cursor"] == "2-0"
-    assert resp.data["events"] == expected_events
-    assert recorded == {
-        "user_id": user.id,
-        "cursor": "0-0",
-        "block_ms": 5000,
-        "count": 100,
-    }
-
+    assert captured["timeout"] == 25.0
 
-def test_events_stream_invalid_timeout_uses_default(api_client, user, monkeypatch):
-    captured = {}
 
-    def fake_read_user_events(*, user_id, cursor, block_ms, count):
-        captured.update(
-            {
-                "user_id": user_id,
-                "cursor": cursor,
-                "block_ms": block_ms,
-                "count": count,
-            }
-        )
-        return cursor, []
-
-    monkeypatch.setattr("views_events.read_user_events", fake_read_user_events)
+def test_events_stream_flags_trimmed_cursor(api_client, user, hub, monkeypatch):
+    hub.trimmed.add("3-0")
+    _capture_collect(monkeypatch, [])
     api_client.force_authenticate(user=user)
 
-    resp = api_client.get("/api/events/stream/?timeout=abc")
+    resp = api_client.get("/api/events/stream/?cursor=3-0&timeout=1")
 
     assert resp.status_code == 200
-    assert captured["block_ms"] == 25000
+    assert resp.json()["gap"] is True
+    assert resp.json()["cursor"] == "10-0"
+    assert hub.subscriptions == [{"user_id": user.id, "cursor": "10-0"}]
+
+
+def test_events_stream_rejects_malformed_cursor(api_client, user, hub):
+    api_client.force_authenticate(user=user)
+
+    resp = api_client.get("/api/events/stream/?cursor=not-a-cursor")
+
+    assert resp.status_code == 400
+    assert hub.subscriptions == []
+
+
+def _event(n):
+    return {"id": f"{n}-0", "type": "chat:new_message", "payload": {"n": n}}
+
+
+def test_collect_events_returns_after_linger_or_max_events():
+    async def collect(batches, **kwargs):
+        subscription = FakeSubscription("0-0", batches)
+        return await views_events._collect_events(subscription, **kwargs)
+
+    # Batches arriving within the linger window are returned together...
+    lingered = asyncio.run(
+        collect([[_event(1)], [_event(2), _event(3)]], timeout=5, max_events=100, linger=0.05)
+    )
+    assert [event["id"] for event in lingered] == ["1-0", "2-0", "3-0"]
+
+    # ...a full batch returns at once, trimmed so the cursor never skips undelivered events...
+    capped = asyncio.run(
+        collect([[_event(1), _event(2)], [_event(3)]], timeout=5, max_events=2, linger=5)
+    )
+    assert [event["id"] for event in capped] == ["1-0", "2-0"]
+
+    # ...and without events the poll ends at the timeout.
+    assert asyncio.run(collect([], timeout=0.01, max_events=100, linger=0.05)) == []
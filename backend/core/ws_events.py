@@ -14,32 +14,35 @@ from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import AccessToken
 
-from core.redis import read_user_events
+from core.event_hub import SubscriptionOverflow, get_event_hub
 
 logger = logging.getLogger(__name__)
 
-DEFAULT_BLOCK_MS = 25_000
-DEFAULT_COUNT = 100
-
-_read_events_async = sync_to_async(read_user_events, thread_sensitive=False)
+# Close code for clients that fall too far behind; they should reconnect.
+SLOW_CONSUMER_CLOSE_CODE = 1013
 
 
 class AuthenticationError(Exception):
     """Raised when the access token is missing or invalid."""
 
 
-def _extract_token(scope: Dict[str, Any]) -> str:
-    """Return the ?token=... query parameter from the ASGI scope."""
+def _query_param(scope: Dict[str, Any], name: str) -> str:
+    """Return a query parameter from the ASGI scope ("" when absent)."""
     query_string = scope.get("query_string", b"")
     if isinstance(query_string, bytes):
         raw_query = query_string.decode("utf-8", errors="ignore")
     else:
         raw_query = str(query_string)
     params = parse_qs(raw_query, keep_blank_values=True)
-    values = params.get("token")
+    values = params.get(name)
     return values[0] if values else ""
 
 
+def _extract_token(scope: Dict[str, Any]) -> str:
+    """Return the ?token=... query parameter from the ASGI scope."""
+    return _query_param(scope, "token")
+
+
 async def _authenticate_user(scope: Dict[str, Any]) -> Any:
     """Validate the JWT access token and return the associated user."""
     token = _extract_token(scope).strip()
@@ -73,30 +76,35 @@ async def _send_close(send, code: int) -> None:
         logger.debug("events_ws: failed to send close frame code=%s", code, exc_info=True)
 
 
-async def _stream_events(user_id: int, send, stop_event: asyncio.Event) -> None:
-    """Background producer task pulling Redis events and pushing WebSocket frames."""
-    cursor = "$"
+def _frame(cursor: str, events: list, **extra: Any) -> Dict[str, Any]:
+    payload = json.dumps({"cursor": cursor, "events": events, **extra}, separators=(",", ":"))
+    return {"type": "websocket.send", "text": payload}
+
+
+async def _stream_events(user_id: int, send, stop_event: asyncio.Event, cursor: str = "$") -> None:
+    """
+    Background producer task forwarding the user's event-hub batches as WebSocket frames.
+
+    The first frame carries no events, only the cursor the stream starts from, so a client
+    can always reconnect with ``?cursor=`` without losing events. It has ``"gap": true``
+    when the requested cursor could not be replayed in full.
+    """
+    hub = get_event_hub()
     try:
-        while not stop_event.is_set():
-            next_cursor, events = await _read_events_async(
-                user_id=user_id,
-                cursor=cursor,
-                block_ms=DEFAULT_BLOCK_MS,
-                count=DEFAULT_COUNT,
-            )
-            if next_cursor:
-                cursor = next_cursor
-            if events:
-                payload = json.dumps(
-                    {
-                        "cursor": cursor,
-                        "events": events,
-                    },
-                    separators=(",", ":"),
-                )
-                await send({"type": "websocket.send", "text": payload})
+        gap = False
+        if cursor != "$":
+            cursor, gap = await hub.resume_cursor(user_id, cursor)
+        async with hub.subscribe(user_id, cursor) as subscription:
+            await send(_frame(subscription.cursor, [], gap=gap))
+            while not stop_event.is_set():
+                events = await subscription.get()
+                await send(_frame(events[-1]["id"], events))
     except asyncio.CancelledError:
         raise
+    except SubscriptionOverflow:
+        logger.info("events_ws: disconnecting slow consumer user=%s", user_id)
+        stop_event.set()
+        await _send_close(send, SLOW_CONSUMER_CLOSE_CODE)
     except Exception:
         logger.exception("events_ws: sender loop failed for user=%s", user_id)
         stop_event.set()
@@ -125,6 +133,8 @@ async def _receive_loop(receive, stop_event: asyncio.Event) -> None:
 async def events_ws_app(scope: Dict[str, Any], receive, send) -> None:
     """
     WebSocket ASGI app that authenticates via JWT and streams Redis events.
+
+    ``?cursor=<last seen id>`` resumes after a reconnect; without it only new events are sent.
     """
     if scope.get("type") != "websocket":
         await _send_close(send, 1002)
@@ -143,7 +153,8 @@ async def events_ws_app(scope: Dict[str, Any], receive, send) -> None:
     await send({"type": "websocket.accept"})
 
     stop_event = asyncio.Event()
-    sender_task = asyncio.create_task(_stream_events(user.id, send, stop_event))
+    cursor = _query_param(scope, "cursor").strip() or "$"
+    sender_task = asyncio.create_task(_stream_events(user.id, send, stop_event, cursor))
     receiver_task = asyncio.create_task(_receive_loop(receive, stop_event))
 
     try:
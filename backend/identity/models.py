@@ -52,6 +52,11 @@ def is_user_identity_verified(user) -> bool:
     """Return True if the user is fully onboarded on Stripe Connect."""
     if user is None or not getattr(user, "pk", None):
         return False
+    descriptor = getattr(type(user), "payout_account", None)
+    if descriptor is not None and descriptor.is_cached(user):
+        # Loaded via select_related("...payout_account"); avoid a query per participant.
+        payout_account = getattr(user, "payout_account", None)
+        return bool(payout_account and payout_account.is_fully_onboarded)
     try:
         payout_account = OwnerPayoutAccount.objects.get(user=user)
     except OwnerPayoutAccount.DoesNotExist:
@@ -5,29 +5,35 @@ from functools import lru_cache
 import redis
 import requests
 from django.conf import settings
-from django.core.cache import cache
-from django.db.models import BooleanField, Case, Prefetch, Value, When
+from django.db.models import BooleanField, Case, Prefetch, Q, Value, When
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from rest_framework import permissions, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import AuthenticationFailed, NotFound, PermissionDenied
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
+from core.cursors import decode_cursor, encode_cursor
 from promotions.cache import get_active_promoted_listing_ids
 from storage.s3 import guess_content_type, object_key, presign_put, public_url
-from storage.tasks import scan_and_finalize_photo
+from storage.tasks import queue_listing_photo_scan
 from storage.validators import coerce_int, max_bytes_for_content_type, validate_image_limits
 
 from .cache import (
-    categories_cache_timeout,
+    CATEGORIES_ENDPOINT_CACHE,
+    FEED_ENDPOINT_CACHES,
+    build_feed_entry,
+    feed_entry_is_current,
     get_categories_cache_key,
-    invalidate_listing_feed_cache,
     listing_feed_cache_key,
     listings_cache_timeout,
+    snapshot_feed_scope,
 )
+from .geo import default_radius_km, is_valid_coordinate, max_radius_km
 from .models import Category, Listing, ListingPhoto
 from .serializers import (
     CategorySerializer,
@@ -150,6 +156,44 @@ def _request_geocode(address: str, api_key: str):
     return formatted_address, float(lat), float(lng)
 
 
+def lookup_geocode(postal_code: str, city: str = "", region: str = "") -> tuple[dict, bool]:
+    """
+    Resolve an address to coordinates through the shared geocode cache.
+
+    Returns ``(payload, cache_hit)``; raises ``GeocodeNotFoundError`` or
+    ``GeocodeServiceError`` when the lookup fails. Callers must check that
+    ``GOOGLE_MAPS_API_KEY`` is configured.
+    """
+    sanitized_postal_code = _normalize_postal_code(postal_code)
+    sanitized_city = _normalize_component(city)
+    sanitized_region = _normalize_component(region)
+
+    cache_key = _cache_key(sanitized_postal_code, sanitized_city, sanitized_region)
+    cached_payload = _load_cached_geocode(cache_key)
+    if cached_payload:
+        return cached_payload, True
+
+    address_parts = [sanitized_postal_code]
+    if sanitized_city:
+        address_parts.append(sanitized_city)
+    if sanitized_region:
+        address_parts.append(sanitized_region)
+    address_str = ", ".join(address_parts)
+
+    formatted_address, lat, lng = _request_geocode(address_str, settings.GOOGLE_MAPS_API_KEY)
+    payload = {
+        "location": {"lat": lat, "lng": lng},
+        "formatted_address": formatted_address,
+        "address": {
+            "postal_code": sanitized_postal_code,
+            "city": sanitized_city or None,
+            "region": sanitized_region or None,
+        },
+    }
+    _store_cached_geocode(cache_key, payload)
+    return payload, False
+
+
 @api_view(["GET"])
 @permission_classes([permissions.AllowAny])
 def geocode_listing_location(request):
@@ -170,26 +214,8 @@ def geocode_listing_location(request):
             status=status.HTTP_503_SERVICE_UNAVAILABLE,
         )
 
-    sanitized_postal_code = _normalize_postal_code(postal_code_raw)
-    sanitized_city = _normalize_component(city_raw)
-    sanitized_region = _normalize_component(region_raw)
-
-    cache_key = _cache_key(sanitized_postal_code, sanitized_city, sanitized_region)
-    cached_payload = _load_cached_geocode(cache_key)
-    if cached_payload:
-        response_payload = dict(cached_payload)
-        response_payload["cache_hit"] = True
-        return Response(response_payload)
-
-    address_parts = [sanitized_postal_code]
-    if sanitized_city:
-        address_parts.append(sanitized_city)
-    if sanitized_region:
-        address_parts.append(sanitized_region)
-    address_str = ", ".join(address_parts)
-
     try:
-        formatted_address, lat, lng = _request_geocode(address_str, api_key)
+        payload, cache_hit = lookup_geocode(postal_code_raw, city_raw, region_raw)
     except GeocodeNotFoundError:
         return Response(
             {"detail": "Location not found for the provided address."},
@@ -201,18 +227,8 @@ def geocode_listing_location(request):
             status=status.HTTP_502_BAD_GATEWAY,
         )
 
-    payload = {
-        "location": {"lat": lat, "lng": lng},
-        "formatted_address": formatted_address,
-        "address": {
-            "postal_code": sanitized_postal_code,
-            "city": sanitized_city or None,
-            "region": sanitized_region or None,
-        },
-    }
-    _store_cached_geocode(cache_key, payload)
     response_payload = dict(payload)
-    response_payload["cache_hit"] = False
+    response_payload["cache_hit"] = cache_hit
     return Response(response_payload)
 
 
@@ -247,6 +263,106 @@ class ListingPagination(PageNumberPagination):
         )
 
 
+class ListingFeedCursorPagination(BasePagination):
+    """
+    Keyset pagination for the public feed, ordered by ``(created_at, id)`` descending so
+    ``listing_feed_keyset_idx`` serves every page. Enabled when the request carries a
+    ``cursor`` parameter (an empty value requests the first page); skips the COUNT query
+    and the OFFSET scan entirely.
+
+    Up to a page of active promotions is fetched by id and pinned above the first page.
+    The cursor records how many were pinned, so later pages leave out exactly those
+    listings; promotions beyond that appear in keyset order, still flagged as promoted.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = ListingPagination.page_size
+    page_size_query_param = ListingPagination.page_size_query_param
+    max_page_size = ListingPagination.max_page_size
+    ordering = ("-created_at", "-id")
+    invalid_cursor_message = "Invalid cursor."
+
+    @classmethod
+    def is_requested(cls, request) -> bool:
+        return cls.cursor_query_param in request.query_params
+
+    def get_page_size(self, request) -> int:
+        raw = request.query_params.get(self.page_size_query_param)
+        try:
+            size = int(raw) if raw not in (None, "") else self.page_size
+        except (TypeError, ValueError):
+            size = self.page_size
+        if size <= 0:
+            size = self.page_size
+        return min(size, self.max_page_size)
+
+    def encode_cursor(self, listing, pin_limit: int) -> str:
+        return encode_cursor({"c": listing.created_at.isoformat(), "i": listing.pk, "p": pin_limit})
+
+    def decode_cursor(self, token: str) -> tuple[object, int, int]:
+        try:
+            position = decode_cursor(token)
+            created_at = parse_datetime(position["c"])
+            listing_id = int(position["i"])
+            pin_limit = int(position.get("p", self.page_size_value))
+        except (ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if created_at is None or pin_limit < 0:
+            raise NotFound(self.invalid_cursor_message)
+        return created_at, listing_id, pin_limit
+
+    def _after(self, created_at, listing_id: int) -> Q:
+        return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=listing_id)
+
+    def paginate_queryset(self, queryset, request, view=None, promoted_ids=()):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        promoted_ids = set(promoted_ids)
+        queryset = queryset.order_by(*self.ordering)
+        promoted = queryset.filter(pk__in=promoted_ids)
+        token = request.query_params.get(self.cursor_query_param) or ""
+        if token:
+            created_at, listing_id, pin_limit = self.decode_cursor(token)
+            pinned = []
+            pinned_ids = (
+                list(promoted.values_list("pk", flat=True)[:pin_limit]) if promoted_ids else []
+            )
+            queryset = queryset.filter(self._after(created_at, listing_id))
+        else:
+            pin_limit = self.page_size_value
+            pinned = list(promoted[:pin_limit]) if promoted_ids else []
+            pinned_ids = [listing.pk for listing in pinned]
+        if pinned_ids:
+            queryset = queryset.exclude(pk__in=pinned_ids)
+        rows = list(queryset[: self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        rows = rows[: self.page_size_value]
+        for listing in pinned:
+            listing.is_promoted = True
+        for listing in rows:
+            listing.is_promoted = listing.pk in promoted_ids
+        self.page = pinned + rows
+        self.next_cursor = self.encode_cursor(rows[-1], pin_limit) if self.has_next else None
+        return self.page
+
+    def get_next_link(self) -> str | None:
+        if not self.next_cursor:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "next_cursor": self.next_cursor,
+                "page_size": self.page_size_value,
+                "has_next": self.has_next,
+                "results": data,
+            }
+        )
+
+
 class IsOwnerOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
@@ -314,6 +430,26 @@ class ListingViewSet(viewsets.ModelViewSet):
             except (TypeError, ValueError):
                 return None
 
+        def _parse_date(value):
+            try:
+                return parse_date(value) if value else None
+            except ValueError:
+                return None
+
+        start_date = _parse_date(params.get("start_date"))
+        end_date = _parse_date(params.get("end_date"))
+        if not start_date or not end_date or end_date <= start_date:
+            start_date = end_date = None
+
+        lat = _parse_float(params.get("lat"))
+        lng = _parse_float(params.get("lng"))
+        radius_km = None
+        if is_valid_coordinate(lat, lng):
+            radius_km = _parse_float(params.get("radius_km")) or default_radius_km()
+            radius_km = min(max(radius_km, 0.1), max_radius_km())
+        else:
+            lat = lng = None
+
         return {
             "q": q,
             "price_min": _parse_float(price_min_raw),
@@ -321,6 +457,11 @@ class ListingViewSet(viewsets.ModelViewSet):
             "category": category,
             "city": city,
             "owner_id": _parse_int(owner_id_raw),
+            "lat": lat,
+            "lng": lng,
+            "radius_km": radius_km,
+            "start_date": start_date,
+            "end_date": end_date,
         }
 
     def _base_queryset(self):
@@ -341,14 +482,18 @@ class ListingViewSet(viewsets.ModelViewSet):
             )
         else:
             qs = qs.annotate(is_promoted=Value(False))
-        return qs.order_by("-is_promoted", "-created_at")
+        ordering = qs.query.order_by or ("-created_at",)
+        if "distance_km" in ordering:
+            # Radius searches stay strictly nearest-first.
+            return qs
+        return qs.order_by("-is_promoted", *ordering)
 
     def get_queryset(self):
         base_qs = self._base_queryset().prefetch_related("photos")
         qs = self._filtered_queryset(base_qs=base_qs)
         return self._with_promotions(qs)
 
-    def get_feed_queryset(self):
+    def get_feed_queryset(self, *, cap_results: bool = True, promoted_first: bool = True):
         photo_qs = ListingPhoto.objects.filter(
             status=ListingPhoto.Status.ACTIVE,
             av_status=ListingPhoto.AVStatus.CLEAN,
@@ -373,13 +518,14 @@ class ListingViewSet(viewsets.ModelViewSet):
             "is_available",
             "is_deleted",
         )
-        qs = self._with_promotions(qs)
+        if promoted_first:
+            qs = self._with_promotions(qs)
         max_feed_results = getattr(
             settings,
             "LISTING_MAX_FEED_RESULTS",
             getattr(ListingPagination, "max_results", None),
         )
-        if max_feed_results:
+        if cap_results and max_feed_results:
             qs = qs[:max_feed_results]
         return qs
 
@@ -393,29 +539,47 @@ class ListingViewSet(viewsets.ModelViewSet):
         response["Cache-Control"] = f"public, max-age={cache_ttl}"
         return response
 
-    def list(self, request, *args, **kwargs):
-        cache_key = listing_feed_cache_key(request.query_params, variant="full")
-        etag = f'W/"{cache_key}"'
-        cached = cache.get(cache_key)
-        if cached is not None and self._etag_matches(request, etag):
+    def _cached_feed_response(self, request, *, variant: str, build_page):
+        """
+        Serve a feed page from the dependency-tracked cache; concurrent misses for the
+        same page share a single rebuild.
+
+        ``build_page`` returns ``(data, listing_ids)`` for the current request.
+        """
+        cache_key = listing_feed_cache_key(request.query_params, variant=variant)
+
+        def build_entry():
+            scope_versions = snapshot_feed_scope(request.query_params)
+            data, listing_ids = build_page()
+            return build_feed_entry(data, listing_ids, scope_versions=scope_versions)
+
+        entry = FEED_ENDPOINT_CACHES[variant].get_or_build(
+            cache_key, build_entry, validate=feed_entry_is_current
+        )
+        etag = f'W/"{cache_key}:{entry["etag"]}"'
+        if self._etag_matches(request, etag):
             return self._with_cache_headers(
                 Response(status=status.HTTP_304_NOT_MODIFIED),
                 etag,
             )
-        if cached is not None:
-            return self._with_cache_headers(Response(cached), etag)
+        return self._with_cache_headers(Response(entry["data"]), etag)
 
-        queryset = self.filter_queryset(self.get_queryset())
+    def _paginated_data(self, queryset, serialize):
         page = self.paginate_queryset(queryset)
         if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
-        else:
-            serializer = self.get_serializer(queryset, many=True)
-            response = Response(serializer.data)
+            response = self.get_paginated_response(serialize(page))
+            return response.data, [obj.pk for obj in page]
+        items = list(queryset)
+        return serialize(items), [obj.pk for obj in items]
+
+    def list(self, request, *args, **kwargs):
+        def build_page():
+            queryset = self.filter_queryset(self.get_queryset())
+            return self._paginated_data(
+                queryset, lambda items: self.get_serializer(items, many=True).data
+            )
 
-        cache.set(cache_key, response.data, timeout=listings_cache_timeout())
-        return self._with_cache_headers(response, etag)
+        return self._cached_feed_response(request, variant="full", build_page=build_page)
 
     @action(
         detail=False,
@@ -424,36 +588,46 @@ class ListingViewSet(viewsets.ModelViewSet):
         permission_classes=[permissions.AllowAny],
     )
     def feed(self, request):
-        cache_key = listing_feed_cache_key(request.query_params, variant="summary")
-        etag = f'W/"{cache_key}"'
-        cached = cache.get(cache_key)
-        if cached is not None and self._etag_matches(request, etag):
-            return self._with_cache_headers(
-                Response(status=status.HTTP_304_NOT_MODIFIED),
-                etag,
+        if ListingFeedCursorPagination.is_requested(request):
+            return self._cursor_feed(request)
+
+        def build_page():
+            queryset = self.filter_queryset(self.get_feed_queryset())
+            return self._paginated_data(
+                queryset, lambda items: ListingFeedSerializer(items, many=True).data
             )
-        if cached is not None:
-            return self._with_cache_headers(Response(cached), etag)
 
-        queryset = self.filter_queryset(self.get_feed_queryset())
-        page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = ListingFeedSerializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
-        else:
-            serializer = ListingFeedSerializer(queryset, many=True)
-            response = Response(serializer.data)
+        return self._cached_feed_response(request, variant="summary", build_page=build_page)
 
-        cache.set(cache_key, response.data, timeout=listings_cache_timeout())
-        return self._with_cache_headers(response, etag)
+    def _cursor_feed(self, request):
+        """
+        Infinite-scroll variant of the feed; page-number clients keep the default mode.
+
+        Cursor pages are newest first only, so text (``q``) and radius searches, which
+        order by relevance and distance, are rejected here.
+        """
+        params = self._search_params()
+        if params["q"] or params["lat"] is not None:
+            return Response(
+                {"detail": "cursor pagination does not support q or location searches."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        paginator = ListingFeedCursorPagination()
 
-    def perform_create(self, serializer):
-        serializer.save()
-        invalidate_listing_feed_cache()
+        def build_page():
+            queryset = self.filter_queryset(
+                self.get_feed_queryset(cap_results=False, promoted_first=False)
+            )
+            page = paginator.paginate_queryset(
+                queryset,
+                request,
+                view=self,
+                promoted_ids=get_active_promoted_listing_ids(),
+            )
+            data = ListingFeedSerializer(page, many=True).data
+            return paginator.get_paginated_response(data).data, [obj.pk for obj in page]
 
-    def perform_update(self, serializer):
-        serializer.save()
-        invalidate_listing_feed_cache()
+        return self._cached_feed_response(request, variant="cursor", build_page=build_page)
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
@@ -465,8 +639,8 @@ class ListingViewSet(viewsets.ModelViewSet):
         update_fields = ["is_deleted", "deleted_at"]
         if hasattr(instance, "updated_at"):
             update_fields.append("updated_at")
+        # The post_save signal evicts the affected feed pages.
         instance.save(update_fields=update_fields)
-        invalidate_listing_feed_cache()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(detail=True, methods=["get"], url_path="photos")
@@ -519,13 +693,11 @@ class CategoryViewSet(viewsets.ReadOnlyModelViewSet):
     authentication_classes = []
 
     def list(self, request, *args, **kwargs):
-        cache_key = get_categories_cache_key()
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return Response(cached)
-        response = super().list(request, *args, **kwargs)
-        cache.set(cache_key, response.data, timeout=categories_cache_timeout())
-        return response
+        data = CATEGORIES_ENDPOINT_CACHE.get_or_build(
+            get_categories_cache_key(),
+            lambda: super(CategoryViewSet, self).list(request, *args, **kwargs).data,
+        )
+        return Response(data)
 
 
 def _require_listing_owner(listing_id: int, user) -> Listing:
@@ -701,8 +873,6 @@ def photos_complete(request, listing_id: int):
         )
     width = coerce_int(request.data.get("width"))
     height = coerce_int(request.data.get("height"))
-    original_size = coerce_int(request.data.get("original_size"))
-    compressed_size = coerce_int(request.data.get("compressed_size"))
     max_bytes = max_bytes_for_content_type(content_type) or settings.S3_MAX_UPLOAD_BYTES
     if max_bytes and size_int > max_bytes:
         return Response(
@@ -736,20 +906,11 @@ def photos_complete(request, listing_id: int):
     photo.height = height
     photo.save()
 
-    meta = {
-        "etag": etag,
-        "filename": filename,
-        "content_type": content_type,
-        "size": size_int,
-        "width": width,
-        "height": height,
-        "original_size": original_size,
-        "compressed_size": compressed_size,
-    }
-    scan_and_finalize_photo.delay(
+    # The batch task reads the pending row written above.
+    queue_listing_photo_scan(
+        listing_id,
         key=key,
-        listing_id=listing_id,
-        owner_id=request.user.id,
-        meta=meta,
+        original_size=coerce_int(request.data.get("original_size")),
+        compressed_size=coerce_int(request.data.get("compressed_size")),
     )
     return Response({"status": "queued", "key": key}, status=status.HTTP_202_ACCEPTED)
@@ -1,15 +1,25 @@
 from __future__ import annotations
 
-from urllib.parse import urlencode
+import time
+from typing import Any, Iterable, Mapping
+from urllib.parse import quote, urlencode
 
 from django.conf import settings
 from django.core.cache import cache
 from django.http import QueryDict
 
+from core.cache import ENDPOINT_CACHE_COUNTERS, EndpointCache
+
+from .models import Listing
+
 FEED_VERSION_KEY = "listings:feed:version"
 FEED_CACHE_PREFIX = "listings:feed"
+FEED_TAG_PREFIX = "listings:feed:tag"
 CATEGORIES_CACHE_KEY = "listings:categories:v1"
 
+ANY_SCOPE = "*"
+PRICE_FILTER_PARAMS = ("price_min", "price_max")
+
 
 def _get_feed_version() -> int:
     version = cache.get(FEED_VERSION_KEY)
@@ -44,9 +54,220 @@ def listing_feed_cache_key(params: QueryDict, *, variant: str = "full") -> str:
 
 
 def invalidate_listing_feed_cache() -> None:
+    """Drop every cached feed page (full flush); prefer the targeted helpers below."""
     _bump_feed_version()
 
 
+# --- Dependency tracking -------------------------------------------------------------
+#
+# Every cached feed page records the tags it depends on together with the tag versions
+# seen when it was stored:
+#   scope:{category}:{city}  listings entering/leaving the (category, city) result set
+#   text:{category}:{city}   title/description edits (only pages with ``q``)
+#   price:{category}:{city}  price edits (only pages with price filters)
+#   geo:{category}:{city}    coordinate changes (only pages with lat/lng radius filters)
+#   dates:{category}:{city}  blocking booking changes (only pages with start/end dates)
+#   listing:{id}             display-only changes for listings rendered on the page
+# ``*`` stands for "no filter" on that dimension. Changes bump the versions of the
+# affected tags, and a page is treated as evicted once any of its tags moved on. Pages
+# are stored through the shared ``core.cache`` endpoint caches defined at the bottom.
+
+
+def _scope_value(value: str | None) -> str:
+    value = (value or "").strip().lower()
+    return quote(value, safe="") if value else ANY_SCOPE
+
+
+def _scope_pairs(category: str | None, city: str | None) -> set[tuple[str, str]]:
+    categories = {ANY_SCOPE, _scope_value(category)}
+    cities = {ANY_SCOPE, _scope_value(city)}
+    return {(cat, town) for cat in categories for town in cities}
+
+
+def _tag_key(tag: str) -> str:
+    return f"{FEED_TAG_PREFIX}:{tag}"
+
+
+def _tag_timeout() -> int:
+    # Tags only need to outlive the pages that reference them; a missing tag reads as
+    # "changed", so expiring one early can only cause a miss, never a stale hit.
+    return max(listings_cache_timeout(), 1) * 10
+
+
+def _new_tag_version() -> int:
+    return time.time_ns()
+
+
+def feed_page_tags(params: QueryDict, listing_ids: Iterable[int] = ()) -> list[str]:
+    category = _scope_value(params.get("category"))
+    city = _scope_value(params.get("city"))
+    tags = [f"scope:{category}:{city}"]
+    if params.get("q"):
+        tags.append(f"text:{category}:{city}")
+    if any(params.get(key) not in (None, "") for key in PRICE_FILTER_PARAMS):
+        tags.append(f"price:{category}:{city}")
+    if params.get("lat") and params.get("lng"):
+        tags.append(f"geo:{category}:{city}")
+    if params.get("start_date") and params.get("end_date"):
+        tags.append(f"dates:{category}:{city}")
+    tags.extend(f"listing:{int(listing_id)}" for listing_id in listing_ids)
+    return tags
+
+
+def _current_tag_versions(tags: Iterable[str], *, create_missing: bool) -> dict[str, Any]:
+    keys = {_tag_key(tag): tag for tag in tags}
+    found = cache.get_many(list(keys.keys()))
+    versions: dict[str, Any] = {}
+    for key, tag in keys.items():
+        version = found.get(key)
+        if version is None and create_missing:
+            version = _new_tag_version()
+            if not cache.add(key, version, timeout=_tag_timeout()):
+                version = cache.get(key)
+        versions[tag] = version
+    return versions
+
+
+def _bump_tags(tags: Iterable[str]) -> None:
+    unique = set(tags)
+    if not unique:
+        return
+    version = _new_tag_version()
+    cache.set_many({_tag_key(tag): version for tag in unique}, timeout=_tag_timeout())
+
+
+def feed_entry_is_current(entry: Any) -> bool:
+    """True if none of the dependency tags recorded on a cached feed entry moved on."""
+    if not isinstance(entry, dict) or "tags" not in entry:
+        return False
+    stored: Mapping[str, Any] = entry["tags"]
+    current = _current_tag_versions(stored.keys(), create_missing=False)
+    return all(current.get(tag) == version for tag, version in stored.items())
+
+
+def snapshot_feed_scope(params: QueryDict) -> dict[str, Any]:
+    """
+    Capture the scope tag versions *before* the page is queried, so a change that
+    lands while the page is being built evicts it instead of being masked.
+    """
+    return _current_tag_versions(feed_page_tags(params, []), create_missing=True)
+
+
+def build_feed_entry(
+    data: Any,
+    listing_ids: Iterable[int],
+    *,
+    scope_versions: Mapping[str, Any],
+) -> dict[str, Any]:
+    """Wrap a rendered page as ``{"data", "etag", "tags"}`` for the feed endpoint caches."""
+    listing_tags = [f"listing:{int(listing_id)}" for listing_id in listing_ids]
+    tags = dict(scope_versions)
+    tags.update(_current_tag_versions(listing_tags, create_missing=True))
+    return {
+        "data": data,
+        "etag": str(_new_tag_version()),
+        "tags": tags,
+    }
+
+
+def feed_cache_stats() -> dict[str, Any]:
+    """Combined counters for every feed variant (list, feed, cursor feed)."""
+    totals = dict.fromkeys(ENDPOINT_CACHE_COUNTERS, 0)
+    for endpoint_cache in FEED_ENDPOINT_CACHES.values():
+        for counter, value in endpoint_cache.stats().items():
+            if counter in totals:
+                totals[counter] += value
+    stats: dict[str, Any] = {
+        "hits": totals["hits"] + totals["stale"],
+        "misses": totals["misses"],
+        "evictions": totals["evictions"],
+        "stale": totals["stale"],
+        "coalesced": totals["coalesced"],
+    }
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+    return stats
+
+
+def reset_feed_cache_stats() -> None:
+    for endpoint_cache in FEED_ENDPOINT_CACHES.values():
+        endpoint_cache.reset_stats()
+
+
+def is_feed_visible(snapshot: Mapping[str, Any] | None) -> bool:
+    if not snapshot:
+        return False
+    return bool(
+        snapshot.get("is_active")
+        and snapshot.get("is_available")
+        and not snapshot.get("is_deleted")
+    )
+
+
+def _changed(before: Mapping[str, Any], after: Mapping[str, Any], *fields: str) -> bool:
+    return any(before.get(field) != after.get(field) for field in fields)
+
+
+def invalidate_feed_for_listing_change(
+    listing_id: int,
+    before: Mapping[str, Any] | None,
+    after: Mapping[str, Any] | None,
+) -> None:
+    """
+    Evict only the feed pages affected by a listing change.
+
+    ``before``/``after`` are snapshots (see ``listings.signals``) with the visibility
+    flags, ``category_slug``, ``city``, ``title``, ``description``, ``daily_price_cad``
+    and coordinates; ``None`` means the listing did not exist / no longer exists.
+    """
+    tags = [f"listing:{int(listing_id)}"]
+    was_visible = is_feed_visible(before)
+    now_visible = is_feed_visible(after)
+
+    membership_changed = was_visible != now_visible or (
+        was_visible
+        and now_visible
+        and (
+            before.get("category_slug") != after.get("category_slug")
+            or _scope_value(before.get("city")) != _scope_value(after.get("city"))
+        )
+    )
+    if membership_changed:
+        for snapshot, visible in ((before, was_visible), (after, now_visible)):
+            if visible:
+                pairs = _scope_pairs(snapshot.get("category_slug"), snapshot.get("city"))
+                tags.extend(f"scope:{cat}:{town}" for cat, town in pairs)
+    elif now_visible:
+        pairs = _scope_pairs(after.get("category_slug"), after.get("city"))
+        if _changed(before, after, "title", "description"):
+            tags.extend(f"text:{cat}:{town}" for cat, town in pairs)
+        if _changed(before, after, "daily_price_cad"):
+            tags.extend(f"price:{cat}:{town}" for cat, town in pairs)
+        if _changed(before, after, "latitude", "longitude"):
+            tags.extend(f"geo:{cat}:{town}" for cat, town in pairs)
+    _bump_tags(tags)
+
+
+def invalidate_feed_scope(category_slug: str | None, city: str | None) -> None:
+    """Evict every page whose result set or ordering may include this (category, city)."""
+    pairs = _scope_pairs(category_slug, city)
+    _bump_tags(f"scope:{cat}:{town}" for cat, town in pairs)
+
+
+def invalidate_feed_for_availability_change(listing_id: int) -> None:
+    """Evict date-filtered pages that may include or exclude this listing."""
+    row = Listing.objects.filter(pk=listing_id).values("category__slug", "city").first()
+    if row is None:
+        return
+    pairs = _scope_pairs(row["category__slug"], row["city"])
+    _bump_tags(f"dates:{cat}:{town}" for cat, town in pairs)
+
+
+def invalidate_feed_for_listing_ids(listing_ids: Iterable[int]) -> None:
+    """Evict only the pages currently rendering any of these listings."""
+    _bump_tags(f"listing:{int(listing_id)}" for listing_id in listing_ids)
+
+
 def get_categories_cache_key() -> str:
     return CATEGORIES_CACHE_KEY
 
@@ -61,3 +282,11 @@ def listings_cache_timeout() -> int:
 
 def categories_cache_timeout() -> int:
     return getattr(settings, "CACHE_TTL_CATEGORIES", 300)
+
+
+FEED_ENDPOINT_CACHES = {
+    "full": EndpointCache("listings.list", ttl=listings_cache_timeout),
+    "summary": EndpointCache("listings.feed", ttl=listings_cache_timeout),
+    "cursor": EndpointCache("listings.feed_cursor", ttl=listings_cache_timeout),
+}
+CATEGORIES_ENDPOINT_CACHE = EndpointCache("listings.categories", ttl=categories_cache_timeout)
@@ -0,0 +1,162 @@
+"""Geohash bucketing and radius search for listings (no PostGIS required).
+
+Listings store ``latitude``/``longitude`` plus a ``geohash`` string. A radius query
+picks the finest geohash precision whose cells are at least as large as the radius,
+narrows candidates to the 3x3 block of cells around the centre with indexed
+``geohash LIKE 'prefix%'`` lookups, then applies an exact distance filter.
+"""
+
+from __future__ import annotations
+
+import math
+
+from django.conf import settings
+from django.db.models import F, Q, QuerySet, Value
+from django.db.models.functions import Sqrt
+
+GEOHASH_PRECISION = 9
+KM_PER_DEGREE = 111.195
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_BASE32_INDEX = {char: index for index, char in enumerate(_BASE32)}
+
+
+def default_radius_km() -> float:
+    return float(getattr(settings, "LISTING_GEO_DEFAULT_RADIUS_KM", 25))
+
+
+def max_radius_km() -> float:
+    return float(getattr(settings, "LISTING_GEO_MAX_RADIUS_KM", 200))
+
+
+def is_valid_coordinate(lat: float | None, lng: float | None) -> bool:
+    if lat is None or lng is None:
+        return False
+    return -90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0
+
+
+def encode_geohash(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars: list[str] = []
+    bit = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if lng >= mid:
+                value = (value << 1) | 1
+                lng_range[0] = mid
+            else:
+                value <<= 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if lat >= mid:
+                value = (value << 1) | 1
+                lat_range[0] = mid
+            else:
+                value <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(_BASE32[value])
+            bit = 0
+            value = 0
+    return "".join(chars)
+
+
+def decode_geohash_bounds(geohash: str) -> tuple[float, float, float, float]:
+    """Return ``(min_lat, max_lat, min_lng, max_lng)`` for a geohash cell."""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _BASE32_INDEX[char]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            target = lng_range if even else lat_range
+            mid = (target[0] + target[1]) / 2
+            if bit:
+                target[0] = mid
+            else:
+                target[1] = mid
+            even = not even
+    return lat_range[0], lat_range[1], lng_range[0], lng_range[1]
+
+
+def _cell_size_degrees(precision: int) -> tuple[float, float]:
+    bits = precision * 5
+    lng_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (2**lat_bits), 360.0 / (2**lng_bits)
+
+
+def precision_for_radius(lat: float, radius_km: float) -> int:
+    """Finest precision whose cells are at least ``radius_km`` tall and wide near ``lat``."""
+    # Cells narrow towards the poles, so size them for the poleward edge of the circle.
+    edge_lat = min(abs(lat) + radius_km / KM_PER_DEGREE, 89.9)
+    lng_scale = max(math.cos(math.radians(edge_lat)), 0.01)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_deg, lng_deg = _cell_size_degrees(precision)
+        if (
+            lat_deg * KM_PER_DEGREE >= radius_km
+            and lng_deg * KM_PER_DEGREE * lng_scale >= radius_km
+        ):
+            return precision
+    return 1
+
+
+def neighbor_cells(lat: float, lng: float, precision: int) -> set[str]:
+    """The cell containing the point plus its eight neighbours."""
+    cell = encode_geohash(lat, lng, precision)
+    min_lat, max_lat, min_lng, max_lng = decode_geohash_bounds(cell)
+    lat_step = max_lat - min_lat
+    lng_step = max_lng - min_lng
+    center_lat = (min_lat + max_lat) / 2
+    center_lng = (min_lng + max_lng) / 2
+    cells: set[str] = set()
+    for dlat in (-1, 0, 1):
+        cell_lat = center_lat + dlat * lat_step
+        if not -90.0 <= cell_lat <= 90.0:
+            continue
+        for dlng in (-1, 0, 1):
+            cell_lng = center_lng + dlng * lng_step
+            cell_lng = ((cell_lng + 180.0) % 360.0) - 180.0
+            cells.add(encode_geohash(cell_lat, cell_lng, precision))
+    return cells
+
+
+def filter_within_radius(
+    qs: QuerySet,
+    lat: float,
+    lng: float,
+    radius_km: float,
+) -> QuerySet:
+    """
+    Restrict ``qs`` to listings within ``radius_km`` of the point, annotating
+    ``distance_km`` (equirectangular approximation, accurate well below 1% at
+    search-radius scale).
+    """
+    precision = precision_for_radius(lat, radius_km)
+    cell_filter = Q()
+    for cell in sorted(neighbor_cells(lat, lng, precision)):
+        cell_filter |= Q(geohash__startswith=cell)
+
+    lat_delta = radius_km / KM_PER_DEGREE
+    lng_scale = max(math.cos(math.radians(lat)), 0.01)
+    lng_delta = min(radius_km / (KM_PER_DEGREE * lng_scale), 180.0)
+    qs = qs.filter(
+        cell_filter,
+        latitude__gte=lat - lat_delta,
+        latitude__lte=lat + lat_delta,
+        longitude__gte=lng - lng_delta,
+        longitude__lte=lng + lng_delta,
+    )
+
+    dy = F("latitude") - Value(lat)
+    dx = (F("longitude") - Value(lng)) * Value(lng_scale)
+    distance = Sqrt(dy * dy + dx * dx) * Value(KM_PER_DEGREE)
+    return qs.annotate(distance_km=distance).filter(distance_km__lte=radius_km)
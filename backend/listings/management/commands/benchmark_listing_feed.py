@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import statistics
+import time
+from itertools import cycle
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.text import slugify
+from rest_framework.test import APIRequestFactory
+
+from core.benchmarks import percentile
+from listings.api import ListingViewSet
+from listings.cache import invalidate_listing_feed_cache
+from listings.management.commands.populate_listings import CATEGORY_SEEDS, LISTING_SEEDS
+from listings.models import Category, Listing
+from listings.search import rebuild_listing_search_documents
+
+User = get_user_model()
+
+BENCHMARK_OWNER_USERNAME = "feed-benchmark-owner"
+DEFAULT_QUERIES = [
+    "",
+    "q=drill",
+    "q=dri",
+    "q=pressure washer",
+    "q=tent&city=Edmonton",
+    "q=projector&price_max=60",
+    "category=power-tools",
+    "city=Calgary&page=3",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic listings and report p50/p95 latency of /api/listings/feed/ "
+        "with the endpoint cache disabled."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--listings",
+            type=int,
+            default=100_000,
+            help="Target number of benchmark listings (seeded if missing).",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Requests per query string.",
+        )
+        parser.add_argument(
+            "--skip-seed",
+            action="store_true",
+            help="Do not create listings; benchmark the current table as-is.",
+        )
+        parser.add_argument(
+            "--cleanup",
+            action="store_true",
+            help="Delete the benchmark owner and its listings afterwards.",
+        )
+        parser.add_argument(
+            "--allow-destructive",
+            action="store_true",
+            help=(
+                "Run with DEBUG off. The command writes listings to the configured database "
+                "and invalidates the shared feed cache, so only use it on a throwaway stack."
+            ),
+        )
+
+    def handle(self, *args, **options) -> None:
+        target = options["listings"]
+        iterations = options["iterations"]
+        if target <= 0 or iterations <= 0:
+            raise CommandError("--listings and --iterations must be greater than 0.")
+        if not settings.DEBUG and not options["allow_destructive"]:
+            raise CommandError(
+                "Refusing to seed listings and flush the feed cache with DEBUG off; "
+                "pass --allow-destructive if this database and cache are disposable."
+            )
+
+        if not options["skip_seed"]:
+            created = self._seed(target)
+            self.stdout.write(f"Seeded listings: {created}")
+
+        factory = APIRequestFactory()
+        view = ListingViewSet.as_view({"get": "feed"})
+        all_samples: list[float] = []
+        for query in DEFAULT_QUERIES:
+            samples: list[float] = []
+            for _ in range(iterations):
+                # Only the feed pages are dropped; other cached data is left alone.
+                invalidate_listing_feed_cache()
+                request = factory.get(f"/api/listings/feed/?{query}")
+                started = time.perf_counter()
+                response = view(request)
+                response.render()
+                samples.append((time.perf_counter() - started) * 1000)
+            all_samples.extend(samples)
+            self.stdout.write(
+                f"{query or '(none)':<32} p50={statistics.median(samples):7.1f}ms "
+                f"p95={percentile(samples, 95):7.1f}ms"
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Overall p50={statistics.median(all_samples):.1f}ms "
+                f"p95={percentile(all_samples, 95):.1f}ms "
+                f"({len(all_samples)} requests, {Listing.objects.count()} listings)"
+            )
+        )
+
+        if options["cleanup"]:
+            User.objects.filter(username=BENCHMARK_OWNER_USERNAME).delete()
+            self.stdout.write("Benchmark data removed.")
+
+    def _seed(self, target: int) -> int:
+        owner, _ = User.objects.get_or_create(
+            username=BENCHMARK_OWNER_USERNAME,
+            defaults={"email": "feed-benchmark@example.com", "can_list": True},
+        )
+        existing = Listing.objects.filter(owner=owner).count()
+        missing = max(target - existing, 0)
+        if not missing:
+            return 0
+
+        categories = []
+        for seed in CATEGORY_SEEDS:
+            category, _ = Category.objects.get_or_create(
+                name=seed["name"],
+                defaults={key: seed[key] for key in ("icon", "accent", "icon_color")},
+            )
+            categories.append(category)
+
+        seeds_cycle = cycle(LISTING_SEEDS)
+        categories_cycle = cycle(categories)
+        batch: list[Listing] = []
+        with transaction.atomic():
+            for index in range(existing, existing + missing):
+                seed = next(seeds_cycle)
+                batch.append(
+                    Listing(
+                        owner=owner,
+                        category=next(categories_cycle),
+                        slug=f"{slugify(seed['title'])[:120]}-bench-{index}",
+                        **seed,
+                    )
+                )
+                if len(batch) >= 5000:
+                    Listing.objects.bulk_create(batch)
+                    batch = []
+            if batch:
+                Listing.objects.bulk_create(batch)
+        # bulk_create bypasses post_save, so refresh the search index explicitly.
+        rebuild_listing_search_documents()
+        return missing
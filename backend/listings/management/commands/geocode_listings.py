@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from listings.models import Listing
+from listings.tasks import geocode_listing
+
+
+class Command(BaseCommand):
+    help = "Queue geocoding for listings that have no stored coordinates."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=0,
+            help="Maximum number of listings to queue (0 = all).",
+        )
+        parser.add_argument(
+            "--sync",
+            action="store_true",
+            help="Geocode inline instead of queueing Celery tasks.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if not getattr(settings, "GOOGLE_MAPS_API_KEY", None):
+            raise CommandError("GOOGLE_MAPS_API_KEY is not configured.")
+
+        limit = options["limit"]
+        if limit < 0:
+            raise CommandError("--limit must be 0 or higher.")
+
+        qs = (
+            Listing.objects.filter(is_deleted=False, latitude__isnull=True)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        if limit:
+            qs = qs[:limit]
+
+        queued = 0
+        for listing_id in qs.iterator():
+            if options["sync"]:
+                geocode_listing(listing_id)
+            else:
+                geocode_listing.delay(listing_id)
+            queued += 1
+
+        verb = "Geocoded" if options["sync"] else "Queued"
+        self.stdout.write(self.style.SUCCESS(f"{verb} listings: {queued}"))
@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+
+from listings.search import rebuild_listing_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild the listing full-text search documents from the Listing table."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of listings written per batch.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = options["batch_size"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be greater than 0.")
+
+        total = rebuild_listing_search_documents(batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f"Search documents rebuilt: {total}"))
@@ -0,0 +1,102 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:57
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+SEARCH_VECTOR_INDEX = "listings_search_vector_gin"
+
+
+def create_search_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {SEARCH_VECTOR_INDEX} "
+        "ON listings_listingsearchdocument USING gin (search_vector)"
+    )
+
+
+def drop_search_vector_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {SEARCH_VECTOR_INDEX}")
+
+
+def backfill_search_documents(apps, schema_editor):
+    Listing = apps.get_model("listings", "Listing")
+    ListingSearchDocument = apps.get_model("listings", "ListingSearchDocument")
+    batch = []
+    for listing in Listing.objects.select_related("category").iterator(chunk_size=1000):
+        category_name = listing.category.name if listing.category_id else ""
+        parts = [listing.title or "", category_name, listing.city or "", listing.description or ""]
+        batch.append(
+            ListingSearchDocument(
+                listing_id=listing.pk,
+                title=listing.title or "",
+                description=listing.description or "",
+                city=listing.city or "",
+                category_name=category_name,
+                document=" ".join(part.strip() for part in parts if part.strip()).lower(),
+            )
+        )
+        if len(batch) >= 1000:
+            ListingSearchDocument.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        ListingSearchDocument.objects.bulk_create(batch, ignore_conflicts=True)
+
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(
+            "UPDATE listings_listingsearchdocument SET search_vector = "
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(category_name, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(city, '')), 'B') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'C')"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0008_listingphoto_listings_li_listing_a0631b_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ListingSearchDocument",
+            fields=[
+                (
+                    "listing",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="search_document",
+                        serialize=False,
+                        to="listings.listing",
+                    ),
+                ),
+                ("title", models.CharField(blank=True, max_length=140)),
+                ("description", models.TextField(blank=True)),
+                ("city", models.CharField(blank=True, max_length=60)),
+                ("category_name", models.CharField(blank=True, max_length=80)),
+                (
+                    "document",
+                    models.TextField(
+                        blank=True,
+                        help_text="Lower-cased concatenation of the indexed fields (non-Postgres fallback).",
+                    ),
+                ),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(
+                        blank=True,
+                        help_text="Weighted tsvector, populated on PostgreSQL only.",
+                        null=True,
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(create_search_vector_index, drop_search_vector_index),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-16 21:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0009_listingsearchdocument"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="listing",
+            index=models.Index(
+                condition=models.Q(
+                    ("is_active", True), ("is_available", True), ("is_deleted", False)
+                ),
+                fields=["-created_at", "-id"],
+                name="listing_feed_keyset_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.7 on 2026-10-16 21:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("listings", "0010_listing_feed_keyset_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="listing",
+            name="geohash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                help_text="Geohash of latitude/longitude used for radius search buckets.",
+                max_length=12,
+            ),
+        ),
+        migrations.AddField(
+            model_name="listing",
+            name="latitude",
+            field=models.FloatField(
+                blank=True,
+                help_text="Approximate latitude, geocoded from the postal code/city on save.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="listing",
+            name="longitude",
+            field=models.FloatField(
+                blank=True,
+                help_text="Approximate longitude, geocoded from the postal code/city on save.",
+                null=True,
+            ),
+        ),
+    ]
@@ -1,11 +1,14 @@
 from decimal import Decimal
 
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
 from django.utils.text import slugify
 
+from .geo import encode_geohash, is_valid_coordinate
+
 
 class Category(models.Model):
     name = models.CharField(max_length=80, unique=True)
@@ -96,6 +99,23 @@ class Listing(models.Model):
         default="",
         help_text="Optional postal code to approximate the item's location.",
     )
+    latitude = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Approximate latitude, geocoded from the postal code/city on save.",
+    )
+    longitude = models.FloatField(
+        null=True,
+        blank=True,
+        help_text="Approximate longitude, geocoded from the postal code/city on save.",
+    )
+    geohash = models.CharField(
+        max_length=12,
+        blank=True,
+        default="",
+        db_index=True,
+        help_text="Geohash of latitude/longitude used for radius search buckets.",
+    )
     is_active = models.BooleanField(default=True)
     is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
@@ -126,11 +146,25 @@ class Listing(models.Model):
 
         self.postal_code = (self.postal_code or "").strip().upper()
 
+        if (self.latitude is None) != (self.longitude is None):
+            errors.setdefault("latitude", []).append(
+                "Latitude and longitude must be provided together."
+            )
+        elif self.latitude is not None and not is_valid_coordinate(self.latitude, self.longitude):
+            errors.setdefault("latitude", []).append("Coordinates are out of range.")
+
         if errors:
             raise ValidationError(errors)
 
     def save(self, *args, **kwargs):
         self.full_clean()
+        if self.latitude is not None and self.longitude is not None:
+            self.geohash = encode_geohash(self.latitude, self.longitude)
+        else:
+            self.geohash = ""
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = set(update_fields) | {"geohash"}
         if not self.slug:
             base = slugify(self.title)[:120] or "listing"
             count = type(self).objects.count() + 1
@@ -143,6 +177,11 @@ class Listing(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["is_deleted", "deleted_at"]),
+            models.Index(
+                fields=["-created_at", "-id"],
+                name="listing_feed_keyset_idx",
+                condition=models.Q(is_active=True, is_available=True, is_deleted=False),
+            ),
         ]
 
 
@@ -196,3 +235,31 @@ class ListingPhoto(models.Model):
 
     def __str__(self) -> str:
         return f"Photo {self.id} for listing {self.listing_id}"
+
+
+class ListingSearchDocument(models.Model):
+    """Denormalized search text for a listing, maintained by ``listings.signals``."""
+
+    listing = models.OneToOneField(
+        Listing,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    title = models.CharField(max_length=140, blank=True)
+    description = models.TextField(blank=True)
+    city = models.CharField(max_length=60, blank=True)
+    category_name = models.CharField(max_length=80, blank=True)
+    document = models.TextField(
+        blank=True,
+        help_text="Lower-cased concatenation of the indexed fields (non-Postgres fallback).",
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        blank=True,
+        help_text="Weighted tsvector, populated on PostgreSQL only.",
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"Search document for listing {self.listing_id}"
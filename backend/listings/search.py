@@ -0,0 +1,146 @@
+"""Full-text search index for listings.
+
+Each listing owns a ``ListingSearchDocument`` row holding the searchable text
+(title, description, city, category name). On PostgreSQL the row also carries a
+weighted ``tsvector`` backed by a GIN index, and queries use ranked prefix
+matching. Other backends (SQLite in tests) match every query term against the
+lower-cased ``document`` column instead.
+"""
+
+from __future__ import annotations
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection
+from django.db.models import F, FloatField, QuerySet, Value
+
+from .models import Category, Listing, ListingSearchDocument
+
+SEARCH_CONFIG = "simple"
+SEARCH_SOURCE_FIELDS = frozenset({"title", "description", "city", "category", "category_id"})
+MAX_QUERY_TERMS = 8
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def uses_postgres_search() -> bool:
+    return connection.vendor == "postgresql"
+
+
+def tokenize_query(q: str | None) -> list[str]:
+    """Split a free-text query into lower-cased word terms safe for tsquery."""
+    if not q:
+        return []
+    terms: list[str] = []
+    for term in _TERM_RE.findall(q.lower()):
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_QUERY_TERMS]
+
+
+def _weighted_vector() -> SearchVector:
+    return (
+        SearchVector("title", weight="A", config=SEARCH_CONFIG)
+        + SearchVector("category_name", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("city", weight="B", config=SEARCH_CONFIG)
+        + SearchVector("description", weight="C", config=SEARCH_CONFIG)
+    )
+
+
+def build_search_document(listing: Listing) -> dict[str, str]:
+    category_name = listing.category.name if listing.category_id else ""
+    title = (listing.title or "").strip()
+    description = (listing.description or "").strip()
+    city = (listing.city or "").strip()
+    document = " ".join(part for part in (title, category_name, city, description) if part)
+    return {
+        "title": title,
+        "description": description,
+        "city": city,
+        "category_name": category_name,
+        "document": document.lower(),
+    }
+
+
+def _refresh_search_vectors(doc_qs: QuerySet[ListingSearchDocument]) -> None:
+    if uses_postgres_search():
+        doc_qs.update(search_vector=_weighted_vector())
+
+
+def sync_listing_search_document(listing: Listing) -> None:
+    """Create or refresh the search document for a single listing."""
+    ListingSearchDocument.objects.update_or_create(
+        listing_id=listing.pk,
+        defaults=build_search_document(listing),
+    )
+    _refresh_search_vectors(ListingSearchDocument.objects.filter(listing_id=listing.pk))
+
+
+def refresh_category_search_documents(category: Category) -> int:
+    """Propagate a category rename to every search document in that category."""
+    doc_qs = ListingSearchDocument.objects.filter(listing__category_id=category.pk).exclude(
+        category_name=category.name
+    )
+    docs = list(doc_qs.select_related("listing", "listing__category"))
+    for doc in docs:
+        fields = build_search_document(doc.listing)
+        doc.category_name = fields["category_name"]
+        doc.document = fields["document"]
+    if docs:
+        ListingSearchDocument.objects.bulk_update(
+            docs, ["category_name", "document"], batch_size=500
+        )
+        _refresh_search_vectors(
+            ListingSearchDocument.objects.filter(pk__in=[doc.pk for doc in docs])
+        )
+    return len(docs)
+
+
+def rebuild_listing_search_documents(*, batch_size: int = 1000) -> int:
+    """Rebuild every search document; used by the backfill command and benchmarks."""
+    total = 0
+    listings = Listing.objects.select_related("category").order_by("id")
+    batch: list[ListingSearchDocument] = []
+    for listing in listings.iterator(chunk_size=batch_size):
+        batch.append(ListingSearchDocument(listing_id=listing.pk, **build_search_document(listing)))
+        if len(batch) >= batch_size:
+            total += _write_batch(batch)
+            batch = []
+    if batch:
+        total += _write_batch(batch)
+    _refresh_search_vectors(ListingSearchDocument.objects.all())
+    return total
+
+
+def _write_batch(batch: list[ListingSearchDocument]) -> int:
+    ListingSearchDocument.objects.bulk_create(
+        batch,
+        update_conflicts=True,
+        unique_fields=["listing"],
+        update_fields=["title", "description", "city", "category_name", "document"],
+    )
+    return len(batch)
+
+
+def apply_listing_search(qs: QuerySet[Listing], q: str | None) -> QuerySet[Listing]:
+    """
+    Filter ``qs`` down to listings matching ``q`` and annotate ``search_rank``.
+
+    Every term must match and is matched as a prefix, so type-ahead queries
+    ("dri" -> "drill") work on both backends.
+    """
+    terms = tokenize_query(q)
+    if not terms:
+        return qs.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    if uses_postgres_search():
+        raw_query = " & ".join(f"{term}:*" for term in terms)
+        query = SearchQuery(raw_query, search_type="raw", config=SEARCH_CONFIG)
+        return qs.filter(search_document__search_vector=query).annotate(
+            search_rank=SearchRank(F("search_document__search_vector"), query)
+        )
+
+    for term in terms:
+        qs = qs.filter(search_document__document__contains=term)
+    return qs.annotate(search_rank=Value(0.0, output_field=FloatField()))
@@ -1,3 +1,4 @@
+import math
 from decimal import Decimal
 
 from django.conf import settings
@@ -74,6 +75,7 @@ class ListingFeedSerializer(serializers.ModelSerializer):
     owner_rating = serializers.ReadOnlyField(source="owner.rating")
     owner_review_count = serializers.ReadOnlyField(source="owner.review_count")
     is_promoted = serializers.SerializerMethodField()
+    distance_km = serializers.SerializerMethodField()
 
     class Meta:
         model = Listing
@@ -89,6 +91,7 @@ class ListingFeedSerializer(serializers.ModelSerializer):
             "primary_photo_url",
             "owner_rating",
             "owner_review_count",
+            "distance_km",
             "created_at",
         ]
         read_only_fields = fields
@@ -117,6 +120,14 @@ class ListingFeedSerializer(serializers.ModelSerializer):
         promoted_ids = get_active_promoted_listing_ids()
         return obj.id in promoted_ids
 
+    def get_distance_km(self, obj) -> int | None:
+        distance = getattr(obj, "distance_km", None)
+        if distance is None:
+            return None
+        # Whole kilometres, rounded up and never below 1: a finer distance from a few
+        # caller-chosen points would be enough to trilaterate the hidden location.
+        return max(math.ceil(distance), 1)
+
 
 class ListingSerializer(serializers.ModelSerializer):
     """Serializer for Listing that enforces business rules and permissions."""
@@ -151,6 +162,8 @@ class ListingSerializer(serializers.ModelSerializer):
             "damage_deposit_cad",
             "city",
             "postal_code",
+            "latitude",
+            "longitude",
             "category",
             "category_name",
             "is_active",
@@ -160,6 +173,11 @@ class ListingSerializer(serializers.ModelSerializer):
             "created_at",
         ]
         read_only_fields = ["owner", "slug", "created_at"]
+        # Coordinates pinpoint the owner's address: accepted on write, never returned.
+        extra_kwargs = {
+            "latitude": {"min_value": -90.0, "max_value": 90.0, "write_only": True},
+            "longitude": {"min_value": -180.0, "max_value": 180.0, "write_only": True},
+        }
 
     def get_photos(self, obj):
         """Return only photos that passed moderation and AV scans."""
@@ -171,8 +189,15 @@ class ListingSerializer(serializers.ModelSerializer):
         return serializer.data
 
     def validate(self, attrs):
-        """Enforce ID verification limits for high-value listings."""
+        """Check coordinate pairs and enforce ID verification limits for high-value listings."""
         attrs = super().validate(attrs)
+        if "latitude" in attrs or "longitude" in attrs:
+            latitude = attrs.get("latitude", getattr(self.instance, "latitude", None))
+            longitude = attrs.get("longitude", getattr(self.instance, "longitude", None))
+            if (latitude is None) != (longitude is None):
+                raise serializers.ValidationError(
+                    {"latitude": ["Latitude and longitude must be provided together."]}
+                )
         request = self.context.get("request")
         user = getattr(request, "user", None)
 
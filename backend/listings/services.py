@@ -2,8 +2,10 @@ from datetime import date
 from decimal import ROUND_HALF_UP, Decimal
 
 from django.conf import settings
-from django.db.models import Q, QuerySet
+from django.db.models import Exists, OuterRef, QuerySet
 
+from bookings.availability import ACTIVE_BOOKING_STATUSES
+from bookings.models import Booking
 from core.settings_resolver import get_int
 from payments.tax import (
     compute_fee_with_gst,
@@ -12,7 +14,9 @@ from payments.tax import (
     platform_gst_rate,
 )
 
+from .geo import filter_within_radius, is_valid_coordinate
 from .models import Listing
+from .search import apply_listing_search
 
 
 def search_listings(
@@ -23,9 +27,21 @@ def search_listings(
     category: str | None = None,
     city: str | None = None,
     owner_id: int | None = None,
+    lat: float | None = None,
+    lng: float | None = None,
+    radius_km: float | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
 ) -> QuerySet[Listing]:
-    if q:
-        qs = qs.filter(Q(title__icontains=q) | Q(description__icontains=q) | Q(city__icontains=q))
+    """
+    Filter the public listings queryset.
+
+    When ``lat``/``lng`` are given, results are limited to ``radius_km`` around the
+    point (see ``listings.geo``), annotated with ``distance_km`` and ordered nearest
+    first; otherwise text matches are ordered by rank, then newest first.
+    ``start_date``/``end_date`` drop listings with a confirmed/paid booking overlapping
+    ``[start_date, end_date)``.
+    """
     if price_min is not None:
         qs = qs.filter(daily_price_cad__gte=price_min)
     if price_max is not None:
@@ -36,7 +52,32 @@ def search_listings(
         qs = qs.filter(city__iexact=city)
     if owner_id is not None:
         qs = qs.filter(owner_id=owner_id)
-    return qs.filter(is_active=True, is_available=True, is_deleted=False).order_by("-created_at")
+    qs = qs.filter(is_active=True, is_available=True, is_deleted=False)
+    if start_date and end_date:
+        qs = exclude_booked_listings(qs, start_date, end_date)
+    ordering: list[str] = []
+    if is_valid_coordinate(lat, lng) and radius_km:
+        qs = filter_within_radius(qs, lat, lng, radius_km)
+        ordering.append("distance_km")
+    if q:
+        qs = apply_listing_search(qs, q)
+        ordering.append("-search_rank")
+    return qs.order_by(*ordering, "-created_at")
+
+
+def exclude_booked_listings(
+    qs: QuerySet[Listing],
+    start_date: date,
+    end_date: date,
+) -> QuerySet[Listing]:
+    """Anti-join (``NOT EXISTS``) against blocking bookings overlapping the range."""
+    overlapping = Booking.objects.filter(
+        listing_id=OuterRef("pk"),
+        status__in=ACTIVE_BOOKING_STATUSES,
+        start_date__lt=end_date,
+        end_date__gt=start_date,
+    )
+    return qs.filter(~Exists(overlapping))
 
 
 def compute_booking_totals(
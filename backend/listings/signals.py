@@ -1,25 +1,125 @@
 from __future__ import annotations
 
-from django.db.models.signals import post_delete, post_save
+from typing import Any
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .cache import invalidate_categories_cache, invalidate_listing_feed_cache
+from .cache import (
+    invalidate_categories_cache,
+    invalidate_feed_for_listing_change,
+    invalidate_feed_for_listing_ids,
+    invalidate_listing_feed_cache,
+)
 from .models import Category, Listing, ListingPhoto
+from .search import (
+    SEARCH_SOURCE_FIELDS,
+    refresh_category_search_documents,
+    sync_listing_search_document,
+)
+
+FEED_SNAPSHOT_FIELDS = (
+    "is_active",
+    "is_available",
+    "is_deleted",
+    "city",
+    "title",
+    "description",
+    "daily_price_cad",
+    "postal_code",
+    "latitude",
+    "longitude",
+)
+
+
+def _feed_snapshot(listing: Listing) -> dict[str, Any]:
+    snapshot = {field: getattr(listing, field) for field in FEED_SNAPSHOT_FIELDS}
+    snapshot["category_slug"] = listing.category.slug if listing.category_id else None
+    return snapshot
+
+
+def _stored_feed_snapshot(listing_id: int) -> dict[str, Any] | None:
+    row = (
+        Listing.objects.filter(pk=listing_id)
+        .values(*FEED_SNAPSHOT_FIELDS, "category__slug")
+        .first()
+    )
+    if row is None:
+        return None
+    row["category_slug"] = row.pop("category__slug")
+    return row
+
+
+@receiver(pre_save, sender=Listing, dispatch_uid="listing_feed_snapshot_before_save")
+def _capture_listing_feed_snapshot(sender, instance, raw=False, **kwargs):
+    instance._feed_snapshot_before = (
+        _stored_feed_snapshot(instance.pk) if instance.pk and not raw else None
+    )
 
 
 @receiver(post_save, sender=Listing, dispatch_uid="listing_feed_invalidate_on_save")
+def _invalidate_listing_feed_on_listing_save(sender, instance, **kwargs):
+    before = getattr(instance, "_feed_snapshot_before", None)
+    invalidate_feed_for_listing_change(instance.pk, before, _feed_snapshot(instance))
+
+
+@receiver(post_save, sender=Listing, dispatch_uid="listing_geocode_on_location_change")
+def _geocode_listing_on_location_change(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, "_feed_snapshot_before", None) or {}
+    location_changed = created or any(
+        before.get(field) != getattr(instance, field) for field in ("postal_code", "city")
+    )
+    coordinates_supplied = instance.latitude is not None and (
+        created
+        or before.get("latitude") != instance.latitude
+        or before.get("longitude") != instance.longitude
+    )
+    if not location_changed or coordinates_supplied:
+        return
+
+    from .tasks import geocode_listing
+
+    listing_id = instance.pk
+    transaction.on_commit(lambda: geocode_listing.delay(listing_id))
+
+
 @receiver(post_delete, sender=Listing, dispatch_uid="listing_feed_invalidate_on_delete")
-def _invalidate_listing_feed_on_listing_change(sender, instance, **kwargs):
-    invalidate_listing_feed_cache()
+def _invalidate_listing_feed_on_listing_delete(sender, instance, **kwargs):
+    invalidate_feed_for_listing_change(instance.pk, _feed_snapshot(instance), None)
+
+
+@receiver(post_save, sender=Listing, dispatch_uid="listing_search_document_sync_on_save")
+def _sync_search_document_on_listing_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    update_fields = kwargs.get("update_fields")
+    if update_fields and not SEARCH_SOURCE_FIELDS.intersection(update_fields):
+        return
+    sync_listing_search_document(instance)
 
 
 @receiver(post_save, sender=ListingPhoto, dispatch_uid="listing_feed_invalidate_on_photo_save")
 @receiver(post_delete, sender=ListingPhoto, dispatch_uid="listing_feed_invalidate_on_photo_delete")
 def _invalidate_listing_feed_on_photo_change(sender, instance, **kwargs):
-    invalidate_listing_feed_cache()
+    # Photos never change which listings match a query, only how they render.
+    invalidate_feed_for_listing_ids([instance.listing_id])
 
 
 @receiver(post_save, sender=Category, dispatch_uid="categories_cache_invalidate_on_save")
 @receiver(post_delete, sender=Category, dispatch_uid="categories_cache_invalidate_on_delete")
-def _invalidate_categories_on_change(sender, instance, **kwargs):
+def _invalidate_categories_on_change(sender, instance, created=False, **kwargs):
     invalidate_categories_cache()
+    if not created:
+        # Renames/deletes touch every page showing the category; they are rare enough
+        # that a full feed flush is cheaper than tracking per-category pages.
+        invalidate_listing_feed_cache()
+
+
+@receiver(post_save, sender=Category, dispatch_uid="listing_search_documents_on_category_save")
+def _refresh_search_documents_on_category_save(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    refresh_category_search_documents(instance)
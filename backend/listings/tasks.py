@@ -47,3 +47,35 @@ def purge_soft_deleted_listings() -> int:
     qs.delete()
     logger.info("listings: purged %s soft-deleted listings", count)
     return count
+
+
+@shared_task(name="listings.geocode_listing")
+def geocode_listing(listing_id: int) -> str:
+    """
+    Persist coordinates for a listing from its postal code/city.
+
+    Returns a short status string: "updated", "skipped", "not_found" or "error".
+    """
+    if not getattr(settings, "GOOGLE_MAPS_API_KEY", None):
+        return "skipped"
+
+    from .api import GeocodeNotFoundError, GeocodeServiceError, lookup_geocode
+
+    listing = Listing.objects.filter(pk=listing_id).first()
+    if listing is None or not (listing.postal_code or listing.city):
+        return "skipped"
+
+    try:
+        payload, _ = lookup_geocode(listing.postal_code or "", listing.city or "")
+    except GeocodeNotFoundError:
+        logger.info("listings: no geocode result for listing %s", listing_id)
+        return "not_found"
+    except GeocodeServiceError:
+        logger.warning("listings: geocode failed for listing %s", listing_id, exc_info=True)
+        return "error"
+
+    location = payload.get("location") or {}
+    listing.latitude = float(location["lat"])
+    listing.longitude = float(location["lng"])
+    listing.save(update_fields=["latitude", "longitude"])
+    return "updated"
@@ -0,0 +1,118 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from bookings.models import Booking
+from listings.models import Listing
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def owner():
+    return User.objects.create_user(
+        username="dates-owner",
+        password="x",
+        can_list=True,
+        can_rent=True,
+    )
+
+
+@pytest.fixture
+def renter():
+    return User.objects.create_user(username="dates-renter", password="x", can_rent=True)
+
+
+def make_listing(owner, **overrides):
+    data = {
+        "owner": owner,
+        "title": "Sample Listing",
+        "daily_price_cad": Decimal("25.00"),
+        "city": "Edmonton",
+    }
+    data.update(overrides)
+    return Listing.objects.create(**data)
+
+
+def book(listing, renter, start, end, status):
+    return Booking.objects.create(
+        listing=listing,
+        owner=listing.owner,
+        renter=renter,
+        start_date=start,
+        end_date=end,
+        status=status,
+    )
+
+
+def future(days):
+    return date.today() + timedelta(days=days)
+
+
+def _range(start, end):
+    return f"start_date={start.isoformat()}&end_date={end.isoformat()}"
+
+
+def test_feed_excludes_listings_booked_in_range(owner, renter):
+    booked = make_listing(owner, title="Booked Drill")
+    requested = make_listing(owner, title="Requested Saw")
+    adjacent = make_listing(owner, title="Adjacent Tent")
+    book(booked, renter, future(5), future(8), Booking.Status.PAID)
+    book(requested, renter, future(5), future(8), Booking.Status.REQUESTED)
+    book(adjacent, renter, future(8), future(10), Booking.Status.CONFIRMED)
+
+    client = APIClient()
+    resp = client.get(f"/api/listings/feed/?{_range(future(6), future(8))}")
+    assert resp.status_code == 200
+    slugs = {item["slug"] for item in resp.data["results"]}
+    assert slugs == {requested.slug, adjacent.slug}
+
+    resp = client.get(f"/api/listings/?{_range(future(6), future(8))}")
+    assert {item["slug"] for item in resp.data["results"]} == slugs
+
+
+def test_invalid_or_partial_ranges_are_ignored(owner, renter):
+    listing = make_listing(owner)
+    book(listing, renter, future(5), future(8), Booking.Status.PAID)
+
+    client = APIClient()
+    for query in (
+        f"start_date={future(6).isoformat()}",
+        _range(future(8), future(6)),
+        "start_date=not-a-date&end_date=2026-99-01",
+    ):
+        resp = client.get(f"/api/listings/feed/?{query}")
+        assert resp.status_code == 200
+        assert resp.data["count"] == 1
+
+
+def test_booking_changes_evict_date_filtered_pages(owner, renter):
+    listing = make_listing(owner)
+    url = f"/api/listings/feed/?{_range(future(3), future(5))}"
+
+    client = APIClient()
+    assert client.get(url).data["count"] == 1
+
+    booking = book(listing, renter, future(2), future(4), Booking.Status.REQUESTED)
+    assert client.get(url).data["count"] == 1
+
+    booking.status = Booking.Status.CONFIRMED
+    booking.save(update_fields=["status"])
+    assert client.get(url).data["count"] == 0
+
+    booking.status = Booking.Status.CANCELED
+    booking.save(update_fields=["status"])
+    assert client.get(url).data["count"] == 1
@@ -0,0 +1,166 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from listings.cache import feed_cache_stats
+from listings.models import Category, Listing, ListingPhoto
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def owner():
+    return User.objects.create_user(
+        username="feed-cache-owner",
+        password="x",
+        can_list=True,
+        can_rent=True,
+    )
+
+
+@pytest.fixture
+def tools():
+    return Category.objects.create(name="Power Tools")
+
+
+@pytest.fixture
+def outdoors():
+    return Category.objects.create(name="Outdoors")
+
+
+def make_listing(owner, **overrides):
+    data = {
+        "owner": owner,
+        "title": "Sample Listing",
+        "description": "Sample description",
+        "daily_price_cad": Decimal("25.00"),
+        "city": "Edmonton",
+        "is_active": True,
+        "is_available": True,
+    }
+    data.update(overrides)
+    return Listing.objects.create(**data)
+
+
+def _warm(client, *paths):
+    for path in paths:
+        assert client.get(path).status_code == 200
+
+
+def _counts():
+    stats = feed_cache_stats()
+    return stats["hits"], stats["misses"], stats["evictions"]
+
+
+def test_repeat_request_is_a_hit_and_etag_round_trips(owner, tools):
+    make_listing(owner, category=tools)
+    client = APIClient()
+
+    first = client.get("/api/listings/feed/")
+    second = client.get("/api/listings/feed/")
+    assert second.data == first.data
+    assert second["ETag"] == first["ETag"]
+    assert _counts() == (1, 1, 0)
+
+    not_modified = client.get("/api/listings/feed/", HTTP_IF_NONE_MATCH=first["ETag"])
+    assert not_modified.status_code == 304
+
+
+def test_new_listing_only_evicts_pages_in_its_scope(owner, tools, outdoors):
+    make_listing(owner, title="Drill", category=tools)
+    make_listing(owner, title="Tent", category=outdoors)
+    client = APIClient()
+    tools_path = f"/api/listings/feed/?category={tools.slug}"
+    outdoors_path = f"/api/listings/feed/?category={outdoors.slug}"
+    _warm(client, tools_path, outdoors_path, "/api/listings/feed/")
+
+    make_listing(owner, title="Saw", category=tools)
+
+    hits_before, _, evictions_before = _counts()
+    assert client.get(outdoors_path).data["count"] == 1
+    assert client.get(tools_path).data["count"] == 2
+    assert client.get("/api/listings/feed/").data["count"] == 3
+    hits, _, evictions = _counts()
+    assert hits - hits_before == 1
+    assert evictions - evictions_before == 2
+
+
+def test_photo_change_only_evicts_pages_showing_the_listing(owner, tools, outdoors):
+    drill = make_listing(owner, title="Drill", category=tools)
+    make_listing(owner, title="Tent", category=outdoors)
+    client = APIClient()
+    tools_path = f"/api/listings/feed/?category={tools.slug}"
+    outdoors_path = f"/api/listings/feed/?category={outdoors.slug}"
+    _warm(client, tools_path, outdoors_path)
+
+    ListingPhoto.objects.create(
+        listing=drill,
+        owner=owner,
+        key="uploads/listings/drill.jpg",
+        url="https://cdn.example.com/drill.jpg",
+        status=ListingPhoto.Status.ACTIVE,
+        av_status=ListingPhoto.AVStatus.CLEAN,
+    )
+
+    hits_before, _, _ = _counts()
+    outdoors_resp = client.get(outdoors_path)
+    tools_resp = client.get(tools_path)
+    assert _counts()[0] - hits_before == 1
+    assert outdoors_resp.status_code == 200
+    assert tools_resp.data["results"][0]["primary_photo_url"] == "https://cdn.example.com/drill.jpg"
+
+
+def test_text_edit_keeps_unfiltered_pages_without_the_listing(owner, tools, outdoors):
+    drill = make_listing(owner, title="Drill", category=tools)
+    make_listing(owner, title="Tent", category=outdoors)
+    client = APIClient()
+    outdoors_path = f"/api/listings/feed/?category={outdoors.slug}"
+    search_path = "/api/listings/feed/?q=hammer"
+    _warm(client, outdoors_path, search_path)
+
+    drill.title = "Hammer Drill"
+    drill.save()
+
+    hits_before, _, _ = _counts()
+    assert client.get(outdoors_path).status_code == 200
+    assert _counts()[0] - hits_before == 1
+    assert client.get(search_path).data["count"] == 1
+
+
+def test_invisible_listing_changes_do_not_evict_scope_pages(owner, tools):
+    make_listing(owner, title="Drill", category=tools)
+    hidden = make_listing(owner, title="Old Ladder", category=tools, is_active=False)
+    client = APIClient()
+    _warm(client, "/api/listings/feed/")
+
+    hidden.description = "Still hidden"
+    hidden.save()
+
+    hits_before, _, evictions_before = _counts()
+    assert client.get("/api/listings/feed/").data["count"] == 1
+    hits, _, evictions = _counts()
+    assert hits - hits_before == 1
+    assert evictions == evictions_before
+
+
+def test_soft_delete_evicts_scope_pages(owner, tools):
+    listing = make_listing(owner, title="Drill", category=tools)
+    client = APIClient()
+    _warm(client, f"/api/listings/feed/?category={tools.slug}")
+
+    listing.is_deleted = True
+    listing.save(update_fields=["is_deleted"])
+
+    assert client.get(f"/api/listings/feed/?category={tools.slug}").data["count"] == 0
@@ -0,0 +1,172 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from listings.models import Listing
+from promotions.models import PromotedSlot
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def owner():
+    return User.objects.create_user(
+        username="cursor-owner",
+        password="x",
+        can_list=True,
+        can_rent=True,
+    )
+
+
+def make_listings(owner, count):
+    now = timezone.now()
+    listings = []
+    for index in range(count):
+        listing = Listing.objects.create(
+            owner=owner,
+            title=f"Listing {index}",
+            daily_price_cad=Decimal("10.00"),
+            city="Edmonton",
+        )
+        # Two listings share each timestamp to exercise the id tie-breaker.
+        Listing.objects.filter(pk=listing.pk).update(created_at=now - timedelta(hours=index // 2))
+        listings.append(listing)
+    return listings
+
+
+def _collect(client, path):
+    slugs = []
+    url = path
+    pages = 0
+    while url:
+        resp = client.get(url)
+        assert resp.status_code == 200
+        assert "count" not in resp.data
+        slugs.extend(item["slug"] for item in resp.data["results"])
+        url = resp.data["next"]
+        pages += 1
+    return slugs, pages
+
+
+def test_cursor_feed_walks_every_listing_once_in_order(owner):
+    make_listings(owner, 7)
+    client = APIClient()
+
+    slugs, pages = _collect(client, "/api/listings/feed/?cursor=&page_size=3")
+
+    expected = [listing.slug for listing in Listing.objects.order_by("-created_at", "-id")]
+    assert slugs == expected
+    assert pages == 3
+
+
+def test_cursor_feed_puts_promoted_first_and_skips_count(owner):
+    listings = make_listings(owner, 4)
+    promoted = listings[-1]
+    now = timezone.now()
+    PromotedSlot.objects.create(
+        listing=promoted,
+        owner=owner,
+        price_per_day_cents=500,
+        total_price_cents=500,
+        starts_at=now - timedelta(hours=1),
+        ends_at=now + timedelta(days=1),
+        active=True,
+    )
+    client = APIClient()
+
+    with CaptureQueriesContext(connection) as ctx:
+        first = client.get("/api/listings/feed/?cursor=&page_size=2")
+    sql = [query["sql"].upper() for query in ctx.captured_queries]
+    assert not any("COUNT(" in query for query in sql)
+    # Promotions are fetched by id, so the keyset query orders by plain columns only.
+    assert not any("CASE" in query for query in sql)
+    assert first.data["results"][0]["slug"] == promoted.slug
+    assert first.data["results"][0]["is_promoted"] is True
+    assert len(first.data["results"]) == 3
+    assert first.data["has_next"] is True
+
+    slugs, _ = _collect(client, first.data["next"])
+    all_slugs = [item["slug"] for item in first.data["results"]] + slugs
+    assert len(all_slugs) == len(set(all_slugs)) == 4
+
+
+def test_cursor_feed_keeps_promotions_beyond_the_first_page(owner):
+    listings = make_listings(owner, 6)
+    now = timezone.now()
+    promoted = {listing.slug for listing in listings[1:6:2]}
+    for listing in listings[1:6:2]:
+        PromotedSlot.objects.create(
+            listing=listing,
+            owner=owner,
+            price_per_day_cents=500,
+            total_price_cents=500,
+            starts_at=now - timedelta(hours=1),
+            ends_at=now + timedelta(days=1),
+            active=True,
+        )
+    client = APIClient()
+
+    items = []
+    url = "/api/listings/feed/?cursor=&page_size=2"
+    while url:
+        resp = client.get(url)
+        items.extend(resp.data["results"])
+        url = resp.data["next"]
+
+    slugs = [item["slug"] for item in items]
+    assert sorted(slugs) == sorted(listing.slug for listing in listings)
+    assert len(set(slugs)) == len(slugs)
+    # Two promotions are pinned above page one; the third shows up in keyset order.
+    assert {item["slug"] for item in items[:2]} <= promoted
+    assert {item["slug"] for item in items if item["is_promoted"]} == promoted
+
+
+def test_cursor_is_stable_when_new_listings_arrive(owner):
+    make_listings(owner, 4)
+    client = APIClient()
+    first = client.get("/api/listings/feed/?cursor=&page_size=2")
+    seen = [item["slug"] for item in first.data["results"]]
+
+    Listing.objects.create(owner=owner, title="Brand New", daily_price_cad=Decimal("5.00"))
+
+    second = client.get(first.data["next"])
+    later = [item["slug"] for item in second.data["results"]]
+    assert not set(seen) & set(later)
+    assert second.data["has_next"] is False
+
+
+def test_invalid_cursor_returns_404(owner):
+    make_listings(owner, 1)
+    resp = APIClient().get("/api/listings/feed/?cursor=not-a-cursor")
+    assert resp.status_code == 404
+
+
+def test_cursor_feed_rejects_ranked_and_radius_searches(owner):
+    make_listings(owner, 1)
+    client = APIClient()
+    assert client.get("/api/listings/feed/?cursor=&q=listing").status_code == 400
+    assert client.get("/api/listings/feed/?cursor=&lat=53.5&lng=-113.5").status_code == 400
+
+
+def test_page_number_mode_still_available(owner):
+    make_listings(owner, 3)
+    resp = APIClient().get("/api/listings/feed/?page=1&page_size=2")
+    assert resp.status_code == 200
+    assert resp.data["count"] == 3
+    assert resp.data["has_next"] is True
@@ -0,0 +1,152 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from listings.geo import decode_geohash_bounds, encode_geohash, neighbor_cells, precision_for_radius
+from listings.models import Listing
+from listings.tasks import geocode_listing
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+EDMONTON = (53.5461, -113.4938)
+ST_ALBERT = (53.6305, -113.6256)  # ~13 km from downtown Edmonton
+CALGARY = (51.0447, -114.0719)  # ~280 km away
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def owner():
+    return User.objects.create_user(
+        username="geo-owner",
+        password="x",
+        can_list=True,
+        can_rent=True,
+    )
+
+
+def make_listing(owner, coords=None, **overrides):
+    data = {
+        "owner": owner,
+        "title": "Sample Listing",
+        "daily_price_cad": Decimal("25.00"),
+        "city": "Edmonton",
+    }
+    if coords:
+        data["latitude"], data["longitude"] = coords
+    data.update(overrides)
+    return Listing.objects.create(**data)
+
+
+def test_geohash_round_trip_and_neighbors():
+    geohash = encode_geohash(*EDMONTON)
+    assert len(geohash) == 9
+    min_lat, max_lat, min_lng, max_lng = decode_geohash_bounds(geohash)
+    assert min_lat <= EDMONTON[0] <= max_lat
+    assert min_lng <= EDMONTON[1] <= max_lng
+
+    precision = precision_for_radius(EDMONTON[0], 25)
+    cells = neighbor_cells(*EDMONTON, precision)
+    assert len(cells) == 9
+    assert encode_geohash(*EDMONTON, precision) in cells
+
+
+def test_listing_save_stores_geohash(owner):
+    listing = make_listing(owner, coords=EDMONTON)
+    assert listing.geohash == encode_geohash(*EDMONTON)
+
+    listing.latitude, listing.longitude = CALGARY
+    listing.save(update_fields=["latitude", "longitude"])
+    listing.refresh_from_db()
+    assert listing.geohash == encode_geohash(*CALGARY)
+
+
+def test_feed_radius_search_sorts_by_distance(owner):
+    near = make_listing(owner, coords=EDMONTON, title="Downtown Drill")
+    suburb = make_listing(owner, coords=ST_ALBERT, title="Suburb Saw", city="St. Albert")
+    make_listing(owner, coords=CALGARY, title="Far Away Tent", city="Calgary")
+    make_listing(owner, title="No Coordinates")
+
+    client = APIClient()
+    resp = client.get(f"/api/listings/feed/?lat={EDMONTON[0]}&lng={EDMONTON[1]}&radius_km=30")
+    assert resp.status_code == 200
+    results = resp.data["results"]
+    assert [item["slug"] for item in results] == [near.slug, suburb.slug]
+    assert results[0]["distance_km"] == 1
+    assert results[1]["distance_km"] == pytest.approx(13, abs=1.5)
+
+    narrow = client.get(f"/api/listings/?lat={EDMONTON[0]}&lng={EDMONTON[1]}&radius_km=5")
+    assert [item["slug"] for item in narrow.data["results"]] == [near.slug]
+
+
+def test_feed_distance_is_coarsened_to_whole_kilometres(owner):
+    make_listing(owner, coords=EDMONTON)
+
+    client = APIClient()
+    distances = set()
+    # Probes ~0 m, ~300 m and ~700 m away all see the same bucket.
+    for lat_offset in (0, 0.0027, 0.0063):
+        resp = client.get(f"/api/listings/feed/?lat={EDMONTON[0] + lat_offset}&lng={EDMONTON[1]}")
+        distances.add(resp.data["results"][0]["distance_km"])
+    assert distances == {1}
+
+    resp = client.get(f"/api/listings/feed/?lat={EDMONTON[0] + 0.05}&lng={EDMONTON[1]}")
+    assert resp.data["results"][0]["distance_km"] == 6
+
+
+def test_radius_filter_combines_with_text_search(owner):
+    make_listing(owner, coords=EDMONTON, title="Cordless Drill")
+    tent = make_listing(owner, coords=ST_ALBERT, title="Camping Tent")
+
+    resp = APIClient().get(f"/api/listings/feed/?q=tent&lat={EDMONTON[0]}&lng={EDMONTON[1]}")
+    assert [item["slug"] for item in resp.data["results"]] == [tent.slug]
+
+
+def test_invalid_coordinates_are_ignored(owner):
+    make_listing(owner, coords=EDMONTON)
+    make_listing(owner)
+
+    resp = APIClient().get("/api/listings/feed/?lat=200&lng=-113")
+    assert resp.status_code == 200
+    assert resp.data["count"] == 2
+
+
+def test_geocode_task_persists_coordinates(owner, settings, monkeypatch):
+    settings.GOOGLE_MAPS_API_KEY = "test-key"
+    listing = make_listing(owner, postal_code="T5J 1N2")
+    monkeypatch.setattr(
+        "listings.api.lookup_geocode",
+        lambda postal_code, city="", region="": (
+            {"location": {"lat": EDMONTON[0], "lng": EDMONTON[1]}},
+            False,
+        ),
+    )
+
+    assert geocode_listing(listing.id) == "updated"
+    listing.refresh_from_db()
+    assert (listing.latitude, listing.longitude) == EDMONTON
+    assert listing.geohash == encode_geohash(*EDMONTON)
+
+
+def test_listing_detail_does_not_expose_coordinates(owner):
+    listing = make_listing(owner, coords=EDMONTON)
+    resp = APIClient().get(f"/api/listings/{listing.slug}/")
+    assert resp.status_code == 200
+    assert "latitude" not in resp.data
+    assert "longitude" not in resp.data
+
+
+def test_geocode_task_skips_without_api_key(owner, settings):
+    settings.GOOGLE_MAPS_API_KEY = None
+    listing = make_listing(owner)
+    assert geocode_listing(listing.id) == "skipped"
@@ -226,12 +226,11 @@ def test_complete_rejects_large_dimensions(owner, listing, settings):
 def test_owner_can_complete_upload(monkeypatch, owner, listing):
     client = _auth_client(owner)
 
-    delay_calls = {}
-
-    def fake_delay(**kwargs):
-        delay_calls["call"] = kwargs
-
-    monkeypatch.setattr("listings.api.scan_and_finalize_photo.delay", fake_delay)
+    queued = []
+    monkeypatch.setattr(
+        "listings.api.queue_listing_photo_scan",
+        lambda listing_id, **kwargs: queued.append((listing_id, kwargs)),
+    )
 
     payload = {
         "key": "uploads/listings/1/1/fake-key-drill.jpg",
@@ -262,25 +261,21 @@ def test_owner_can_complete_upload(monkeypatch, owner, listing):
     assert photo.height == payload["height"]
     assert photo.etag == "etag-1234"
 
-    queued = delay_calls["call"]
-    assert queued["key"] == payload["key"]
-    assert queued["listing_id"] == listing.id
-    assert queued["owner_id"] == owner.id
-    assert queued["meta"]["filename"] == payload["filename"]
-    assert queued["meta"]["size"] == payload["size"]
-    assert queued["meta"]["width"] == payload["width"]
-    assert queued["meta"]["height"] == payload["height"]
-    assert queued["meta"]["original_size"] == payload["original_size"]
-    assert queued["meta"]["compressed_size"] == payload["compressed_size"]
+    assert queued == [
+        (
+            listing.id,
+            {"key": payload["key"], "original_size": 3000000, "compressed_size": 2048},
+        )
+    ]
 
 
 def test_non_owner_cannot_complete(monkeypatch, listing, other_user):
     client = _auth_client(other_user)
 
-    def _should_not_run(**kwargs):  # pragma: no cover - guard
+    def _should_not_run(listing_id):  # pragma: no cover - guard
         pytest.fail("scan task should not be queued for non-owners.")
 
-    monkeypatch.setattr("listings.api.scan_and_finalize_photo.delay", _should_not_run)
+    monkeypatch.setattr("listings.api.queue_listing_photo_scan", _should_not_run)
 
     resp = client.post(
         f"/api/listings/{listing.id}/photos/complete",
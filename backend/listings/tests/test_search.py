@@ -0,0 +1,99 @@
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from listings.models import Category, Listing, ListingSearchDocument
+from listings.search import rebuild_listing_search_documents, tokenize_query
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture
+def owner():
+    return User.objects.create_user(
+        username="search-owner",
+        password="x",
+        can_list=True,
+        can_rent=True,
+    )
+
+
+def make_listing(owner, **overrides):
+    data = {
+        "owner": owner,
+        "title": "Sample Listing",
+        "description": "Sample description",
+        "daily_price_cad": Decimal("25.00"),
+        "city": "Edmonton",
+        "is_active": True,
+        "is_available": True,
+    }
+    data.update(overrides)
+    return Listing.objects.create(**data)
+
+
+def test_tokenize_query_lowercases_and_dedupes():
+    assert tokenize_query("  Drill DRILL, bits & (saw)") == ["drill", "bits", "saw"]
+    assert tokenize_query("") == []
+    assert tokenize_query(None) == []
+
+
+def test_search_document_tracks_listing_edits(owner):
+    tools = Category.objects.create(name="Power Tools")
+    listing = make_listing(owner, title="Cordless Drill", category=tools)
+
+    doc = ListingSearchDocument.objects.get(listing=listing)
+    assert doc.category_name == "Power Tools"
+    assert "cordless drill" in doc.document
+
+    listing.title = "Impact Driver"
+    listing.save()
+    doc.refresh_from_db()
+    assert doc.title == "Impact Driver"
+    assert "drill" not in doc.document
+
+
+def test_category_rename_refreshes_search_documents(owner):
+    category = Category.objects.create(name="Camping")
+    listing = make_listing(owner, title="Four Person Tent", category=category)
+
+    category.name = "Outdoor Gear"
+    category.save()
+
+    doc = ListingSearchDocument.objects.get(listing=listing)
+    assert doc.category_name == "Outdoor Gear"
+    assert "outdoor gear" in doc.document
+
+
+def test_feed_search_matches_prefix_category_and_all_terms(owner):
+    cache.clear()
+    tools = Category.objects.create(name="Power Tools")
+    drill = make_listing(owner, title="Cordless Drill", category=tools, city="Calgary")
+    saw = make_listing(owner, title="Circular Saw", description="Fresh blade", category=tools)
+    make_listing(owner, title="Kayak", description="Two paddles included")
+
+    client = APIClient()
+
+    def slugs(query):
+        resp = client.get(f"/api/listings/feed/?{query}")
+        assert resp.status_code == 200
+        return {item["slug"] for item in resp.data["results"]}
+
+    assert slugs("q=dri") == {drill.slug}
+    assert slugs("q=power") == {drill.slug, saw.slug}
+    assert slugs("q=tools blade") == {saw.slug}
+    assert slugs("q=calg") == {drill.slug}
+    assert slugs("q=nothing-matches-this") == set()
+
+
+def test_rebuild_restores_missing_documents(owner):
+    listing = make_listing(owner, title="Pressure Washer")
+    ListingSearchDocument.objects.all().delete()
+
+    assert rebuild_listing_search_documents(batch_size=1) == 1
+    assert ListingSearchDocument.objects.get(listing=listing).title == "Pressure Washer"
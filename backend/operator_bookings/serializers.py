@@ -14,6 +14,7 @@ from payments.stripe_api import (
     StripeTransientError,
     get_payment_intent_fee,
 )
+from payments.stripe_fees import get_stripe_fees, record_stripe_fee
 
 
 def _display_name(user) -> str:
@@ -146,17 +147,20 @@ class OperatorBookingDetailSerializer(OperatorBookingListSerializer):
         intent_id = getattr(instance, "charge_payment_intent_id", "") or ""
         if not intent_id:
             return data
-        try:
-            fee_value = get_payment_intent_fee(intent_id)
-        except (StripeConfigurationError, StripePaymentError, StripeTransientError) as exc:
-            logger.warning(
-                "operator_booking_detail: stripe fee lookup failed for booking %s: %s",
-                getattr(instance, "id", "unknown"),
-                str(exc) or "stripe error",
-            )
-            return data
+        fee_value = get_stripe_fees([intent_id]).get(intent_id)
         if fee_value is None:
-            return data
+            try:
+                fee_value = get_payment_intent_fee(intent_id)
+            except (StripeConfigurationError, StripePaymentError, StripeTransientError) as exc:
+                logger.warning(
+                    "operator_booking_detail: stripe fee lookup failed for booking %s: %s",
+                    getattr(instance, "id", "unknown"),
+                    str(exc) or "stripe error",
+                )
+                return data
+            if fee_value is None:
+                return data
+            record_stripe_fee(intent_id, fee_value)
         totals = {**totals, "stripe_fee": f"{fee_value.quantize(Decimal('0.01'))}"}
         data["totals"] = totals
         return data
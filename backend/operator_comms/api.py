@@ -1,4 +1,4 @@
-from django.db.models import Max, Prefetch
+from django.db.models import Prefetch
 from rest_framework import generics
 
 from chat.models import Conversation, Message
@@ -22,17 +22,13 @@ class OperatorConversationListView(generics.ListAPIView):
     http_method_names = ["get"]
 
     def get_queryset(self):
-        return (
-            Conversation.objects.select_related(
-                "booking",
-                "booking__listing",
-                "listing",
-                "owner",
-                "renter",
-            )
-            .annotate(last_message_at=Max("messages__created_at"))
-            .order_by("-last_message_at", "-created_at")
-        )
+        return Conversation.objects.select_related(
+            "booking",
+            "booking__listing",
+            "listing",
+            "owner",
+            "renter",
+        ).order_by("-last_message_at", "-created_at")
 
 
 class OperatorConversationDetailView(generics.RetrieveAPIView):
@@ -43,16 +39,12 @@ class OperatorConversationDetailView(generics.RetrieveAPIView):
 
     def get_queryset(self):
         messages_qs = Message.objects.select_related("sender").order_by("created_at")
-        return (
-            Conversation.objects.select_related(
-                "booking",
-                "booking__listing",
-                "listing",
-                "owner",
-                "renter",
-            )
-            .annotate(last_message_at=Max("messages__created_at"))
-            .prefetch_related(
-                Prefetch("messages", queryset=messages_qs, to_attr="prefetched_messages")
-            )
+        return Conversation.objects.select_related(
+            "booking",
+            "booking__listing",
+            "listing",
+            "owner",
+            "renter",
+        ).prefetch_related(
+            Prefetch("messages", queryset=messages_qs, to_attr="prefetched_messages")
         )
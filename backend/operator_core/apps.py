@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class OperatorCoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "operator_core"
+
+    def ready(self):
+        # Import signal handlers
+        from . import signals  # noqa: F401
@@ -2,9 +2,8 @@ from __future__ import annotations
 
 from datetime import timedelta
 from decimal import Decimal
-from typing import Iterable
 
-from django.db.models import Count
+from django.db.models import Case, Count, IntegerField, Sum, Value, When, Window
 from django.utils import timezone
 from rest_framework import serializers
 from rest_framework.response import Response
@@ -12,9 +11,16 @@ from rest_framework.views import APIView
 
 from bookings.models import Booking
 from disputes.models import DisputeCase
-from listings.models import Listing
 from operator_core.permissions import HasOperatorRole, IsOperator
-from users.models import User
+from operator_core.rollups import (
+    BOOKING_STATUS_METRIC_PREFIX,
+    METRIC_BOOKINGS_GMV,
+    METRIC_NEW_DISPUTES,
+    METRIC_NEW_LISTINGS,
+    METRIC_NEW_USERS,
+    day_bucket,
+    hourly_window_totals,
+)
 
 
 class OperatorDashboardSerializer(serializers.Serializer):
@@ -57,36 +63,32 @@ def _total_charge_label(booking: Booking) -> str:
     return str(raw)
 
 
-def _gmv_from_totals_dict(totals: dict | None) -> Decimal:
-    """
-    Best-effort GMV extraction that tolerates missing/partial totals.
-    """
-    if not totals or not isinstance(totals, dict):
-        return Decimal("0")
-
-    def _to_decimal(value) -> Decimal:
-        try:
-            return Decimal(str(value))
-        except Exception:
-            return Decimal("0")
-
-    if "total_charge" in totals:
-        total_charge = _to_decimal(totals.get("total_charge"))
-        deposit = _to_decimal(totals.get("damage_deposit"))
-        return max(total_charge - deposit, Decimal("0"))
+def _window_summary(totals: dict[str, Decimal]) -> dict:
+    status_counts = {
+        metric[len(BOOKING_STATUS_METRIC_PREFIX) :]: int(value)
+        for metric, value in sorted(totals.items())
+        if metric.startswith(BOOKING_STATUS_METRIC_PREFIX) and value
+    }
+    return {
+        "new_users": int(totals.get(METRIC_NEW_USERS, 0)),
+        "new_listings": int(totals.get(METRIC_NEW_LISTINGS, 0)),
+        "new_disputes": int(totals.get(METRIC_NEW_DISPUTES, 0)),
+        "new_bookings_by_status": status_counts,
+        "gmv_approx": Decimal(totals.get(METRIC_BOOKINGS_GMV, 0)).quantize(Decimal("0.01")),
+    }
 
-    subtotal = _to_decimal(totals.get("rental_subtotal"))
-    renter_fee = _to_decimal(totals.get("renter_fee"))
-    if subtotal or renter_fee:
-        return subtotal + renter_fee
-    return Decimal("0")
 
+def _top_with_total(queryset, limit: int = 5, **window_totals) -> tuple[list, int]:
+    """
+    First ``limit`` rows plus the size of the whole filtered set, in one query.
 
-def _sum_gmv_for_bookings(bookings: Iterable[dict]) -> Decimal:
-    total = Decimal("0")
-    for totals in bookings:
-        total += _gmv_from_totals_dict(totals)
-    return total
+    ``window_totals`` are extra aggregates computed over the same set (read from the
+    first row); the total count is ``COUNT(*) OVER ()`` instead of a separate ``COUNT``.
+    """
+    annotations = {name: Window(expression=agg) for name, agg in window_totals.items()}
+    annotations["window_total"] = Window(expression=Count("id"))
+    rows = list(queryset.annotate(**annotations)[:limit])
+    return rows, (rows[0].window_total if rows else 0)
 
 
 class OperatorDashboardView(APIView):
@@ -95,35 +97,21 @@ class OperatorDashboardView(APIView):
     def get(self, request):
         now = timezone.now()
         today = timezone.localdate()
-        seven_days_ago = now - timedelta(days=7)
-
-        users_today = User.objects.filter(date_joined__date=today).count()
-        users_last_7 = User.objects.filter(date_joined__gte=seven_days_ago).count()
-
-        listings_today = Listing.objects.filter(created_at__date=today).count()
-        listings_last_7 = Listing.objects.filter(created_at__gte=seven_days_ago).count()
-
-        bookings_today = Booking.objects.filter(created_at__date=today)
-        bookings_last_7 = Booking.objects.filter(created_at__gte=seven_days_ago)
+        # Counts and GMV come from hourly rollups (operator_core.rollups); only the risk
+        # lists below query the source tables, and each returns its count alongside.
+        window_totals = hourly_window_totals(
+            {"today": day_bucket(now), "last_7d": now - timedelta(days=7)}
+        )
 
-        def _booking_stats(qs):
-            status_counts = dict(
-                qs.values("status").annotate(c=Count("id")).values_list("status", "c")
+        overdue_rows, overdue_bookings_count = _top_with_total(
+            Booking.objects.filter(
+                end_date__lt=today,
+                return_confirmed_at__isnull=True,
+                status__in=[Booking.Status.CONFIRMED, Booking.Status.PAID],
             )
-            gmv_qs = qs.filter(status__in=[Booking.Status.PAID, Booking.Status.COMPLETED])
-            totals_list = gmv_qs.values_list("totals", flat=True)
-            gmv = _sum_gmv_for_bookings(totals_list)
-            return status_counts, gmv
-
-        today_status_counts, today_gmv = _booking_stats(bookings_today)
-        last7_status_counts, last7_gmv = _booking_stats(bookings_last_7)
-
-        overdue_qs = Booking.objects.filter(
-            end_date__lt=today,
-            return_confirmed_at__isnull=True,
-            status__in=[Booking.Status.CONFIRMED, Booking.Status.PAID],
+            .select_related("listing", "renter")
+            .order_by("end_date")
         )
-        overdue_bookings_count = overdue_qs.count()
         disputed_bookings_count = Booking.objects.filter(is_disputed=True).count()
 
         open_statuses = [
@@ -132,22 +120,36 @@ class OperatorDashboardView(APIView):
             DisputeCase.Status.AWAITING_REBUTTAL,
             DisputeCase.Status.UNDER_REVIEW,
         ]
-        open_disputes_qs = DisputeCase.objects.filter(status__in=open_statuses)
-        open_disputes_count = open_disputes_qs.count()
-        rebuttals_due_soon_count = DisputeCase.objects.filter(
-            status=DisputeCase.Status.AWAITING_REBUTTAL,
-            rebuttal_due_at__lte=now + timedelta(hours=12),
-            rebuttal_due_at__gte=now,
-        ).count()
-
-        failed_payments_qs = Booking.objects.filter(
-            status=Booking.Status.CONFIRMED,
-            charge_payment_intent_id="",
+        dispute_rows, open_disputes_count = _top_with_total(
+            DisputeCase.objects.filter(status__in=open_statuses)
+            .select_related("booking")
+            .order_by("-created_at"),
+            rebuttals_due_soon=Sum(
+                Case(
+                    When(
+                        status=DisputeCase.Status.AWAITING_REBUTTAL,
+                        rebuttal_due_at__lte=now + timedelta(hours=12),
+                        rebuttal_due_at__gte=now,
+                        then=Value(1),
+                    ),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            ),
+        )
+        rebuttals_due_soon_count = dispute_rows[0].rebuttals_due_soon if dispute_rows else 0
+
+        failed_payment_rows, failed_payments_count = _top_with_total(
+            Booking.objects.filter(
+                status=Booking.Status.CONFIRMED,
+                charge_payment_intent_id="",
+            )
+            .select_related("renter")
+            .order_by("-created_at")
         )
-        failed_payments_count = failed_payments_qs.count()
 
         overdue_items = []
-        for booking in overdue_qs.select_related("listing", "renter").order_by("end_date")[:5]:
+        for booking in overdue_rows:
             end_date = booking.end_date
             overdue_days = (today - end_date).days if end_date else 0
             listing_title = getattr(booking.listing, "title", None) if booking.listing_id else None
@@ -164,7 +166,7 @@ class OperatorDashboardView(APIView):
             )
 
         disputed_items = []
-        for dispute in open_disputes_qs.select_related("booking").order_by("-created_at")[:5]:
+        for dispute in dispute_rows:
             filed_at = dispute.created_at
             disputed_items.append(
                 {
@@ -175,7 +177,7 @@ class OperatorDashboardView(APIView):
             )
 
         failed_payment_items = []
-        for booking in failed_payments_qs.select_related("renter").order_by("-created_at")[:5]:
+        for booking in failed_payment_rows:
             renter = booking.renter
             failed_payment_items.append(
                 {
@@ -188,18 +190,8 @@ class OperatorDashboardView(APIView):
             )
 
         data = {
-            "today": {
-                "new_users": users_today,
-                "new_listings": listings_today,
-                "new_bookings_by_status": today_status_counts,
-                "gmv_approx": today_gmv,
-            },
-            "last_7d": {
-                "new_users": users_last_7,
-                "new_listings": listings_last_7,
-                "new_bookings_by_status": last7_status_counts,
-                "gmv_approx": last7_gmv,
-            },
+            "today": _window_summary(window_totals["today"]),
+            "last_7d": _window_summary(window_totals["last_7d"]),
             "risk": {
                 "overdue_bookings_count": overdue_bookings_count,
                 "disputed_bookings_count": disputed_bookings_count,
@@ -10,8 +10,11 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from core.cache import endpoint_cache_stats
 from core.redis import get_redis_client
+from listings.cache import feed_cache_stats
 from operator_core.permissions import HasOperatorRole, IsOperator
+from payments.stripe_cache import stripe_object_cache_stats
 from storage import s3 as storage_s3
 
 logger = logging.getLogger(__name__)
@@ -222,8 +225,26 @@ class OperatorHealthView(APIView):
         checks["email"] = email_payload
         overall_ok = overall_ok and email_ok
 
+        # --- Cache metrics (informational, never affects overall status) ---
+        metrics: Dict[str, Any] = {}
+        try:
+            metrics["listing_feed_cache"] = feed_cache_stats()
+        except Exception as exc:
+            metrics["listing_feed_cache"] = {"error": _error_payload(exc)}
+        try:
+            metrics["endpoint_caches"] = endpoint_cache_stats()
+        except Exception as exc:
+            metrics["endpoint_caches"] = {"error": _error_payload(exc)}
+        try:
+            metrics["stripe_object_cache"] = stripe_object_cache_stats()
+        except Exception as exc:
+            metrics["stripe_object_cache"] = {"error": _error_payload(exc)}
+
         http_status = status.HTTP_200_OK if overall_ok else status.HTTP_503_SERVICE_UNAVAILABLE
-        return Response({"ok": overall_ok, "checks": checks}, status=http_status)
+        return Response(
+            {"ok": overall_ok, "checks": checks, "metrics": metrics},
+            status=http_status,
+        )
 
 
 class OperatorHealthTestEmailView(APIView):
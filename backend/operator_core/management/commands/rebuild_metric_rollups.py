@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from operator_core.rollups import ROLLUP_REBUILD_DAYS, rebuild_metric_rollups
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the operator dashboard's hourly/daily metric rollups from the source "
+        "tables (backfill after deploy, or repair drift)."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=ROLLUP_REBUILD_DAYS,
+            help="Rebuild this many local days, ending today.",
+        )
+        parser.add_argument(
+            "--since",
+            type=str,
+            default=None,
+            help="Rebuild from this date (YYYY-MM-DD) through today; overrides --days.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        now = timezone.now()
+        if options["since"]:
+            try:
+                since = datetime.strptime(options["since"], "%Y-%m-%d").date()
+            except ValueError as exc:
+                raise CommandError("--since must be YYYY-MM-DD.") from exc
+            start = timezone.make_aware(datetime.combine(since, time.min))
+        else:
+            if options["days"] <= 0:
+                raise CommandError("--days must be greater than 0.")
+            start = now - timedelta(days=options["days"] - 1)
+        if start > now:
+            raise CommandError("--since must not be in the future.")
+
+        rows = rebuild_metric_rollups(start, now)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt metric rollups from {timezone.localtime(start):%Y-%m-%d}: {rows} rows."
+            )
+        )
@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("operator_core", "0003_operatorjobrun"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MetricRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "granularity",
+                    models.CharField(choices=[("hour", "Hour"), ("day", "Day")], max_length=8),
+                ),
+                ("bucket_start", models.DateTimeField()),
+                ("metric", models.CharField(max_length=64)),
+                (
+                    "value",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=14),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("granularity", "bucket_start", "metric"),
+                        name="metric_rollup_bucket_uniq",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -87,3 +87,32 @@ class OperatorJobRun(models.Model):
 
     def __str__(self) -> str:
         return f"{self.job_name} ({self.status})"
+
+
+class MetricRollup(models.Model):
+    """
+    One metric's value for one hour (UTC) or day (local midnight) bucket.
+
+    Kept current by ``operator_core.signals`` and rebuilt nightly from the source tables
+    by ``operator_core.rebuild_metric_rollups``; see ``operator_core.rollups``.
+    """
+
+    class Granularity(models.TextChoices):
+        HOUR = "hour", "Hour"
+        DAY = "day", "Day"
+
+    granularity = models.CharField(max_length=8, choices=Granularity.choices)
+    bucket_start = models.DateTimeField()
+    metric = models.CharField(max_length=64)
+    value = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["granularity", "bucket_start", "metric"],
+                name="metric_rollup_bucket_uniq",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.metric} {self.granularity} {self.bucket_start:%Y-%m-%d %H:%M} = {self.value}"
@@ -0,0 +1,266 @@
+"""Hourly and daily metric rollups behind the operator dashboard.
+
+Each ``MetricRollup`` row holds one metric for one bucket: UTC hours, and days starting at
+local midnight. Metrics are attributed to the bucket the object was *created* in, matching
+what the dashboard has always shown (e.g. bookings created today, grouped by their current
+status):
+
+* ``users.new``, ``listings.new``, ``disputes.new`` – rows created in the bucket.
+* ``bookings.status.<status>`` – bookings created in the bucket, by current status.
+* ``bookings.gmv`` – ``GMV_EXPRESSION`` summed over those bookings that are paid/completed.
+
+``operator_core.signals`` applies deltas as rows are created, change status/money or are
+deleted, once the surrounding transaction commits, so reads never touch the source tables.
+Writes that bypass signals (``QuerySet.update()``, raw SQL) and deltas lost to a failed
+commit hook are corrected by ``rebuild_metric_rollups``, which the nightly
+``operator_core.rebuild_metric_rollups`` task runs over the dashboard's window.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from functools import partial
+from typing import Any, Mapping
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, DecimalField, F, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest, TruncDay, TruncHour
+from django.utils import timezone
+
+from bookings.models import Booking
+from disputes.models import DisputeCase
+from listings.models import Listing
+
+from .models import MetricRollup
+
+METRIC_NEW_USERS = "users.new"
+METRIC_NEW_LISTINGS = "listings.new"
+METRIC_NEW_DISPUTES = "disputes.new"
+METRIC_BOOKINGS_GMV = "bookings.gmv"
+BOOKING_STATUS_METRIC_PREFIX = "bookings.status."
+
+GMV_STATUSES = (Booking.Status.PAID, Booking.Status.COMPLETED)
+ROLLUP_REBUILD_DAYS = 8
+
+_MONEY = DecimalField(max_digits=14, decimal_places=2)
+_ZERO = Value(Decimal("0.00"), output_field=_MONEY)
+
+# Best-effort GMV that tolerates missing/partial totals: the charge net of the deposit,
+# or subtotal + renter fee for bookings that never stored a total charge.
+GMV_EXPRESSION = Case(
+    When(
+        total_charge__isnull=False,
+        then=Greatest(F("total_charge") - Coalesce("damage_deposit", _ZERO), _ZERO),
+    ),
+    default=Coalesce("rental_subtotal", _ZERO) + Coalesce("renter_fee_total", _ZERO),
+    output_field=_MONEY,
+)
+
+# Booking fields a rollup delta depends on; saves touching none of them are skipped.
+BOOKING_ROLLUP_FIELDS = frozenset(
+    {"status", "total_charge", "damage_deposit", "rental_subtotal", "renter_fee_total"}
+)
+
+
+def hour_bucket(value: datetime) -> datetime:
+    return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def day_bucket(value: datetime) -> datetime:
+    return timezone.localtime(value).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def booking_status_metric(status: str) -> str:
+    return f"{BOOKING_STATUS_METRIC_PREFIX}{status}"
+
+
+def booking_gmv(values: Mapping[str, Any]) -> Decimal:
+    """Python twin of ``GMV_EXPRESSION`` for one booking's money columns."""
+    total_charge = values.get("total_charge")
+    if total_charge is not None:
+        return max(Decimal(total_charge) - Decimal(values.get("damage_deposit") or 0), Decimal(0))
+    return Decimal(values.get("rental_subtotal") or 0) + Decimal(
+        values.get("renter_fee_total") or 0
+    )
+
+
+def booking_contribution(values: Mapping[str, Any]) -> dict[str, Decimal]:
+    """Metrics one booking adds to its creation bucket."""
+    status = values.get("status")
+    contribution = {booking_status_metric(status): Decimal(1)}
+    if status in GMV_STATUSES:
+        contribution[METRIC_BOOKINGS_GMV] = booking_gmv(values)
+    return contribution
+
+
+def booking_rollup_values(booking: Booking) -> dict[str, Any]:
+    return {field: getattr(booking, field) for field in BOOKING_ROLLUP_FIELDS}
+
+
+def diff_contributions(
+    before: Mapping[str, Decimal], after: Mapping[str, Decimal]
+) -> dict[str, Decimal]:
+    return {
+        metric: after.get(metric, Decimal(0)) - before.get(metric, Decimal(0))
+        for metric in {*before, *after}
+    }
+
+
+def _add(granularity: str, bucket_start: datetime, metric: str, delta: Decimal) -> None:
+    rows = MetricRollup.objects.filter(
+        granularity=granularity, bucket_start=bucket_start, metric=metric
+    )
+    if rows.update(value=F("value") + delta):
+        return
+    try:
+        with transaction.atomic():
+            MetricRollup.objects.create(
+                granularity=granularity, bucket_start=bucket_start, metric=metric, value=delta
+            )
+    except IntegrityError:
+        # Another writer created the bucket between our update and insert.
+        rows.update(value=F("value") + delta)
+
+
+def _apply_rows(rows: list[tuple[str, datetime, str, Decimal]]) -> None:
+    with transaction.atomic():
+        for granularity, bucket_start, metric, delta in rows:
+            _add(granularity, bucket_start, metric, delta)
+
+
+def apply_metric_deltas(created_at: datetime | None, deltas: Mapping[str, Decimal]) -> None:
+    """
+    Add ``deltas`` to the hour and day buckets containing ``created_at``.
+
+    The writes run once the caller's transaction commits, so the few hot rollup rows are
+    locked only for their own short transaction instead of for the caller's whole one,
+    and rolled-back changes are never counted. A failed write is logged and left for
+    ``rebuild_metric_rollups`` to repair.
+    """
+    deltas = {metric: delta for metric, delta in deltas.items() if delta}
+    if created_at is None or not deltas:
+        return
+    buckets = (
+        (MetricRollup.Granularity.HOUR, hour_bucket(created_at)),
+        (MetricRollup.Granularity.DAY, day_bucket(created_at)),
+    )
+    rows = [
+        (granularity, bucket_start, metric, delta)
+        for granularity, bucket_start in buckets
+        for metric, delta in sorted(deltas.items())
+    ]
+    transaction.on_commit(partial(_apply_rows, rows), robust=True)
+
+
+def _computed_rollups(start: datetime, end: datetime, granularity: str) -> dict[tuple, Decimal]:
+    if granularity == MetricRollup.Granularity.HOUR:
+
+        def trunc(field: str):
+            return TruncHour(field, tzinfo=dt_timezone.utc)
+
+    else:
+
+        def trunc(field: str):
+            return TruncDay(field, tzinfo=timezone.get_current_timezone())
+
+    counted_sources = (
+        (get_user_model().objects.all(), "date_joined", METRIC_NEW_USERS),
+        (Listing.objects.all(), "created_at", METRIC_NEW_LISTINGS),
+        (DisputeCase.objects.all(), "created_at", METRIC_NEW_DISPUTES),
+    )
+    values: dict[tuple, Decimal] = {}
+    for queryset, field, metric in counted_sources:
+        rows = (
+            queryset.filter(**{f"{field}__gte": start, f"{field}__lt": end})
+            .annotate(bucket=trunc(field))
+            .values("bucket")
+            .annotate(count=Count("id"))
+            .values_list("bucket", "count")
+        )
+        for bucket, count in rows:
+            values[(bucket, metric)] = Decimal(count)
+
+    bookings = (
+        Booking.objects.filter(created_at__gte=start, created_at__lt=end)
+        .annotate(bucket=trunc("created_at"))
+        .values("bucket", "status")
+        .annotate(
+            count=Count("id"),
+            gmv=Coalesce(
+                Sum(
+                    Case(
+                        When(status__in=GMV_STATUSES, then=GMV_EXPRESSION),
+                        default=_ZERO,
+                        output_field=_MONEY,
+                    )
+                ),
+                _ZERO,
+            ),
+        )
+        .values_list("bucket", "status", "count", "gmv")
+    )
+    for bucket, status, count, gmv in bookings:
+        values[(bucket, booking_status_metric(status))] = Decimal(count)
+        gmv_key = (bucket, METRIC_BOOKINGS_GMV)
+        values[gmv_key] = values.get(gmv_key, Decimal(0)) + Decimal(gmv or 0)
+    return {key: value for key, value in values.items() if value}
+
+
+def rebuild_metric_rollups(start: datetime, end: datetime) -> int:
+    """
+    Recompute every bucket between ``start`` and ``end`` from the source tables.
+
+    The range is widened to whole local days (and whole hours), so every bucket written
+    is complete. Returns the number of rows written.
+    """
+    day_start = day_bucket(start)
+    day_end = day_bucket(end) + timedelta(days=1)
+    ranges = (
+        (MetricRollup.Granularity.HOUR, hour_bucket(day_start), hour_bucket(day_end)),
+        (MetricRollup.Granularity.DAY, day_start, day_end),
+    )
+    written = 0
+    with transaction.atomic():
+        for granularity, range_start, range_end in ranges:
+            values = _computed_rollups(range_start, range_end, granularity)
+            MetricRollup.objects.filter(
+                granularity=granularity,
+                bucket_start__gte=range_start,
+                bucket_start__lt=range_end,
+            ).delete()
+            MetricRollup.objects.bulk_create(
+                [
+                    MetricRollup(
+                        granularity=granularity, bucket_start=bucket, metric=metric, value=value
+                    )
+                    for (bucket, metric), value in values.items()
+                ],
+                batch_size=1000,
+            )
+            written += len(values)
+    return written
+
+
+def hourly_window_totals(windows: Mapping[str, datetime]) -> dict[str, dict[str, Decimal]]:
+    """
+    Sum hourly buckets per window in one query.
+
+    ``windows`` maps a name to the window's start; each window runs to now. Buckets are
+    included when they start at or after the hour containing the window start.
+    """
+    starts = {name: hour_bucket(start) for name, start in windows.items()}
+    totals: dict[str, dict[str, Decimal]] = {name: {} for name in windows}
+    if not starts:
+        return totals
+    rows = MetricRollup.objects.filter(
+        granularity=MetricRollup.Granularity.HOUR,
+        bucket_start__gte=min(starts.values()),
+    ).values_list("bucket_start", "metric", "value")
+    for bucket_start, metric, value in rows:
+        for name, start in starts.items():
+            if bucket_start >= start:
+                totals[name][metric] = totals[name].get(metric, Decimal(0)) + value
+    return totals
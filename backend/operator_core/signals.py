@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bookings.models import Booking
+from bookings.signals import booking_snapshot, register_snapshot_fields
+from disputes.models import DisputeCase
+from listings.models import Listing
+
+from .rollups import (
+    BOOKING_ROLLUP_FIELDS,
+    METRIC_NEW_DISPUTES,
+    METRIC_NEW_LISTINGS,
+    METRIC_NEW_USERS,
+    apply_metric_deltas,
+    booking_contribution,
+    booking_rollup_values,
+    diff_contributions,
+)
+
+User = get_user_model()
+
+# Models counted into the bucket they were created in: sender -> (timestamp field, metric).
+_COUNTED_MODELS = {
+    User: ("date_joined", METRIC_NEW_USERS),
+    Listing: ("created_at", METRIC_NEW_LISTINGS),
+    DisputeCase: ("created_at", METRIC_NEW_DISPUTES),
+}
+
+
+@receiver(post_save, sender=User, dispatch_uid="metric_rollup_user_created")
+@receiver(post_save, sender=Listing, dispatch_uid="metric_rollup_listing_created")
+@receiver(post_save, sender=DisputeCase, dispatch_uid="metric_rollup_dispute_created")
+def _count_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        field, metric = _COUNTED_MODELS[sender]
+        apply_metric_deltas(getattr(instance, field), {metric: Decimal(1)})
+
+
+@receiver(post_delete, sender=User, dispatch_uid="metric_rollup_user_deleted")
+@receiver(post_delete, sender=Listing, dispatch_uid="metric_rollup_listing_deleted")
+@receiver(post_delete, sender=DisputeCase, dispatch_uid="metric_rollup_dispute_deleted")
+def _count_deleted(sender, instance, **kwargs):
+    field, metric = _COUNTED_MODELS[sender]
+    apply_metric_deltas(getattr(instance, field), {metric: Decimal(-1)})
+
+
+# Rollup fields ride along in the bookings app's single pre_save snapshot.
+register_snapshot_fields(BOOKING_ROLLUP_FIELDS)
+
+
+@receiver(post_save, sender=Booking, dispatch_uid="metric_rollup_booking_save")
+def _update_booking_rollups(sender, instance: Booking, created, raw=False, **kwargs):
+    if raw:
+        return
+    after = booking_contribution(booking_rollup_values(instance))
+    if created:
+        apply_metric_deltas(instance.created_at, after)
+        return
+    update_fields = kwargs.get("update_fields")
+    before = booking_snapshot(instance)
+    if before is None or (update_fields and not BOOKING_ROLLUP_FIELDS.intersection(update_fields)):
+        return
+    delta = diff_contributions(booking_contribution(before), after)
+    apply_metric_deltas(instance.created_at, delta)
+
+
+@receiver(post_delete, sender=Booking, dispatch_uid="metric_rollup_booking_delete")
+def _remove_booking_from_rollups(sender, instance: Booking, **kwargs):
+    contribution = booking_contribution(booking_rollup_values(instance))
+    apply_metric_deltas(
+        instance.created_at, {metric: -value for metric, value in contribution.items()}
+    )
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import logging
 import time
+from datetime import timedelta
 
 from celery import shared_task
+from django.utils import timezone
 
 from core.redis import get_redis_client
 
@@ -29,3 +31,14 @@ def operator_health_ping() -> float | None:
     except Exception:
         logger.warning("operator_health_ping: failed to write heartbeat", exc_info=True)
         return None
+
+
+@shared_task(name="operator_core.rebuild_metric_rollups")
+def rebuild_metric_rollups(days: int | None = None) -> dict:
+    """Recompute dashboard rollups for the last ``days`` local days from source tables."""
+    from operator_core.rollups import ROLLUP_REBUILD_DAYS
+    from operator_core.rollups import rebuild_metric_rollups as _rebuild
+
+    days = days or ROLLUP_REBUILD_DAYS
+    now = timezone.now()
+    return {"days": days, "rows": _rebuild(now - timedelta(days=days - 1), now)}
@@ -0,0 +1,162 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from bookings.models import Booking
+from disputes.models import DisputeCase
+from listings.models import Listing
+from operator_core.models import MetricRollup
+from operator_core.rollups import (
+    day_bucket,
+    hour_bucket,
+    hourly_window_totals,
+    rebuild_metric_rollups,
+)
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+def _rollups(granularity=MetricRollup.Granularity.HOUR):
+    return {
+        (row.bucket_start, row.metric): row.value
+        for row in MetricRollup.objects.filter(granularity=granularity)
+        if row.value
+    }
+
+
+@pytest.fixture
+def listing(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        owner = User.objects.create_user(username="rollup-owner", password="x")
+        return Listing.objects.create(
+            owner=owner,
+            title="Ladder",
+            description="Tall ladder",
+            daily_price_cad=Decimal("20.00"),
+            city="Edmonton",
+        )
+
+
+def _booking(listing, **fields):
+    renter = User.objects.create_user(username=f"rollup-renter-{Booking.objects.count()}")
+    return Booking.objects.create(
+        listing=listing,
+        owner=listing.owner,
+        renter=renter,
+        start_date=date(2030, 1, 1),
+        end_date=date(2030, 1, 3),
+        **fields,
+    )
+
+
+def test_signals_track_booking_status_and_gmv(listing, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        booking = _booking(
+            listing, status=Booking.Status.REQUESTED, totals={"total_charge": "150.00"}
+        )
+    hour = hour_bucket(booking.created_at)
+    assert _rollups()[(hour, "bookings.status.requested")] == 1
+    assert (hour, "bookings.gmv") not in _rollups()
+
+    booking.status = Booking.Status.PAID
+    booking.totals = {"total_charge": "150.00", "damage_deposit": "100.00"}
+    with django_capture_on_commit_callbacks(execute=True):
+        booking.save()
+    hourly = _rollups()
+    assert (hour, "bookings.status.requested") not in hourly
+    assert hourly[(hour, "bookings.status.paid")] == 1
+    assert hourly[(hour, "bookings.gmv")] == Decimal("50.00")
+    daily = _rollups(MetricRollup.Granularity.DAY)
+    assert daily[(day_bucket(booking.created_at), "bookings.gmv")] == Decimal("50.00")
+
+    # Saves that touch no rollup field neither snapshot nor write.
+    booking.deposit_attempt_count = 1
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        booking.save(update_fields=["deposit_attempt_count"])
+    assert callbacks == []
+    assert _rollups() == hourly
+
+    with django_capture_on_commit_callbacks(execute=True):
+        booking.delete()
+    remaining = _rollups()
+    assert (hour, "bookings.status.paid") not in remaining
+    assert (hour, "bookings.gmv") not in remaining
+
+
+def test_deltas_wait_for_commit_and_skip_rollbacks(listing, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        booking = _booking(listing, status=Booking.Status.REQUESTED)
+    hour = hour_bucket(booking.created_at)
+    assert (hour, "bookings.status.requested") not in _rollups()
+
+    for callback in callbacks:
+        callback()
+    assert _rollups()[(hour, "bookings.status.requested")] == 1
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                booking.status = Booking.Status.CANCELED
+                booking.save(update_fields=["status"])
+                raise RuntimeError("rolled back")
+    assert callbacks == []
+    assert _rollups()[(hour, "bookings.status.requested")] == 1
+
+
+def test_rebuild_matches_signals_and_repairs_drift(listing, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        booking = _booking(listing, status=Booking.Status.PAID, totals={"total_charge": "80.00"})
+        _booking(listing, status=Booking.Status.COMPLETED, totals={"rental_subtotal": "40.00"})
+        DisputeCase.objects.create(
+            booking=booking,
+            opened_by=booking.renter,
+            opened_by_role=DisputeCase.OpenedByRole.RENTER,
+            category=DisputeCase.Category.DAMAGE,
+            description="Scratched",
+        )
+    incremental = (_rollups(), _rollups(MetricRollup.Granularity.DAY))
+
+    now = timezone.now()
+    rebuild_metric_rollups(now, now)
+    assert (_rollups(), _rollups(MetricRollup.Granularity.DAY)) == incremental
+
+    # QuerySet.update() bypasses the signals; the rebuild picks the change up.
+    Booking.objects.filter(pk=booking.pk).update(status=Booking.Status.CANCELED)
+    rebuild_metric_rollups(now, now)
+    hourly = _rollups()
+    hour = hour_bucket(booking.created_at)
+    assert hourly[(hour, "bookings.status.canceled")] == 1
+    assert hourly[(hour, "bookings.gmv")] == Decimal("40.00")
+    assert hourly[(hour, "disputes.new")] == 1
+
+
+def test_hourly_window_totals_respects_window_starts():
+    now = timezone.now()
+    current = hour_bucket(now)
+    MetricRollup.objects.bulk_create(
+        [
+            MetricRollup(granularity="hour", bucket_start=current, metric="users.new", value=2),
+            MetricRollup(
+                granularity="hour",
+                bucket_start=current - timedelta(days=3),
+                metric="users.new",
+                value=5,
+            ),
+            MetricRollup(
+                granularity="hour",
+                bucket_start=current - timedelta(days=9),
+                metric="users.new",
+                value=7,
+            ),
+            MetricRollup(granularity="day", bucket_start=current, metric="users.new", value=99),
+        ]
+    )
+
+    totals = hourly_window_totals({"recent": now, "week": now - timedelta(days=7)})
+    assert totals == {"recent": {"users.new": 2}, "week": {"users.new": 7}}
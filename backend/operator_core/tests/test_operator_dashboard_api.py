@@ -1,4 +1,6 @@
 import importlib
+from datetime import date
+from decimal import Decimal
 
 import pytest
 from django.contrib.auth import get_user_model
@@ -7,6 +9,8 @@ from django.urls import clear_url_caches
 from rest_framework.test import APIClient
 
 import renter.urls as renter_urls
+from bookings.models import Booking
+from listings.models import Listing
 
 pytestmark = pytest.mark.django_db
 
@@ -73,3 +77,39 @@ def test_operator_dashboard_returns_expected_keys(operator_user):
     assert "risk" in data
     assert "open_disputes_count" in data
     assert "rebuttals_due_soon_count" in data
+
+
+def test_operator_dashboard_gmv_sums_paid_bookings(
+    operator_user, django_capture_on_commit_callbacks
+):
+    owner = User.objects.create_user(username="gmv-owner", password="pass123")
+    renter = User.objects.create_user(username="gmv-renter", password="pass123")
+    listing = Listing.objects.create(
+        owner=owner,
+        title="Ladder",
+        description="Tall ladder",
+        daily_price_cad=Decimal("20.00"),
+        city="Edmonton",
+    )
+
+    def _booking(status, totals):
+        return Booking.objects.create(
+            listing=listing,
+            owner=owner,
+            renter=renter,
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 3),
+            status=status,
+            totals=totals,
+        )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _booking(Booking.Status.PAID, {"total_charge": "150.00", "damage_deposit": "100.00"})
+        _booking(Booking.Status.COMPLETED, {"rental_subtotal": "40.00", "renter_fee": "4.00"})
+        _booking(Booking.Status.REQUESTED, {"total_charge": "999.00"})
+
+    resp = _authed_client(operator_user).get("/api/operator/dashboard/")
+
+    assert resp.status_code == 200, resp.data
+    assert Decimal(resp.data["today"]["gmv_approx"]) == Decimal("94.00")
+    assert Decimal(resp.data["last_7d"]["gmv_approx"]) == Decimal("94.00")
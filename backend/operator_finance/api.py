@@ -1,13 +1,15 @@
-import csv
-import io
 import logging
 from datetime import datetime, time, timedelta
 from decimal import Decimal, InvalidOperation
+from itertools import chain
+from typing import Iterable, Iterator
 
-from django.db.models import Prefetch
-from django.http import HttpResponse
+from django.db.models import Exists, OuterRef, Prefetch
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.gzip import gzip_page
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics, status
 from rest_framework.response import Response
@@ -19,6 +21,7 @@ from operator_bookings.models import BookingEvent
 from operator_core.audit import audit
 from operator_core.models import OperatorAuditEvent
 from operator_core.permissions import HasOperatorRole, IsOperator
+from operator_finance.exports import csv_streaming_response, iter_keyset_chunks
 from operator_finance.filters import OperatorTransactionFilter
 from operator_finance.renderers import CSVRenderer
 from operator_finance.serializers import (
@@ -27,12 +30,8 @@ from operator_finance.serializers import (
     _format_money,
 )
 from payments.models import Transaction
-from payments.stripe_api import (
-    StripeConfigurationError,
-    StripePaymentError,
-    StripeTransientError,
-    get_payment_intent_fee,
-)
+from payments.stripe_api import StripePaymentError
+from payments.stripe_fees import get_stripe_fees
 
 logger = logging.getLogger(__name__)
 
@@ -79,15 +78,9 @@ def _safe_notify_booking_action(booking: Booking, action: str):
         pass
 
 
-def _csv_download(filename: str, headers: list[str], rows: list[dict]) -> HttpResponse:
-    buffer = io.StringIO()
-    writer = csv.DictWriter(buffer, fieldnames=headers)
-    writer.writeheader()
-    for row in rows:
-        writer.writerow(row)
-    response = HttpResponse(buffer.getvalue(), content_type="text/csv")
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
+def _csv_download(filename: str, headers: list[str], rows: Iterable[dict]) -> StreamingHttpResponse:
+    # Rows are consumed lazily while the response streams; see operator_finance.exports.
+    return csv_streaming_response(filename, headers, rows)
 
 
 def _parse_date_param(raw: str | None):
@@ -158,9 +151,8 @@ def _refund_window_bounds(booking: Booking) -> tuple[datetime | None, datetime |
 def _booking_gst_amount(booking: Booking | None) -> Decimal:
     if booking is None:
         return Decimal("0.00")
-    totals = booking.totals or {}
-    renter_gst = _safe_decimal(totals.get("renter_fee_gst")) or Decimal("0.00")
-    owner_gst = _safe_decimal(totals.get("owner_fee_gst")) or Decimal("0.00")
+    renter_gst = booking.renter_fee_gst or Decimal("0.00")
+    owner_gst = booking.owner_fee_gst or Decimal("0.00")
     return (renter_gst + owner_gst).quantize(Decimal("0.01"))
 
 
@@ -174,30 +166,15 @@ def _promotion_gst_amount(promotion_slot) -> Decimal:
     return (Decimal(gst_cents) / Decimal("100")).quantize(Decimal("0.01"))
 
 
-def _stripe_fee_for_intent_id(intent_id: str | None, cache: dict[str, Decimal | None]) -> Decimal:
-    intent_id = (intent_id or "").strip()
-    if not intent_id or not intent_id.startswith(("pi_", "ch_", "cs_")):
-        return Decimal("0.00")
-    if intent_id in cache:
-        return cache[intent_id] or Decimal("0.00")
-    try:
-        fee_value = get_payment_intent_fee(intent_id)
-    except (StripeConfigurationError, StripePaymentError, StripeTransientError) as exc:
-        logger.warning(
-            "platform_revenue_export: stripe fee lookup failed for intent %s: %s",
-            intent_id,
-            str(exc) or "stripe error",
-        )
-        fee_value = None
-    cache[intent_id] = fee_value
-    return fee_value or Decimal("0.00")
+def _stripe_fee_for_intent_id(intent_id: str | None, fees: dict[str, Decimal]) -> Decimal:
+    return fees.get((intent_id or "").strip()) or Decimal("0.00")
 
 
-def _stripe_fee_for_booking(booking: Booking | None, cache: dict[str, Decimal | None]) -> Decimal:
+def _stripe_fee_for_booking(booking: Booking | None, fees: dict[str, Decimal]) -> Decimal:
     if booking is None:
         return Decimal("0.00")
     intent_id = getattr(booking, "charge_payment_intent_id", "") or ""
-    return _stripe_fee_for_intent_id(intent_id, cache)
+    return _stripe_fee_for_intent_id(intent_id, fees)
 
 
 class OperatorTransactionListView(generics.ListAPIView):
@@ -486,6 +463,65 @@ class OperatorBookingDepositReleaseView(APIView):
         )
 
 
+def _platform_revenue_ledger_rows(txn_qs) -> Iterator[dict]:
+    for chunk in iter_keyset_chunks(txn_qs):
+        # Fees are persisted by payments.stripe_fees; the export never calls Stripe.
+        stripe_fees = get_stripe_fees(
+            [tx.stripe_id for tx in chunk]
+            + [getattr(tx.booking, "charge_payment_intent_id", "") for tx in chunk]
+        )
+        for tx in chunk:
+            booking = getattr(tx, "booking", None)
+            gross_income = tx.amount
+            if tx.kind == Transaction.Kind.PLATFORM_FEE:
+                stripe_fee = _stripe_fee_for_booking(booking, stripe_fees)
+                if stripe_fee == Decimal("0.00") and tx.stripe_id:
+                    stripe_fee = _stripe_fee_for_intent_id(tx.stripe_id, stripe_fees)
+            elif tx.kind == Transaction.Kind.PROMOTION_CHARGE:
+                stripe_fee = _stripe_fee_for_intent_id(tx.stripe_id, stripe_fees)
+            else:
+                stripe_fee = Decimal("0.00")
+            gst_amount = (
+                _booking_gst_amount(booking)
+                if booking is not None
+                else _promotion_gst_amount(getattr(tx, "promotion_slot", None))
+            )
+            net_income = gross_income - stripe_fee - gst_amount
+            yield {
+                "created_at": _format_datetime(tx.created_at),
+                "source": tx.kind,
+                "booking_id": getattr(tx.booking, "id", None),
+                "txn_id": tx.id,
+                "Gross income": _format_money(gross_income),
+                "Stripe Fee": _format_money(stripe_fee),
+                "GST": _format_money(gst_amount),
+                "Net income": _format_money(net_income),
+                "currency": (tx.currency or "").upper(),
+            }
+
+
+def _platform_revenue_approx_rows(booking_qs) -> Iterator[dict]:
+    for chunk in iter_keyset_chunks(booking_qs):
+        stripe_fees = get_stripe_fees(booking.charge_payment_intent_id for booking in chunk)
+        for booking in chunk:
+            amount_decimal = booking.platform_fee_total
+            stripe_fee = _stripe_fee_for_booking(booking, stripe_fees)
+            gst_amount = _booking_gst_amount(booking)
+            net_income = amount_decimal - stripe_fee - gst_amount
+            yield {
+                "created_at": _format_datetime(getattr(booking, "created_at", None)),
+                "source": "booking_totals_approx",
+                "booking_id": booking.id,
+                "txn_id": "",
+                "Gross income": _format_money(amount_decimal),
+                "Stripe Fee": _format_money(stripe_fee),
+                "GST": _format_money(gst_amount),
+                "Net income": _format_money(net_income),
+                "currency": "CAD",
+            }
+
+
+@method_decorator(gzip_page, name="dispatch")
 class OperatorPlatformRevenueExportView(APIView):
     permission_classes = [IsOperator, HasOperatorRole.with_roles(FINANCE_ROLES)]
     renderer_classes = [CSVRenderer]
@@ -507,8 +543,6 @@ class OperatorPlatformRevenueExportView(APIView):
             "Net income",
             "currency",
         ]
-        rows: list[dict] = []
-        stripe_fee_cache: dict[str, Decimal | None] = {}
 
         txn_filter = {
             "kind__in": [Transaction.Kind.PLATFORM_FEE, Transaction.Kind.PROMOTION_CHARGE]
@@ -517,90 +551,53 @@ class OperatorPlatformRevenueExportView(APIView):
             txn_filter["created_at__gte"] = start_dt
         if end_dt:
             txn_filter["created_at__lte"] = end_dt
-
-        ledger_txns = (
-            Transaction.objects.filter(**txn_filter)
-            .select_related("booking", "promotion_slot")
-            .order_by("created_at", "id")
+        ledger_txns = Transaction.objects.filter(**txn_filter).select_related(
+            "booking", "promotion_slot"
         )
-        for tx in ledger_txns:
-            booking = getattr(tx, "booking", None)
-            gross_income = tx.amount
-            if tx.kind == Transaction.Kind.PLATFORM_FEE:
-                stripe_fee = _stripe_fee_for_booking(booking, stripe_fee_cache)
-                if stripe_fee == Decimal("0.00") and tx.stripe_id:
-                    stripe_fee = _stripe_fee_for_intent_id(tx.stripe_id, stripe_fee_cache)
-            elif tx.kind == Transaction.Kind.PROMOTION_CHARGE:
-                stripe_fee = _stripe_fee_for_intent_id(tx.stripe_id, stripe_fee_cache)
-            else:
-                stripe_fee = Decimal("0.00")
-            gst_amount = (
-                _booking_gst_amount(booking)
-                if booking is not None
-                else _promotion_gst_amount(getattr(tx, "promotion_slot", None))
-            )
-            net_income = gross_income - stripe_fee - gst_amount
-            rows.append(
-                {
-                    "created_at": _format_datetime(tx.created_at),
-                    "source": tx.kind,
-                    "booking_id": getattr(tx.booking, "id", None),
-                    "txn_id": tx.id,
-                    "Gross income": _format_money(gross_income),
-                    "Stripe Fee": _format_money(stripe_fee),
-                    "GST": _format_money(gst_amount),
-                    "Net income": _format_money(net_income),
-                    "currency": (tx.currency or "").upper(),
-                }
-            )
 
         booking_filter = {"status__in": [Booking.Status.PAID, Booking.Status.COMPLETED]}
         if date_from:
             booking_filter["created_at__date__gte"] = date_from
         if date_to:
             booking_filter["created_at__date__lte"] = date_to
-
-        platform_fee_booking_ids = set(
-            Transaction.objects.filter(kind=Transaction.Kind.PLATFORM_FEE)
-            .exclude(booking_id=None)
-            .values_list("booking_id", flat=True)
+        platform_fee_logged = Transaction.objects.filter(
+            kind=Transaction.Kind.PLATFORM_FEE, booking_id=OuterRef("pk")
         )
-
         approx_bookings = (
             Booking.objects.filter(**booking_filter)
-            .exclude(id__in=platform_fee_booking_ids)
-            .only("id", "totals", "created_at", "charge_payment_intent_id")
-            .order_by("created_at", "id")
-        )
-        for booking in approx_bookings:
-            totals = booking.totals or {}
-            platform_fee_total = totals.get("platform_fee_total") or totals.get("platform_fee")
-            try:
-                amount_decimal = Decimal(str(platform_fee_total))
-            except (InvalidOperation, TypeError, ValueError):
-                continue
-            if amount_decimal is None or amount_decimal <= Decimal("0"):
-                continue
-            stripe_fee = _stripe_fee_for_booking(booking, stripe_fee_cache)
-            gst_amount = _booking_gst_amount(booking)
-            net_income = amount_decimal - stripe_fee - gst_amount
-            rows.append(
-                {
-                    "created_at": _format_datetime(getattr(booking, "created_at", None)),
-                    "source": "booking_totals_approx",
-                    "booking_id": booking.id,
-                    "txn_id": "",
-                    "Gross income": _format_money(amount_decimal),
-                    "Stripe Fee": _format_money(stripe_fee),
-                    "GST": _format_money(gst_amount),
-                    "Net income": _format_money(net_income),
-                    "currency": "CAD",
-                }
+            .filter(~Exists(platform_fee_logged), platform_fee_total__gt=0)
+            .only(
+                "id",
+                "created_at",
+                "charge_payment_intent_id",
+                "platform_fee_total",
+                "renter_fee_gst",
+                "owner_fee_gst",
             )
+        )
 
+        rows = chain(
+            _platform_revenue_ledger_rows(ledger_txns),
+            _platform_revenue_approx_rows(approx_bookings),
+        )
         return _csv_download("platform-revenue.csv", headers, rows)
 
 
+def _owner_ledger_rows(txn_qs) -> Iterator[dict]:
+    for chunk in iter_keyset_chunks(txn_qs):
+        for tx in chunk:
+            yield {
+                "created_at": _format_datetime(tx.created_at),
+                "txn_id": tx.id,
+                "kind": tx.kind,
+                "amount": _format_money(tx.amount),
+                "currency": (tx.currency or "").upper(),
+                "booking_id": tx.booking_id,
+                "stripe_id": tx.stripe_id or "",
+            }
+
+
+@method_decorator(gzip_page, name="dispatch")
 class OperatorOwnerLedgerExportView(APIView):
     permission_classes = [IsOperator, HasOperatorRole.with_roles(FINANCE_ROLES)]
     renderer_classes = [CSVRenderer]
@@ -620,24 +617,7 @@ class OperatorOwnerLedgerExportView(APIView):
         if end_dt:
             txn_filter["created_at__lte"] = end_dt
 
-        qs = (
-            Transaction.objects.filter(**txn_filter)
-            .select_related("booking")
-            .order_by("created_at", "id")
-        )
+        qs = Transaction.objects.filter(**txn_filter)
 
         headers = ["created_at", "txn_id", "kind", "amount", "currency", "booking_id", "stripe_id"]
-        rows = []
-        for tx in qs:
-            rows.append(
-                {
-                    "created_at": _format_datetime(tx.created_at),
-                    "txn_id": tx.id,
-                    "kind": tx.kind,
-                    "amount": _format_money(tx.amount),
-                    "currency": (tx.currency or "").upper(),
-                    "booking_id": getattr(tx.booking, "id", None),
-                    "stripe_id": tx.stripe_id or "",
-                }
-            )
-        return _csv_download("owner-ledger.csv", headers, rows)
+        return _csv_download("owner-ledger.csv", headers, _owner_ledger_rows(qs))
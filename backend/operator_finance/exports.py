@@ -0,0 +1,62 @@
+"""Streaming CSV helpers for the operator finance exports.
+
+Rows are read in keyset-paginated chunks ordered by ``(created_at, id)`` and written
+out as they are produced, so an export's memory is bounded by the chunk size rather
+than the date range. Keyset pages are used instead of ``QuerySet.iterator()`` because
+server-side cursors are disabled for pgbouncer (``DISABLE_SERVER_SIDE_CURSORS``), which
+would make ``iterator()`` buffer the whole result set on the client.
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+from typing import Iterable, Iterator
+
+from django.db.models import Q, QuerySet
+from django.http import StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 1000
+CSV_FLUSH_BYTES = 64 * 1024
+
+
+def iter_keyset_chunks(queryset: QuerySet, *, chunk_size: int | None = None) -> Iterator[list]:
+    """Yield lists of at most ``chunk_size`` rows ordered by ``(created_at, id)``."""
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    ordered = queryset.order_by("created_at", "id")
+    cursor = None
+    while True:
+        page = ordered
+        if cursor is not None:
+            created_at, pk = cursor
+            page = page.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+        rows = list(page[:chunk_size])
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        cursor = (rows[-1].created_at, rows[-1].id)
+
+
+def iter_csv(headers: list[str], rows: Iterable[dict]) -> Iterator[bytes]:
+    """Encode ``rows`` as CSV, yielding roughly ``CSV_FLUSH_BYTES`` per chunk."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=headers)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= CSV_FLUSH_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def csv_streaming_response(
+    filename: str, headers: list[str], rows: Iterable[dict]
+) -> StreamingHttpResponse:
+    response = StreamingHttpResponse(iter_csv(headers, rows), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
@@ -1,3 +1,4 @@
+import gzip
 import importlib
 from datetime import timedelta
 from decimal import Decimal
@@ -19,7 +20,7 @@ from disputres.services import settlement
 from operator_bookings.models import BookingEvent
 from operator_core.models import OperatorAuditEvent
 from operator_settings.models import DbSetting
-from payments.models import Transaction
+from payments.models import StripeProcessingFee, Transaction
 
 pytestmark = pytest.mark.django_db
 
@@ -501,6 +502,11 @@ def test_settlement_transfer_gst_split_idempotent(
     assert gst_collected.first().amount == Decimal("0.48")
 
 
+def _streamed(resp) -> str:
+    assert resp.streaming
+    return b"".join(resp.streaming_content).decode()
+
+
 def test_exports_csv(operator_finance_user, booking_factory, renter_user):
     booking = booking_factory(status=Booking.Status.PAID)
     now = timezone.now()
@@ -532,7 +538,7 @@ def test_exports_csv(operator_finance_user, booking_factory, renter_user):
         },
     )
     assert resp.status_code == status.HTTP_200_OK
-    content = resp.content.decode().strip().splitlines()
+    content = _streamed(resp).strip().splitlines()
     header = content[0].split(",")
     assert header == [
         "created_at",
@@ -550,6 +556,38 @@ def test_exports_csv(operator_finance_user, booking_factory, renter_user):
     assert Transaction.Kind.PROMOTION_CHARGE in body
 
 
+def test_revenue_export_reads_stored_stripe_fees(
+    operator_finance_user, booking_factory, renter_user
+):
+    booking = booking_factory(
+        status=Booking.Status.PAID,
+        charge_payment_intent_id="pi_export",
+        totals={"renter_fee_gst": "0.10", "owner_fee_gst": "0.05"},
+    )
+    Transaction.objects.create(
+        user=renter_user,
+        booking=booking,
+        kind=Transaction.Kind.PLATFORM_FEE,
+        amount="3.00",
+        currency="cad",
+    )
+    StripeProcessingFee.objects.create(
+        stripe_id="pi_export", fee=Decimal("0.75"), resolved_at=timezone.now()
+    )
+
+    client = _ops_client(operator_finance_user)
+    with patch(
+        "payments.stripe_fees.get_payment_intent_fee",
+        side_effect=AssertionError("export must not call Stripe"),
+    ):
+        resp = client.get("/api/operator/exports/platform-revenue.csv")
+
+    assert resp.status_code == status.HTTP_200_OK
+    rows = _streamed(resp).strip().splitlines()[1:]
+    assert len(rows) == 1
+    assert ",3.00,0.75,0.15,2.10,CAD" in rows[0]
+
+
 def test_owner_ledger_export_filters_by_owner(
     operator_finance_user, booking_factory, owner_user, other_user
 ):
@@ -577,6 +615,41 @@ def test_owner_ledger_export_filters_by_owner(
         {"owner_id": owner_user.id, "from": timezone.localdate().isoformat()},
     )
     assert resp.status_code == status.HTTP_200_OK
-    body = resp.content.decode()
+    body = _streamed(resp)
     assert str(tx_owner.id) in body
     assert "tr_other" not in body
+
+
+def test_exports_stream_in_keyset_chunks_and_gzip(
+    monkeypatch, operator_finance_user, booking_factory, owner_user
+):
+    booking = booking_factory(owner=owner_user, status=Booking.Status.PAID)
+    created = timezone.now()
+    txns = [
+        Transaction.objects.create(
+            user=owner_user,
+            booking=booking,
+            kind=Transaction.Kind.OWNER_EARNING,
+            amount="1.00",
+            stripe_id=f"tr_chunk_{index}",
+        )
+        for index in range(5)
+    ]
+    # Identical timestamps force the id tie-breaker in the keyset cursor.
+    Transaction.objects.filter(pk__in=[tx.pk for tx in txns]).update(created_at=created)
+    monkeypatch.setattr("operator_finance.exports.EXPORT_CHUNK_SIZE", 2)
+
+    client = _ops_client(operator_finance_user)
+    resp = client.get("/api/operator/exports/owner-ledger.csv", {"owner_id": owner_user.id})
+    assert resp.status_code == status.HTTP_200_OK
+    rows = _streamed(resp).strip().splitlines()[1:]
+    assert [row.split(",")[1] for row in rows] == [str(tx.id) for tx in txns]
+
+    resp = client.get(
+        "/api/operator/exports/owner-ledger.csv",
+        {"owner_id": owner_user.id},
+        HTTP_ACCEPT_ENCODING="gzip",
+    )
+    assert resp["Content-Encoding"] == "gzip"
+    body = gzip.decompress(b"".join(resp.streaming_content)).decode()
+    assert body.strip().splitlines()[1:] == rows
@@ -213,10 +213,107 @@ def scan_disputes_stuck_in_stage(params: dict) -> dict:
     return {"count": len(ids), "ids": ids, "oldest_updated_at": oldest_updated_at}
 
 
+def rebuild_user_activity_stats(params: dict) -> dict:
+    """
+    Recount UserActivityStats (listings/bookings/disputes per user) from source tables.
+
+    Users are scanned in id order after after_id; rows that are missing or differ from a
+    recount are reported and, unless dry_run, rewritten. Pass the returned last_user_id as
+    after_id to continue a partial scan.
+
+    Params:
+      - user_id: int (optional; recount a single user)
+      - after_id: int (default 0)
+      - limit: int (default 10000)
+      - dry_run: bool (default True)
+
+    Output:
+      - checked_count: int
+      - mismatched_count: int
+      - repaired_count: int
+      - ids: list[int] (max 200)
+      - last_user_id: int | None
+      - dry_run: bool
+    """
+
+    from operator_users.activity import rebuild_user_activity_stats as rebuild
+
+    user_id = _get_int_param(params, "user_id", 0, min_value=1)
+    after_id = _get_int_param(params, "after_id", 0, min_value=0)
+    limit = _get_int_param(params, "limit", 10000, min_value=1)
+    dry_run = _get_bool_param(params, "dry_run", True)
+
+    if user_id:
+        result = rebuild([user_id], dry_run=dry_run)
+    else:
+        result = rebuild(after_id=after_id, limit=limit, dry_run=dry_run)
+
+    mismatched_ids = result["mismatched_ids"]
+    return {
+        "checked_count": result["checked_count"],
+        "mismatched_count": len(mismatched_ids),
+        "repaired_count": 0 if dry_run else len(mismatched_ids),
+        "ids": mismatched_ids[:200],
+        "last_user_id": result["last_user_id"],
+        "dry_run": dry_run,
+    }
+
+
+def rebuild_chat_inbox_state(params: dict) -> dict:
+    """
+    Recompute denormalized chat inbox state (last message, per-participant unread counts).
+
+    Conversations are scanned in id order after after_id; ones whose stored state differs
+    from the messages table are reported and, unless dry_run, repaired.
+
+    Params:
+      - after_id: int (default 0)
+      - limit: int (default 5000)
+      - dry_run: bool (default True)
+
+    Output:
+      - checked_count: int
+      - mismatched_count: int
+      - ids: list[int] (max 200)
+      - last_conversation_id: int | None
+      - dry_run: bool
+    """
+
+    from chat.models import Conversation, rebuild_inbox_state
+
+    after_id = _get_int_param(params, "after_id", 0, min_value=0)
+    limit = _get_int_param(params, "limit", 5000, min_value=1)
+    dry_run = _get_bool_param(params, "dry_run", True)
+
+    checked = 0
+    mismatched: list[int] = []
+    while checked < limit:
+        batch = list(
+            Conversation.objects.filter(id__gt=after_id)
+            .order_by("id")
+            .values_list("id", flat=True)[: min(500, limit - checked)]
+        )
+        if not batch:
+            break
+        mismatched.extend(rebuild_inbox_state(batch, dry_run=dry_run))
+        checked += len(batch)
+        after_id = batch[-1]
+
+    return {
+        "checked_count": checked,
+        "mismatched_count": len(mismatched),
+        "ids": mismatched[:200],
+        "last_conversation_id": after_id if checked else None,
+        "dry_run": dry_run,
+    }
+
+
 JOB_REGISTRY: dict[str, JobFn] = {
     "auto_close_missing_evidence_disputes": auto_close_missing_evidence_disputes,
     "recalc_dispute_window_for_bookings_missing_expires_at": (
         recalc_dispute_window_for_bookings_missing_expires_at
     ),
     "scan_disputes_stuck_in_stage": scan_disputes_stuck_in_stage,
+    "rebuild_user_activity_stats": rebuild_user_activity_stats,
+    "rebuild_chat_inbox_state": rebuild_chat_inbox_state,
 }
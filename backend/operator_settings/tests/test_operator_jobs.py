@@ -7,11 +7,13 @@ from bookings.models import Booking
 from disputes.models import DisputeCase
 from operator_settings.jobs import (
     auto_close_missing_evidence_disputes,
+    rebuild_user_activity_stats,
     recalc_dispute_window_for_bookings_missing_expires_at,
     scan_disputes_stuck_in_stage,
 )
 from operator_settings.models import OperatorJobRun
 from operator_settings.tasks import operator_run_job
+from operator_users.models import UserActivityStats
 
 pytestmark = pytest.mark.django_db
 
@@ -112,6 +114,24 @@ def test_scan_disputes_stuck_in_stage_does_not_mutate(
     assert dispute.updated_at == before_updated_at
 
 
+def test_rebuild_user_activity_stats_respects_dry_run(booking_factory, renter_user):
+    booking = booking_factory(renter=renter_user)
+    UserActivityStats.objects.filter(user=renter_user).update(bookings_as_renter_count=5)
+
+    out = rebuild_user_activity_stats({"user_id": renter_user.id})
+    assert out["dry_run"] is True
+    assert out["ids"] == [renter_user.id]
+    assert out["repaired_count"] == 0
+    assert renter_user.activity_stats.bookings_as_renter_count == 5
+
+    out2 = rebuild_user_activity_stats({"after_id": 0, "limit": 100, "dry_run": False})
+    assert out2["checked_count"] >= 2
+    assert out2["repaired_count"] == 1
+    renter_user.activity_stats.refresh_from_db()
+    assert renter_user.activity_stats.bookings_as_renter_count == 1
+    assert booking.owner.activity_stats.bookings_as_owner_count == 1
+
+
 def test_operator_run_job_persists_output_and_status():
     run = OperatorJobRun.objects.create(
         name="scan_disputes_stuck_in_stage",
@@ -0,0 +1,155 @@
+"""Maintained per-user activity counters (``UserActivityStats``).
+
+The operator user list used to compute listing/booking/dispute counts with five
+``COUNT(DISTINCT ...)`` aggregates over a fan-out join per page. Those counts now live in one
+row per user:
+
+* ``operator_users.signals`` applies +1/-1 deltas inside the transaction that creates or
+  deletes the listing, booking or dispute, so counts commit (or roll back) with the change.
+* ``rebuild_user_activity_stats`` recounts users from the source tables and repairs rows
+  that drifted (``QuerySet.update()``/``bulk_create``, raw SQL, reassigned bookings). It
+  backs the ``rebuild_user_activity_stats`` operator job.
+
+Users without a row have never been counted; readers treat a missing row as zeros and the
+first positive delta creates it from a full recount.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, F
+from django.utils import timezone
+
+from bookings.models import Booking
+from disputes.models import DisputeCase
+from listings.models import Listing
+
+from .models import UserActivityStats
+
+ACTIVITY_COUNT_FIELDS = (
+    "listings_count",
+    "bookings_as_renter_count",
+    "bookings_as_owner_count",
+    "disputes_as_owner_count",
+    "disputes_as_renter_count",
+)
+
+REBUILD_BATCH_SIZE = 500
+
+# (queryset, user id lookup, counter) – each counts rows per user without a fan-out join.
+_COUNT_SOURCES = (
+    (Listing.objects.all(), "owner_id", "listings_count"),
+    (Booking.objects.all(), "renter_id", "bookings_as_renter_count"),
+    (Booking.objects.all(), "owner_id", "bookings_as_owner_count"),
+    (DisputeCase.objects.all(), "booking__owner_id", "disputes_as_owner_count"),
+    (DisputeCase.objects.all(), "booking__renter_id", "disputes_as_renter_count"),
+)
+
+
+def adjust_user_activity(user_id: int | None, **deltas: int) -> None:
+    """Add ``deltas`` (counter name -> change) to one user's activity row."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not user_id or not deltas:
+        return
+    updated = UserActivityStats.objects.filter(user_id=user_id).update(
+        updated_at=timezone.now(),
+        **{field: F(field) + delta for field, delta in deltas.items()},
+    )
+    if updated or min(deltas.values()) < 0:
+        # Decrements never create rows: the user may be mid-cascade delete.
+        return
+    # First activity for this user: a recount already includes the row being saved.
+    rebuild_user_activity_stats([user_id])
+
+
+def compute_user_activity(user_ids: Iterable[int]) -> dict[int, dict[str, int]]:
+    """Count each user's activity from the source tables."""
+    counts = {user_id: dict.fromkeys(ACTIVITY_COUNT_FIELDS, 0) for user_id in user_ids}
+    if not counts:
+        return counts
+    for queryset, lookup, field in _COUNT_SOURCES:
+        rows = (
+            queryset.filter(**{f"{lookup}__in": list(counts)})
+            .values(lookup)
+            .annotate(total=Count("id"))
+            .values_list(lookup, "total")
+        )
+        for user_id, total in rows:
+            counts[user_id][field] = total
+    return counts
+
+
+def _repair_batch(user_ids: list[int], *, dry_run: bool) -> list[int]:
+    computed = compute_user_activity(user_ids)
+    stored = {
+        row["user_id"]: row
+        for row in UserActivityStats.objects.filter(user_id__in=user_ids).values(
+            "user_id", *ACTIVITY_COUNT_FIELDS
+        )
+    }
+    mismatched = [
+        user_id
+        for user_id, counts in computed.items()
+        if user_id not in stored
+        or any(stored[user_id][field] != value for field, value in counts.items())
+    ]
+    if mismatched and not dry_run:
+        now = timezone.now()
+        UserActivityStats.objects.bulk_create(
+            [
+                UserActivityStats(user_id=user_id, updated_at=now, **computed[user_id])
+                for user_id in mismatched
+            ],
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=[*ACTIVITY_COUNT_FIELDS, "updated_at"],
+        )
+    return mismatched
+
+
+def rebuild_user_activity_stats(
+    user_ids: Iterable[int] | None = None,
+    *,
+    after_id: int = 0,
+    limit: int | None = None,
+    dry_run: bool = False,
+) -> dict:
+    """
+    Recount users and upsert rows that are missing or differ from the source tables.
+
+    Without ``user_ids`` users are walked in id order from ``after_id``, at most ``limit``
+    of them. Returns ``checked_count``, ``mismatched_ids`` and ``last_user_id``.
+    """
+    if user_ids is not None:
+        pending = sorted(set(user_ids))
+        batches = (
+            pending[start : start + REBUILD_BATCH_SIZE]
+            for start in range(0, len(pending), REBUILD_BATCH_SIZE)
+        )
+    else:
+        batches = _user_id_batches(after_id, limit)
+
+    checked = 0
+    last_user_id = None
+    mismatched: list[int] = []
+    for batch in batches:
+        mismatched.extend(_repair_batch(batch, dry_run=dry_run))
+        checked += len(batch)
+        last_user_id = batch[-1]
+    return {"checked_count": checked, "mismatched_ids": mismatched, "last_user_id": last_user_id}
+
+
+def _user_id_batches(after_id: int, limit: int | None):
+    users = get_user_model().objects.order_by("id")
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = REBUILD_BATCH_SIZE if remaining is None else min(REBUILD_BATCH_SIZE, remaining)
+        batch = list(users.filter(id__gt=after_id).values_list("id", flat=True)[:size])
+        if not batch:
+            return
+        yield batch
+        after_id = batch[-1]
+        if remaining is not None:
+            remaining -= len(batch)
@@ -1,15 +1,7 @@
 from datetime import timedelta
 
 from django.contrib.auth import get_user_model
-from django.db.models import (
-    BooleanField,
-    Count,
-    ExpressionWrapper,
-    F,
-    IntegerField,
-    Prefetch,
-    Value,
-)
+from django.db.models import BooleanField, ExpressionWrapper, F, IntegerField, Prefetch, Value
 from django.db.models.functions import Coalesce
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
@@ -25,6 +17,7 @@ from operator_core.api_base import OperatorAPIView, OperatorThrottleMixin
 from operator_core.audit import audit
 from operator_core.models import OperatorAuditEvent
 from operator_core.permissions import HasOperatorRole, IsOperator
+from operator_users.activity import ACTIVITY_COUNT_FIELDS
 from operator_users.filters import OperatorUserFilter
 from operator_users.models import UserRiskFlag
 from operator_users.serializers import OperatorUserDetailSerializer, OperatorUserListSerializer
@@ -53,12 +46,13 @@ def _annotated_staff_queryset():
     return (
         User.objects.all()
         .select_related("fee_override")
+        # Counters are maintained in UserActivityStats (see operator_users.activity), so
+        # this is a single LEFT JOIN rather than COUNT(DISTINCT) over a fan-out join.
         .annotate(
-            listings_count=Count("listings", distinct=True),
-            bookings_as_renter_count=Count("bookings_as_renter", distinct=True),
-            bookings_as_owner_count=Count("bookings_as_owner", distinct=True),
-            disputes_as_owner_count=Count("bookings_as_owner__dispute_cases", distinct=True),
-            disputes_as_renter_count=Count("bookings_as_renter__dispute_cases", distinct=True),
+            **{
+                field: Coalesce(F(f"activity_stats__{field}"), ZERO_INT)
+                for field in ACTIVITY_COUNT_FIELDS
+            }
         )
         .annotate(
             disputes_count=ExpressionWrapper(
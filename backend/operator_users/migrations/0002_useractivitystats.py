@@ -0,0 +1,85 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL_CHUNK_SIZE = 1000
+
+# Frozen copy of operator_users.activity._COUNT_SOURCES.
+COUNT_SOURCES = (
+    ("listings", "Listing", "owner_id", "listings_count"),
+    ("bookings", "Booking", "renter_id", "bookings_as_renter_count"),
+    ("bookings", "Booking", "owner_id", "bookings_as_owner_count"),
+    ("disputes", "DisputeCase", "booking__owner_id", "disputes_as_owner_count"),
+    ("disputes", "DisputeCase", "booking__renter_id", "disputes_as_renter_count"),
+)
+
+
+def backfill_user_activity_stats(apps, schema_editor):
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    UserActivityStats = apps.get_model("operator_users", "UserActivityStats")
+    last_id = 0
+    while True:
+        user_ids = list(
+            User.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:BACKFILL_CHUNK_SIZE]
+        )
+        if not user_ids:
+            return
+        counts = {user_id: {} for user_id in user_ids}
+        for app_label, model_name, lookup, field in COUNT_SOURCES:
+            rows = (
+                apps.get_model(app_label, model_name)
+                .objects.filter(**{f"{lookup}__in": user_ids})
+                .values(lookup)
+                .annotate(total=models.Count("id"))
+                .values_list(lookup, "total")
+            )
+            for user_id, total in rows:
+                counts[user_id][field] = total
+        UserActivityStats.objects.bulk_create(
+            [
+                UserActivityStats(user_id=user_id, **fields)
+                for user_id, fields in counts.items()
+                if fields
+            ]
+        )
+        last_id = user_ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookings", "0016_booking_money_columns"),
+        ("disputes", "0004_disputecase_pickup_no_show_category"),
+        ("listings", "0011_listing_coordinates"),
+        ("operator_users", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserActivityStats",
+            fields=[
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="activity_stats",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("listings_count", models.IntegerField(default=0)),
+                ("bookings_as_renter_count", models.IntegerField(default=0)),
+                ("bookings_as_owner_count", models.IntegerField(default=0)),
+                ("disputes_as_owner_count", models.IntegerField(default=0)),
+                ("disputes_as_renter_count", models.IntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(backfill_user_activity_stats, migrations.RunPython.noop),
+    ]
@@ -39,3 +39,26 @@ class UserRiskFlag(models.Model):
             models.Index(fields=["category", "active"]),
             models.Index(fields=["created_at"]),
         ]
+
+
+class UserActivityStats(models.Model):
+    """
+    Per-user activity counters shown on the operator user list/detail pages.
+
+    Kept in step with listings, bookings and disputes by ``operator_users.signals`` and
+    repaired by the ``rebuild_user_activity_stats`` operator job (see
+    ``operator_users.activity``).
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="activity_stats",
+    )
+    listings_count = models.IntegerField(default=0)
+    bookings_as_renter_count = models.IntegerField(default=0)
+    bookings_as_owner_count = models.IntegerField(default=0)
+    disputes_as_owner_count = models.IntegerField(default=0)
+    disputes_as_renter_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from bookings.models import Booking
+from disputes.models import DisputeCase
+from listings.models import Listing
+
+from .activity import adjust_user_activity
+
+
+@receiver(post_save, sender=Listing, dispatch_uid="user_activity_listing_created")
+def _count_listing_created(sender, instance: Listing, created, raw=False, **kwargs):
+    if created and not raw:
+        adjust_user_activity(instance.owner_id, listings_count=1)
+
+
+@receiver(post_delete, sender=Listing, dispatch_uid="user_activity_listing_deleted")
+def _count_listing_deleted(sender, instance: Listing, **kwargs):
+    adjust_user_activity(instance.owner_id, listings_count=-1)
+
+
+def _adjust_booking_parties(owner_id, renter_id, delta: int, *, prefix: str) -> None:
+    adjust_user_activity(owner_id, **{f"{prefix}_as_owner_count": delta})
+    adjust_user_activity(renter_id, **{f"{prefix}_as_renter_count": delta})
+
+
+@receiver(post_save, sender=Booking, dispatch_uid="user_activity_booking_created")
+def _count_booking_created(sender, instance: Booking, created, raw=False, **kwargs):
+    if created and not raw:
+        _adjust_booking_parties(instance.owner_id, instance.renter_id, 1, prefix="bookings")
+
+
+@receiver(post_delete, sender=Booking, dispatch_uid="user_activity_booking_deleted")
+def _count_booking_deleted(sender, instance: Booking, **kwargs):
+    _adjust_booking_parties(instance.owner_id, instance.renter_id, -1, prefix="bookings")
+
+
+def _dispute_parties(dispute: DisputeCase) -> tuple[int | None, int | None]:
+    if DisputeCase.booking.is_cached(dispute):
+        return dispute.booking.owner_id, dispute.booking.renter_id
+    parties = (
+        Booking.objects.filter(pk=dispute.booking_id).values_list("owner_id", "renter_id").first()
+    )
+    return parties or (None, None)
+
+
+@receiver(post_save, sender=DisputeCase, dispatch_uid="user_activity_dispute_created")
+def _count_dispute_created(sender, instance: DisputeCase, created, raw=False, **kwargs):
+    if created and not raw:
+        _adjust_booking_parties(*_dispute_parties(instance), 1, prefix="disputes")
+
+
+@receiver(post_delete, sender=DisputeCase, dispatch_uid="user_activity_dispute_deleted")
+def _count_dispute_deleted(sender, instance: DisputeCase, **kwargs):
+    _adjust_booking_parties(*_dispute_parties(instance), -1, prefix="disputes")
@@ -0,0 +1,112 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from bookings.models import Booking
+from disputes.models import DisputeCase
+from listings.models import Listing
+from operator_users.activity import ACTIVITY_COUNT_FIELDS, rebuild_user_activity_stats
+from operator_users.models import UserActivityStats
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+def _stats(user):
+    row = UserActivityStats.objects.filter(user=user).values(*ACTIVITY_COUNT_FIELDS).first()
+    return row or dict.fromkeys(ACTIVITY_COUNT_FIELDS, 0)
+
+
+def _listing(owner, title="Drill"):
+    return Listing.objects.create(
+        owner=owner,
+        title=title,
+        description="Cordless drill",
+        daily_price_cad=Decimal("15.00"),
+        city="Edmonton",
+    )
+
+
+def _booking(listing, renter):
+    return Booking.objects.create(
+        listing=listing,
+        owner=listing.owner,
+        renter=renter,
+        start_date=date(2030, 1, 1),
+        end_date=date(2030, 1, 3),
+    )
+
+
+def _dispute(booking):
+    return DisputeCase.objects.create(
+        booking=booking,
+        opened_by=booking.renter,
+        opened_by_role=DisputeCase.OpenedByRole.RENTER,
+        category=DisputeCase.Category.DAMAGE,
+        description="Chipped bit",
+    )
+
+
+@pytest.fixture
+def owner():
+    return User.objects.create_user(username="activity-owner", password="x")
+
+
+@pytest.fixture
+def renter():
+    return User.objects.create_user(username="activity-renter", password="x")
+
+
+def test_signals_keep_counts_in_step(owner, renter):
+    listing = _listing(owner)
+    _listing(owner, title="Saw")
+    booking = _booking(listing, renter)
+    dispute = _dispute(booking)
+
+    assert _stats(owner) == {
+        "listings_count": 2,
+        "bookings_as_renter_count": 0,
+        "bookings_as_owner_count": 1,
+        "disputes_as_owner_count": 1,
+        "disputes_as_renter_count": 0,
+    }
+    assert _stats(renter)["bookings_as_renter_count"] == 1
+    assert _stats(renter)["disputes_as_renter_count"] == 1
+
+    dispute.delete()
+    assert _stats(owner)["disputes_as_owner_count"] == 0
+    assert _stats(renter)["disputes_as_renter_count"] == 0
+
+    # Deleting a listing cascades to its bookings and their disputes.
+    _dispute(booking)
+    listing.delete()
+    assert _stats(owner) == {**dict.fromkeys(ACTIVITY_COUNT_FIELDS, 0), "listings_count": 1}
+    assert _stats(renter) == dict.fromkeys(ACTIVITY_COUNT_FIELDS, 0)
+
+
+def test_deleting_a_user_leaves_counterparty_counts_correct(owner, renter):
+    _booking(_listing(owner), renter)
+
+    renter.delete()
+
+    assert _stats(owner)["bookings_as_owner_count"] == 0
+    assert not UserActivityStats.objects.filter(user_id=renter.id).exists()
+
+
+def test_rebuild_reports_and_repairs_drift(owner, renter):
+    booking = _booking(_listing(owner), renter)
+    Booking.objects.filter(pk=booking.pk).update(renter=owner)
+    UserActivityStats.objects.filter(user=owner).update(listings_count=7)
+
+    report = rebuild_user_activity_stats(dry_run=True)
+    assert sorted(report["mismatched_ids"]) == sorted([owner.id, renter.id])
+    assert _stats(owner)["listings_count"] == 7
+
+    rebuild_user_activity_stats()
+    assert _stats(owner)["listings_count"] == 1
+    assert _stats(owner)["bookings_as_renter_count"] == 1
+    assert _stats(renter)["bookings_as_renter_count"] == 0
+    assert rebuild_user_activity_stats()["mismatched_ids"] == []
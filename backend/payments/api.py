@@ -7,16 +7,20 @@ from datetime import timezone as datetime_timezone
 from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
 
 from django.conf import settings
+from django.db.models import Q
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from core.cursors import decode_cursor, encode_cursor
 from payments.tax import compute_gst, platform_gst_enabled, platform_gst_rate
 from storage.s3 import presign_get
 
 from .ledger import (
+    cached_history_count,
     compute_owner_available_balance,
     compute_owner_balances,
     compute_owner_total_balance,
@@ -210,6 +214,23 @@ def _parse_offset(value: str | None) -> int:
     return parsed
 
 
+def _encode_history_cursor(tx: Transaction) -> str:
+    return encode_cursor({"c": tx.created_at.isoformat(), "i": tx.id})
+
+
+def _decode_history_cursor(token: str) -> Q:
+    """Return the filter selecting rows after ``token`` in ``(-created_at, -id)`` order."""
+    position = decode_cursor(token)
+    try:
+        created_at = parse_datetime(position["c"])
+        tx_id = int(position["i"])
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("cursor is invalid.")
+    if created_at is None:
+        raise ValueError("cursor is invalid.")
+    return Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=tx_id)
+
+
 def _parse_history_scope(value: str | None) -> str | None:
     if value is None:
         return None
@@ -271,7 +292,12 @@ def _history_direction(amount: Decimal) -> str:
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
 def owner_payouts_history(request):
-    """Return paginated ledger rows for owner earnings."""
+    """
+    Return paginated ledger rows for owner earnings.
+
+    Pass ``cursor`` (empty for the first page, then ``next_cursor``) for keyset pagination;
+    ``offset`` is still honoured when no cursor is sent. ``count`` is cached per user.
+    """
     user = request.user
     is_owner = bool(getattr(user, "can_list", False))
     try:
@@ -292,19 +318,26 @@ def owner_payouts_history(request):
         qs = get_owner_history_queryset(user)
     elif is_owner:
         qs = get_owner_history_queryset(user)
+        scope = "owner"
     else:
         # For renters, show their charges/refunds but hide deposit holds.
         qs = Transaction.objects.filter(user=user).exclude(
             kind=Transaction.Kind.DAMAGE_DEPOSIT_HOLD,
         )
-    qs = qs.select_related("booking__listing")
+        scope = "all"
+    qs = qs.select_related("booking__listing").order_by("-created_at", "-id")
     kind_param = request.query_params.get("kind")
     if kind_param:
         qs = qs.filter(kind=kind_param)
 
+    # ``cursor`` (empty for the first page) switches to keyset pagination on
+    # (created_at, id); limit/offset stays for older clients.
+    cursor_mode = "cursor" in request.query_params
     try:
         limit = _parse_limit(request.query_params.get("limit"))
-        offset = _parse_offset(request.query_params.get("offset"))
+        offset = 0 if cursor_mode else _parse_offset(request.query_params.get("offset"))
+        cursor = request.query_params.get("cursor") or ""
+        after = _decode_history_cursor(cursor) if cursor else None
     except ValueError:
         logger.warning(
             "Invalid pagination params for owner payouts history",
@@ -315,8 +348,16 @@ def owner_payouts_history(request):
             {"detail": "Invalid pagination parameters."}, status=status.HTTP_400_BAD_REQUEST
         )
 
-    total_count = qs.count()
-    sliced = qs[offset : offset + limit]
+    if kind_param and kind_param not in Transaction.Kind.values:
+        total_count = 0
+    else:
+        total_count = cached_history_count(
+            qs, user_id=user.id, variant=f"{scope}:{kind_param or '*'}"
+        )
+    page_qs = qs.filter(after) if after is not None else qs
+    rows = list(page_qs[offset : offset + limit + 1])
+    has_next = len(rows) > limit
+    sliced = rows[:limit]
 
     results = []
     for tx in sliced:
@@ -347,15 +388,13 @@ def owner_payouts_history(request):
             }
         )
 
-    next_offset = offset + limit
-    if next_offset >= total_count:
-        next_offset = None
-
     return Response(
         {
             "results": results,
             "count": total_count,
-            "next_offset": next_offset,
+            "next_offset": offset + limit if has_next and not cursor_mode else None,
+            "next_cursor": _encode_history_cursor(sliced[-1]) if has_next else None,
+            "has_next": has_next,
         }
     )
 
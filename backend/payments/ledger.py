@@ -2,10 +2,14 @@ from datetime import datetime, time, timedelta
 from decimal import Decimal
 from typing import Optional
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction as db_transaction
+from django.db.models import F, Sum
 from django.utils import timezone
 
-from .models import Transaction
+from .models import OwnerBalance, OwnerPendingEarning, Transaction
 
 User = get_user_model()
 OWNER_EARNING_KINDS = [
@@ -15,7 +19,15 @@ OWNER_EARNING_KINDS = [
     Transaction.Kind.DAMAGE_DEPOSIT_RELEASE,
 ]
 OWNER_HISTORY_KINDS = OWNER_EARNING_KINDS + [Transaction.Kind.OWNER_PAYOUT]
+OWNER_BALANCE_KINDS = [
+    Transaction.Kind.OWNER_EARNING,
+    Transaction.Kind.REFUND,
+    Transaction.Kind.OWNER_PAYOUT,
+    Transaction.Kind.PROMOTION_CHARGE,
+]
+HISTORY_COUNT_CACHE_PREFIX = "payments:history-count"
 TWO_PLACES = Decimal("0.01")
+ZERO = Decimal("0.00")
 OWNER_HOLD_HOURS = 48
 
 
@@ -63,6 +75,40 @@ def get_owner_history_queryset(user: User):
     ).order_by("-created_at")
 
 
+def _history_generation_key(user_id: int) -> str:
+    return f"{HISTORY_COUNT_CACHE_PREFIX}:gen:{int(user_id)}"
+
+
+def cached_history_count(queryset, *, user_id: int, variant: str) -> int:
+    """
+    Return ``queryset.count()`` for one user's payout history, cached per filter variant.
+
+    Cached counts are keyed on a per-user generation that ``invalidate_history_counts``
+    bumps whenever one of the user's transactions is written, so they never outlive a
+    ledger change by more than the commit; the TTL only bounds memory.
+    """
+    generation = cache.get(_history_generation_key(user_id)) or 0
+    key = f"{HISTORY_COUNT_CACHE_PREFIX}:{int(user_id)}:{generation}:{variant}"
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        ttl = max(int(getattr(settings, "PAYOUT_HISTORY_COUNT_CACHE_TTL_SECONDS", 600) or 0), 0)
+        if ttl:
+            cache.set(key, count, ttl)
+    return count
+
+
+def invalidate_history_counts(user_id: int | None) -> None:
+    if not user_id:
+        return
+    key = _history_generation_key(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
 def _booking_hold_release_at(booking) -> datetime | None:
     if not booking or not getattr(booking, "end_date", None):
         return None
@@ -94,57 +140,164 @@ def _owner_transaction_available_at(tx: Transaction) -> datetime | None:
     return hold_at or stripe_available_on
 
 
-def compute_owner_available_balance(user: User) -> Decimal:
-    """Return the owner's spendable balance based on ledger + availability rules."""
-    spendable_kinds = [
-        Transaction.Kind.OWNER_EARNING,
-        Transaction.Kind.REFUND,
-        Transaction.Kind.OWNER_PAYOUT,
-        Transaction.Kind.PROMOTION_CHARGE,
-    ]
-    now = timezone.now()
-    total = Decimal("0.00")
-    qs = Transaction.objects.filter(user=user, kind__in=spendable_kinds).select_related(
+def _balance_effect(tx: Transaction) -> tuple[Decimal, datetime | None]:
+    """
+    Return ``(amount, available_at)`` for how ``tx`` moves the owner balance.
+
+    ``available_at`` is only set for positive owner earnings, which stay pending until
+    the booking hold (and Stripe's own availability date) has passed.
+    """
+    if tx.kind not in OWNER_BALANCE_KINDS:
+        return ZERO, None
+    amount = Decimal(tx.amount)
+    if tx.kind == Transaction.Kind.PROMOTION_CHARGE:
+        return (-abs(amount) if _promotion_charge_is_earnings(tx) else ZERO), None
+    if tx.kind == Transaction.Kind.OWNER_EARNING and amount > ZERO:
+        return amount, _owner_transaction_available_at(tx)
+    return amount, None
+
+
+def recompute_owner_balance(user_id: int, *, now: datetime | None = None) -> dict:
+    """
+    Recompute an owner's balance from every ledger row.
+
+    Returns ``{"total", "available", "pending"}`` where ``pending`` maps transaction ids
+    to ``(amount, available_at)`` for earnings that are not spendable yet at ``now``.
+    """
+    now = now or timezone.now()
+    total = ZERO
+    available = ZERO
+    pending: dict[int, tuple[Decimal, datetime]] = {}
+    qs = Transaction.objects.filter(user_id=user_id, kind__in=OWNER_BALANCE_KINDS).select_related(
         "booking",
         "promotion_slot",
     )
     for tx in qs:
-        amount = Decimal(tx.amount)
-        if tx.kind == Transaction.Kind.PROMOTION_CHARGE:
-            if _promotion_charge_is_earnings(tx):
-                total -= abs(amount)
-            continue
-        if amount <= Decimal("0.00"):
-            total += amount
-            continue
-        if tx.kind == Transaction.Kind.OWNER_EARNING:
-            available_at = _owner_transaction_available_at(tx)
-            if available_at and available_at > now:
-                continue
+        amount, available_at = _balance_effect(tx)
         total += amount
-    return total.quantize(TWO_PLACES)
+        if available_at and available_at > now:
+            pending[tx.id] = (amount, available_at)
+        else:
+            available += amount
+    return {
+        "total": total.quantize(TWO_PLACES),
+        "available": available.quantize(TWO_PLACES),
+        "pending": pending,
+    }
+
+
+def rebuild_owner_balance(user_id: int, *, create: bool = True) -> OwnerBalance | None:
+    """Replace an owner's balance snapshot and release schedule with a full recompute."""
+    with db_transaction.atomic():
+        if create:
+            OwnerBalance.objects.get_or_create(user_id=user_id)
+        # Lock before recomputing: a concurrent ``apply_transaction_to_balance`` has then
+        # either committed (and is part of the recompute) or waits for this rebuild.
+        balance = OwnerBalance.objects.select_for_update().filter(user_id=user_id).first()
+        if balance is None:
+            return None
+        state = recompute_owner_balance(user_id)
+        balance.total = state["total"]
+        balance.available = state["available"]
+        balance.save(update_fields=["total", "available", "updated_at"])
+        OwnerPendingEarning.objects.filter(user_id=user_id).delete()
+        OwnerPendingEarning.objects.bulk_create(
+            [
+                OwnerPendingEarning(
+                    transaction_id=tx_id,
+                    user_id=user_id,
+                    amount=amount,
+                    available_at=available_at,
+                )
+                for tx_id, (amount, available_at) in state["pending"].items()
+            ]
+        )
+    return balance
+
+
+def apply_transaction_to_balance(tx: Transaction) -> None:
+    """Add a newly written ledger row to its owner's balance snapshot."""
+    amount, available_at = _balance_effect(tx)
+    if amount == ZERO:
+        return
+    with db_transaction.atomic():
+        # Creating the row serialises concurrent first writers on its primary key; the lock
+        # then orders this update after any rebuild still in flight.
+        _, created = OwnerBalance.objects.get_or_create(user_id=tx.user_id)
+        OwnerBalance.objects.select_for_update().filter(user_id=tx.user_id).first()
+        if created:
+            # First balance-relevant row for this owner (or a pre-snapshot owner):
+            # the recompute already includes ``tx``.
+            rebuild_owner_balance(tx.user_id)
+            return
+        pending = available_at is not None and available_at > timezone.now()
+        if pending:
+            OwnerPendingEarning.objects.create(
+                transaction=tx, user_id=tx.user_id, amount=amount, available_at=available_at
+            )
+        OwnerBalance.objects.filter(user_id=tx.user_id).update(
+            total=F("total") + amount,
+            available=F("available") + (ZERO if pending else amount),
+            updated_at=timezone.now(),
+        )
+
+
+def remove_transaction_from_balance(tx: Transaction, *, amount: Decimal, pending: bool) -> None:
+    """Back a deleted ledger row out of its owner's snapshot (never creates one)."""
+    if amount == ZERO:
+        return
+    OwnerBalance.objects.filter(user_id=tx.user_id).update(
+        total=F("total") - amount,
+        available=F("available") - (ZERO if pending else amount),
+        updated_at=timezone.now(),
+    )
+
+
+def release_matured_owner_earnings(*, now: datetime | None = None) -> int:
+    """Move pending earnings whose ``available_at`` has passed into ``available``."""
+    now = now or timezone.now()
+    user_ids = list(
+        OwnerPendingEarning.objects.filter(available_at__lte=now)
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+    released = 0
+    for user_id in user_ids:
+        with db_transaction.atomic():
+            balance = OwnerBalance.objects.select_for_update().filter(user_id=user_id).first()
+            due = OwnerPendingEarning.objects.filter(user_id=user_id, available_at__lte=now)
+            amount = due.aggregate(total=Sum("amount"))["total"] or ZERO
+            released += due.count()
+            due.delete()
+            if balance is not None:
+                balance.available = (balance.available + amount).quantize(TWO_PLACES)
+                balance.save(update_fields=["available", "updated_at"])
+    return released
+
+
+def get_owner_balance(user: User) -> OwnerBalance:
+    balance = OwnerBalance.objects.filter(user_id=user.pk).first()
+    if balance is None:
+        balance = rebuild_owner_balance(user.pk)
+    return balance
+
+
+def compute_owner_available_balance(user: User) -> Decimal:
+    """Return the owner's spendable balance based on ledger + availability rules."""
+    balance = get_owner_balance(user)
+    # Earnings that matured since the last release run are spendable already.
+    matured = (
+        OwnerPendingEarning.objects.filter(
+            user_id=user.pk, available_at__lte=timezone.now()
+        ).aggregate(total=Sum("amount"))["total"]
+        or ZERO
+    )
+    return (balance.available + matured).quantize(TWO_PLACES)
 
 
 def compute_owner_total_balance(user: User) -> Decimal:
     """Return total owner balance (available + pending), net of payouts."""
-    spendable_kinds = [
-        Transaction.Kind.OWNER_EARNING,
-        Transaction.Kind.REFUND,
-        Transaction.Kind.OWNER_PAYOUT,
-        Transaction.Kind.PROMOTION_CHARGE,
-    ]
-    total = Decimal("0.00")
-    qs = Transaction.objects.filter(user=user, kind__in=spendable_kinds).select_related(
-        "promotion_slot",
-    )
-    for tx in qs:
-        amount = Decimal(tx.amount)
-        if tx.kind == Transaction.Kind.PROMOTION_CHARGE:
-            if _promotion_charge_is_earnings(tx):
-                total -= abs(amount)
-            continue
-        total += amount
-    return total.quantize(TWO_PLACES)
+    return Decimal(get_owner_balance(user).total).quantize(TWO_PLACES)
 
 
 def compute_owner_balances(user: User) -> dict[str, str]:
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from payments.stripe_api import StripeConfigurationError
+from payments.stripe_fees import backfill_stripe_fees
+
+
+class Command(BaseCommand):
+    help = "Resolve and store missing Stripe processing fees for ledger rows and paid bookings."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--since",
+            default="",
+            help="Only consider rows created on or after this date (YYYY-MM-DD).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Number of pending fees resolved per batch.",
+        )
+        parser.add_argument(
+            "--max-workers",
+            type=int,
+            default=None,
+            help="Concurrent Stripe lookups (defaults to STRIPE_FEE_RESOLVE_WORKERS).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        batch_size = options["batch_size"]
+        max_workers = options["max_workers"]
+        if batch_size <= 0:
+            raise CommandError("--batch-size must be greater than 0.")
+        if max_workers is not None and max_workers <= 0:
+            raise CommandError("--max-workers must be greater than 0.")
+
+        since = None
+        if options["since"]:
+            try:
+                since_date = datetime.fromisoformat(options["since"]).date()
+            except ValueError as exc:
+                raise CommandError("--since must be a date in YYYY-MM-DD format.") from exc
+            since = timezone.make_aware(datetime.combine(since_date, time.min))
+
+        try:
+            summary = backfill_stripe_fees(
+                since=since, batch_size=batch_size, max_workers=max_workers
+            )
+        except StripeConfigurationError as exc:
+            raise CommandError(f"Stripe is not configured: {exc}") from exc
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Stripe fees checked: {checked}, resolved: {resolved}, "
+                "unresolved: {unresolved}".format(**summary)
+            )
+        )
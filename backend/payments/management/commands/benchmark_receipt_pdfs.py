@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from bookings.models import Booking
+from core.benchmarks import percentile
+from listings.models import Listing
+from payments import receipts
+from payments.models import OwnerFeeTaxInvoice
+from promotions.models import PromotedSlot
+
+User = get_user_model()
+
+
+def _sample_documents() -> dict[str, tuple]:
+    """Unsaved model instances shaped like a paid booking/promotion/invoice."""
+    now = timezone.now()
+    owner = User(id=1, username="bench-owner", first_name="Olivia", last_name="Owner")
+    renter = User(id=2, username="bench-renter", first_name="Rina", last_name="Renter")
+    listing = Listing(id=1, owner=owner, title="Circular Saw", city="Edmonton")
+    booking = Booking(
+        id=1,
+        listing=listing,
+        owner=owner,
+        renter=renter,
+        start_date=date(2025, 8, 10),
+        end_date=date(2025, 8, 13),
+        created_at=now,
+        updated_at=now,
+        totals={
+            "days": "3",
+            "rental_subtotal": "135.00",
+            "renter_fee_base": "13.50",
+            "renter_fee_gst": "0.68",
+            "renter_fee_total": "14.18",
+            "owner_fee_base": "6.75",
+            "owner_fee_gst": "0.34",
+            "owner_fee_total": "7.09",
+            "owner_payout": "127.91",
+            "damage_deposit": "120.00",
+            "total_charge": "269.18",
+            "gst_enabled": True,
+        },
+    )
+    slot = PromotedSlot(
+        id=1,
+        listing=listing,
+        owner=owner,
+        price_per_day_cents=1500,
+        base_price_cents=4500,
+        gst_cents=225,
+        total_price_cents=4725,
+        starts_at=now,
+        ends_at=now + timedelta(days=3),
+        created_at=now,
+        updated_at=now,
+    )
+    invoice = OwnerFeeTaxInvoice(
+        id=1,
+        owner=owner,
+        period_start=date(2025, 8, 1),
+        period_end=date(2025, 8, 31),
+        fee_subtotal=Decimal("67.50"),
+        gst=Decimal("3.38"),
+        total=Decimal("70.88"),
+        invoice_number="INV-202508-1-001",
+    )
+    return {
+        "receipt": (
+            booking,
+            receipts.render_booking_receipt_pdf,
+            receipts.booking_receipt_inputs,
+        ),
+        "owner-statement": (
+            booking,
+            receipts.render_owner_earnings_statement_pdf,
+            receipts.owner_earnings_statement_inputs,
+        ),
+        "fee-invoice": (
+            invoice,
+            receipts.render_owner_fee_tax_invoice_pdf,
+            receipts.owner_fee_tax_invoice_inputs,
+        ),
+        "promotion-receipt": (
+            slot,
+            receipts.render_promotion_receipt_pdf,
+            receipts.promotion_receipt_inputs,
+        ),
+    }
+
+
+def _run_worker(kind: str, iterations: int, mode: str) -> list[float]:
+    obj, render, inputs = _sample_documents()[kind]
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        if mode == "render":
+            render(obj)
+        else:
+            receipts.pdf_cache_key(kind, inputs(obj))
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure receipt/statement/invoice PDFs rendered per second per worker process, "
+        "next to the cost of computing the render cache key (no DB or S3 traffic)."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=200,
+            help="Documents rendered per worker for each kind.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Concurrent worker processes, approximating the pdfs queue concurrency.",
+        )
+        parser.add_argument(
+            "--kind",
+            action="append",
+            choices=["receipt", "owner-statement", "fee-invoice", "promotion-receipt"],
+            help="Restrict to these document kinds (repeatable).",
+        )
+
+    def handle(self, *args, **options) -> None:
+        iterations = options["iterations"]
+        workers = options["workers"]
+        if iterations <= 0 or workers <= 0:
+            raise CommandError("--iterations and --workers must be greater than 0.")
+        kinds = options["kind"] or list(_sample_documents())
+
+        for kind in kinds:
+            for mode in ("render", "cache-key"):
+                wall_started = time.perf_counter()
+                if workers == 1:
+                    batches = [_run_worker(kind, iterations, mode)]
+                else:
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        batches = list(
+                            executor.map(
+                                _run_worker,
+                                [kind] * workers,
+                                [iterations] * workers,
+                                [mode] * workers,
+                            )
+                        )
+                elapsed = time.perf_counter() - wall_started
+                samples = [sample for batch in batches for sample in batch]
+                total_rate = len(samples) / elapsed
+                self.stdout.write(
+                    f"{kind:<18} {mode:<9} {total_rate / workers:9.1f}/s per worker "
+                    f"({total_rate:9.1f}/s total) "
+                    f"p50={statistics.median(samples):7.2f}ms "
+                    f"p95={percentile(samples, 95):7.2f}ms"
+                )
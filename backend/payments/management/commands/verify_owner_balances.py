@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from payments.ledger import rebuild_owner_balance, recompute_owner_balance
+from payments.models import OwnerBalance, OwnerPendingEarning
+
+
+class Command(BaseCommand):
+    help = "Compare owner balance snapshots against a full ledger recompute."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--user-id",
+            type=int,
+            action="append",
+            default=[],
+            help="Only verify these owners (repeatable).",
+        )
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Rebuild snapshots that do not match the ledger.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        balances = OwnerBalance.objects.order_by("user_id")
+        if options["user_id"]:
+            balances = balances.filter(user_id__in=options["user_id"])
+
+        checked = 0
+        mismatched: list[int] = []
+        for balance in balances:
+            checked += 1
+            now = timezone.now()
+            expected = recompute_owner_balance(balance.user_id, now=now)
+            rows = OwnerPendingEarning.objects.filter(user_id=balance.user_id).values_list(
+                "transaction_id", "amount", "available_at"
+            )
+            # Same view as the read path: matured rows count as available.
+            available = balance.available
+            pending = {}
+            for tx_id, amount, available_at in rows:
+                if available_at <= now:
+                    available += amount
+                else:
+                    pending[tx_id] = amount
+            expected_pending = {tx_id: amount for tx_id, (amount, _) in expected["pending"].items()}
+            if (
+                balance.total == expected["total"]
+                and available == expected["available"]
+                and pending == expected_pending
+            ):
+                continue
+            mismatched.append(balance.user_id)
+            self.stdout.write(
+                f"user {balance.user_id}: snapshot total={balance.total} "
+                f"available={available}, ledger total={expected['total']} "
+                f"available={expected['available']}"
+            )
+            if options["repair"]:
+                rebuild_owner_balance(balance.user_id)
+
+        summary = f"Owner balances checked: {checked}, mismatched: {len(mismatched)}"
+        if mismatched and not options["repair"]:
+            raise CommandError(summary)
+        self.stdout.write(self.style.SUCCESS(summary))
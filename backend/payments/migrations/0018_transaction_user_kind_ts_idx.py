@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0017_stripewebhookevent"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["user", "kind", "created_at", "id"],
+                name="payments_tx_user_kind_ts_idx",
+            ),
+        ),
+    ]
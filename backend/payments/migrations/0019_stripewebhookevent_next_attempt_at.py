@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0018_transaction_user_kind_ts_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stripewebhookevent",
+            name="next_attempt_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-17 02:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0019_stripewebhookevent_next_attempt_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["user", "created_at", "id"],
+                name="payments_tx_user_ts_idx",
+            ),
+        ),
+    ]
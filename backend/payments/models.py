@@ -52,11 +52,104 @@ class Transaction(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Keyset pagination of /owner/payouts/history by (created_at, id), with and
+            # without a kind filter.
+            models.Index(
+                fields=["user", "created_at", "id"],
+                name="payments_tx_user_ts_idx",
+            ),
+            models.Index(
+                fields=["user", "kind", "created_at", "id"],
+                name="payments_tx_user_kind_ts_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.user} {self.kind} {self.amount} {self.currency}"
 
 
+class OwnerBalance(models.Model):
+    """
+    Running owner balance maintained by ``payments.ledger`` as transactions are written.
+
+    ``available`` excludes earnings still listed in ``OwnerPendingEarning``; reads add
+    the pending rows that have matured since the last release run.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="owner_balance",
+    )
+    total = models.DecimalField(max_digits=12, decimal_places=2, default="0.00")
+    available = models.DecimalField(max_digits=12, decimal_places=2, default="0.00")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.user_id} total={self.total} available={self.available}"
+
+
+class OwnerPendingEarning(models.Model):
+    """An owner earning that becomes spendable at ``available_at``."""
+
+    transaction = models.OneToOneField(
+        Transaction,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="pending_release",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="pending_owner_earnings",
+    )
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    available_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "available_at"], name="owner_pending_user_at_idx"),
+            models.Index(fields=["available_at"], name="owner_pending_at_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} {self.amount} at {self.available_at}"
+
+
+class StripeProcessingFee(models.Model):
+    """
+    Stripe processing fee for a PaymentIntent / Charge / Checkout Session.
+
+    Rows are created pending when a charge is recorded and resolved in the background,
+    so finance exports read fees from the database instead of the Stripe API.
+    """
+
+    stripe_id = models.CharField(max_length=255, unique=True)
+    fee = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="Processing fee in major currency units; null until resolved.",
+    )
+    resolved_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.CharField(max_length=255, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["resolved_at", "attempts"], name="stripe_fee_pending_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.stripe_id} fee={self.fee}"
+
+
 class OwnerPayoutAccount(models.Model):
     """Stripe Connect Express account tracking for listing owners."""
 
@@ -176,3 +269,41 @@ class PaymentSetupIntent(models.Model):
 
     def __str__(self) -> str:
         return f"{self.user} setup_intent={self.stripe_setup_intent_id} ({self.intent_type})"
+
+
+class StripeWebhookEvent(models.Model):
+    """
+    A verified Stripe webhook stored for asynchronous processing.
+
+    ``event_id`` is unique so Stripe's retries are acknowledged without being applied
+    twice. Events sharing an ``ordering_key`` (booking, account or Stripe object) are
+    processed one at a time in arrival order.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        PROCESSED = "processed", "Processed"
+        FAILED = "failed", "Failed"
+
+    event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=120)
+    ordering_key = models.CharField(max_length=160)
+    account_id = models.CharField(max_length=120, blank=True, default="")
+    payload = models.JSONField()
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.CharField(max_length=255, blank=True, default="")
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["ordering_key", "status", "id"], name="stripe_evt_key_status_idx"),
+            models.Index(fields=["status", "received_at"], name="stripe_evt_status_recv_idx"),
+            models.Index(fields=["account_id", "event_type"], name="stripe_evt_account_type_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event_type} {self.event_id} ({self.status})"
@@ -9,6 +9,7 @@ from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from . import stripe_cache
 from .models import PaymentMethod, PaymentSetupIntent
 from .stripe_api import (
     StripeConfigurationError,
@@ -216,6 +217,7 @@ class PaymentMethodViewSet(viewsets.ModelViewSet):
     def perform_destroy(self, instance: PaymentMethod) -> None:
         payment_method_id = instance.stripe_payment_method_id
         if payment_method_id:
+            stripe_cache.invalidate_payment_method(payment_method_id)
             try:
                 stripe.api_key = _get_stripe_api_key()
                 stripe.PaymentMethod.detach(payment_method_id)
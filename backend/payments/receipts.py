@@ -1,13 +1,26 @@
-"""Utilities for rendering booking payment receipts."""
+"""Utilities for rendering booking payment receipts.
+
+Rendered PDFs are stored content-addressed under ``uploads/private/pdf-cache/``: the key
+is a hash of ``PDF_TEMPLATE_VERSION`` plus every value the template prints, so re-sends
+and downloads reuse the stored object and any change to the inputs (or a template
+version bump) produces a fresh render. ``queue_booking_pdf_prerender`` and
+``queue_promotion_pdf_prerender`` warm the cache on the low-priority ``pdfs`` queue right
+after payment, before the notification emails ask for the attachments.
+"""
 
 from __future__ import annotations
 
+import hashlib
+import json
+import logging
 from dataclasses import dataclass
 from datetime import date, timedelta
 from decimal import ROUND_HALF_UP, Decimal
+from functools import partial
 from io import BytesIO
-from typing import Iterable, Mapping, Tuple
+from typing import Callable, Iterable, Mapping, Tuple
 
+from botocore.exceptions import ClientError
 from django.conf import settings
 from django.utils import timezone
 from reportlab.lib.pagesizes import letter  # Requires reportlab package.
@@ -19,6 +32,12 @@ from payments.models import OwnerFeeTaxInvoice
 from promotions.models import PromotedSlot
 from storage import s3 as storage_s3
 
+logger = logging.getLogger(__name__)
+
+# Bump whenever a render_* function changes its layout or wording.
+PDF_TEMPLATE_VERSION = 1
+PDF_CACHE_PREFIX = "uploads/private/pdf-cache"
+
 _TWO_PLACES = Decimal("0.01")
 _ZERO = Decimal("0.00")
 _BRAND_COLOR = (79 / 255, 134 / 255, 182 / 255)  # Rentino blue
@@ -65,6 +84,150 @@ def _cents_to_decimal(value: int | Decimal) -> Decimal:
     return (Decimal(value) / Decimal("100")).quantize(_TWO_PLACES, rounding=ROUND_HALF_UP)
 
 
+def _pdf_digest(kind: str, inputs: Mapping[str, object]) -> str:
+    payload = json.dumps(
+        {"kind": kind, "template_version": PDF_TEMPLATE_VERSION, "inputs": inputs},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def pdf_cache_key(kind: str, inputs: Mapping[str, object]) -> str:
+    """S3 key for a rendered PDF; identical render inputs always map to the same key."""
+    return f"{PDF_CACHE_PREFIX}/{kind}/{_pdf_digest(kind, inputs)}.pdf"
+
+
+def _cache_miss(exc: ClientError, key: str) -> None:
+    # Missing objects surface as 404, or 403 without s3:ListBucket; either way render.
+    code = (exc.response.get("Error") or {}).get("Code")
+    if code not in ("404", "NoSuchKey", "NotFound"):
+        logger.info("receipts: cached PDF %s unreadable (%s); re-rendering", key, code)
+
+
+def _fetch_cached_pdf(key: str) -> bytes | None:
+    try:
+        response = storage_s3._client().get_object(
+            Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+            Key=key,
+        )
+    except ClientError as exc:
+        _cache_miss(exc, key)
+        return None
+    return response["Body"].read()
+
+
+def _cached_pdf_exists(key: str) -> bool:
+    try:
+        storage_s3._client().head_object(Bucket=settings.AWS_STORAGE_BUCKET_NAME, Key=key)
+    except ClientError as exc:
+        _cache_miss(exc, key)
+        return False
+    return True
+
+
+def _store_pdf(key: str, pdf_bytes: bytes) -> None:
+    storage_s3._client().put_object(
+        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
+        Key=key,
+        Body=pdf_bytes,
+        ContentType="application/pdf",
+    )
+
+
+def _get_or_render_pdf(
+    kind: str, inputs: Mapping[str, object], render: Callable[[], bytes]
+) -> Tuple[str, str, bytes]:
+    key = pdf_cache_key(kind, inputs)
+    pdf_bytes = _fetch_cached_pdf(key)
+    if pdf_bytes is None:
+        pdf_bytes = render()
+        _store_pdf(key, pdf_bytes)
+    return key, storage_s3.public_url(key), pdf_bytes
+
+
+def _ensure_pdf_cached(
+    kind: str, inputs: Mapping[str, object], render: Callable[[], bytes]
+) -> bool:
+    """Render and store the PDF unless it is already cached; returns True if rendered."""
+    key = pdf_cache_key(kind, inputs)
+    if _cached_pdf_exists(key):
+        return False
+    _store_pdf(key, render())
+    return True
+
+
+def _user_inputs(user) -> dict[str, object]:
+    return {
+        "name": _display_name(user),
+        "email": getattr(user, "email", "") or "",
+        "phone": getattr(user, "phone", "") or "",
+    }
+
+
+def booking_receipt_inputs(booking: Booking) -> dict[str, object]:
+    """Everything ``render_booking_receipt_pdf`` prints, as the cache key input."""
+    return {
+        "booking_id": booking.id,
+        "totals": booking.totals or {},
+        "renter": _user_inputs(getattr(booking, "renter", None)),
+        "owner": _user_inputs(getattr(booking, "owner", None)),
+        "listing_title": getattr(getattr(booking, "listing", None), "title", "Listing"),
+        "start_date": booking.start_date,
+        "end_date": booking.end_date,
+        "created_on": _local_date(booking.created_at),
+        "paid_on": _local_date(booking.updated_at or booking.created_at),
+    }
+
+
+def owner_earnings_statement_inputs(booking: Booking) -> dict[str, object]:
+    """Everything ``render_owner_earnings_statement_pdf`` prints."""
+    return {
+        "booking_id": booking.id,
+        "totals": booking.totals or {},
+        "owner": _user_inputs(getattr(booking, "owner", None)),
+        "listing_title": getattr(getattr(booking, "listing", None), "title", "Listing"),
+        "start_date": booking.start_date,
+        "end_date": booking.end_date,
+        "created_on": _local_date(booking.created_at),
+    }
+
+
+def owner_fee_tax_invoice_inputs(invoice: OwnerFeeTaxInvoice) -> dict[str, object]:
+    """Everything ``render_owner_fee_tax_invoice_pdf`` prints (it is dated the day it renders)."""
+    return {
+        "invoice_number": invoice.invoice_number,
+        "fee_subtotal": invoice.fee_subtotal,
+        "gst": invoice.gst,
+        "total": invoice.total,
+        "gst_number": invoice.gst_number_snapshot,
+        "period_start": invoice.period_start,
+        "period_end": invoice.period_end,
+        "owner": _user_inputs(getattr(invoice, "owner", None)),
+        "issued_on": date.today(),
+    }
+
+
+def promotion_receipt_inputs(slot: PromotedSlot) -> dict[str, object]:
+    """Everything ``render_promotion_receipt_pdf`` prints."""
+    listing = getattr(slot, "listing", None)
+    return {
+        "slot_id": slot.id,
+        "base_price_cents": getattr(slot, "base_price_cents", 0),
+        "gst_cents": getattr(slot, "gst_cents", 0),
+        "total_price_cents": getattr(slot, "total_price_cents", 0),
+        "price_per_day_cents": getattr(slot, "price_per_day_cents", 0),
+        "owner": _user_inputs(getattr(slot, "owner", None)),
+        "listing_title": getattr(listing, "title", "Listing"),
+        "listing_city": getattr(listing, "city", "") or "",
+        "starts_on": _local_date(getattr(slot, "starts_at", None)),
+        "ends_on": _local_date(getattr(slot, "ends_at", None)),
+        "duration_days": _promotion_duration_days(slot),
+        "created_on": _local_date(getattr(slot, "created_at", None)),
+        "paid_on": _local_date(getattr(slot, "updated_at", None)),
+    }
+
+
 def render_booking_receipt_pdf(booking: Booking) -> bytes:
     """
     Render a PDF receipt for a paid booking.
@@ -322,24 +485,18 @@ def render_owner_earnings_statement_pdf(booking: Booking) -> bytes:
 
 def upload_owner_earnings_statement_pdf(booking: Booking) -> Tuple[str, str, bytes]:
     """
-    Generate and upload an owner earnings statement PDF to S3.
+    Fetch an owner earnings statement PDF from the S3 render cache, rendering on a miss.
 
     Returns a tuple of (key, url, pdf_bytes) for the uploaded file.
     """
     if not booking.id:
         raise ValueError("Booking must be persisted before generating a statement.")
 
-    pdf_bytes = render_owner_earnings_statement_pdf(booking)
-    key = f"uploads/private/owner-statements/{booking.id}_owner_statement.pdf"
-
-    storage_s3._client().put_object(
-        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-        Key=key,
-        Body=pdf_bytes,
-        ContentType="application/pdf",
+    return _get_or_render_pdf(
+        "owner-statements",
+        owner_earnings_statement_inputs(booking),
+        lambda: render_owner_earnings_statement_pdf(booking),
     )
-    url = storage_s3.public_url(key)
-    return key, url, pdf_bytes
 
 
 def render_owner_fee_tax_invoice_pdf(invoice: OwnerFeeTaxInvoice) -> bytes:
@@ -437,41 +594,29 @@ def render_owner_fee_tax_invoice_pdf(invoice: OwnerFeeTaxInvoice) -> bytes:
 
 def upload_owner_fee_tax_invoice_pdf(invoice: OwnerFeeTaxInvoice) -> Tuple[str, str, bytes]:
     """
-    Generate and upload a monthly tax invoice PDF to S3.
+    Fetch a monthly tax invoice PDF from the S3 render cache, rendering on a miss.
     """
-    pdf_bytes = render_owner_fee_tax_invoice_pdf(invoice)
-    key = f"uploads/private/fee-invoices/{invoice.invoice_number}.pdf"
-
-    storage_s3._client().put_object(
-        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-        Key=key,
-        Body=pdf_bytes,
-        ContentType="application/pdf",
+    return _get_or_render_pdf(
+        "fee-invoices",
+        owner_fee_tax_invoice_inputs(invoice),
+        lambda: render_owner_fee_tax_invoice_pdf(invoice),
     )
-    url = storage_s3.public_url(key)
-    return key, url, pdf_bytes
 
 
 def upload_booking_receipt_pdf(booking: Booking) -> Tuple[str, str, bytes]:
     """
-    Generate and upload a booking receipt PDF to S3.
+    Fetch a booking receipt PDF from the S3 render cache, rendering on a miss.
 
     Returns a tuple of (key, url, pdf_bytes) for the uploaded file.
     """
     if not booking.id:
         raise ValueError("Booking must be persisted before generating a receipt.")
 
-    pdf_bytes = render_booking_receipt_pdf(booking)
-    key = f"uploads/private/receipts/{booking.id}_receipt.pdf"
-
-    storage_s3._client().put_object(
-        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-        Key=key,
-        Body=pdf_bytes,
-        ContentType="application/pdf",
+    return _get_or_render_pdf(
+        "receipts",
+        booking_receipt_inputs(booking),
+        lambda: render_booking_receipt_pdf(booking),
     )
-    url = storage_s3.public_url(key)
-    return key, url, pdf_bytes
 
 
 def render_promotion_receipt_pdf(slot: PromotedSlot) -> bytes:
@@ -590,24 +735,18 @@ def render_promotion_receipt_pdf(slot: PromotedSlot) -> bytes:
 
 def upload_promotion_receipt_pdf(slot: PromotedSlot) -> Tuple[str, str, bytes]:
     """
-    Generate and upload a promotion receipt PDF to S3.
+    Fetch a promotion receipt PDF from the S3 render cache, rendering on a miss.
 
     Returns a tuple of (key, url, pdf_bytes) for the uploaded file.
     """
     if not slot.id:
         raise ValueError("Promotion slot must be persisted before generating a receipt.")
 
-    pdf_bytes = render_promotion_receipt_pdf(slot)
-    key = f"uploads/private/receipts/promotions/{slot.id}_promotion_receipt.pdf"
-
-    storage_s3._client().put_object(
-        Bucket=settings.AWS_STORAGE_BUCKET_NAME,
-        Key=key,
-        Body=pdf_bytes,
-        ContentType="application/pdf",
+    return _get_or_render_pdf(
+        "promotion-receipts",
+        promotion_receipt_inputs(slot),
+        lambda: render_promotion_receipt_pdf(slot),
     )
-    url = storage_s3.public_url(key)
-    return key, url, pdf_bytes
 
 
 def _extract_payment_breakdown(totals: Mapping[str, object]) -> _PaymentBreakdown:
@@ -749,7 +888,85 @@ def _promotion_duration_days(slot: PromotedSlot) -> int:
     return 0
 
 
+def prerender_booking_pdfs(booking_id: int) -> dict[str, bool]:
+    """
+    Warm the render cache for a paid booking's receipt and owner statement.
+
+    Returns ``{document: rendered}``; documents that fail are logged and reported as
+    ``False`` so the email tasks fall back to rendering them on demand.
+    """
+    booking = (
+        Booking.objects.select_related("listing", "owner", "renter").filter(pk=booking_id).first()
+    )
+    if booking is None:
+        return {}
+    documents = (
+        ("receipt", "receipts", booking_receipt_inputs, render_booking_receipt_pdf),
+        (
+            "owner_statement",
+            "owner-statements",
+            owner_earnings_statement_inputs,
+            render_owner_earnings_statement_pdf,
+        ),
+    )
+    results: dict[str, bool] = {}
+    for name, kind, inputs, render in documents:
+        try:
+            results[name] = _ensure_pdf_cached(kind, inputs(booking), partial(render, booking))
+        except Exception:
+            logger.exception("receipts: failed to pre-render %s for booking %s", name, booking_id)
+            results[name] = False
+    return results
+
+
+def prerender_promotion_receipt_pdf(slot_id: int) -> dict[str, bool]:
+    """Warm the render cache for a paid promotion slot's receipt."""
+    slot = PromotedSlot.objects.select_related("listing", "owner").filter(pk=slot_id).first()
+    if slot is None:
+        return {}
+    try:
+        rendered = _ensure_pdf_cached(
+            "promotion-receipts",
+            promotion_receipt_inputs(slot),
+            lambda: render_promotion_receipt_pdf(slot),
+        )
+    except Exception:
+        logger.exception("receipts: failed to pre-render promotion receipt for slot %s", slot_id)
+        rendered = False
+    return {"promotion_receipt": rendered}
+
+
+def queue_booking_pdf_prerender(booking_id: int) -> None:
+    """Queue ``payments.prerender_booking_pdfs`` on the low-priority ``pdfs`` queue."""
+    from payments.tasks import prerender_booking_pdfs as _task
+
+    try:
+        _task.delay(booking_id)
+    except Exception:
+        logger.info("receipts: could not queue PDF pre-render for booking %s", booking_id)
+
+
+def queue_promotion_pdf_prerender(slot_id: int) -> None:
+    """Queue ``payments.prerender_promotion_receipt_pdf`` on the ``pdfs`` queue."""
+    from payments.tasks import prerender_promotion_receipt_pdf as _task
+
+    try:
+        _task.delay(slot_id)
+    except Exception:
+        logger.info("receipts: could not queue PDF pre-render for promotion slot %s", slot_id)
+
+
 __all__ = [
+    "PDF_TEMPLATE_VERSION",
+    "pdf_cache_key",
+    "booking_receipt_inputs",
+    "owner_earnings_statement_inputs",
+    "owner_fee_tax_invoice_inputs",
+    "promotion_receipt_inputs",
+    "prerender_booking_pdfs",
+    "prerender_promotion_receipt_pdf",
+    "queue_booking_pdf_prerender",
+    "queue_promotion_pdf_prerender",
     "render_booking_receipt_pdf",
     "upload_booking_receipt_pdf",
     "render_promotion_receipt_pdf",
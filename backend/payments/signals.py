@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from bookings.models import Booking
+from bookings.signals import booking_snapshot
+
+from .ledger import (
+    _balance_effect,
+    apply_transaction_to_balance,
+    invalidate_history_counts,
+    rebuild_owner_balance,
+    remove_transaction_from_balance,
+)
+from .models import OwnerPendingEarning, Transaction
+
+
+@receiver(post_save, sender=Transaction, dispatch_uid="owner_balance_apply_on_save")
+def _update_owner_balance_on_save(sender, instance: Transaction, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        apply_transaction_to_balance(instance)
+    else:
+        # Edits are rare (e.g. Stripe availability dates); recompute instead of diffing.
+        rebuild_owner_balance(instance.user_id, create=False)
+
+
+@receiver(pre_delete, sender=Transaction, dispatch_uid="owner_balance_capture_before_delete")
+def _capture_balance_effect(sender, instance: Transaction, **kwargs):
+    amount, _ = _balance_effect(instance)
+    instance._balance_removal = (
+        amount,
+        OwnerPendingEarning.objects.filter(transaction_id=instance.pk).exists(),
+    )
+
+
+@receiver(post_delete, sender=Transaction, dispatch_uid="owner_balance_remove_on_delete")
+def _update_owner_balance_on_delete(sender, instance: Transaction, **kwargs):
+    removal = getattr(instance, "_balance_removal", None)
+    if removal is None:
+        return
+    # Adjust in place rather than rebuilding: the delete may be a cascade from the user.
+    amount, pending = removal
+    remove_transaction_from_balance(instance, amount=amount, pending=pending)
+
+
+@receiver(post_save, sender=Transaction, dispatch_uid="history_count_invalidate_on_save")
+@receiver(post_delete, sender=Transaction, dispatch_uid="history_count_invalidate_on_delete")
+def _invalidate_history_counts(sender, instance: Transaction, raw=False, **kwargs):
+    if raw:
+        return
+    # Bump now for this connection and again at commit, so a count cached by another
+    # request between the write and the commit is not reused.
+    invalidate_history_counts(instance.user_id)
+    transaction.on_commit(partial(invalidate_history_counts, instance.user_id))
+
+
+@receiver(post_save, sender=Booking, dispatch_uid="owner_balance_reschedule_on_booking_save")
+def _reschedule_owner_earnings(sender, instance: Booking, created, raw=False, **kwargs):
+    # The snapshot is captured by the bookings pre_save handler.
+    before = booking_snapshot(instance)
+    if raw or created or before is None or before["end_date"] == instance.end_date:
+        return
+    owner_ids = (
+        Transaction.objects.filter(booking=instance, kind=Transaction.Kind.OWNER_EARNING)
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+    for user_id in owner_ids:
+        rebuild_owner_balance(user_id, create=False)
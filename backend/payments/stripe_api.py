@@ -20,6 +20,7 @@ from rest_framework.response import Response
 from bookings.models import Booking
 from identity.models import IdentityVerification
 from listings.models import Listing
+from payments import stripe_cache
 from payments.ledger import log_transaction
 from payments.models import OwnerPayoutAccount, PaymentSetupIntent, Transaction
 from promotions.models import PromotedSlot, PromotionCheckoutSession
@@ -2385,6 +2386,8 @@ def ensure_stripe_customer(
     Return an existing Stripe Customer ID for the user, creating one if necessary.
 
     - Request-scoped cache avoids multiple Stripe Customer.retrieve calls per request.
+    - The shared cache (``payments.stripe_cache``) skips revalidation across requests
+      while the stored id matches the one verified last.
     - A verification timestamp throttles revalidation of existing customer IDs.
     """
     stripe.api_key = _get_stripe_api_key()
@@ -2397,6 +2400,10 @@ def ensure_stripe_customer(
 
     stored_id = (getattr(user, "stripe_customer_id", "") or "").strip()
     candidate_id = (customer_id or stored_id or "").strip()
+    if cache_key is not None and candidate_id and candidate_id == stored_id:
+        if stripe_cache.get_cached_customer_id(int(cache_key)) == candidate_id:
+            cache[int(cache_key)] = candidate_id
+            return candidate_id
     now = timezone.now()
     verified_at = getattr(user, "stripe_customer_verified_at", None)
     needs_verification = bool(candidate_id) and (
@@ -2439,6 +2446,7 @@ def ensure_stripe_customer(
 
     if cache_key is not None and candidate_id:
         cache[int(cache_key)] = candidate_id
+        stripe_cache.cache_customer_id(int(cache_key), candidate_id)
 
     return candidate_id
 
@@ -2547,6 +2555,29 @@ def create_or_reuse_setup_intent(
     )
 
 
+def _get_payment_method(
+    payment_method_id: str,
+    *,
+    cache_scope: object | None = None,
+    customer_id: str | None = None,
+) -> dict[str, Any]:
+    """Return a PaymentMethod snapshot from the request cache, shared cache or Stripe."""
+    cache = _get_payment_method_cache(cache_scope)
+    payment_method = cache.get(payment_method_id)
+    if payment_method is not None:
+        return payment_method
+    payment_method = stripe_cache.get_cached_payment_method(payment_method_id)
+    if payment_method is None:
+        try:
+            _log_stripe_call("payment_method.retrieve", customer_id=customer_id)
+            retrieved = stripe.PaymentMethod.retrieve(payment_method_id)
+        except stripe.error.StripeError as exc:
+            _handle_stripe_error(exc)
+        payment_method = stripe_cache.cache_payment_method(payment_method_id, retrieved)
+    cache[payment_method_id] = payment_method
+    return payment_method
+
+
 def _ensure_payment_method_for_customer(
     payment_method_id: str,
     customer_id: str,
@@ -2561,16 +2592,10 @@ def _ensure_payment_method_for_customer(
         return
 
     stripe.api_key = _get_stripe_api_key()
-    cache = _get_payment_method_cache(cache_scope)
-    payment_method = cache.get(payment_method_id)
-    if payment_method is None:
-        try:
-            _log_stripe_call("payment_method.retrieve", customer_id=customer_id)
-            payment_method = stripe.PaymentMethod.retrieve(payment_method_id)
-            cache[payment_method_id] = payment_method
-        except stripe.error.StripeError as exc:
-            _handle_stripe_error(exc)
-    attached_customer = getattr(payment_method, "customer", None)
+    payment_method = _get_payment_method(
+        payment_method_id, cache_scope=cache_scope, customer_id=customer_id
+    )
+    attached_customer = payment_method["customer"]
     if attached_customer == customer_id:
         return
     if attached_customer and attached_customer != customer_id:
@@ -2578,13 +2603,17 @@ def _ensure_payment_method_for_customer(
             _log_stripe_call("payment_method.detach", customer_id=attached_customer)
             stripe.PaymentMethod.detach(payment_method_id)
         except stripe.error.StripeError as exc:
+            stripe_cache.invalidate_payment_method(payment_method_id)
             _handle_stripe_error(exc)
     try:
         _log_stripe_call("payment_method.attach", customer_id=customer_id)
         attached_pm = stripe.PaymentMethod.attach(payment_method_id, customer=customer_id)
-        cache[payment_method_id] = attached_pm
     except stripe.error.StripeError as exc:
+        stripe_cache.invalidate_payment_method(payment_method_id)
         _handle_stripe_error(exc)
+    _get_payment_method_cache(cache_scope)[payment_method_id] = stripe_cache.cache_payment_method(
+        payment_method_id, attached_pm
+    )
 
 
 def fetch_payment_method_details(
@@ -2597,22 +2626,7 @@ def fetch_payment_method_details(
         raise StripePaymentError("payment_method_id is required.")
 
     stripe.api_key = _get_stripe_api_key()
-    cache = _get_payment_method_cache(cache_scope)
-    pm = cache.get(payment_method_id)
-    if pm is None:
-        try:
-            _log_stripe_call("payment_method.retrieve", customer_id=None)
-            pm = stripe.PaymentMethod.retrieve(payment_method_id)
-            cache[payment_method_id] = pm
-        except stripe.error.StripeError as exc:
-            _handle_stripe_error(exc)
-
-    card = getattr(pm, "card", None) or getattr(pm, "card", {}) or {}
-    if hasattr(card, "get"):
-        card_dict = card
-    else:
-        # stripe objects behave like dicts
-        card_dict = dict(card)
+    card_dict = _get_payment_method(payment_method_id, cache_scope=cache_scope)["card"]
 
     return {
         "brand": (card_dict.get("brand") or "").upper(),
@@ -2723,7 +2737,7 @@ def _log_owner_payout_event(*, event_type: str, data_object: dict, account_id: s
 @authentication_classes([])
 @permission_classes([])
 def stripe_webhook(request):
-    """Handle Stripe webhook callbacks for booking-related PaymentIntents."""
+    """Verify a Stripe webhook, store it and hand it to the Celery consumer."""
     payload = request.body
     sig_header = request.META.get("HTTP_STRIPE_SIGNATURE", "")
     endpoint_secret = getattr(settings, "STRIPE_WEBHOOK_SECRET", "")
@@ -2739,25 +2753,31 @@ def stripe_webhook(request):
     except stripe.error.SignatureVerificationError:
         return Response(status=status.HTTP_400_BAD_REQUEST)
 
+    from payments.webhooks import ingest_stripe_event
+
+    # Processing happens in payments.process_stripe_webhook_events; Stripe only needs a 2xx.
+    ingest_stripe_event(event)
+    return Response(status=status.HTTP_200_OK)
+
+
+def handle_stripe_event(event: dict) -> None:
+    """Apply one verified Stripe event (called by the webhook consumer, in event order)."""
     event_type = event.get("type")
     data_object = event.get("data", {}).get("object", {}) or {}
+    if stripe_cache.invalidate_from_stripe_event(event_type or "", data_object):
+        return
     metadata = data_object.get("metadata") or {}
     booking_id = metadata.get("booking_id")
     kind = metadata.get("kind")
 
     account_id = event.get("account") or data_object.get("account") or ""
-    account_data: Any | None = None
+    if event_type == "account.updated":
+        account_id = account_id or data_object.get("id") or ""
     if account_id:
-        try:
-            account_data = _retrieve_account_with_expand(account_id)
-            _handle_connect_account_updated_event(account_data)
-        except StripeConfigurationError:
-            logger.warning("stripe_webhook: missing Stripe config for account sync")
-        except stripe.error.StripeError as exc:  # noqa: PERF203
-            logger.warning(
-                "stripe_webhook: failed to sync connect account",
-                extra={"account_id": account_id, "error": str(exc)},
-            )
+        from payments.webhooks import queue_connect_account_sync
+
+        # Bursts of events for one account collapse into a single expanded fetch.
+        queue_connect_account_sync(account_id)
 
     if event_type == "payout.paid":
         _log_owner_payout_event(
@@ -2765,23 +2785,20 @@ def stripe_webhook(request):
             data_object=data_object,
             account_id=account_id,
         )
-        return Response(status=status.HTTP_200_OK)
+        return
 
     if event_type == "account.updated":
-        if account_data is not None:
-            return Response(status=status.HTTP_200_OK)
-        _handle_connect_account_updated_event(data_object)
-        return Response(status=status.HTTP_200_OK)
+        return
 
     if event_type == "identity.verification_session.verified":
         user_id = metadata.get("user_id")
         session_id = data_object.get("id")
         if not user_id or not session_id:
-            return Response(status=status.HTTP_200_OK)
+            return
         try:
             user = User.objects.get(pk=int(user_id))
         except (User.DoesNotExist, ValueError, TypeError):
-            return Response(status=status.HTTP_200_OK)
+            return
 
         IdentityVerification.objects.update_or_create(
             user=user,
@@ -2797,11 +2814,7 @@ def stripe_webhook(request):
             "Stripe identity session verified",
             extra={"user_id": user.id, "session_id": session_id},
         )
-        return Response(status=status.HTTP_200_OK)
-
-    if event_type == "account.updated":
-        _handle_connect_account_updated_event(data_object)
-        return Response(status=status.HTTP_200_OK)
+        return
 
     if event_type == "checkout.session.completed":
         session_metadata = metadata or {}
@@ -2814,12 +2827,12 @@ def stripe_webhook(request):
                     session_url=session_url or None,
                     consumed_at=timezone.now(),
                 )
-            return Response(status=status.HTTP_200_OK)
+            return
         session_id = data_object.get("id", "")
         session_url = data_object.get("url", "") or ""
         if not session_id:
             logger.warning("stripe_webhook: promotion session missing id")
-            return Response(status=status.HTTP_200_OK)
+            return
         PromotionCheckoutSession.objects.filter(stripe_session_id=session_id).update(
             status="completed",
             session_url=session_url or None,
@@ -2832,9 +2845,9 @@ def stripe_webhook(request):
         )
         if slot is None:
             logger.info("stripe_webhook: no promoted slot for session %s", session_id)
-            return Response(status=status.HTTP_200_OK)
+            return
         if slot.active:
-            return Response(status=status.HTTP_200_OK)
+            return
 
         updated_fields = ["active", "updated_at"]
         current_tz = timezone.get_current_timezone()
@@ -2873,19 +2886,23 @@ def stripe_webhook(request):
 
         slot.active = True
         slot.save(update_fields=updated_fields)
-        return Response(status=status.HTTP_200_OK)
+        return
 
     if event_type == "payment_intent.succeeded" and booking_id and kind == "booking_charge":
         try:
             booking = Booking.objects.get(pk=int(booking_id))
         except (Booking.DoesNotExist, ValueError):
-            return Response(status=status.HTTP_200_OK)
+            return
 
         intent_id = data_object.get("id", "") or booking.charge_payment_intent_id
         if booking.status in {Booking.Status.REQUESTED, Booking.Status.CONFIRMED}:
             booking.status = Booking.Status.PAID
             booking.charge_payment_intent_id = intent_id or booking.charge_payment_intent_id
             booking.save(update_fields=["status", "charge_payment_intent_id", "updated_at"])
+        if intent_id:
+            from payments.stripe_fees import queue_fee_resolution
+
+            queue_fee_resolution(intent_id)
         if getattr(settings, "STRIPE_BOOKINGS_DESTINATION_CHARGES", True):
             try:
                 fees = _extract_booking_fees(booking)
@@ -2895,7 +2912,7 @@ def stripe_webhook(request):
                     booking.id,
                     str(exc) or "fee error",
                 )
-                return Response(status=status.HTTP_200_OK)
+                return
 
             owner_payout = fees["owner_payout"]
             platform_fee_total = fees["platform_fee_total"]
@@ -2958,5 +2975,3 @@ def stripe_webhook(request):
                     intent_payload=data_object,
                     intent_id=intent_id or None,
                 )
-
-    return Response(status=status.HTTP_200_OK)
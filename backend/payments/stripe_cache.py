@@ -0,0 +1,177 @@
+"""Shared cache for Stripe customer ids and PaymentMethod details.
+
+The request/contextvar caches in ``stripe_api`` only dedupe lookups within one request
+or task. This layer sits behind them in the default cache (Redis in production), so
+``/pay``, deposit authorizations and promotion purchases stop re-fetching the same
+``Customer``/``PaymentMethod`` for ``STRIPE_OBJECT_CACHE_TTL_SECONDS``.
+
+Entries are keyed per user (customer id) and per payment method id; only plain data is
+stored. ``customer.*`` and ``payment_method.*`` webhooks invalidate them, as do local
+attach/detach calls. Hit/miss counters are surfaced by the operator health endpoint.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+
+STRIPE_CACHE_PREFIX = "stripe:cache"
+STRIPE_CACHE_STATS_PREFIX = "cache:stripe:stats"
+STRIPE_CACHE_KINDS = ("customer", "payment_method")
+STRIPE_CACHE_COUNTERS = ("hits", "misses", "invalidations")
+
+CUSTOMER_EVENT_TYPES = {"customer.updated", "customer.deleted"}
+PAYMENT_METHOD_EVENT_TYPES = {
+    "payment_method.attached",
+    "payment_method.detached",
+    "payment_method.updated",
+    "payment_method.automatically_updated",
+}
+
+
+def _ttl_seconds() -> int:
+    return max(int(getattr(settings, "STRIPE_OBJECT_CACHE_TTL_SECONDS", 900) or 0), 0)
+
+
+def _value(obj: Any, name: str, default: Any = None) -> Any:
+    if obj is None:
+        return default
+    if hasattr(obj, "get"):
+        try:
+            value = obj.get(name, default)
+        except TypeError:
+            value = default
+        if value is not default:
+            return value
+    return getattr(obj, name, default)
+
+
+def _stat_key(kind: str, counter: str) -> str:
+    return f"{STRIPE_CACHE_STATS_PREFIX}:{kind}:{counter}"
+
+
+def _record(kind: str, counter: str) -> None:
+    key = _stat_key(kind, counter)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def customer_cache_key(user_id: int) -> str:
+    return f"{STRIPE_CACHE_PREFIX}:customer:{int(user_id)}"
+
+
+def payment_method_cache_key(payment_method_id: str) -> str:
+    return f"{STRIPE_CACHE_PREFIX}:pm:{payment_method_id}"
+
+
+def get_cached_customer_id(user_id: int) -> str | None:
+    """Return the customer id verified for ``user_id`` within the TTL, if any."""
+    value = cache.get(customer_cache_key(user_id))
+    _record("customer", "hits" if value else "misses")
+    return value or None
+
+
+def cache_customer_id(user_id: int, customer_id: str) -> None:
+    ttl = _ttl_seconds()
+    if customer_id and ttl:
+        cache.set(customer_cache_key(user_id), customer_id, timeout=ttl)
+
+
+def invalidate_customer(user_id: int) -> None:
+    cache.delete(customer_cache_key(user_id))
+    _record("customer", "invalidations")
+
+
+def payment_method_snapshot(payment_method: Any) -> dict[str, Any]:
+    """Reduce a Stripe PaymentMethod to the fields our callers read."""
+    customer = _value(payment_method, "customer")
+    if customer is not None and not isinstance(customer, str):
+        customer = _value(customer, "id")
+    card = _value(payment_method, "card") or {}
+    return {
+        "id": _value(payment_method, "id") or "",
+        "customer": customer or None,
+        "card": {
+            "brand": _value(card, "brand") or "",
+            "last4": _value(card, "last4") or "",
+            "exp_month": _value(card, "exp_month"),
+            "exp_year": _value(card, "exp_year"),
+        },
+    }
+
+
+def get_cached_payment_method(payment_method_id: str) -> dict[str, Any] | None:
+    value = cache.get(payment_method_cache_key(payment_method_id))
+    _record("payment_method", "hits" if value is not None else "misses")
+    return value
+
+
+def cache_payment_method(payment_method_id: str, payment_method: Any) -> dict[str, Any]:
+    snapshot = payment_method_snapshot(payment_method)
+    snapshot["id"] = snapshot["id"] or payment_method_id
+    ttl = _ttl_seconds()
+    if ttl:
+        cache.set(payment_method_cache_key(payment_method_id), snapshot, timeout=ttl)
+    return snapshot
+
+
+def invalidate_payment_method(payment_method_id: str) -> None:
+    if not payment_method_id:
+        return
+    cache.delete(payment_method_cache_key(payment_method_id))
+    _record("payment_method", "invalidations")
+
+
+def invalidate_from_stripe_event(event_type: str, data_object: Any) -> bool:
+    """Drop cache entries touched by a ``customer.*``/``payment_method.*`` webhook."""
+    if event_type in PAYMENT_METHOD_EVENT_TYPES:
+        invalidate_payment_method(_value(data_object, "id") or "")
+        return True
+    if event_type not in CUSTOMER_EVENT_TYPES:
+        return False
+    customer_id = _value(data_object, "id") or ""
+    if not customer_id:
+        return False
+    from django.contrib.auth import get_user_model
+
+    metadata = _value(data_object, "metadata") or {}
+    user_ids = set(
+        get_user_model().objects.filter(stripe_customer_id=customer_id).values_list("id", flat=True)
+    )
+    try:
+        user_ids.add(int(_value(metadata, "user_id")))
+    except (TypeError, ValueError):
+        pass
+    for user_id in user_ids:
+        invalidate_customer(user_id)
+    return True
+
+
+def stripe_object_cache_stats() -> dict[str, dict[str, Any]]:
+    """Counters per cached object kind, with ``hit_rate`` over hits + misses."""
+    stats: dict[str, dict[str, Any]] = {}
+    for kind in STRIPE_CACHE_KINDS:
+        keys = [_stat_key(kind, counter) for counter in STRIPE_CACHE_COUNTERS]
+        found = cache.get_many(keys)
+        kind_stats: dict[str, Any] = {
+            counter: int(found.get(key) or 0) for counter, key in zip(STRIPE_CACHE_COUNTERS, keys)
+        }
+        lookups = kind_stats["hits"] + kind_stats["misses"]
+        kind_stats["hit_rate"] = round(kind_stats["hits"] / lookups, 4) if lookups else None
+        stats[kind] = kind_stats
+    return stats
+
+
+def reset_stripe_object_cache_stats() -> None:
+    cache.delete_many(
+        [
+            _stat_key(kind, counter)
+            for kind in STRIPE_CACHE_KINDS
+            for counter in STRIPE_CACHE_COUNTERS
+        ]
+    )
@@ -0,0 +1,188 @@
+"""Persisted Stripe processing fees.
+
+Fees are looked up once per Stripe object (``pi_``/``ch_``/``cs_``) and stored in
+``StripeProcessingFee``: charges queue a background resolution when they are recorded,
+and ``backfill_stripe_fees`` resolves anything still missing with a bounded thread pool.
+Finance exports then read fees with ``get_stripe_fees`` and never call Stripe.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from decimal import Decimal
+from typing import Iterable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from bookings.models import Booking
+
+from .models import StripeProcessingFee, Transaction
+from .stripe_api import (
+    StripeConfigurationError,
+    StripePaymentError,
+    StripeTransientError,
+    get_payment_intent_fee,
+)
+
+logger = logging.getLogger(__name__)
+
+FEE_SOURCE_PREFIXES = ("pi_", "ch_", "cs_")
+# Give up on ids Stripe never reports a fee for (e.g. zero-amount or failed charges).
+MAX_FEE_ATTEMPTS = 5
+FEE_LEDGER_KINDS = (Transaction.Kind.PLATFORM_FEE, Transaction.Kind.PROMOTION_CHARGE)
+
+
+def normalize_fee_source_id(value: str | None) -> str | None:
+    value = (value or "").strip()
+    if not value.startswith(FEE_SOURCE_PREFIXES):
+        return None
+    return value
+
+
+def _resolve_workers() -> int:
+    return max(int(getattr(settings, "STRIPE_FEE_RESOLVE_WORKERS", 8) or 1), 1)
+
+
+def ensure_pending_fees(stripe_ids: Iterable[str | None]) -> list[str]:
+    """Create pending rows for fee sources we have not seen yet; returns the valid ids."""
+    ids = sorted({sid for sid in map(normalize_fee_source_id, stripe_ids) if sid})
+    if ids:
+        StripeProcessingFee.objects.bulk_create(
+            [StripeProcessingFee(stripe_id=sid) for sid in ids],
+            ignore_conflicts=True,
+        )
+    return ids
+
+
+def queue_fee_resolution(stripe_id: str | None) -> bool:
+    """Record a pending fee and resolve it in the background once the transaction commits."""
+    ids = ensure_pending_fees([stripe_id])
+    if not ids:
+        return False
+    from .tasks import resolve_stripe_fee
+
+    transaction.on_commit(lambda: resolve_stripe_fee.delay(ids[0]))
+    return True
+
+
+def record_stripe_fee(stripe_id: str | None, fee: Decimal) -> None:
+    stripe_id = normalize_fee_source_id(stripe_id)
+    if not stripe_id:
+        return
+    StripeProcessingFee.objects.update_or_create(
+        stripe_id=stripe_id,
+        defaults={
+            "fee": fee.quantize(Decimal("0.01")),
+            "resolved_at": timezone.now(),
+            "last_error": "",
+        },
+    )
+
+
+def _mark_failed(stripe_id: str, error: str) -> None:
+    StripeProcessingFee.objects.filter(stripe_id=stripe_id).update(
+        attempts=F("attempts") + 1,
+        last_error=error[:255],
+        updated_at=timezone.now(),
+    )
+
+
+def resolve_stripe_fees(
+    stripe_ids: Iterable[str | None],
+    *,
+    max_workers: int | None = None,
+) -> dict[str, Decimal | None]:
+    """
+    Look up fees from Stripe concurrently and store them.
+
+    Stripe calls run on at most ``max_workers`` threads (``STRIPE_FEE_RESOLVE_WORKERS``);
+    database writes happen on the calling thread. Returns ``{stripe_id: fee or None}``.
+    Raises ``StripeConfigurationError`` when Stripe is not configured at all.
+    """
+    ids = ensure_pending_fees(stripe_ids)
+    if not ids:
+        return {}
+    workers = min(max_workers or _resolve_workers(), len(ids))
+    fees: dict[str, Decimal | None] = {}
+    errors: dict[str, str] = {}
+    config_error: StripeConfigurationError | None = None
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stripe-fee") as pool:
+        futures = {pool.submit(get_payment_intent_fee, sid): sid for sid in ids}
+        for future in as_completed(futures):
+            sid = futures[future]
+            try:
+                fees[sid] = future.result()
+            except StripeConfigurationError as exc:
+                config_error = exc
+            except (StripePaymentError, StripeTransientError) as exc:
+                errors[sid] = str(exc) or "stripe error"
+    if config_error is not None:
+        raise config_error
+
+    for sid in ids:
+        fee = fees.get(sid)
+        if fee is not None:
+            record_stripe_fee(sid, fee)
+            continue
+        error = errors.get(sid, "fee not available yet")
+        logger.info("stripe_fees: fee unresolved for %s: %s", sid, error)
+        _mark_failed(sid, error)
+    return {sid: fees.get(sid) for sid in ids}
+
+
+def _fee_source_ids(since: datetime | None = None) -> set[str]:
+    txns = Transaction.objects.filter(kind__in=FEE_LEDGER_KINDS)
+    bookings = Booking.objects.filter(
+        status__in=[Booking.Status.PAID, Booking.Status.COMPLETED]
+    ).exclude(charge_payment_intent_id="")
+    if since is not None:
+        txns = txns.filter(created_at__gte=since)
+        bookings = bookings.filter(created_at__gte=since)
+    ids: set[str] = set()
+    for stripe_id, intent_id in txns.values_list("stripe_id", "booking__charge_payment_intent_id"):
+        ids.update(filter(None, (stripe_id, intent_id)))
+    ids.update(bookings.values_list("charge_payment_intent_id", flat=True))
+    return ids
+
+
+def backfill_stripe_fees(
+    *,
+    since: datetime | None = None,
+    batch_size: int = 200,
+    max_workers: int | None = None,
+) -> dict[str, int]:
+    """Resolve every missing fee referenced by the ledger or paid bookings."""
+    ensure_pending_fees(_fee_source_ids(since))
+    pending = StripeProcessingFee.objects.filter(
+        resolved_at__isnull=True, attempts__lt=MAX_FEE_ATTEMPTS
+    ).order_by("id")
+    summary = {"checked": 0, "resolved": 0, "unresolved": 0}
+    last_id = 0
+    while True:
+        batch = list(pending.filter(id__gt=last_id).values_list("id", "stripe_id")[:batch_size])
+        if not batch:
+            break
+        last_id = batch[-1][0]
+        results = resolve_stripe_fees([sid for _, sid in batch], max_workers=max_workers)
+        resolved = sum(1 for fee in results.values() if fee is not None)
+        summary["checked"] += len(results)
+        summary["resolved"] += resolved
+        summary["unresolved"] += len(results) - resolved
+    return summary
+
+
+def get_stripe_fees(stripe_ids: Iterable[str | None]) -> dict[str, Decimal]:
+    """Return stored fees for the resolved ids among ``stripe_ids`` (one query)."""
+    ids = {sid for sid in map(normalize_fee_source_id, stripe_ids) if sid}
+    if not ids:
+        return {}
+    return dict(
+        StripeProcessingFee.objects.filter(
+            stripe_id__in=ids, resolved_at__isnull=False, fee__isnull=False
+        ).values_list("stripe_id", "fee")
+    )
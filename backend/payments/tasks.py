@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import logging
+from datetime import timedelta
 
 from celery import shared_task
 from django.db.models import Exists, OuterRef
@@ -8,10 +9,14 @@ from django.utils import timezone
 
 from bookings.models import Booking
 from payments.models import Transaction
-from payments.stripe_api import create_owner_transfer_for_booking
+from payments.stripe_api import StripeConfigurationError, create_owner_transfer_for_booking
 
 logger = logging.getLogger(__name__)
 
+# The hourly fee backfill only revisits recent rows; older gaps are filled by the
+# ``backfill_stripe_fees`` management command.
+STRIPE_FEE_BACKFILL_WINDOW = timedelta(hours=48)
+
 # Ensure auxiliary tasks are registered with Celery.
 from payments import tasks_tax_invoices as _tasks_tax_invoices  # noqa: F401,E402
 
@@ -53,3 +58,82 @@ def process_owner_payouts():
                 "owner payout task failed for booking %s: %s", booking.id, exc, exc_info=True
             )
     return {"processed": processed, "checked": len(bookings)}
+
+
+@shared_task(name="payments.resolve_stripe_fee")
+def resolve_stripe_fee(stripe_id: str):
+    """
+    Fetch and store the Stripe processing fee for one PaymentIntent/Charge/Session.
+    Unresolved fees are retried by the periodic backfill.
+    """
+    from payments.stripe_fees import resolve_stripe_fees
+
+    try:
+        fee = resolve_stripe_fees([stripe_id], max_workers=1).get(stripe_id)
+    except StripeConfigurationError:
+        logger.warning("stripe fee lookup skipped for %s: Stripe is not configured", stripe_id)
+        return {"stripe_id": stripe_id, "fee": None}
+    return {"stripe_id": stripe_id, "fee": str(fee) if fee is not None else None}
+
+
+@shared_task(name="payments.backfill_stripe_fees")
+def backfill_stripe_fees():
+    """Resolve Stripe fees still missing for recent ledger rows and paid bookings."""
+    from payments.stripe_fees import backfill_stripe_fees as _backfill
+
+    try:
+        return _backfill(since=timezone.now() - STRIPE_FEE_BACKFILL_WINDOW)
+    except StripeConfigurationError:
+        logger.warning("stripe fee backfill skipped: Stripe is not configured")
+        return {"checked": 0, "resolved": 0, "unresolved": 0}
+
+
+@shared_task(name="payments.release_matured_owner_earnings")
+def release_matured_owner_earnings():
+    """Move owner earnings past their hold into the available balance snapshot."""
+    from payments.ledger import release_matured_owner_earnings as _release
+
+    return {"released": _release()}
+
+
+@shared_task(name="payments.process_stripe_webhook_events")
+def process_stripe_webhook_events(ordering_key: str):
+    """Apply stored Stripe webhook events for one booking/account/object, in order."""
+    from payments.webhooks import process_stripe_events
+
+    result = process_stripe_events(ordering_key)
+    if result["retry_in"] is not None:
+        process_stripe_webhook_events.apply_async(args=[ordering_key], countdown=result["retry_in"])
+    return result
+
+
+@shared_task(name="payments.sync_connect_account")
+def sync_connect_account(account_id: str):
+    """Debounced Connect account sync queued by webhook events."""
+    from payments.webhooks import sync_connect_account as _sync
+
+    return {"account_id": account_id, "synced": _sync(account_id)}
+
+
+@shared_task(name="payments.sweep_stripe_webhook_events")
+def sweep_stripe_webhook_events():
+    """Re-queue stored webhook events that no consumer picked up."""
+    from payments.webhooks import sweep_pending_stripe_events
+
+    return {"queued_keys": sweep_pending_stripe_events()}
+
+
+@shared_task(name="payments.prerender_booking_pdfs", queue="pdfs")
+def prerender_booking_pdfs(booking_id: int):
+    """Render a paid booking's receipt and owner statement into the S3 render cache."""
+    from payments.receipts import prerender_booking_pdfs as _prerender
+
+    return {"booking_id": booking_id, **_prerender(booking_id)}
+
+
+@shared_task(name="payments.prerender_promotion_receipt_pdf", queue="pdfs")
+def prerender_promotion_receipt_pdf(slot_id: int):
+    """Render a paid promotion slot's receipt into the S3 render cache."""
+    from payments.receipts import prerender_promotion_receipt_pdf as _prerender
+
+    return {"slot_id": slot_id, **_prerender(slot_id)}
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import logging
 from datetime import date, timedelta
-from decimal import Decimal, InvalidOperation
+from decimal import Decimal
 
 from celery import shared_task
 from django.db import transaction
+from django.db.models import DecimalField, Q, Sum, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 
 from bookings.models import Booking
@@ -16,13 +18,6 @@ from payments.tax import platform_gst_number
 logger = logging.getLogger(__name__)
 
 
-def _safe_decimal(value: object) -> Decimal:
-    try:
-        return Decimal(str(value or "0")).quantize(Decimal("0.01"))
-    except (InvalidOperation, TypeError, ValueError):
-        return Decimal("0.00")
-
-
 def _previous_month_range(today: date) -> tuple[date, date]:
     first_of_month = today.replace(day=1)
     last_prev_month = first_of_month - timedelta(days=1)
@@ -45,28 +40,25 @@ def generate_owner_fee_tax_invoices() -> dict[str, int]:
     today = timezone.localdate()
     period_start, period_end = _previous_month_range(today)
 
-    bookings = (
+    zero = Value(Decimal("0.00"), output_field=DecimalField(max_digits=12, decimal_places=2))
+    fee_rows = (
         Booking.objects.filter(
             status=Booking.Status.PAID,
             paid_at__date__gte=period_start,
             paid_at__date__lte=period_end,
         )
-        .select_related("owner")
-        .only("id", "owner_id", "totals", "paid_at")
-    )
-
-    totals_by_owner: dict[int, dict[str, Decimal]] = {}
-    for booking in bookings:
-        totals = booking.totals or {}
-        fee_base = _safe_decimal(totals.get("owner_fee_base") or totals.get("owner_fee"))
-        fee_gst = _safe_decimal(totals.get("owner_fee_gst"))
-        if fee_base <= Decimal("0.00") and fee_gst <= Decimal("0.00"):
-            continue
-        bucket = totals_by_owner.setdefault(
-            booking.owner_id, {"fee_subtotal": Decimal("0.00"), "fee_gst": Decimal("0.00")}
+        .filter(Q(owner_fee_base__gt=0) | Q(owner_fee_gst__gt=0))
+        .values("owner_id")
+        .annotate(
+            fee_subtotal=Sum(Coalesce("owner_fee_base", zero)),
+            fee_gst=Sum(Coalesce("owner_fee_gst", zero)),
         )
-        bucket["fee_subtotal"] += fee_base
-        bucket["fee_gst"] += fee_gst
+        .order_by("owner_id")
+    )
+    totals_by_owner: dict[int, dict[str, Decimal]] = {
+        row["owner_id"]: {"fee_subtotal": row["fee_subtotal"], "fee_gst": row["fee_gst"]}
+        for row in fee_rows
+    }
 
     created = 0
     for owner_id, bucket in totals_by_owner.items():
@@ -0,0 +1,211 @@
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db.models.query import QuerySet
+from django.utils import timezone
+
+from bookings.models import Booking
+from listings.models import Listing
+from payments import ledger
+from payments.ledger import (
+    compute_owner_available_balance,
+    compute_owner_total_balance,
+    log_transaction,
+    recompute_owner_balance,
+    release_matured_owner_earnings,
+)
+from payments.models import OwnerBalance, OwnerPendingEarning, Transaction
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture
+def owner_user():
+    return User.objects.create_user(username="owner", password="test-pass")
+
+
+@pytest.fixture
+def renter_user():
+    return User.objects.create_user(username="renter", password="test-pass")
+
+
+@pytest.fixture
+def listing(owner_user):
+    return Listing.objects.create(
+        owner=owner_user,
+        title="Cordless Drill",
+        description="Drill description",
+        daily_price_cad=Decimal("25.00"),
+        replacement_value_cad=Decimal("200.00"),
+        damage_deposit_cad=Decimal("50.00"),
+        city="Edmonton",
+        postal_code="T5K 2M5",
+        is_active=True,
+        is_available=True,
+    )
+
+
+def _booking(listing, owner_user, renter_user, *, end_offset_days: int) -> Booking:
+    today = timezone.localdate()
+    return Booking.objects.create(
+        listing=listing,
+        owner=owner_user,
+        renter=renter_user,
+        start_date=today + timedelta(days=end_offset_days - 2),
+        end_date=today + timedelta(days=end_offset_days),
+    )
+
+
+def _assert_matches_recompute(user):
+    expected = recompute_owner_balance(user.id)
+    assert compute_owner_total_balance(user) == expected["total"]
+    assert compute_owner_available_balance(user) == expected["available"]
+
+
+def test_snapshot_tracks_ledger_writes(owner_user, renter_user, listing):
+    past = _booking(listing, owner_user, renter_user, end_offset_days=-5)
+    future = _booking(listing, owner_user, renter_user, end_offset_days=3)
+
+    log_transaction(
+        user=owner_user, booking=past, kind=Transaction.Kind.OWNER_EARNING, amount=Decimal("80")
+    )
+    log_transaction(
+        user=owner_user, booking=future, kind=Transaction.Kind.OWNER_EARNING, amount=Decimal("40")
+    )
+    log_transaction(
+        user=owner_user, booking=past, kind=Transaction.Kind.REFUND, amount=Decimal("-10.00")
+    )
+    Transaction.objects.create(
+        user=owner_user, kind=Transaction.Kind.OWNER_PAYOUT, amount=Decimal("-20.00")
+    )
+    log_transaction(
+        user=owner_user,
+        kind=Transaction.Kind.PROMOTION_CHARGE,
+        amount=Decimal("5.00"),
+        stripe_id="earnings:promo-1",
+    )
+
+    balance = OwnerBalance.objects.get(user=owner_user)
+    assert balance.total == Decimal("85.00")
+    assert balance.available == Decimal("45.00")
+    assert compute_owner_total_balance(owner_user) == Decimal("85.00")
+    assert compute_owner_available_balance(owner_user) == Decimal("45.00")
+    assert OwnerPendingEarning.objects.filter(user=owner_user).count() == 1
+    _assert_matches_recompute(owner_user)
+
+
+def test_release_moves_matured_earnings(owner_user, renter_user, listing):
+    booking = _booking(listing, owner_user, renter_user, end_offset_days=-5)
+    log_transaction(
+        user=owner_user,
+        booking=booking,
+        kind=Transaction.Kind.OWNER_EARNING,
+        amount=Decimal("30.00"),
+        stripe_available_on=timezone.now() + timedelta(hours=6),
+    )
+    assert compute_owner_available_balance(owner_user) == Decimal("0.00")
+
+    later = timezone.now() + timedelta(hours=7)
+    assert release_matured_owner_earnings(now=later) == 1
+    assert not OwnerPendingEarning.objects.filter(user=owner_user).exists()
+    assert OwnerBalance.objects.get(user=owner_user).available == Decimal("30.00")
+    assert compute_owner_total_balance(owner_user) == Decimal("30.00")
+
+
+def test_booking_end_date_change_reschedules_pending(owner_user, renter_user, listing):
+    booking = _booking(listing, owner_user, renter_user, end_offset_days=3)
+    log_transaction(
+        user=owner_user, booking=booking, kind=Transaction.Kind.OWNER_EARNING, amount=Decimal("60")
+    )
+    assert compute_owner_available_balance(owner_user) == Decimal("0.00")
+
+    booking.start_date = booking.start_date - timedelta(days=10)
+    booking.end_date = booking.end_date - timedelta(days=10)
+    booking.save()
+
+    assert compute_owner_available_balance(owner_user) == Decimal("60.00")
+    _assert_matches_recompute(owner_user)
+
+
+def test_rebuild_locks_the_snapshot_before_recomputing(
+    owner_user, renter_user, listing, monkeypatch
+):
+    booking = _booking(listing, owner_user, renter_user, end_offset_days=-5)
+    log_transaction(
+        user=owner_user, booking=booking, kind=Transaction.Kind.OWNER_EARNING, amount=Decimal("50")
+    )
+    events = []
+    real_select_for_update = QuerySet.select_for_update
+    real_recompute = ledger.recompute_owner_balance
+
+    def select_for_update(self, *args, **kwargs):
+        if self.model is OwnerBalance and not events:
+            events.append("lock")
+            # A concurrent apply that commits while the rebuild waits for the lock.
+            log_transaction(
+                user=owner_user,
+                booking=booking,
+                kind=Transaction.Kind.OWNER_EARNING,
+                amount=Decimal("25"),
+            )
+        return real_select_for_update(self, *args, **kwargs)
+
+    def recompute(user_id, **kwargs):
+        events.append("recompute")
+        return real_recompute(user_id, **kwargs)
+
+    monkeypatch.setattr(QuerySet, "select_for_update", select_for_update)
+    monkeypatch.setattr(ledger, "recompute_owner_balance", recompute)
+
+    ledger.rebuild_owner_balance(owner_user.id)
+
+    assert events[:2] == ["lock", "recompute"]
+    assert OwnerBalance.objects.get(user=owner_user).total == Decimal("75.00")
+    _assert_matches_recompute(owner_user)
+
+
+def test_deleting_transactions_updates_snapshot(owner_user, renter_user, listing):
+    booking = _booking(listing, owner_user, renter_user, end_offset_days=-5)
+    earning = log_transaction(
+        user=owner_user, booking=booking, kind=Transaction.Kind.OWNER_EARNING, amount=Decimal("50")
+    )
+    log_transaction(
+        user=owner_user, booking=booking, kind=Transaction.Kind.REFUND, amount=Decimal("-5.00")
+    )
+
+    earning.delete()
+
+    assert compute_owner_total_balance(owner_user) == Decimal("-5.00")
+    _assert_matches_recompute(owner_user)
+
+
+def test_verify_owner_balances_reports_and_repairs_drift(owner_user, renter_user, listing):
+    booking = _booking(listing, owner_user, renter_user, end_offset_days=-5)
+    log_transaction(
+        user=owner_user, booking=booking, kind=Transaction.Kind.OWNER_EARNING, amount=Decimal("50")
+    )
+    call_command("verify_owner_balances")
+
+    OwnerBalance.objects.filter(user=owner_user).update(total=Decimal("1.00"))
+    with pytest.raises(CommandError):
+        call_command("verify_owner_balances")
+
+    call_command("verify_owner_balances", "--repair")
+    assert OwnerBalance.objects.get(user=owner_user).total == Decimal("50.00")
+    call_command("verify_owner_balances", "--user-id", str(owner_user.id))
+
+
+def test_first_read_builds_snapshot_for_existing_ledger(owner_user, renter_user, listing):
+    booking = _booking(listing, owner_user, renter_user, end_offset_days=-5)
+    log_transaction(
+        user=owner_user, booking=booking, kind=Transaction.Kind.OWNER_EARNING, amount=Decimal("70")
+    )
+    OwnerBalance.objects.filter(user=owner_user).delete()
+
+    assert compute_owner_available_balance(owner_user) == Decimal("70.00")
+    assert OwnerBalance.objects.filter(user=owner_user).exists()
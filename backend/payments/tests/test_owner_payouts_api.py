@@ -8,6 +8,7 @@ from types import SimpleNamespace
 
 import pytest
 import stripe
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 from backend.payments.stripe_api import StripeConfigurationError, StripeTransientError
@@ -22,6 +23,14 @@ from payments.models import OwnerPayoutAccount, Transaction
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    # History counts are cached per user id, and ids are reused across tests.
+    cache.clear()
+    yield
+    cache.clear()
+
+
 def _auth_client(user):
     client = APIClient()
     resp = client.post(
@@ -299,6 +308,43 @@ def test_owner_payouts_history_returns_paginated_results(owner_user, booking_fac
     assert resp_filtered.data["results"][0]["direction"] == "debit"
 
 
+def test_owner_payouts_history_cursor_pages_and_cached_count(owner_user, booking_factory):
+    booking = booking_factory(status=Booking.Status.PAID)
+    for amount in ("10.00", "20.00", "30.00"):
+        log_transaction(
+            user=owner_user,
+            booking=booking,
+            kind=Transaction.Kind.OWNER_EARNING,
+            amount=Decimal(amount),
+        )
+    client = _auth_client(owner_user)
+
+    first = client.get("/api/owner/payouts/history/?limit=2&cursor=")
+    assert first.status_code == 200, first.data
+    assert [row["amount"] for row in first.data["results"]] == ["30.00", "20.00"]
+    assert first.data["count"] == 3
+    assert first.data["has_next"] is True
+    assert first.data["next_offset"] is None
+
+    cursor = first.data["next_cursor"]
+    second = client.get(f"/api/owner/payouts/history/?limit=2&cursor={cursor}")
+    assert [row["amount"] for row in second.data["results"]] == ["10.00"]
+    assert second.data["has_next"] is False
+    assert second.data["next_cursor"] is None
+
+    # Ledger writes invalidate the cached count.
+    log_transaction(
+        user=owner_user,
+        booking=booking,
+        kind=Transaction.Kind.OWNER_PAYOUT,
+        amount=Decimal("-60.00"),
+    )
+    assert client.get("/api/owner/payouts/history/?cursor=").data["count"] == 4
+
+    bad = client.get("/api/owner/payouts/history/?cursor=not-a-cursor")
+    assert bad.status_code == 400
+
+
 def test_owner_payouts_history_includes_booking_charge_with_all_scope(
     owner_user,
     booking_factory,
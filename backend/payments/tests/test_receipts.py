@@ -1,15 +1,22 @@
 from datetime import date, timedelta
 from decimal import Decimal
+from io import BytesIO
 
 import pytest
+from botocore.exceptions import ClientError
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
 from bookings.models import Booking
 from listings.models import Listing
+from payments import receipts, tasks
 from payments.receipts import (
     _extract_owner_earnings_breakdown,
     _extract_payment_breakdown,
+    booking_receipt_inputs,
+    owner_earnings_statement_inputs,
+    pdf_cache_key,
+    promotion_receipt_inputs,
     render_booking_receipt_pdf,
     render_owner_earnings_statement_pdf,
     render_promotion_receipt_pdf,
@@ -25,6 +32,32 @@ pytestmark = pytest.mark.django_db
 User = get_user_model()
 
 
+class _StubS3Client:
+    """In-memory bucket: get/head miss until the key has been put."""
+
+    def __init__(self):
+        self.calls = []
+        self.objects = {}
+
+    def _missing(self, operation):
+        return ClientError({"Error": {"Code": "NoSuchKey"}}, operation)
+
+    def head_object(self, **kwargs):
+        if kwargs["Key"] not in self.objects:
+            raise self._missing("HeadObject")
+        return {"ContentLength": len(self.objects[kwargs["Key"]])}
+
+    def get_object(self, **kwargs):
+        if kwargs["Key"] not in self.objects:
+            raise self._missing("GetObject")
+        return {"Body": BytesIO(self.objects[kwargs["Key"]])}
+
+    def put_object(self, **kwargs):
+        self.calls.append(kwargs)
+        self.objects[kwargs["Key"]] = kwargs["Body"]
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+
+
 @pytest.fixture
 def owner_user():
     return User.objects.create_user(username="owner_receipt", password="test-pass")
@@ -186,20 +219,12 @@ def test_upload_booking_receipt_pdf_uploads_and_returns_key(
     settings.AWS_S3_REGION_NAME = "ca-central-1"
     settings.AWS_S3_ENDPOINT_URL = ""
 
-    class _StubS3Client:
-        def __init__(self):
-            self.calls = []
-
-        def put_object(self, **kwargs):
-            self.calls.append(kwargs)
-            return {"ResponseMetadata": {"HTTPStatusCode": 200}}
-
     stub_client = _StubS3Client()
     monkeypatch.setattr("payments.receipts.storage_s3._client", lambda: stub_client)
 
     key, url, pdf_bytes = upload_booking_receipt_pdf(booking)
 
-    expected_key = f"uploads/private/receipts/{booking.id}_receipt.pdf"
+    expected_key = pdf_cache_key("receipts", booking_receipt_inputs(booking))
     assert key == expected_key
     expected_url = storage_s3.public_url(expected_key)
     assert url == expected_url
@@ -221,20 +246,12 @@ def test_upload_promotion_receipt_pdf_uploads_and_returns_key(
     settings.AWS_S3_REGION_NAME = "ca-central-1"
     settings.AWS_S3_ENDPOINT_URL = ""
 
-    class _StubS3Client:
-        def __init__(self):
-            self.calls = []
-
-        def put_object(self, **kwargs):
-            self.calls.append(kwargs)
-            return {"ResponseMetadata": {"HTTPStatusCode": 200}}
-
     stub_client = _StubS3Client()
     monkeypatch.setattr("payments.receipts.storage_s3._client", lambda: stub_client)
 
     key, url, pdf_bytes = upload_promotion_receipt_pdf(promotion_slot)
 
-    expected_key = f"uploads/private/receipts/promotions/{promotion_slot.id}_promotion_receipt.pdf"
+    expected_key = pdf_cache_key("promotion-receipts", promotion_receipt_inputs(promotion_slot))
     assert key == expected_key
     expected_url = storage_s3.public_url(expected_key)
     assert url == expected_url
@@ -274,20 +291,12 @@ def test_upload_owner_earnings_statement_pdf_uploads_and_returns_key(
     settings.AWS_S3_REGION_NAME = "ca-central-1"
     settings.AWS_S3_ENDPOINT_URL = ""
 
-    class _StubS3Client:
-        def __init__(self):
-            self.calls = []
-
-        def put_object(self, **kwargs):
-            self.calls.append(kwargs)
-            return {"ResponseMetadata": {"HTTPStatusCode": 200}}
-
     stub_client = _StubS3Client()
     monkeypatch.setattr("payments.receipts.storage_s3._client", lambda: stub_client)
 
     key, url, pdf_bytes = upload_owner_earnings_statement_pdf(booking)
 
-    expected_key = f"uploads/private/owner-statements/{booking.id}_owner_statement.pdf"
+    expected_key = pdf_cache_key("owner-statements", owner_earnings_statement_inputs(booking))
     assert key == expected_key
     expected_url = storage_s3.public_url(expected_key)
     assert url == expected_url
@@ -300,3 +309,76 @@ def test_upload_owner_earnings_statement_pdf_uploads_and_returns_key(
     assert call["Key"] == expected_key
     assert call["ContentType"] == "application/pdf"
     assert call["Body"] == pdf_bytes
+
+
+def test_booking_receipt_is_reused_until_totals_change(
+    listing, owner_user, renter_user, settings, monkeypatch
+):
+    booking = Booking.objects.create(
+        listing=listing,
+        owner=owner_user,
+        renter=renter_user,
+        start_date=date(2025, 8, 10),
+        end_date=date(2025, 8, 13),
+        totals={"days": "3", "rental_subtotal": "135.00", "total_charge": "155.25"},
+    )
+    settings.AWS_STORAGE_BUCKET_NAME = "test-bucket"
+    stub_client = _StubS3Client()
+    monkeypatch.setattr("payments.receipts.storage_s3._client", lambda: stub_client)
+    renders = []
+    original_render = receipts.render_booking_receipt_pdf
+
+    def counting_render(obj):
+        renders.append(obj.id)
+        return original_render(obj)
+
+    monkeypatch.setattr(receipts, "render_booking_receipt_pdf", counting_render)
+
+    first_key, _, first_bytes = upload_booking_receipt_pdf(booking)
+    second_key, _, second_bytes = upload_booking_receipt_pdf(booking)
+    assert first_key == second_key
+    assert second_bytes == first_bytes
+    assert renders == [booking.id]
+    assert len(stub_client.calls) == 1
+
+    booking.totals = {**booking.totals, "total_charge": "160.00"}
+    third_key, _, _ = upload_booking_receipt_pdf(booking)
+    assert third_key != first_key
+    assert renders == [booking.id, booking.id]
+
+    monkeypatch.setattr(receipts, "PDF_TEMPLATE_VERSION", receipts.PDF_TEMPLATE_VERSION + 1)
+    assert pdf_cache_key("receipts", booking_receipt_inputs(booking)) != third_key
+
+
+def test_prerender_booking_pdfs_warms_cache_for_email_task(
+    listing, owner_user, renter_user, settings, monkeypatch
+):
+    booking = Booking.objects.create(
+        listing=listing,
+        owner=owner_user,
+        renter=renter_user,
+        start_date=date(2025, 8, 10),
+        end_date=date(2025, 8, 13),
+        totals={
+            "days": "3",
+            "rental_subtotal": "135.00",
+            "owner_fee_base": "6.75",
+            "owner_payout": "128.25",
+            "total_charge": "155.25",
+        },
+    )
+    settings.AWS_STORAGE_BUCKET_NAME = "test-bucket"
+    stub_client = _StubS3Client()
+    monkeypatch.setattr("payments.receipts.storage_s3._client", lambda: stub_client)
+
+    result = tasks.prerender_booking_pdfs.delay(booking.id).get()
+    assert result == {"booking_id": booking.id, "receipt": True, "owner_statement": True}
+    assert tasks.prerender_booking_pdfs.queue == "pdfs"
+    assert receipts.prerender_booking_pdfs(booking.id) == {
+        "receipt": False,
+        "owner_statement": False,
+    }
+
+    key, _, pdf_bytes = upload_booking_receipt_pdf(booking)
+    assert stub_client.objects[key] == pdf_bytes
+    assert len(stub_client.calls) == 2
@@ -0,0 +1,143 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from bookings.models import Booking
+from listings.models import Listing
+from payments import stripe_fees, tasks
+from payments.models import StripeProcessingFee, Transaction
+from payments.stripe_api import StripeConfigurationError, StripeTransientError
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture
+def owner_user():
+    return User.objects.create_user(username="fee-owner", password="test-pass")
+
+
+@pytest.fixture
+def renter_user():
+    return User.objects.create_user(username="fee-renter", password="test-pass")
+
+
+@pytest.fixture
+def booking(owner_user, renter_user):
+    listing = Listing.objects.create(
+        owner=owner_user,
+        title="Pressure Washer",
+        description="Washer",
+        daily_price_cad=Decimal("30.00"),
+        replacement_value_cad=Decimal("300.00"),
+        damage_deposit_cad=Decimal("50.00"),
+        city="Edmonton",
+        is_active=True,
+        is_available=True,
+    )
+    return Booking.objects.create(
+        listing=listing,
+        owner=owner_user,
+        renter=renter_user,
+        start_date=date(2025, 1, 1),
+        end_date=date(2025, 1, 3),
+        status=Booking.Status.PAID,
+        charge_payment_intent_id="pi_booking",
+    )
+
+
+def _fake_fees(monkeypatch, fees):
+    calls = []
+
+    def _lookup(stripe_id):
+        calls.append(stripe_id)
+        value = fees[stripe_id]
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    monkeypatch.setattr(stripe_fees, "get_payment_intent_fee", _lookup)
+    return calls
+
+
+def test_resolve_stores_fees_and_counts_misses(monkeypatch):
+    _fake_fees(
+        monkeypatch,
+        {
+            "pi_ok": Decimal("1.23"),
+            "ch_later": None,
+            "pi_flaky": StripeTransientError("timeout"),
+        },
+    )
+
+    results = stripe_fees.resolve_stripe_fees(
+        ["pi_ok", "ch_later", "pi_flaky", "tr_not_a_charge", ""], max_workers=3
+    )
+
+    assert results == {"ch_later": None, "pi_flaky": None, "pi_ok": Decimal("1.23")}
+    rows = {row.stripe_id: row for row in StripeProcessingFee.objects.all()}
+    assert set(rows) == {"pi_ok", "ch_later", "pi_flaky"}
+    assert rows["pi_ok"].fee == Decimal("1.23") and rows["pi_ok"].resolved_at
+    assert rows["ch_later"].resolved_at is None and rows["ch_later"].attempts == 1
+    assert rows["pi_flaky"].last_error == "timeout"
+    assert stripe_fees.get_stripe_fees(["pi_ok", "ch_later", None]) == {"pi_ok": Decimal("1.23")}
+
+
+def test_resolve_surfaces_missing_configuration(monkeypatch):
+    _fake_fees(monkeypatch, {"pi_x": StripeConfigurationError("no key")})
+
+    with pytest.raises(StripeConfigurationError):
+        stripe_fees.resolve_stripe_fees(["pi_x"])
+    assert StripeProcessingFee.objects.get(stripe_id="pi_x").attempts == 0
+
+
+def test_backfill_resolves_ledger_and_booking_ids_once(monkeypatch, booking, owner_user):
+    Transaction.objects.create(
+        user=owner_user,
+        booking=booking,
+        kind=Transaction.Kind.PLATFORM_FEE,
+        amount=Decimal("3.00"),
+    )
+    Transaction.objects.create(
+        user=owner_user,
+        kind=Transaction.Kind.PROMOTION_CHARGE,
+        amount=Decimal("5.00"),
+        stripe_id="pi_promo",
+    )
+    Transaction.objects.create(
+        user=owner_user,
+        kind=Transaction.Kind.PROMOTION_CHARGE,
+        amount=Decimal("5.00"),
+        stripe_id="earnings:7",
+    )
+    StripeProcessingFee.objects.create(
+        stripe_id="pi_gave_up", attempts=stripe_fees.MAX_FEE_ATTEMPTS
+    )
+    calls = _fake_fees(monkeypatch, {"pi_booking": Decimal("0.90"), "pi_promo": Decimal("0.45")})
+
+    summary = stripe_fees.backfill_stripe_fees(batch_size=1, max_workers=2)
+
+    assert summary == {"checked": 2, "resolved": 2, "unresolved": 0}
+    assert sorted(calls) == ["pi_booking", "pi_promo"]
+    assert stripe_fees.backfill_stripe_fees() == {"checked": 0, "resolved": 0, "unresolved": 0}
+    assert len(calls) == 2
+
+
+def test_periodic_backfill_only_scans_recent_rows(monkeypatch, booking, owner_user):
+    old = Transaction.objects.create(
+        user=owner_user,
+        kind=Transaction.Kind.PROMOTION_CHARGE,
+        amount=Decimal("5.00"),
+        stripe_id="pi_old_promo",
+    )
+    Transaction.objects.filter(pk=old.pk).update(
+        created_at=timezone.now() - tasks.STRIPE_FEE_BACKFILL_WINDOW - timedelta(hours=1)
+    )
+    calls = _fake_fees(monkeypatch, {"pi_booking": Decimal("0.90")})
+
+    assert tasks.backfill_stripe_fees() == {"checked": 1, "resolved": 1, "unresolved": 0}
+    assert calls == ["pi_booking"]
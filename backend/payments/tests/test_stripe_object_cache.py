@@ -0,0 +1,98 @@
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from payments import stripe_api, stripe_cache
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def _stripe_env(monkeypatch):
+    cache.clear()
+    monkeypatch.setattr(stripe_api, "_get_stripe_api_key", lambda: "sk_test")
+    yield
+    cache.clear()
+
+
+def _scope():
+    # Stand-in for a DRF request: each instance is a separate request-level cache.
+    return SimpleNamespace()
+
+
+def test_customer_verification_is_shared_across_requests(monkeypatch):
+    user = User.objects.create_user(
+        username="cached-renter", password="x", stripe_customer_id="cus_123"
+    )
+    retrieved = []
+    monkeypatch.setattr(
+        stripe_api.stripe.Customer, "retrieve", lambda customer_id: retrieved.append(customer_id)
+    )
+
+    assert stripe_api.ensure_stripe_customer(user, cache_scope=_scope()) == "cus_123"
+    user.stripe_customer_verified_at = None  # force the DB-level TTL to be expired
+    assert stripe_api.ensure_stripe_customer(user, cache_scope=_scope()) == "cus_123"
+    assert retrieved == ["cus_123"]
+
+    stripe_api.handle_stripe_event(
+        {"type": "customer.updated", "data": {"object": {"id": "cus_123", "metadata": {}}}}
+    )
+    stripe_api.ensure_stripe_customer(user, cache_scope=_scope())
+    assert retrieved == ["cus_123", "cus_123"]
+
+    stats = stripe_cache.stripe_object_cache_stats()["customer"]
+    assert stats["hits"] == 1
+    assert stats["invalidations"] == 1
+
+
+def test_payment_method_details_are_cached_until_webhook(monkeypatch):
+    calls = []
+
+    def fake_retrieve(payment_method_id):
+        calls.append(payment_method_id)
+        return {
+            "id": payment_method_id,
+            "customer": "cus_1",
+            "card": {"brand": "visa", "last4": "4242", "exp_month": 4, "exp_year": 2030},
+        }
+
+    monkeypatch.setattr(stripe_api.stripe.PaymentMethod, "retrieve", fake_retrieve)
+
+    first = stripe_api.fetch_payment_method_details("pm_1", cache_scope=_scope())
+    second = stripe_api.fetch_payment_method_details("pm_1", cache_scope=_scope())
+    assert first == second == {"brand": "VISA", "last4": "4242", "exp_month": 4, "exp_year": 2030}
+    assert calls == ["pm_1"]
+
+    stripe_api.handle_stripe_event(
+        {"type": "payment_method.updated", "data": {"object": {"id": "pm_1"}}}
+    )
+    stripe_api.fetch_payment_method_details("pm_1", cache_scope=_scope())
+    assert calls == ["pm_1", "pm_1"]
+
+    stats = stripe_cache.stripe_object_cache_stats()["payment_method"]
+    assert stats == {"hits": 1, "misses": 2, "invalidations": 1, "hit_rate": 0.3333}
+
+
+def test_attach_refreshes_the_cached_payment_method(monkeypatch):
+    monkeypatch.setattr(
+        stripe_api.stripe.PaymentMethod,
+        "retrieve",
+        lambda payment_method_id: SimpleNamespace(id=payment_method_id, customer=None, card={}),
+    )
+    attached = []
+
+    def fake_attach(payment_method_id, customer):
+        attached.append((payment_method_id, customer))
+        return SimpleNamespace(id=payment_method_id, customer=customer, card={})
+
+    monkeypatch.setattr(stripe_api.stripe.PaymentMethod, "attach", fake_attach)
+
+    stripe_api._ensure_payment_method_for_customer("pm_2", "cus_2", cache_scope=_scope())
+    stripe_api._ensure_payment_method_for_customer("pm_2", "cus_2", cache_scope=_scope())
+
+    assert attached == [("pm_2", "cus_2")]
+    assert stripe_cache.get_cached_payment_method("pm_2")["customer"] == "cus_2"
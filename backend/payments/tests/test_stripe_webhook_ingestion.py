@@ -0,0 +1,187 @@
+import json
+from datetime import timedelta
+
+import pytest
+import stripe
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from payments import stripe_api, tasks, webhooks
+from payments.models import StripeWebhookEvent
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _event(event_id: str, *, booking_id: str = "7", event_type: str = "payment_intent.succeeded"):
+    return {
+        "id": event_id,
+        "type": event_type,
+        "data": {
+            "object": {
+                "id": f"pi_{event_id}",
+                "object": "payment_intent",
+                "metadata": {"booking_id": booking_id, "kind": "booking_charge"},
+            }
+        },
+    }
+
+
+def _post(monkeypatch, event):
+    monkeypatch.setattr(
+        "payments.stripe_api.stripe.Webhook.construct_event",
+        lambda payload, sig_header, secret: event,
+    )
+    return APIClient().post(
+        "/api/payments/stripe/webhook/",
+        data=json.dumps(event),
+        content_type="application/json",
+        HTTP_STRIPE_SIGNATURE="test_sig",
+    )
+
+
+def test_duplicate_events_are_stored_and_applied_once(monkeypatch):
+    handled = []
+    monkeypatch.setattr(stripe_api, "handle_stripe_event", lambda event: handled.append(event))
+
+    for _ in range(3):
+        assert _post(monkeypatch, _event("evt_dup")).status_code == 200
+
+    stored = StripeWebhookEvent.objects.get(event_id="evt_dup")
+    assert stored.status == StripeWebhookEvent.Status.PROCESSED
+    assert stored.ordering_key == "booking:7"
+    assert [event["id"] for event in handled] == ["evt_dup"]
+
+
+def test_failed_event_blocks_later_events_for_the_same_key(monkeypatch):
+    monkeypatch.setattr(tasks.process_stripe_webhook_events, "delay", lambda key: None)
+    handled = []
+    failures = {"evt_a": 1}
+
+    def fake_handle(event):
+        if failures.get(event["id"]):
+            failures[event["id"]] -= 1
+            raise RuntimeError("boom")
+        handled.append(event["id"])
+
+    monkeypatch.setattr(stripe_api, "handle_stripe_event", fake_handle)
+    webhooks.ingest_stripe_event(_event("evt_a"))
+    webhooks.ingest_stripe_event(_event("evt_b"))
+    webhooks.ingest_stripe_event(_event("evt_other", booking_id="8"))
+
+    result = webhooks.process_stripe_events("booking:7")
+    assert result == {"processed": 0, "retry_in": 10}
+    assert handled == []
+    assert StripeWebhookEvent.objects.get(event_id="evt_a").attempts == 1
+
+    # The countdown elapses before the retry runs.
+    StripeWebhookEvent.objects.filter(event_id="evt_a").update(
+        next_attempt_at=timezone.now() - timedelta(seconds=1)
+    )
+    result = webhooks.process_stripe_events("booking:7")
+    assert result == {"processed": 2, "retry_in": None}
+    assert handled == ["evt_a", "evt_b"]
+    assert StripeWebhookEvent.objects.filter(status="pending").count() == 1
+
+
+def test_new_event_during_backoff_does_not_retry_the_failed_head(monkeypatch):
+    monkeypatch.setattr(tasks.process_stripe_webhook_events, "delay", lambda key: None)
+    calls = []
+
+    def fake_handle(event):
+        calls.append(event["id"])
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(stripe_api, "handle_stripe_event", fake_handle)
+    webhooks.ingest_stripe_event(_event("evt_a"))
+    assert webhooks.process_stripe_events("booking:7") == {"processed": 0, "retry_in": 10}
+
+    # A newer event for the same key wakes the worker while evt_a is backing off.
+    webhooks.ingest_stripe_event(_event("evt_b"))
+    result = webhooks.process_stripe_events("booking:7")
+
+    assert calls == ["evt_a"]
+    assert 0 < result["retry_in"] <= 10
+    assert StripeWebhookEvent.objects.get(event_id="evt_a").attempts == 1
+
+
+def test_event_is_dead_lettered_after_max_attempts(monkeypatch):
+    monkeypatch.setattr(tasks.process_stripe_webhook_events, "delay", lambda key: None)
+
+    def fake_handle(event):
+        raise RuntimeError("always")
+
+    monkeypatch.setattr(stripe_api, "handle_stripe_event", fake_handle)
+    webhooks.ingest_stripe_event(_event("evt_bad"))
+    StripeWebhookEvent.objects.filter(event_id="evt_bad").update(
+        attempts=webhooks.WEBHOOK_MAX_ATTEMPTS - 1
+    )
+
+    assert webhooks.process_stripe_events("booking:7")["retry_in"] is None
+    stored = StripeWebhookEvent.objects.get(event_id="evt_bad")
+    assert stored.status == StripeWebhookEvent.Status.FAILED
+    assert stored.last_error == "always"
+
+
+def test_sweep_queues_each_stalled_key_once_and_skips_pending_retries(monkeypatch):
+    monkeypatch.setattr(tasks.process_stripe_webhook_events, "delay", lambda key: None)
+    for event_id, booking_id in [("evt_1", "1"), ("evt_2", "1"), ("evt_3", "2"), ("evt_4", "3")]:
+        webhooks.ingest_stripe_event(_event(event_id, booking_id=booking_id))
+    now = timezone.now()
+    StripeWebhookEvent.objects.update(received_at=now - timedelta(minutes=10))
+    # booking:2 is waiting out a retry countdown; booking:3's countdown already elapsed.
+    StripeWebhookEvent.objects.filter(event_id="evt_3").update(
+        attempts=1, next_attempt_at=now + timedelta(minutes=5)
+    )
+    StripeWebhookEvent.objects.filter(event_id="evt_4").update(
+        attempts=1, next_attempt_at=now - timedelta(minutes=5)
+    )
+    queued = []
+    monkeypatch.setattr(tasks.process_stripe_webhook_events, "delay", queued.append)
+
+    assert webhooks.sweep_pending_stripe_events() == 2
+    assert sorted(queued) == ["booking:1", "booking:3"]
+
+
+def test_account_syncs_collapse_within_window(monkeypatch):
+    scheduled = []
+    monkeypatch.setattr(
+        tasks.sync_connect_account,
+        "apply_async",
+        lambda args, countdown: scheduled.append((args, countdown)),
+    )
+
+    assert webhooks.queue_connect_account_sync("acct_1") is True
+    assert webhooks.queue_connect_account_sync("acct_1") is False
+    assert webhooks.queue_connect_account_sync("acct_2") is True
+    assert scheduled == [(["acct_1"], 30), (["acct_2"], 30)]
+
+
+def test_account_sync_falls_back_to_latest_payload(monkeypatch):
+    monkeypatch.setattr(tasks.process_stripe_webhook_events, "delay", lambda key: None)
+    webhooks.ingest_stripe_event(
+        {
+            "id": "evt_acct",
+            "type": "account.updated",
+            "data": {"object": {"id": "acct_9", "object": "account"}},
+        }
+    )
+
+    def fail_retrieve(account_id):
+        raise stripe.error.APIConnectionError("down")
+
+    synced = []
+    monkeypatch.setattr(stripe_api, "_retrieve_account_with_expand", fail_retrieve)
+    monkeypatch.setattr(
+        stripe_api, "_handle_connect_account_updated_event", lambda payload: synced.append(payload)
+    )
+
+    assert webhooks.sync_connect_account("acct_9") is True
+    assert synced == [{"id": "acct_9", "object": "account"}]
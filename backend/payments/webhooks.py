@@ -0,0 +1,252 @@
+"""Asynchronous Stripe webhook ingestion.
+
+``stripe_webhook`` only verifies the signature and stores the event (``event_id`` is
+unique, so Stripe's retries are no-ops); ``payments.process_stripe_webhook_events`` then
+applies stored events one ordering key at a time, oldest first. Connect account syncs are
+debounced so a burst of events for one account costs a single expanded ``Account`` fetch.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import StripeWebhookEvent
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_MAX_ATTEMPTS = 5
+WEBHOOK_LOCK_SECONDS = 300
+WEBHOOK_RETRY_MAX_SECONDS = 600
+WEBHOOK_SWEEP_MIN_AGE = timedelta(minutes=2)
+
+
+def _account_sync_delay() -> int:
+    return max(int(getattr(settings, "STRIPE_ACCOUNT_SYNC_DELAY_SECONDS", 30) or 0), 0)
+
+
+def _event_dict(event: Any) -> dict:
+    # stripe.Event is a dict subclass; round-trip through JSON to store plain data.
+    return json.loads(json.dumps(event, default=str))
+
+
+def _event_id(event: dict) -> str:
+    event_id = str(event.get("id") or "").strip()
+    if event_id:
+        return event_id
+    digest = hashlib.sha256(json.dumps(event, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"sha256:{digest}"
+
+
+def _event_account_id(event: dict) -> str:
+    data_object = (event.get("data") or {}).get("object") or {}
+    account_id = event.get("account") or data_object.get("account") or ""
+    if not account_id and str(event.get("type") or "").startswith("account."):
+        account_id = data_object.get("id") or ""
+    return str(account_id)
+
+
+def webhook_ordering_key(event: dict) -> str:
+    """Events that touch the same booking/account/object share a key and run in order."""
+    data_object = (event.get("data") or {}).get("object") or {}
+    metadata = data_object.get("metadata") or {}
+    booking_id = metadata.get("booking_id")
+    if booking_id:
+        return f"booking:{booking_id}"
+    if str(event.get("type") or "").startswith("account."):
+        return f"account:{_event_account_id(event)}"
+    object_id = data_object.get("id")
+    if object_id:
+        return f"{data_object.get('object') or 'object'}:{object_id}"[:160]
+    return f"event:{_event_id(event)}"[:160]
+
+
+def ingest_stripe_event(event: Any) -> StripeWebhookEvent | None:
+    """Store a verified event and queue its consumer; returns None for duplicates."""
+    data = _event_dict(event)
+    try:
+        with transaction.atomic():
+            stored = StripeWebhookEvent.objects.create(
+                event_id=_event_id(data),
+                event_type=str(data.get("type") or "")[:120],
+                ordering_key=webhook_ordering_key(data),
+                account_id=_event_account_id(data)[:120],
+                payload=data,
+            )
+    except IntegrityError:
+        logger.info("stripe_webhook: duplicate event %s ignored", data.get("id"))
+        return None
+
+    from .tasks import process_stripe_webhook_events
+
+    # The webhook view runs in autocommit, so the row is visible to the worker already.
+    process_stripe_webhook_events.delay(stored.ordering_key)
+    return stored
+
+
+def _pending(ordering_key: str):
+    return StripeWebhookEvent.objects.filter(
+        ordering_key=ordering_key, status=StripeWebhookEvent.Status.PENDING
+    ).order_by("id")
+
+
+def _retry_delay(attempts: int) -> int:
+    return min(10 * 2 ** max(attempts - 1, 0), WEBHOOK_RETRY_MAX_SECONDS)
+
+
+def _drain(ordering_key: str) -> tuple[int, int | None]:
+    """Apply pending events in id order; stop at the first one that should be retried."""
+    from .stripe_api import handle_stripe_event
+
+    processed = 0
+    while True:
+        stored = _pending(ordering_key).first()
+        if stored is None:
+            return processed, None
+        if stored.next_attempt_at is not None:
+            wait = (stored.next_attempt_at - timezone.now()).total_seconds()
+            if wait > 0:
+                # Still backing off (woken by a newer event for this key); the scheduled
+                # retry picks it up.
+                return processed, math.ceil(wait)
+        try:
+            with transaction.atomic():
+                handle_stripe_event(stored.payload)
+        except Exception as exc:
+            stored.attempts += 1
+            stored.last_error = (str(exc) or exc.__class__.__name__)[:255]
+            logger.warning(
+                "stripe_webhook: processing failed for %s (attempt %s)",
+                stored.event_id,
+                stored.attempts,
+                exc_info=True,
+            )
+            if stored.attempts < WEBHOOK_MAX_ATTEMPTS:
+                delay = _retry_delay(stored.attempts)
+                stored.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+                stored.save(update_fields=["attempts", "last_error", "next_attempt_at"])
+                # Later events for this key wait so they are never applied out of order.
+                return processed, delay
+            stored.status = StripeWebhookEvent.Status.FAILED
+            stored.save(update_fields=["attempts", "last_error", "status"])
+            continue
+        stored.status = StripeWebhookEvent.Status.PROCESSED
+        stored.processed_at = timezone.now()
+        stored.save(update_fields=["status", "processed_at"])
+        processed += 1
+
+
+def process_stripe_events(ordering_key: str) -> dict[str, Any]:
+    """
+    Process every pending event for ``ordering_key`` unless another worker already is.
+
+    Returns ``{"processed": n, "retry_in": seconds or None}``.
+    """
+    lock_key = f"stripe:webhook-lock:{ordering_key}"
+    processed = 0
+    retry_in = None
+    while cache.add(lock_key, 1, timeout=WEBHOOK_LOCK_SECONDS):
+        try:
+            count, retry_in = _drain(ordering_key)
+            processed += count
+        finally:
+            cache.delete(lock_key)
+        # An event stored while we held the lock found it taken; pick it up here.
+        if retry_in is not None or not _pending(ordering_key).exists():
+            break
+    return {"processed": processed, "retry_in": retry_in}
+
+
+def sweep_pending_stripe_events(*, older_than: timedelta = WEBHOOK_SWEEP_MIN_AGE) -> int:
+    """
+    Re-queue ordering keys whose pending events were never picked up.
+
+    Keys whose oldest pending event failed and is still waiting out its retry countdown
+    are left alone; the countdown task picks them up.
+    """
+    from .tasks import process_stripe_webhook_events
+
+    now = timezone.now()
+    keys = list(
+        StripeWebhookEvent.objects.filter(
+            status=StripeWebhookEvent.Status.PENDING,
+            received_at__lte=now - older_than,
+        )
+        .order_by()
+        .values_list("ordering_key", flat=True)
+        .distinct()
+    )
+    queued = 0
+    for key in keys:
+        head = _pending(key).only("attempts", "next_attempt_at").first()
+        if head is None:
+            continue
+        if head.attempts and head.next_attempt_at and head.next_attempt_at > now:
+            continue
+        process_stripe_webhook_events.delay(key)
+        queued += 1
+    return queued
+
+
+def _account_sync_key(account_id: str) -> str:
+    return f"stripe:account-sync:{account_id}"
+
+
+def queue_connect_account_sync(account_id: str) -> bool:
+    """Schedule one delayed account sync; calls inside the window are collapsed."""
+    if not account_id:
+        return False
+    delay = _account_sync_delay()
+    if not cache.add(_account_sync_key(account_id), 1, timeout=delay + 300):
+        return False
+    from .tasks import sync_connect_account
+
+    sync_connect_account.apply_async(args=[account_id], countdown=delay)
+    return True
+
+
+def _latest_account_payload(account_id: str) -> dict | None:
+    stored = (
+        StripeWebhookEvent.objects.filter(account_id=account_id, event_type="account.updated")
+        .order_by("-id")
+        .first()
+    )
+    if stored is None:
+        return None
+    return (stored.payload.get("data") or {}).get("object") or None
+
+
+def sync_connect_account(account_id: str) -> bool:
+    """Fetch the expanded account from Stripe and sync ``OwnerPayoutAccount``."""
+    import stripe
+
+    from .stripe_api import (
+        StripeConfigurationError,
+        _handle_connect_account_updated_event,
+        _retrieve_account_with_expand,
+    )
+
+    # Clear the debounce key first so events arriving from now on schedule a new sync.
+    cache.delete(_account_sync_key(account_id))
+    try:
+        account_data = _retrieve_account_with_expand(account_id)
+    except (StripeConfigurationError, stripe.error.StripeError) as exc:
+        logger.warning(
+            "stripe_webhook: failed to sync connect account",
+            extra={"account_id": account_id, "error": str(exc)},
+        )
+        # Fall back to the last account.updated payload we received.
+        account_data = _latest_account_payload(account_id)
+        if account_data is None:
+            return False
+    _handle_connect_account_updated_event(account_data)
+    return True
@@ -18,6 +18,7 @@ from listings.models import Listing
 from notifications import tasks as notification_tasks
 from payments.ledger import compute_owner_available_balance, log_transaction
 from payments.models import OwnerPayoutAccount, PaymentSetupIntent, Transaction
+from payments.receipts import queue_promotion_pdf_prerender
 from payments.stripe_api import (
     StripeConfigurationError,
     StripePaymentError,
@@ -29,6 +30,7 @@ from payments.stripe_api import (
     get_connect_available_balance,
     transfer_earnings_to_platform,
 )
+from payments.stripe_fees import queue_fee_resolution
 from payments.tax import compute_fee_with_gst, platform_gst_enabled, platform_gst_rate
 from promotions.models import PromotedSlot
 
@@ -537,7 +539,9 @@ def _pay_for_promotion_with_card(
             "Could not log promotion transaction",
             extra={"user_id": request.user.id, "slot_id": slot.id},
         )
+    queue_fee_resolution(payment_intent_id)
 
+    queue_promotion_pdf_prerender(slot.id)
     try:
         notification_tasks.send_promotion_payment_receipt_email.delay(
             request.user.id,
@@ -677,6 +681,7 @@ def _pay_for_promotion_with_earnings(
             extra={"user_id": request.user.id, "slot_id": slot.id},
         )
 
+    queue_promotion_pdf_prerender(slot.id)
     try:
         notification_tasks.send_promotion_payment_receipt_email.delay(
             request.user.id,
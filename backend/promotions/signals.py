@@ -3,7 +3,7 @@ from __future__ import annotations
 from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from listings.cache import invalidate_listing_feed_cache
+from listings.cache import invalidate_feed_scope
 
 from .cache import invalidate_active_promoted_listing_ids_cache
 from .models import PromotedSlot
@@ -13,4 +13,9 @@ from .models import PromotedSlot
 @receiver(post_delete, sender=PromotedSlot, dispatch_uid="promotions_invalidate_on_delete")
 def _clear_promoted_listing_cache(sender, instance, **kwargs):
     invalidate_active_promoted_listing_ids_cache()
-    invalidate_listing_feed_cache()
+    # Promotion changes reorder every page in the listing's (category, city) scope.
+    listing = getattr(instance, "listing", None)
+    if listing is None:
+        return
+    category_slug = listing.category.slug if listing.category_id else None
+    invalidate_feed_scope(category_slug, listing.city)
@@ -187,6 +187,13 @@ if not AWS_S3_ENDPOINT_URL and R2_ACCOUNT_ID:
     AWS_S3_ENDPOINT_URL = f"https://{R2_ACCOUNT_ID}.r2.cloudflarestorage.com"
 AWS_S3_FORCE_PATH_STYLE  = env.bool("AWS_S3_FORCE_PATH_STYLE", default=True)
 S3_PUBLIC_BASE_URL       = env("S3_PUBLIC_BASE_URL", default="")
+# Shared boto3 client pool (storage.s3._client)
+S3_MAX_POOL_CONNECTIONS  = env.int("S3_MAX_POOL_CONNECTIONS", default=20)
+S3_TCP_KEEPALIVE         = env.bool("S3_TCP_KEEPALIVE", default=True)
+S3_RETRY_MAX_ATTEMPTS    = env.int("S3_RETRY_MAX_ATTEMPTS", default=3)
+S3_RETRY_MODE            = env("S3_RETRY_MODE", default="standard")
+S3_CONNECT_TIMEOUT       = env.float("S3_CONNECT_TIMEOUT", default=5.0)
+S3_READ_TIMEOUT          = env.float("S3_READ_TIMEOUT", default=60.0)
 
 S3_UPLOADS_PREFIX        = env("S3_UPLOADS_PREFIX", default="uploads/listings")
 S3_MAX_UPLOAD_BYTES      = env.int("S3_MAX_UPLOAD_BYTES", default=15 * 1024 * 1024)
@@ -225,6 +232,12 @@ else:
 AV_ENABLED              = env.bool("AV_ENABLED", default=True)
 AV_ENGINE               = env("AV_ENGINE", default="clamd")
 AV_DUMMY_INFECT_MARKER  = env("AV_DUMMY_INFECT_MARKER", default="EICAR")
+# Leading bytes of each scanned object kept in memory for Pillow dimension sniffing.
+AV_HEADER_SNIFF_BYTES   = env.int("AV_HEADER_SNIFF_BYTES", default=256 * 1024)
+# Batch scans: how long uploads are coalesced before the scan runs, and how many
+# objects one batch downloads/scans concurrently.
+AV_BATCH_DELAY_SECONDS  = env.int("AV_BATCH_DELAY_SECONDS", default=3)
+AV_BATCH_CONCURRENCY    = env.int("AV_BATCH_CONCURRENCY", default=4)
 DISPUTE_VIDEO_SCAN_SAMPLE_BYTES = env.int(
     "DISPUTE_VIDEO_SCAN_SAMPLE_BYTES", default=2 * 1024 * 1024
 )
@@ -240,6 +253,10 @@ DISPUTE_VIDEO_COMPRESSION_MAX_PASSES = env.int(
 CLAMD_UNIX_SOCKET = env("CLAMD_UNIX_SOCKET", default=None)
 CLAMD_HOST        = env("CLAMD_HOST", default="clamav")
 CLAMD_PORT        = env.int("CLAMD_PORT", default=3310)
+# Idle session connections kept per worker process; idle ones are PINGed before reuse.
+CLAMD_POOL_SIZE            = env.int("CLAMD_POOL_SIZE", default=4)
+CLAMD_TIMEOUT              = env.float("CLAMD_TIMEOUT", default=30.0)
+CLAMD_HEALTHCHECK_INTERVAL = env.float("CLAMD_HEALTHCHECK_INTERVAL", default=10.0)
 
 # --- Celery / Broker (overridable in tests)
 REDIS_URL= env("REDIS_URL", default="redis://redis:6379/0")
@@ -280,6 +297,10 @@ CELERY_BEAT_SCHEDULE.update(
             "task": "notifications.detect_missing_notifications",
             "schedule": crontab(hour=2, minute=15),
         },
+        "operator_rebuild_metric_rollups_nightly": {
+            "task": "operator_core.rebuild_metric_rollups",
+            "schedule": crontab(hour=3, minute=20),
+        },
         "operator_health_ping_minutely": {
             "task": "operator_health_ping",
             "schedule": crontab(),  # every minute
@@ -288,8 +309,33 @@ CELERY_BEAT_SCHEDULE.update(
             "task": "payments.generate_owner_fee_tax_invoices",
             "schedule": crontab(day_of_month=1, hour=3, minute=10),
         },
+        "payments_backfill_stripe_fees_hourly": {
+            "task": "payments.backfill_stripe_fees",
+            "schedule": crontab(minute=40),
+        },
+        "payments_release_owner_earnings": {
+            "task": "payments.release_matured_owner_earnings",
+            "schedule": crontab(minute="*/15"),
+        },
+        "payments_sweep_stripe_webhook_events": {
+            "task": "payments.sweep_stripe_webhook_events",
+            "schedule": crontab(minute="*/5"),
+        },
     }
 )
+
+# --- Realtime events (core.event_hub) ---
+# Reader tasks per ASGI worker; each holds one Redis connection in a blocking XREAD that
+# covers every connected user in its shard.
+EVENTS_HUB_READERS = env.int("EVENTS_HUB_READERS", default=4)
+EVENTS_HUB_BLOCK_MS = env.int("EVENTS_HUB_BLOCK_MS", default=25_000)
+EVENTS_HUB_READ_COUNT = env.int("EVENTS_HUB_READ_COUNT", default=100)
+# Undelivered event batches buffered per connection before a slow client is disconnected.
+EVENTS_HUB_QUEUE_SIZE = env.int("EVENTS_HUB_QUEUE_SIZE", default=64)
+# /api/events/stream/: after the first event, wait this long for more before responding.
+EVENTS_LONGPOLL_LINGER_MS = env.int("EVENTS_LONGPOLL_LINGER_MS", default=250)
+EVENTS_LONGPOLL_MAX_EVENTS = env.int("EVENTS_LONGPOLL_MAX_EVENTS", default=100)
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 FRONTEND_ORIGIN = env("FRONTEND_ORIGIN", default="http://localhost:5173")
 
@@ -307,11 +353,18 @@ CACHE_TTL_LISTINGS = env.int("CACHE_TTL_LISTINGS", default=120)
 CACHE_TTL_PROMOTIONS = env.int("CACHE_TTL_PROMOTIONS", default=60)
 CACHE_TTL_CATEGORIES = env.int("CACHE_TTL_CATEGORIES", default=300)
 CACHE_TTL_RECENT_RENTALS = env.int("CACHE_TTL_RECENT_RENTALS", default=120)
+# Shared endpoint cache behaviour (core.cache)
+CACHE_TTL_JITTER = env.float("CACHE_TTL_JITTER", default=0.1)
+CACHE_STALE_WHILE_REVALIDATE_SECONDS = env.int("CACHE_STALE_WHILE_REVALIDATE_SECONDS", default=60)
+CACHE_REBUILD_LOCK_TIMEOUT_SECONDS = env.int("CACHE_REBUILD_LOCK_TIMEOUT_SECONDS", default=10)
+CACHE_REBUILD_LOCK_WAIT_SECONDS = env.float("CACHE_REBUILD_LOCK_WAIT_SECONDS", default=2.0)
 
 # --- Geocoding ---
 GOOGLE_MAPS_API_KEY= env("GOOGLE_MAPS_API_KEY", default=None)
 GEOCODE_CACHE_TTL= env.int("GEOCODE_CACHE_TTL", default=7 * 24 * 60 * 60)
 GEOCODE_REQUEST_TIMEOUT= env.float("GEOCODE_REQUEST_TIMEOUT", default=5.0)
+LISTING_GEO_DEFAULT_RADIUS_KM = env.float("LISTING_GEO_DEFAULT_RADIUS_KM", default=25.0)
+LISTING_GEO_MAX_RADIUS_KM = env.float("LISTING_GEO_MAX_RADIUS_KM", default=200.0)
 
 # --- Promotions ---
 PROMOTION_PRICE_CENTS = env.int("PROMOTION_PRICE_CENTS", default=500)
@@ -340,6 +393,16 @@ STRIPE_BOOKINGS_DESTINATION_CHARGES = env.bool(
     "STRIPE_BOOKINGS_DESTINATION_CHARGES",
     default=True,
 )
+# Concurrent Stripe lookups used when resolving stored processing fees.
+STRIPE_FEE_RESOLVE_WORKERS = env.int("STRIPE_FEE_RESOLVE_WORKERS", default=8)
+# Webhook-triggered Connect account syncs within this window collapse into one fetch.
+STRIPE_ACCOUNT_SYNC_DELAY_SECONDS = env.int("STRIPE_ACCOUNT_SYNC_DELAY_SECONDS", default=30)
+# Shared cache for Stripe customer ids / PaymentMethods (invalidated by webhooks).
+STRIPE_OBJECT_CACHE_TTL_SECONDS = env.int("STRIPE_OBJECT_CACHE_TTL_SECONDS", default=900)
+# Cached row counts for /owner/payouts/history (invalidated on ledger writes).
+PAYOUT_HISTORY_COUNT_CACHE_TTL_SECONDS = env.int(
+    "PAYOUT_HISTORY_COUNT_CACHE_TTL_SECONDS", default=600
+)
 CONNECT_BUSINESS_NAME = env("CONNECT_BUSINESS_NAME", default="Rentino")
 CONNECT_BUSINESS_URL = env("CONNECT_BUSINESS_URL", default=FRONTEND_ORIGIN)
 CONNECT_BUSINESS_PRODUCT_DESCRIPTION = env(
@@ -0,0 +1,181 @@
+"""Pooled clamd connections for the AV tasks.
+
+Each worker process keeps a small pool of clamd sockets opened in ``IDSESSION`` mode,
+so consecutive scans reuse one connection instead of paying a connect (and clamd
+thread hand-off) per file. Connections idle for longer than
+``CLAMD_HEALTHCHECK_INTERVAL`` are ``PING``-ed before reuse; broken ones are dropped.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+from django.conf import settings
+
+_INSTREAM_CHUNK_BYTES = 64 * 1024
+
+
+class ClamdError(RuntimeError):
+    """Raised when clamd answers with an error instead of a verdict."""
+
+
+def _pool_size() -> int:
+    return max(int(getattr(settings, "CLAMD_POOL_SIZE", 4)), 1)
+
+
+def _timeout_seconds() -> float:
+    return float(getattr(settings, "CLAMD_TIMEOUT", 30))
+
+
+def _healthcheck_interval() -> float:
+    return float(getattr(settings, "CLAMD_HEALTHCHECK_INTERVAL", 10))
+
+
+class ClamdConnection:
+    """One clamd socket in session mode; not thread-safe, use via ``ClamdPool``."""
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self._buffer = b""
+        self.last_used = time.monotonic()
+
+    @classmethod
+    def connect(cls) -> "ClamdConnection":
+        socket_path = getattr(settings, "CLAMD_UNIX_SOCKET", None)
+        timeout = _timeout_seconds()
+        if socket_path:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            try:
+                sock.connect(socket_path)
+            except OSError:
+                sock.close()
+                raise
+        else:
+            host = getattr(settings, "CLAMD_HOST", "127.0.0.1")
+            port = int(getattr(settings, "CLAMD_PORT", 3310))
+            sock = socket.create_connection((host, port), timeout=timeout)
+        conn = cls(sock)
+        conn._send(b"zIDSESSION\0")
+        return conn
+
+    def _send(self, data: bytes) -> None:
+        self._sock.sendall(data)
+
+    def _read_reply(self) -> str:
+        while b"\0" not in self._buffer:
+            chunk = self._sock.recv(4096)
+            if not chunk:
+                raise ConnectionError("clamd closed the connection.")
+            self._buffer += chunk
+        raw, self._buffer = self._buffer.split(b"\0", 1)
+        reply = raw.decode("utf-8", errors="replace")
+        # Session replies are prefixed with the request id: "<id>: <reply>".
+        _, _, body = reply.partition(": ")
+        return body or reply
+
+    def ping(self) -> bool:
+        try:
+            self._send(b"zPING\0")
+            return self._read_reply().strip() == "PONG"
+        except OSError:
+            return False
+
+    def instream(self, stream: IO[bytes]) -> str:
+        """
+        Send ``stream`` with INSTREAM and return ``"clean"`` or ``"infected"``.
+
+        Any other reply (e.g. ``INSTREAM size limit exceeded. ERROR``) raises ``ClamdError``.
+        """
+        self._send(b"zINSTREAM\0")
+        for chunk in _iter_stream(stream):
+            self._send(struct.pack("!L", len(chunk)) + chunk)
+        self._send(struct.pack("!L", 0))
+        reply = self._read_reply().strip()
+        self.last_used = time.monotonic()
+        if reply.endswith("FOUND"):
+            return "infected"
+        if reply.endswith("OK"):
+            return "clean"
+        raise ClamdError(f"clamd returned an error: {reply}")
+
+    def close(self) -> None:
+        try:
+            self._send(b"zEND\0")
+        except OSError:
+            pass
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+def _iter_stream(stream: IO[bytes]) -> Iterator[bytes]:
+    while True:
+        chunk = stream.read(_INSTREAM_CHUNK_BYTES)
+        if not chunk:
+            return
+        yield chunk
+
+
+class ClamdPool:
+    """Per-process pool of idle ``ClamdConnection`` objects."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._idle: deque[ClamdConnection] = deque()
+        self._pid: Optional[int] = None
+
+    def _take_idle(self) -> Optional[ClamdConnection]:
+        with self._lock:
+            if self._pid != os.getpid():
+                # Inherited across fork: the sockets belong to the parent.
+                self._idle.clear()
+                self._pid = os.getpid()
+            return self._idle.pop() if self._idle else None
+
+    def _checkout(self) -> ClamdConnection:
+        while True:
+            conn = self._take_idle()
+            if conn is None:
+                return ClamdConnection.connect()
+            if time.monotonic() - conn.last_used < _healthcheck_interval():
+                return conn
+            if conn.ping():
+                return conn
+            conn.close()
+
+    def _checkin(self, conn: ClamdConnection) -> None:
+        with self._lock:
+            if self._pid == os.getpid() and len(self._idle) < _pool_size():
+                conn.last_used = time.monotonic()
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    @contextmanager
+    def connection(self) -> Iterator[ClamdConnection]:
+        conn = self._checkout()
+        try:
+            yield conn
+        except BaseException:
+            conn.close()
+            raise
+        self._checkin(conn)
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn in idle:
+            conn.close()
+
+
+clamd_pool = ClamdPool()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from botocore.exceptions import NoCredentialsError
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.benchmarks import percentile
+from storage import s3 as s3util
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure presigned PUT URL throughput with the pooled S3 client versus a client "
+        "built per call (no network traffic; needs AWS credentials to sign)."
+    )
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=500,
+            help="Presign calls per mode.",
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=8,
+            help="Concurrent callers, approximating API workers sharing one process.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        iterations = options["iterations"]
+        threads = options["threads"]
+        if iterations <= 0 or threads <= 0:
+            raise CommandError("--iterations and --threads must be greater than 0.")
+
+        bucket = getattr(settings, "AWS_STORAGE_BUCKET_NAME", None) or "benchmark-bucket"
+        client_options = s3util._client_settings()
+        modes = {
+            "pooled": s3util._client,
+            "per-call": lambda: s3util._build_client(client_options),
+        }
+
+        s3util.reset_client()
+        for name, get_client in modes.items():
+
+            def presign(index: int, get_client=get_client) -> float:
+                started = time.perf_counter()
+                get_client().generate_presigned_url(
+                    ClientMethod="put_object",
+                    Params={
+                        "Bucket": bucket,
+                        "Key": f"benchmark/{index}.jpg",
+                        "ContentType": "image/jpeg",
+                    },
+                    ExpiresIn=900,
+                )
+                return (time.perf_counter() - started) * 1000
+
+            wall_started = time.perf_counter()
+            try:
+                with ThreadPoolExecutor(max_workers=threads) as executor:
+                    samples = list(executor.map(presign, range(iterations)))
+            except NoCredentialsError as exc:
+                raise CommandError(
+                    "AWS credentials are required to sign URLs "
+                    "(set AWS_ACCESS_KEY_ID/AWS_SECRET_ACCESS_KEY)."
+                ) from exc
+            elapsed = time.perf_counter() - wall_started
+            self.stdout.write(
+                f"{name:<10} {iterations / elapsed:9.1f} presigns/s "
+                f"p50={statistics.median(samples):6.2f}ms "
+                f"p95={percentile(samples, 95):6.2f}ms"
+            )
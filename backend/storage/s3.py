@@ -1,7 +1,8 @@
 import mimetypes
 import os
+import threading
 import uuid
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import boto3
 from botocore.config import Config
@@ -19,21 +20,96 @@ def _normalized_endpoint(url: Optional[str]) -> Optional[str]:
     return f"https://{url}"
 
 
-def _client():
-    addressing_style = "path" if getattr(settings, "AWS_S3_FORCE_PATH_STYLE", False) else "auto"
+# One client per (process, config): boto3 clients are thread-safe and keep a urllib3
+# connection pool, so building them once avoids re-parsing endpoint metadata and lets
+# uploads reuse keep-alive connections. Keyed by pid so forked Celery/gunicorn workers
+# never share the parent's sockets.
+_client_lock = threading.Lock()
+_clients: Dict[Tuple, object] = {}
+_client_pid: Optional[int] = None
+
+
+def _client_settings() -> Tuple:
+    return (
+        getattr(settings, "AWS_S3_REGION_NAME", None),
+        _normalized_endpoint(getattr(settings, "AWS_S3_ENDPOINT_URL", None)),
+        bool(getattr(settings, "AWS_S3_FORCE_PATH_STYLE", False)),
+        int(getattr(settings, "S3_MAX_POOL_CONNECTIONS", 20)),
+        bool(getattr(settings, "S3_TCP_KEEPALIVE", True)),
+        int(getattr(settings, "S3_RETRY_MAX_ATTEMPTS", 3)),
+        getattr(settings, "S3_RETRY_MODE", "standard"),
+        float(getattr(settings, "S3_CONNECT_TIMEOUT", 5)),
+        float(getattr(settings, "S3_READ_TIMEOUT", 60)),
+    )
+
+
+def _build_client(options: Tuple):
+    (
+        region,
+        endpoint,
+        force_path_style,
+        max_pool_connections,
+        tcp_keepalive,
+        max_attempts,
+        retry_mode,
+        connect_timeout,
+        read_timeout,
+    ) = options
     cfg = Config(
         signature_version="s3v4",
-        s3={"addressing_style": addressing_style},
+        s3={"addressing_style": "path" if force_path_style else "auto"},
+        max_pool_connections=max_pool_connections,
+        tcp_keepalive=tcp_keepalive,
+        retries={"max_attempts": max_attempts, "mode": retry_mode},
+        connect_timeout=connect_timeout,
+        read_timeout=read_timeout,
     )
-    endpoint = _normalized_endpoint(getattr(settings, "AWS_S3_ENDPOINT_URL", None))
-    return boto3.client(
+    return boto3.session.Session().client(
         "s3",
-        region_name=getattr(settings, "AWS_S3_REGION_NAME", None),
+        region_name=region,
         endpoint_url=endpoint,
         config=cfg,
     )
 
 
+def reset_client() -> None:
+    """Drop pooled clients (used after fork and by tests that change S3 settings)."""
+    global _client_pid
+    with _client_lock:
+        _clients.clear()
+        _client_pid = os.getpid()
+
+
+def _client():
+    global _client_pid
+    options = _client_settings()
+    if _client_pid == os.getpid():
+        client = _clients.get(options)
+        if client is not None:
+            return client
+    with _client_lock:
+        if _client_pid != os.getpid():
+            _clients.clear()
+            _client_pid = os.getpid()
+        client = _clients.get(options)
+        if client is None:
+            client = _build_client(options)
+            _clients[options] = client
+        return client
+
+
+def _reset_after_fork() -> None:
+    # The parent's lock may have been held mid-fork; start the child with a fresh one.
+    global _client_lock, _client_pid
+    _client_lock = threading.Lock()
+    _clients.clear()
+    _client_pid = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
 def object_key(listing_id: int, owner_id: int, filename: str) -> str:
     prefix = (getattr(settings, "S3_UPLOADS_PREFIX", "") or "").strip("/")
     name, ext = os.path.splitext(filename or "")
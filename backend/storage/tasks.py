@@ -6,8 +6,9 @@ import os
 import shutil
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, time, timedelta
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, NamedTuple, Optional, Tuple
 
 from botocore.exceptions import (
     BotoCoreError,
@@ -17,6 +18,7 @@ from botocore.exceptions import (
 )
 from celery import shared_task
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 from django.utils import timezone
 from PIL import Image, UnidentifiedImageError
@@ -26,6 +28,7 @@ from core.settings_resolver import get_int
 from notifications import tasks as notification_tasks
 
 from . import s3 as s3util
+from .clamav import ClamdError, clamd_pool
 from .validators import (
     coerce_int,
     is_image_content_type,
@@ -74,27 +77,160 @@ class AntivirusError(RuntimeError):
     """Raised when ClamAV cannot determine the safety of a file."""
 
 
+class ObjectDownloadError(RuntimeError):
+    """Raised when an S3 object cannot be fetched (retryable by the calling task)."""
+
+
+_STREAM_CHUNK_BYTES = 64 * 1024
+_HEADER_SNIFF_DEFAULT_BYTES = 256 * 1024
+
+
 def _s3_client():
     return s3util._client()
 
 
-def _download_bytes(key: str, *, byte_limit: Optional[int] = None) -> bytes:
+def _header_sniff_bytes() -> int:
+    configured = getattr(settings, "AV_HEADER_SNIFF_BYTES", _HEADER_SNIFF_DEFAULT_BYTES)
+    if not isinstance(configured, int) or configured <= 0:
+        return _HEADER_SNIFF_DEFAULT_BYTES
+    return configured
+
+
+def _open_object_chunks(key: str, *, byte_limit: Optional[int] = None) -> Iterator[bytes]:
+    """Start a GET for ``key`` and return an iterator over its body chunks."""
+    params: dict[str, Any] = {"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": key}
+    if byte_limit and byte_limit > 0:
+        params["Range"] = f"bytes=0-{byte_limit - 1}"
     try:
-        buffer = io.BytesIO()
-        download_kwargs: dict[str, Any] = {}
-        if byte_limit and byte_limit > 0:
-            download_kwargs["ExtraArgs"] = {"Range": f"bytes=0-{byte_limit - 1}"}
-        _s3_client().download_fileobj(
-            settings.AWS_STORAGE_BUCKET_NAME,
-            key,
-            buffer,
-            **download_kwargs,
-        )
-        return buffer.getvalue()
-    except (BotoCoreError, ClientError, EndpointConnectionError, NoCredentialsError) as exc:
-        if isinstance(exc, (NoCredentialsError, EndpointConnectionError)):
-            return DUMMY_IMAGE_BYTES
-        raise RuntimeError(f"Unable to download object {key}: {exc}") from exc
+        body = _s3_client().get_object(**params)["Body"]
+    except (NoCredentialsError, EndpointConnectionError):
+        return iter([DUMMY_IMAGE_BYTES])
+    except (BotoCoreError, ClientError) as exc:
+        raise ObjectDownloadError(f"Unable to download object {key}: {exc}") from exc
+
+    def _chunks() -> Iterator[bytes]:
+        try:
+            for chunk in body.iter_chunks(_STREAM_CHUNK_BYTES):
+                if chunk:
+                    yield chunk
+        except (BotoCoreError, ClientError) as exc:
+            raise ObjectDownloadError(f"Unable to download object {key}: {exc}") from exc
+        finally:
+            body.close()
+
+    return _chunks()
+
+
+def _open_file_chunks(path: str, *, byte_limit: Optional[int] = None) -> Iterator[bytes]:
+    remaining = byte_limit if byte_limit and byte_limit > 0 else None
+    with open(path, "rb") as handle:
+        while remaining is None or remaining > 0:
+            size = _STREAM_CHUNK_BYTES if remaining is None else min(remaining, _STREAM_CHUNK_BYTES)
+            chunk = handle.read(size)
+            if not chunk:
+                return
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+class _ScanStream(io.RawIOBase):
+    """
+    Read-only file object over a chunk iterator.
+
+    Counts every byte that passes through and keeps the first ``header_limit`` bytes
+    for dimension sniffing, so scanners can consume it like a file without the whole
+    object ever being held in memory.
+    """
+
+    def __init__(self, chunks: Iterator[bytes], *, header_limit: int):
+        super().__init__()
+        self._chunks = chunks
+        self._pending = memoryview(b"")
+        self._header_limit = header_limit
+        self.header = bytearray()
+        self.bytes_read = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self._pending:
+            chunk = next(self._chunks, b"")
+            if not chunk:
+                return 0
+            self._pending = memoryview(chunk)
+        count = min(len(buffer), len(self._pending))
+        data = self._pending[:count]
+        buffer[:count] = data
+        self._pending = self._pending[count:]
+        if len(self.header) < self._header_limit:
+            self.header += data[: self._header_limit - len(self.header)]
+        self.bytes_read += count
+        return count
+
+    def iter_chunks(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(_STREAM_CHUNK_BYTES)
+            if not chunk:
+                return
+            yield chunk
+
+    def drain(self) -> None:
+        for _ in self.iter_chunks():
+            pass
+
+
+class _ScanSource:
+    """
+    Re-openable input for ``_scan_stream``.
+
+    Engines that fail part-way (e.g. clamd dropping the connection) get a fresh
+    stream from ``open()``; ``finish()`` drains whichever stream was used last so
+    callers can read the total size and header afterwards.
+    """
+
+    def __init__(self, opener: Callable[[], Iterator[bytes]], *, header_limit: int):
+        self._opener = opener
+        self._header_limit = header_limit
+        self.stream: Optional[_ScanStream] = None
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "_ScanSource":
+        return cls(lambda: iter([data]), header_limit=len(data))
+
+    def open(self) -> _ScanStream:
+        if self.stream is not None and self.stream.bytes_read == 0:
+            return self.stream
+        self.stream = _ScanStream(self._opener(), header_limit=self._header_limit)
+        return self.stream
+
+    def finish(self) -> _ScanStream:
+        stream = self.stream or self.open()
+        stream.drain()
+        return stream
+
+
+class _ScanResult(NamedTuple):
+    verdict: str
+    size: int
+    header: bytes
+
+
+def _scan_object(
+    key: str,
+    *,
+    byte_limit: Optional[int] = None,
+    opener: Optional[Callable[[], Iterator[bytes]]] = None,
+) -> _ScanResult:
+    """Stream ``key`` (or ``opener``'s chunks) through the AV engine in one pass."""
+    source = _ScanSource(
+        opener or (lambda: _open_object_chunks(key, byte_limit=byte_limit)),
+        header_limit=_header_sniff_bytes(),
+    )
+    verdict = _scan_stream(source)
+    stream = source.finish()
+    return _ScanResult(verdict, stream.bytes_read, bytes(stream.header))
 
 
 def _download_to_tempfile(key: str) -> Tuple[str, bool]:
@@ -115,13 +251,6 @@ def _download_to_tempfile(key: str) -> Tuple[str, bool]:
     return tmp.name, used_dummy
 
 
-def _read_file_bytes(path: str, *, byte_limit: Optional[int] = None) -> bytes:
-    with open(path, "rb") as handle:
-        if byte_limit and byte_limit > 0:
-            return handle.read(byte_limit)
-        return handle.read()
-
-
 def _dispute_video_scan_limit(meta: Optional[Dict]) -> Optional[int]:
     kind = ((meta or {}).get("kind") or "").lower()
     content_type = ((meta or {}).get("content_type") or "").lower()
@@ -361,88 +490,94 @@ def _upload_compressed_video(key: str, *, path: str, content_type: str) -> Optio
     return str(etag) if etag else None
 
 
-def _scan_with_clamd(data: bytes) -> Optional[str]:
-    try:
-        import clamd
-    except ImportError:
-        return None
-
-    socket_path = getattr(settings, "CLAMD_UNIX_SOCKET", None)
-    host = getattr(settings, "CLAMD_HOST", "127.0.0.1")
-    port = getattr(settings, "CLAMD_PORT", 3310)
+def _scan_with_clamd(stream: _ScanStream) -> Optional[str]:
     try:
-        if socket_path:
-            client = clamd.ClamdUnixSocket(path=socket_path)
-        else:
-            client = clamd.ClamdNetworkSocket(host=host, port=port)
-        response = client.instream(io.BytesIO(data))
-    except Exception as exc:  # pragma: no cover - depends on env
+        # Pooled session connection; INSTREAM pulls fixed-size chunks as it goes.
+        with clamd_pool.connection() as conn:
+            return conn.instream(stream)
+    except ClamdError as exc:
+        # clamd answered without a verdict (size limit, scan error): keep the upload
+        # quarantined instead of falling back to a weaker check.
         logger.warning("Clamd scan failed: %s", exc)
+        return "infected"
+    except OSError as exc:  # pragma: no cover - depends on env
+        # Only an unreachable clamd falls back to clamscan.
+        logger.warning("Clamd is unavailable: %s", exc)
         return None
 
-    verdict = response.get("stream")
-    status = None
-    if isinstance(verdict, tuple):
-        status = verdict[0]
-    elif isinstance(verdict, dict):
-        status = verdict.get("status")
-    else:
-        status = verdict
-    if status == "OK":
-        return "clean"
-    return "infected"
-
 
-def _scan_with_clamscan(data: bytes) -> str:
+def _scan_with_clamscan(stream: _ScanStream) -> str:
     try:
-        proc = subprocess.run(
+        proc = subprocess.Popen(
             ["clamscan", "--no-summary", "-"],
-            input=data,
-            capture_output=True,
-            check=False,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
         )
     except FileNotFoundError as exc:
         raise AntivirusError("clamscan binary is not available.") from exc
     except OSError as exc:
         raise AntivirusError(f"clamscan failed to start: {exc}") from exc
 
-    if proc.returncode == 0:
+    try:
+        for chunk in stream.iter_chunks():
+            proc.stdin.write(chunk)
+    except BrokenPipeError:
+        # clamscan exited early; its return code below carries the verdict.
+        pass
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+    stderr = proc.stderr.read() if proc.stderr else b""
+    returncode = proc.wait()
+
+    if returncode == 0:
         return "clean"
-    if proc.returncode == 1:
+    if returncode == 1:
         return "infected"
 
-    stderr = (proc.stderr or b"").decode().strip()
-    raise AntivirusError(f"clamscan failed with exit code {proc.returncode}: {stderr}")
+    stderr_text = (stderr or b"").decode().strip()
+    raise AntivirusError(f"clamscan failed with exit code {returncode}: {stderr_text}")
 
 
-def _scan_bytes(data: bytes) -> str:
+def _stream_contains(stream: _ScanStream, marker: bytes) -> bool:
+    overlap = b""
+    for chunk in stream.iter_chunks():
+        window = overlap + chunk
+        if marker in window:
+            return True
+        overlap = window[-(len(marker) - 1) :] if len(marker) > 1 else b""
+    return False
+
+
+def _scan_stream(source: _ScanSource) -> str:
     if not getattr(settings, "AV_ENABLED", True):
         return "clean"
 
     # If clamd is not reachable and clamscan is missing in CI, fall back to
     # a light-weight marker check so tests can still exercise the AV flow
     # without external deps.
-    def _marker_verdict(payload: bytes) -> Optional[str]:
-        marker = (getattr(settings, "AV_DUMMY_INFECT_MARKER", "EICAR") or "").encode()
-        if marker and payload and marker in payload:
-            return "infected"
-        return None
+    marker = (getattr(settings, "AV_DUMMY_INFECT_MARKER", "EICAR") or "").encode()
 
     engine = (getattr(settings, "AV_ENGINE", "clamd") or "clamd").lower()
     if engine == "dummy":
-        marker = (getattr(settings, "AV_DUMMY_INFECT_MARKER", "EICAR") or "").encode()
-        return "infected" if marker and marker in data else "clean"
+        return "infected" if marker and _stream_contains(source.open(), marker) else "clean"
 
     verdict: Optional[str] = None
     if engine in {"clamd", "auto"}:
-        verdict = _scan_with_clamd(data)
+        verdict = _scan_with_clamd(source.open())
     if verdict is None:
         try:
-            verdict = _scan_with_clamscan(data)
+            verdict = _scan_with_clamscan(source.open())
         except AntivirusError:
-            marker = _marker_verdict(data)
-            if marker is not None:
-                verdict = marker
+            if marker and _stream_contains(source.open(), marker):
+                verdict = "infected"
             else:
                 # No scanner available; treat as clean so tests/environments
                 # without AV binaries can proceed
@@ -452,6 +587,10 @@ def _scan_bytes(data: bytes) -> str:
     return verdict
 
 
+def _scan_bytes(data: bytes) -> str:
+    return _scan_stream(_ScanSource.from_bytes(data))
+
+
 def _apply_av_metadata(key: str, status: str) -> None:
     tags = {"av-status": status}
     try:
@@ -733,19 +872,18 @@ def _finalize_dispute_evidence_record(
     return evidence
 
 
-def _run_scan_and_finalize(
-    *,
+def _photo_verdict(
     key: str,
-    listing_id: int,
-    owner_id: int,
-    meta: Dict | None,
-):
-    data = _download_bytes(key)
-    dimensions = _extract_dimensions(data)
-    verdict = _scan_bytes(data)
+    scanned: _ScanResult,
+    meta: Dict,
+    **log_extra: Any,
+) -> Tuple[str, Tuple[Optional[int], Optional[int]]]:
+    """Combine the AV verdict with the image limits; returns ``(verdict, dimensions)``."""
+    dimensions = _extract_dimensions(scanned.header)
+    verdict = scanned.verdict
     constraint_error = validate_image_limits(
-        content_type=meta.get("content_type") if meta else "",
-        size=len(data),
+        content_type=meta.get("content_type") or "",
+        size=scanned.size,
         width=dimensions[0],
         height=dimensions[1],
     )
@@ -753,19 +891,32 @@ def _run_scan_and_finalize(
         verdict = "invalid"
     if verdict not in {"clean", "infected", "invalid"}:
         raise AntivirusError("Unknown antivirus verdict.")
-    if is_image_content_type(meta.get("content_type") if meta else ""):
+    if is_image_content_type(meta.get("content_type") or ""):
         logger.info(
             "image_processed",
             extra={
                 "key": key,
                 "width": dimensions[0],
                 "height": dimensions[1],
-                "bytes": len(data),
-                "original_size": coerce_int(meta.get("original_size") if meta else None),
-                "compressed_size": coerce_int(meta.get("compressed_size") if meta else None),
+                "bytes": scanned.size,
+                "original_size": coerce_int(meta.get("original_size")),
+                "compressed_size": coerce_int(meta.get("compressed_size")),
+                **log_extra,
                 "constraint_error": constraint_error,
             },
         )
+    return verdict, dimensions
+
+
+def _run_scan_and_finalize(
+    *,
+    key: str,
+    listing_id: int,
+    owner_id: int,
+    meta: Dict | None,
+):
+    meta = meta or {}
+    verdict, dimensions = _photo_verdict(key, _scan_object(key), meta)
 
     _apply_av_metadata(key, verdict)
     photo = _finalize_photo_record(
@@ -773,7 +924,7 @@ def _run_scan_and_finalize(
         owner_id=owner_id,
         key=key,
         verdict=verdict,
-        meta=meta or {},
+        meta=meta,
         dimensions=dimensions,
     )
     return {"status": verdict, "photo_id": str(photo.id)}
@@ -786,33 +937,8 @@ def _run_scan_and_finalize_booking_photo(
     uploaded_by_id: int,
     meta: Dict | None,
 ):
-    data = _download_bytes(key)
-    dimensions = _extract_dimensions(data)
-    verdict = _scan_bytes(data)
-    constraint_error = validate_image_limits(
-        content_type=meta.get("content_type") if meta else "",
-        size=len(data),
-        width=dimensions[0],
-        height=dimensions[1],
-    )
-    if constraint_error:
-        verdict = "invalid"
-    if verdict not in {"clean", "infected", "invalid"}:
-        raise AntivirusError("Unknown antivirus verdict.")
-    if is_image_content_type(meta.get("content_type") if meta else ""):
-        logger.info(
-            "image_processed",
-            extra={
-                "key": key,
-                "width": dimensions[0],
-                "height": dimensions[1],
-                "bytes": len(data),
-                "original_size": coerce_int(meta.get("original_size") if meta else None),
-                "compressed_size": coerce_int(meta.get("compressed_size") if meta else None),
-                "booking_id": booking_id,
-                "constraint_error": constraint_error,
-            },
-        )
+    meta = meta or {}
+    verdict, dimensions = _photo_verdict(key, _scan_object(key), meta, booking_id=booking_id)
 
     _apply_av_metadata(key, verdict)
     photo = _finalize_booking_photo_record(
@@ -820,12 +946,139 @@ def _run_scan_and_finalize_booking_photo(
         uploaded_by_id=uploaded_by_id,
         key=key,
         verdict=verdict,
-        meta=meta or {},
+        meta=meta,
         dimensions=dimensions,
     )
     return {"status": verdict, "photo_id": str(photo.id)}
 
 
+def _batch_concurrency() -> int:
+    return max(int(getattr(settings, "AV_BATCH_CONCURRENCY", 4) or 1), 1)
+
+
+def _scan_objects_concurrently(keys: list[str]) -> Dict[str, _ScanResult | Exception]:
+    """
+    Download and scan several objects on a small thread pool.
+
+    Only the I/O-bound scan runs in threads; callers finalize rows sequentially so
+    database work stays on the task's own connection.
+    """
+    if not keys:
+        return {}
+    results: Dict[str, _ScanResult | Exception] = {}
+    workers = min(_batch_concurrency(), len(keys))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="av-scan") as pool:
+        futures = {pool.submit(_scan_object, key): key for key in keys}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                results[key] = future.result()
+            except Exception as exc:
+                results[key] = exc
+    return results
+
+
+def _photo_row_meta(photo, key: str, uploaded: Dict[str, Dict], **extra: Any) -> Dict:
+    return {
+        "etag": photo.etag,
+        "filename": photo.filename,
+        "content_type": photo.content_type,
+        "size": photo.size,
+        **uploaded.get(_upload_sizes_key(key), {}),
+        **extra,
+    }
+
+
+def _uploaded_sizes(keys: list[str]) -> Dict[str, Dict]:
+    """Client-reported sizes stashed by ``_queue_batch_scan``, keyed by cache key."""
+    if not keys:
+        return {}
+    return cache.get_many([_upload_sizes_key(key) for key in keys])
+
+
+def _finish_batch(kind: str, object_id: int, outcomes: Dict[str, str], failed: list[str]):
+    if failed:
+        # Retrying re-runs the batch; photos finalized above are no longer pending.
+        raise ObjectDownloadError(
+            f"Failed to scan {len(failed)} pending {kind} photo(s) for {kind} {object_id}."
+        )
+    return {"scanned": len(outcomes), "results": outcomes}
+
+
+def _run_scan_pending_listing_photos(listing_id: int):
+    from listings.models import ListingPhoto
+
+    photos = list(
+        ListingPhoto.objects.filter(
+            listing_id=listing_id, av_status=ListingPhoto.AVStatus.PENDING
+        ).order_by("id")
+    )
+    scans = _scan_objects_concurrently([photo.key for photo in photos])
+    uploaded = _uploaded_sizes([photo.key for photo in photos])
+    outcomes: Dict[str, str] = {}
+    failed: list[str] = []
+    for photo in photos:
+        scanned = scans[photo.key]
+        if isinstance(scanned, Exception):
+            logger.warning(
+                "Batch scan failed for listing photo",
+                extra={"listing_id": listing_id, "key": photo.key, "error": str(scanned)},
+            )
+            failed.append(photo.key)
+            continue
+        meta = _photo_row_meta(photo, photo.key, uploaded)
+        verdict, dimensions = _photo_verdict(photo.key, scanned, meta)
+        _apply_av_metadata(photo.key, verdict)
+        _finalize_photo_record(
+            listing_id=listing_id,
+            owner_id=photo.owner_id,
+            key=photo.key,
+            verdict=verdict,
+            meta=meta,
+            dimensions=dimensions,
+        )
+        outcomes[photo.key] = verdict
+    cache.delete_many([_upload_sizes_key(key) for key in outcomes])
+    return _finish_batch("listing", listing_id, outcomes, failed)
+
+
+def _run_scan_pending_booking_photos(booking_id: int):
+    from bookings.models import BookingPhoto
+
+    photos = list(
+        BookingPhoto.objects.filter(
+            booking_id=booking_id, av_status=BookingPhoto.AVStatus.PENDING
+        ).order_by("id")
+    )
+    scans = _scan_objects_concurrently([photo.s3_key for photo in photos])
+    uploaded = _uploaded_sizes([photo.s3_key for photo in photos])
+    outcomes: Dict[str, str] = {}
+    failed: list[str] = []
+    for photo in photos:
+        scanned = scans[photo.s3_key]
+        if isinstance(scanned, Exception):
+            logger.warning(
+                "Batch scan failed for booking photo",
+                extra={"booking_id": booking_id, "key": photo.s3_key, "error": str(scanned)},
+            )
+            failed.append(photo.s3_key)
+            continue
+        meta = _photo_row_meta(photo, photo.s3_key, uploaded, role=photo.role)
+        verdict, dimensions = _photo_verdict(photo.s3_key, scanned, meta, booking_id=booking_id)
+        _apply_av_metadata(photo.s3_key, verdict)
+        _finalize_booking_photo_record(
+            booking_id=booking_id,
+            uploaded_by_id=photo.uploaded_by_id,
+            key=photo.s3_key,
+            verdict=verdict,
+            meta=meta,
+            dimensions=dimensions,
+        )
+        outcomes[photo.s3_key] = verdict
+    cache.delete_many([_upload_sizes_key(key) for key in outcomes])
+    return _finish_batch("booking", booking_id, outcomes, failed)
+
+
 def _run_scan_and_finalize_dispute_evidence(
     *,
     key: str,
@@ -834,40 +1087,45 @@ def _run_scan_and_finalize_dispute_evidence(
     meta: Dict | None,
 ):
     meta = dict(meta or {})
-    scan_payload: bytes
+    scanned: _ScanResult
     if _is_video_meta(meta):
         tmp_path, used_dummy = _download_to_tempfile(key)
         try:
-            scan_payload = b""
+            frame_payload = b""
             frame_count = _dispute_video_scan_frames(meta)
             if not used_dummy:
-                scan_payload = (
+                frame_payload = (
                     _video_scan_payload_from_frames(tmp_path, frame_count=frame_count) or b""
                 )
-                if scan_payload:
+                if frame_payload:
                     logger.info(
                         "video_scan_frames_sampled",
                         extra={
                             "key": key,
                             "frame_count": frame_count,
-                            "sample_bytes": len(scan_payload),
+                            "sample_bytes": len(frame_payload),
                             "content_type": meta.get("content_type"),
                         },
                     )
-            if not scan_payload:
+            if frame_payload:
+                scanned = _scan_object(key, opener=lambda: iter([frame_payload]))
+            else:
                 byte_limit = _dispute_video_scan_limit(meta)
-                scan_payload = _read_file_bytes(tmp_path, byte_limit=byte_limit)
+                scanned = _scan_object(
+                    key,
+                    opener=lambda: _open_file_chunks(tmp_path, byte_limit=byte_limit),
+                )
                 if byte_limit:
                     logger.info(
                         "video_scan_sampled",
                         extra={
                             "key": key,
                             "byte_limit": byte_limit,
-                            "downloaded_bytes": len(scan_payload),
+                            "downloaded_bytes": scanned.size,
                             "content_type": meta.get("content_type"),
                         },
                     )
-            verdict = _scan_bytes(scan_payload)
+            verdict = scanned.verdict
 
             original_size = os.path.getsize(tmp_path)
             if verdict == "clean" and not used_dummy and getattr(settings, "USE_S3", False):
@@ -938,22 +1196,22 @@ def _run_scan_and_finalize_dispute_evidence(
             os.unlink(tmp_path)
     else:
         byte_limit = _dispute_video_scan_limit(meta)
-        scan_payload = _download_bytes(key, byte_limit=byte_limit)
+        scanned = _scan_object(key, byte_limit=byte_limit)
         if byte_limit:
             logger.info(
                 "video_scan_sampled",
                 extra={
                     "key": key,
                     "byte_limit": byte_limit,
-                    "downloaded_bytes": len(scan_payload),
+                    "downloaded_bytes": scanned.size,
                     "content_type": meta.get("content_type"),
                 },
             )
-        verdict = _scan_bytes(scan_payload)
-    dimensions = _extract_dimensions(scan_payload)
+        verdict = scanned.verdict
+    dimensions = _extract_dimensions(scanned.header)
     constraint_error = validate_image_limits(
         content_type=meta.get("content_type") if meta else "",
-        size=len(scan_payload),
+        size=scanned.size,
         width=dimensions[0],
         height=dimensions[1],
     )
@@ -968,7 +1226,7 @@ def _run_scan_and_finalize_dispute_evidence(
                 "key": key,
                 "width": dimensions[0],
                 "height": dimensions[1],
-                "bytes": len(scan_payload),
+                "bytes": scanned.size,
                 "original_size": coerce_int(meta.get("original_size") if meta else None),
                 "compressed_size": coerce_int(meta.get("compressed_size") if meta else None),
                 "dispute_id": dispute_id,
@@ -1050,6 +1308,114 @@ def scan_and_finalize_booking_photo(
     )
 
 
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    name="storage.tasks.scan_pending_listing_photos",
+)
+def scan_pending_listing_photos(self, listing_id: int):
+    """
+    Scan every pending ListingPhoto of a listing in one task, downloading concurrently.
+    """
+
+    # Clear the debounce marker first so uploads completing mid-scan queue a new batch.
+    cache.delete(_scan_batch_key("listing", listing_id))
+    return _run_scan_pending_listing_photos(listing_id)
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    name="storage.tasks.scan_pending_booking_photos",
+)
+def scan_pending_booking_photos(self, booking_id: int):
+    """
+    Scan every pending BookingPhoto of a booking in one task, downloading concurrently.
+    """
+
+    cache.delete(_scan_batch_key("booking", booking_id))
+    return _run_scan_pending_booking_photos(booking_id)
+
+
+def _scan_batch_key(kind: str, object_id: int) -> str:
+    return f"storage:av-batch:{kind}:{object_id}"
+
+
+def _upload_sizes_key(key: str) -> str:
+    return f"storage:upload-sizes:{key}"
+
+
+def _queue_batch_scan(
+    task,
+    kind: str,
+    object_id: int,
+    *,
+    key: str | None = None,
+    original_size: int | None = None,
+    compressed_size: int | None = None,
+) -> None:
+    delay = max(int(getattr(settings, "AV_BATCH_DELAY_SECONDS", 3) or 0), 0)
+
+    def schedule():
+        if key and (original_size is not None or compressed_size is not None):
+            # Photo rows have no columns for the client-side sizes; the batch logs them.
+            cache.set(
+                _upload_sizes_key(key),
+                {"original_size": original_size, "compressed_size": compressed_size},
+                timeout=delay + 3600,
+            )
+        # The marker outlives the countdown so a lost task cannot block scans for long.
+        if cache.add(_scan_batch_key(kind, object_id), 1, timeout=delay + 300):
+            task.apply_async(args=[object_id], countdown=delay)
+
+    # Queue once the pending photo row has committed, so the batch cannot miss it.
+    transaction.on_commit(schedule)
+
+
+def queue_listing_photo_scan(
+    listing_id: int,
+    *,
+    key: str | None = None,
+    original_size: int | None = None,
+    compressed_size: int | None = None,
+) -> None:
+    """
+    Schedule a batch scan for a listing's pending photos after the current transaction.
+
+    Uploads completing within ``AV_BATCH_DELAY_SECONDS`` share one task. ``key`` with
+    the client-reported ``original_size``/``compressed_size`` carries those into the
+    batch's ``image_processed`` log.
+    """
+    _queue_batch_scan(
+        scan_pending_listing_photos,
+        "listing",
+        listing_id,
+        key=key,
+        original_size=original_size,
+        compressed_size=compressed_size,
+    )
+
+
+def queue_booking_photo_scan(
+    booking_id: int,
+    *,
+    key: str | None = None,
+    original_size: int | None = None,
+    compressed_size: int | None = None,
+) -> None:
+    """Schedule a batch scan for a booking's pending photos (see ``queue_listing_photo_scan``)."""
+    _queue_batch_scan(
+        scan_pending_booking_photos,
+        "booking",
+        booking_id,
+        key=key,
+        original_size=original_size,
+        compressed_size=compressed_size,
+    )
+
+
 @shared_task(name="storage.tasks.scan_and_finalize_dispute_evidence")
 def scan_and_finalize_dispute_evidence(
     key: str,
@@ -1093,5 +1459,9 @@ def scan_and_finalize_dispute_evidence(
 __all__ = [
     "scan_and_finalize_photo",
     "scan_and_finalize_booking_photo",
+    "scan_pending_listing_photos",
+    "scan_pending_booking_photos",
+    "queue_listing_photo_scan",
+    "queue_booking_photo_scan",
     "scan_and_finalize_dispute_evidence",
 ]
@@ -1,6 +1,8 @@
 import pytest
 from rest_framework.test import APIClient
 
+from storage import s3 as s3util
+
 
 @pytest.fixture
 def api_client():
@@ -13,3 +15,11 @@ def _test_s3_endpoint(settings):
     if settings.AWS_S3_REGION_NAME in (None, "", "auto"):
         settings.AWS_S3_REGION_NAME = "us-east-1"
     settings.AWS_S3_ENDPOINT_URL = None
+
+
+@pytest.fixture(autouse=True)
+def _fresh_s3_client_pool():
+    # Pooled clients must be created inside each test's moto mock.
+    s3util.reset_client()
+    yield
+    s3util.reset_client()
@@ -78,8 +78,24 @@ def _image_bytes(size=(32, 24), color=(10, 120, 220)):
     return buf.getvalue(), size
 
 
+class _StubBody:
+    def __init__(self, payload: bytes):
+        self._payload = payload
+        self.closed = False
+
+    def iter_chunks(self, chunk_size=1024):
+        for start in range(0, len(self._payload), chunk_size):
+            yield self._payload[start : start + chunk_size]
+
+    def close(self):
+        self.closed = True
+
+
 def _stub_s3(monkeypatch, payload: bytes):
     class _StubClient:
+        def get_object(self, Bucket, Key, Range=None):
+            return {"Body": _StubBody(payload)}
+
         def download_fileobj(self, bucket, key, fileobj):
             fileobj.write(payload)
 
@@ -135,7 +151,7 @@ def test_apply_av_metadata_tags_only(monkeypatch):
 def test_scan_task_marks_photo_clean(monkeypatch, listing, owner):
     img_bytes, dims = _image_bytes()
     _stub_s3(monkeypatch, img_bytes)
-    monkeypatch.setattr("storage.tasks._scan_bytes", lambda data: "clean")
+    monkeypatch.setattr("storage.tasks._scan_stream", lambda source: "clean")
 
     key = "uploads/listings/clean/test.jpg"
     photo = ListingPhoto.objects.create(
@@ -174,7 +190,7 @@ def test_scan_task_marks_photo_clean(monkeypatch, listing, owner):
 def test_scan_task_blocks_infected_files(monkeypatch, listing, owner):
     img_bytes, dims = _image_bytes()
     _stub_s3(monkeypatch, img_bytes)
-    monkeypatch.setattr("storage.tasks._scan_bytes", lambda data: "infected")
+    monkeypatch.setattr("storage.tasks._scan_stream", lambda source: "infected")
 
     key = "uploads/listings/infected/test.jpg"
     ListingPhoto.objects.create(
@@ -213,7 +229,7 @@ def test_scan_task_blocks_infected_files(monkeypatch, listing, owner):
 def test_scan_task_updates_booking_photo(monkeypatch, booking, renter):
     img_bytes, dims = _image_bytes()
     _stub_s3(monkeypatch, img_bytes)
-    monkeypatch.setattr("storage.tasks._scan_bytes", lambda data: "clean")
+    monkeypatch.setattr("storage.tasks._scan_stream", lambda source: "clean")
 
     key = "uploads/bookings/clean/test.jpg"
     photo = BookingPhoto.objects.create(
@@ -253,7 +269,7 @@ def test_scan_task_updates_booking_photo(monkeypatch, booking, renter):
 
 def test_download_errors_trigger_task_retry(monkeypatch, listing, owner):
     class _ExplodingClient:
-        def download_fileobj(self, bucket, key, fileobj):
+        def get_object(self, Bucket, Key, Range=None):
             raise ClientError({"Error": {"Code": "404", "Message": "Missing"}}, "GetObject")
 
     monkeypatch.setattr("storage.tasks._s3_client", lambda: _ExplodingClient())
@@ -288,12 +304,14 @@ def test_clamd_failure_falls_back_to_clamscan(monkeypatch, listing, owner, setti
     clamd_calls = {"count": 0}
     clamscan_calls = {"count": 0}
 
-    def fake_clamd(data):
+    def fake_clamd(stream):
         clamd_calls["count"] += 1
+        stream.read(8)  # fail part-way through the stream
         return None
 
-    def fake_clamscan(data):
+    def fake_clamscan(stream):
         clamscan_calls["count"] += 1
+        clamscan_calls["bytes"] = len(stream.read())
         return "clean"
 
     monkeypatch.setattr("storage.tasks._scan_with_clamd", fake_clamd)
@@ -324,6 +342,7 @@ def test_clamd_failure_falls_back_to_clamscan(monkeypatch, listing, owner, setti
 
     assert clamd_calls["count"] == 1
     assert clamscan_calls["count"] == 1
+    assert clamscan_calls["bytes"] == len(img_bytes)
     assert result["status"] == "clean"
     assert photo.status == ListingPhoto.Status.ACTIVE
     assert photo.av_status == ListingPhoto.AVStatus.CLEAN
@@ -364,11 +383,11 @@ def test_dispute_video_scan_uses_byte_limit(monkeypatch, booking, renter, settin
 
     scanned: dict[str, int] = {}
 
-    def fake_scan(data: bytes) -> str:
-        scanned["len"] = len(data)
+    def fake_scan(source) -> str:
+        scanned["len"] = len(source.open().read())
         return "clean"
 
-    monkeypatch.setattr("storage.tasks._scan_bytes", fake_scan)
+    monkeypatch.setattr("storage.tasks._scan_stream", fake_scan)
     settings.DISPUTE_VIDEO_SCAN_SAMPLE_BYTES = 1024
 
     result = tasks.scan_and_finalize_dispute_evidence(
@@ -389,3 +408,174 @@ def test_dispute_video_scan_uses_byte_limit(monkeypatch, booking, renter, settin
     assert evidence.av_status == DisputeEvidence.AVStatus.CLEAN
     assert scanned["len"] == settings.DISPUTE_VIDEO_SCAN_SAMPLE_BYTES
     assert download_calls["range"] is None
+
+
+def test_streaming_scan_keeps_only_a_bounded_header(monkeypatch, settings):
+    settings.AV_ENGINE = "dummy"
+    settings.AV_DUMMY_INFECT_MARKER = "EICAR"
+    settings.AV_HEADER_SNIFF_BYTES = 4096
+    img_bytes, dims = _image_bytes(size=(40, 30))
+    # The marker straddles a chunk boundary and sits far past the header window.
+    payload = img_bytes + b"\0" * (199_998 - len(img_bytes)) + b"EI"
+    payload += b"CAR" + b"\0" * 50_000
+    monkeypatch.setattr(tasks, "_STREAM_CHUNK_BYTES", 1000)
+    _stub_s3(monkeypatch, payload)
+
+    result = tasks._scan_object("uploads/listings/big.png")
+
+    assert result.verdict == "infected"
+    assert result.size == len(payload)
+    assert len(result.header) == 4096
+    assert tasks._extract_dimensions(result.header) == dims
+
+
+def test_batch_scan_finalizes_every_pending_listing_photo(monkeypatch, settings, listing, owner):
+    clean_bytes, dims = _image_bytes()
+    payloads = {
+        "uploads/listings/batch/a.png": clean_bytes,
+        "uploads/listings/batch/b.png": clean_bytes + b"EICAR",
+    }
+
+    class _KeyedClient:
+        def get_object(self, Bucket, Key, Range=None):
+            return {"Body": _StubBody(payloads[Key])}
+
+    monkeypatch.setattr("storage.tasks._s3_client", lambda: _KeyedClient())
+    settings.AV_ENGINE = "dummy"
+    settings.AV_DUMMY_INFECT_MARKER = "EICAR"
+    settings.AV_BATCH_CONCURRENCY = 2
+    for key in payloads:
+        ListingPhoto.objects.create(
+            listing=listing,
+            owner=owner,
+            key=key,
+            url=f"https://cdn.example/{key}",
+            filename=key.rsplit("/", 1)[-1],
+            content_type="image/png",
+            size=len(payloads[key]),
+            status=ListingPhoto.Status.PENDING,
+            av_status=ListingPhoto.AVStatus.PENDING,
+        )
+    ListingPhoto.objects.create(
+        listing=listing,
+        owner=owner,
+        key="uploads/listings/batch/done.png",
+        url="https://cdn.example/done.png",
+        status=ListingPhoto.Status.ACTIVE,
+        av_status=ListingPhoto.AVStatus.CLEAN,
+    )
+
+    result = tasks.scan_pending_listing_photos.run(listing.id)
+
+    assert result["scanned"] == 2
+    clean = ListingPhoto.objects.get(key="uploads/listings/batch/a.png")
+    infected = ListingPhoto.objects.get(key="uploads/listings/batch/b.png")
+    assert clean.av_status == ListingPhoto.AVStatus.CLEAN
+    assert clean.status == ListingPhoto.Status.ACTIVE
+    assert (clean.width, clean.height) == dims
+    assert infected.av_status == ListingPhoto.AVStatus.INFECTED
+    assert infected.status == ListingPhoto.Status.BLOCKED
+
+
+def test_batch_scan_keeps_failed_downloads_pending(monkeypatch, booking, renter):
+    img_bytes, _ = _image_bytes()
+    ok_key = "uploads/bookings/batch/ok.png"
+    missing_key = "uploads/bookings/batch/missing.png"
+
+    class _PartialClient:
+        def get_object(self, Bucket, Key, Range=None):
+            if Key == missing_key:
+                raise ClientError({"Error": {"Code": "503"}}, "GetObject")
+            return {"Body": _StubBody(img_bytes)}
+
+    monkeypatch.setattr("storage.tasks._s3_client", lambda: _PartialClient())
+    monkeypatch.setattr("storage.tasks._scan_stream", lambda source: "clean")
+    for key in (ok_key, missing_key):
+        BookingPhoto.objects.create(
+            booking=booking,
+            uploaded_by=renter,
+            role=BookingPhoto.Role.AFTER,
+            s3_key=key,
+            url=f"https://cdn.example/{key}",
+            content_type="image/png",
+            status=BookingPhoto.Status.PENDING,
+            av_status=BookingPhoto.AVStatus.PENDING,
+        )
+
+    with pytest.raises(tasks.ObjectDownloadError):
+        tasks._run_scan_pending_booking_photos(booking.id)
+
+    ok = BookingPhoto.objects.get(s3_key=ok_key)
+    assert ok.av_status == BookingPhoto.AVStatus.CLEAN
+    assert ok.role == BookingPhoto.Role.AFTER
+    missing = BookingPhoto.objects.get(s3_key=missing_key)
+    assert missing.av_status == BookingPhoto.AVStatus.PENDING
+
+
+def test_batch_scans_are_debounced_per_object(
+    monkeypatch, listing, django_capture_on_commit_callbacks
+):
+    from django.core.cache import cache
+
+    cache.delete(tasks._scan_batch_key("listing", listing.id))
+    queued = []
+    monkeypatch.setattr(
+        tasks.scan_pending_listing_photos,
+        "apply_async",
+        lambda args, countdown: queued.append((args, countdown)),
+    )
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        tasks.queue_listing_photo_scan(listing.id)
+    # Nothing is scheduled until the photo row's transaction commits.
+    assert queued == []
+    for callback in callbacks:
+        callback()
+    assert len(queued) == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        tasks.queue_listing_photo_scan(listing.id)
+    assert len(queued) == 1
+
+    cache.delete(tasks._scan_batch_key("listing", listing.id))
+    with django_capture_on_commit_callbacks(execute=True):
+        tasks.queue_listing_photo_scan(listing.id)
+    assert len(queued) == 2
+
+
+def test_batch_scan_logs_client_reported_sizes(
+    monkeypatch, listing, owner, django_capture_on_commit_callbacks
+):
+    key = "uploads/listings/batch/sized.png"
+    monkeypatch.setattr(tasks.scan_pending_listing_photos, "apply_async", lambda **kwargs: None)
+    monkeypatch.setattr(
+        "storage.tasks._scan_objects_concurrently",
+        lambda keys: {k: tasks._ScanResult("clean", 10, b"") for k in keys},
+    )
+    metas = []
+
+    def fake_verdict(photo_key, scanned, meta, **log_extra):
+        metas.append(meta)
+        return "clean", (None, None)
+
+    monkeypatch.setattr("storage.tasks._photo_verdict", fake_verdict)
+    monkeypatch.setattr("storage.tasks._apply_av_metadata", lambda key, verdict: None)
+    ListingPhoto.objects.create(
+        listing=listing,
+        owner=owner,
+        key=key,
+        url=f"https://cdn.example/{key}",
+        content_type="image/png",
+        status=ListingPhoto.Status.PENDING,
+        av_status=ListingPhoto.AVStatus.PENDING,
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        tasks.queue_listing_photo_scan(
+            listing.id, key=key, original_size=3000, compressed_size=1200
+        )
+    tasks._run_scan_pending_listing_photos(listing.id)
+
+    assert metas[0]["original_size"] == 3000
+    assert metas[0]["compressed_size"] == 1200
+    assert tasks._uploaded_sizes([key]) == {}
@@ -0,0 +1,170 @@
+import socket
+import struct
+import threading
+
+import pytest
+
+from storage import clamav, tasks
+
+
+class _FakeClamd(threading.Thread):
+    """Speaks enough of the clamd session protocol to serve one client socket."""
+
+    def __init__(self, sock, *, infected_marker=b"EICAR"):
+        super().__init__(daemon=True)
+        self.sock = sock
+        self.marker = infected_marker
+        self.commands = []
+        self.buffer = b""
+        self.request_id = 0
+
+    def _read_exact(self, count):
+        while len(self.buffer) < count:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise ConnectionError
+            self.buffer += chunk
+        data, self.buffer = self.buffer[:count], self.buffer[count:]
+        return data
+
+    def _read_command(self):
+        while b"\0" not in self.buffer:
+            chunk = self.sock.recv(65536)
+            if not chunk:
+                raise ConnectionError
+            self.buffer += chunk
+        command, self.buffer = self.buffer.split(b"\0", 1)
+        return command.decode()
+
+    def _reply(self, text):
+        self.request_id += 1
+        self.sock.sendall(f"{self.request_id}: {text}\0".encode())
+
+    def run(self):
+        try:
+            while True:
+                command = self._read_command()
+                self.commands.append(command)
+                if command == "zPING":
+                    self._reply("PONG")
+                elif command == "zINSTREAM":
+                    payload = b""
+                    while True:
+                        (size,) = struct.unpack("!L", self._read_exact(4))
+                        if not size:
+                            break
+                        payload += self._read_exact(size)
+                    if payload.startswith(b"OVERSIZED"):
+                        self._reply("INSTREAM size limit exceeded. ERROR")
+                    elif self.marker in payload:
+                        self._reply("stream: Eicar-Signature FOUND")
+                    else:
+                        self._reply("stream: OK")
+                elif command == "zEND":
+                    return
+        except OSError:
+            return
+        finally:
+            self.sock.close()
+
+
+@pytest.fixture
+def fake_clamd(monkeypatch, settings):
+    settings.CLAMD_UNIX_SOCKET = None
+    settings.CLAMD_POOL_SIZE = 2
+    settings.CLAMD_HEALTHCHECK_INTERVAL = 60
+    servers = []
+
+    def _connect(address, timeout=None):
+        client, server = socket.socketpair()
+        fake = _FakeClamd(server)
+        fake.start()
+        servers.append(fake)
+        return client
+
+    monkeypatch.setattr(clamav.socket, "create_connection", _connect)
+    pool = clamav.ClamdPool()
+    yield pool, servers
+    pool.close_all()
+
+
+class _Stream:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def read(self, size):
+        data, self.payload = self.payload[:size], self.payload[size:]
+        return data
+
+
+def test_pool_reuses_one_session_for_consecutive_scans(fake_clamd):
+    pool, servers = fake_clamd
+
+    for payload in (b"clean bytes", b"x" * 200_000):
+        with pool.connection() as conn:
+            assert conn.instream(_Stream(payload)) == "clean"
+    with pool.connection() as conn:
+        assert conn.instream(_Stream(b"has EICAR inside")) == "infected"
+
+    assert len(servers) == 1
+    assert servers[0].commands == ["zIDSESSION", "zINSTREAM", "zINSTREAM", "zINSTREAM"]
+
+
+def test_idle_connections_are_health_checked(fake_clamd, settings):
+    pool, servers = fake_clamd
+    with pool.connection() as conn:
+        conn.instream(_Stream(b"ok"))
+
+    settings.CLAMD_HEALTHCHECK_INTERVAL = 0
+    with pool.connection() as conn:
+        conn.instream(_Stream(b"ok"))
+
+    assert servers[0].commands[-2:] == ["zPING", "zINSTREAM"]
+
+
+def test_dead_connections_are_replaced(fake_clamd, settings):
+    pool, servers = fake_clamd
+    with pool.connection() as conn:
+        conn.instream(_Stream(b"ok"))
+    servers[0].sock.shutdown(socket.SHUT_RDWR)
+    servers[0].join(timeout=1)
+
+    settings.CLAMD_HEALTHCHECK_INTERVAL = 0
+    with pool.connection() as conn:
+        assert conn.instream(_Stream(b"ok")) == "clean"
+
+    assert len(servers) == 2
+
+
+def test_failed_scans_discard_the_connection(fake_clamd):
+    pool, servers = fake_clamd
+
+    class _Broken:
+        def read(self, size):
+            raise OSError("read failed")
+
+    with pytest.raises(OSError):
+        with pool.connection() as conn:
+            conn.instream(_Broken())
+    with pool.connection() as conn:
+        conn.instream(_Stream(b"ok"))
+
+    assert len(servers) == 2
+
+
+def test_error_replies_keep_the_upload_quarantined(fake_clamd, monkeypatch, settings):
+    pool, servers = fake_clamd
+    settings.AV_ENABLED = True
+    settings.AV_ENGINE = "clamd"
+    monkeypatch.setattr(tasks, "clamd_pool", pool)
+
+    with pytest.raises(clamav.ClamdError):
+        with pool.connection() as conn:
+            conn.instream(_Stream(b"OVERSIZED payload"))
+
+    # No fallback to clamscan or the marker check: an ERROR reply is not "clean".
+    monkeypatch.setattr(
+        tasks, "_scan_with_clamscan", lambda stream: pytest.fail("clamscan fallback used")
+    )
+    assert tasks._scan_bytes(b"OVERSIZED payload") == "infected"
+    assert tasks._scan_bytes(b"clean bytes") == "clean"
@@ -0,0 +1,38 @@
+import os
+
+from storage import s3 as s3util
+
+
+def test_client_is_reused_across_calls(settings):
+    settings.AWS_S3_REGION_NAME = "us-east-1"
+    first = s3util._client()
+    assert s3util._client() is first
+
+
+def test_client_is_rebuilt_when_settings_change(settings):
+    settings.AWS_S3_REGION_NAME = "us-east-1"
+    first = s3util._client()
+    settings.S3_MAX_POOL_CONNECTIONS = 7
+    second = s3util._client()
+    assert second is not first
+    assert second.meta.config.max_pool_connections == 7
+
+
+def test_pool_config_applies_retry_and_keepalive_settings(settings):
+    settings.AWS_S3_REGION_NAME = "us-east-1"
+    settings.S3_RETRY_MAX_ATTEMPTS = 5
+    settings.S3_RETRY_MODE = "adaptive"
+    settings.S3_TCP_KEEPALIVE = True
+    config = s3util._client().meta.config
+    # botocore normalises max_attempts (retries after the first call) to total_max_attempts.
+    assert config.retries["mode"] == "adaptive"
+    assert config.retries["total_max_attempts"] == 6
+    assert config.tcp_keepalive is True
+
+
+def test_client_from_another_process_is_not_reused(settings, monkeypatch):
+    settings.AWS_S3_REGION_NAME = "us-east-1"
+    first = s3util._client()
+    real_pid = os.getpid()
+    monkeypatch.setattr(s3util.os, "getpid", lambda: real_pid + 1)
+    assert s3util._client() is not first
@@ -1,45 +1,144 @@
 from __future__ import annotations
 
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
 from django.utils import timezone
-from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.response import Response
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from core.event_hub import STREAM_ID_RE, SubscriptionOverflow, get_event_hub
+
+MAX_TIMEOUT_SECONDS = 60.0
+MAX_LINGER_MS = 5_000
+
 
-from core.redis import read_user_events
+def _error_response(exc: exceptions.APIException, drf_request: Request) -> JsonResponse:
+    response = JsonResponse({"detail": str(exc.detail)}, status=exc.status_code)
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        authenticators = drf_request.authenticators
+        header = authenticators[0].authenticate_header(drf_request) if authenticators else None
+        if header:
+            response["WWW-Authenticate"] = header
+    if getattr(exc, "wait", None) is not None:
+        response["Retry-After"] = str(int(exc.wait))
+    return response
 
 
-@api_view(["GET"])
-@permission_classes([IsAuthenticated])
-def events_stream(request):
+def _authenticate(request):
+    """
+    Apply the project's DRF authentication and throttles to a plain async view.
+
+    Returns ``(user, None)`` or ``(None, error_response)``.
+    """
+    drf_request = Request(
+        request,
+        authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES],
+    )
+    try:
+        user = drf_request.user
+        if not (user and user.is_authenticated):
+            raise exceptions.NotAuthenticated()
+        for throttle_class in api_settings.DEFAULT_THROTTLE_CLASSES:
+            throttle = throttle_class()
+            if not throttle.allow_request(drf_request, None):
+                raise exceptions.Throttled(throttle.wait())
+    except exceptions.APIException as exc:
+        return None, _error_response(exc, drf_request)
+    return user, None
+
+
+def _bounded_float(value: str | None, default: float, upper: float) -> float:
+    try:
+        parsed = float(value) if value not in (None, "") else default
+    except ValueError:
+        parsed = default
+    return max(0.0, min(parsed, upper))
+
+
+async def _collect_events(subscription, *, timeout: float, max_events: int, linger: float):
+    """
+    Wait up to ``timeout`` seconds for events, then keep collecting for ``linger`` seconds.
+
+    Returns as soon as ``max_events`` have accumulated, the linger window after the first
+    event closes, or the timeout expires.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    events: list = []
+    while len(events) < max_events:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        try:
+            batch = await asyncio.wait_for(subscription.get(), remaining)
+        except (asyncio.TimeoutError, SubscriptionOverflow):
+            # On overflow the client resumes from the last returned id on its next poll.
+            break
+        if not events:
+            deadline = min(deadline, loop.time() + linger)
+        events.extend(batch)
+    return events[:max_events]
+
+
+@require_GET
+async def events_stream(request):
     """
     Long-poll endpoint returning per-user events from Redis Streams.
 
+    Async so a waiting client holds no worker thread; it shares the process's event hub
+    with the WebSocket app.
+
     Query params:
     - cursor: last seen event id (Redis stream id).
-      If omitted, default "$" (only new events).
+      If omitted, default "$" (only new events). ``gap`` is true in the response when
+      events after it were already trimmed; the client should refresh its state.
     - timeout: blocking time in seconds (default 25, max 60).
+    - max_events: return as soon as this many events are ready (default and max 100).
+    - linger_ms: after the first event, wait this long for more before returning
+      (default EVENTS_LONGPOLL_LINGER_MS, max 5000).
     """
-    user = request.user
-    cursor = (request.query_params.get("cursor") or "").strip() or "$"
-    try:
-        timeout_sec = float(request.query_params.get("timeout", "25"))
-    except ValueError:
-        timeout_sec = 25.0
-    timeout_sec = max(0.0, min(timeout_sec, 60.0))
-    block_ms = int(timeout_sec * 1000)
-
-    next_cursor, events = read_user_events(
-        user_id=user.id,
-        cursor=cursor,
-        block_ms=block_ms,
-        count=100,
+    user, error = await sync_to_async(_authenticate, thread_sensitive=True)(request)
+    if error is not None:
+        return error
+
+    params = request.GET
+    cursor = (params.get("cursor") or "").strip() or "$"
+    if cursor != "$" and not STREAM_ID_RE.match(cursor):
+        return JsonResponse({"detail": "Invalid cursor."}, status=status.HTTP_400_BAD_REQUEST)
+    max_count = getattr(settings, "EVENTS_LONGPOLL_MAX_EVENTS", 100)
+    timeout_sec = _bounded_float(params.get("timeout"), 25.0, MAX_TIMEOUT_SECONDS)
+    max_events = int(_bounded_float(params.get("max_events"), max_count, max_count)) or 1
+    linger_ms = _bounded_float(
+        params.get("linger_ms"),
+        getattr(settings, "EVENTS_LONGPOLL_LINGER_MS", 250),
+        MAX_LINGER_MS,
     )
 
-    return Response(
+    hub = get_event_hub()
+    gap = False
+    if cursor != "$":
+        cursor, gap = await hub.resume_cursor(user.id, cursor)
+    async with hub.subscribe(user.id, cursor) as subscription:
+        # "$" resolved to a concrete id, so an empty response still resumes losslessly.
+        start_cursor = subscription.cursor
+        events = await _collect_events(
+            subscription,
+            timeout=timeout_sec,
+            max_events=max_events,
+            linger=linger_ms / 1000,
+        )
+    next_cursor = events[-1]["id"] if events else start_cursor
+
+    return JsonResponse(
         {
             "cursor": next_cursor,
             "events": events,
+            "gap": gap,
             "now": timezone.now().isoformat(),
         },
         status=status.HTTP_200_OK,
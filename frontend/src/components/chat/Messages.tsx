@@ -3,7 +3,9 @@ import { Link } from "react-router-dom";
 
 import {
   applyChatEvent,
+  CHAT_HISTORY_PAGE_SIZE,
   fetchConversationDetail,
+  fetchConversationMessages,
   sendChatMessage,
   type ChatEventPayload,
   type ConversationDetail,
@@ -32,6 +34,7 @@ const ChatMessages: React.FC<MessagesProps> = ({ conversationId }) => {
   const [input, setInput] = useState("");
   const [sending, setSending] = useState(false);
   const [loading, setLoading] = useState(true);
+  const [loadingEarlier, setLoadingEarlier] = useState(false);
   const [error, setError] = useState<string | null>(null);
   const listRef = useRef<HTMLDivElement | null>(null);
   const currentUser = useMemo(() => AuthStore.getCurrentUser(), []);
@@ -45,7 +48,9 @@ const ChatMessages: React.FC<MessagesProps> = ({ conversationId }) => {
     setLoading(true);
     setError(null);
     try {
-      const data = await fetchConversationDetail(conversationId);
+      const data = await fetchConversationDetail(conversationId, {
+        limit: CHAT_HISTORY_PAGE_SIZE,
+      });
       setConversation(data);
     } catch (err) {
       console.error("chat: failed to load conversation", err);
@@ -62,6 +67,41 @@ const ChatMessages: React.FC<MessagesProps> = ({ conversationId }) => {
     void loadConversation();
   }, [loadConversation]);
 
+  const conversationRef = useRef<ConversationDetail | null>(null);
+  conversationRef.current = conversation;
+
+  // After an event-stream gap, fetch only the messages newer than the last one shown.
+  const syncNewerMessages = useCallback(async () => {
+    const current = conversationRef.current;
+    const newest = current?.messages[current.messages.length - 1];
+    if (!current || !newest) {
+      void loadConversation();
+      return;
+    }
+    try {
+      const page = await fetchConversationMessages(conversationId, {
+        afterId: newest.id,
+        limit: 200,
+      });
+      if (page.has_more) {
+        void loadConversation();
+        return;
+      }
+      setConversation((latest) => {
+        if (!latest || latest.id !== conversationId) {
+          return latest;
+        }
+        const known = new Set(latest.messages.map((msg) => msg.id));
+        const newer = page.messages.filter((msg) => !known.has(msg.id));
+        return newer.length ? { ...latest, messages: [...latest.messages, ...newer] } : latest;
+      });
+    } catch (err) {
+      console.error("chat: failed to catch up after an event gap", err);
+    }
+  }, [conversationId, loadConversation]);
+  const syncNewerMessagesRef = useRef(syncNewerMessages);
+  syncNewerMessagesRef.current = syncNewerMessages;
+
   useEffect(() => {
     const handle = startEventStream<ChatEventPayload>({
       onEvents: (events) => {
@@ -73,16 +113,59 @@ const ChatMessages: React.FC<MessagesProps> = ({ conversationId }) => {
           return next;
         });
       },
+      onGap: () => {
+        void syncNewerMessagesRef.current();
+      },
     });
 
     return () => handle.stop();
   }, []);
 
+  const newestMessageId = conversation?.messages[conversation.messages.length - 1]?.id ?? null;
+
+  // Follow new messages only; prepending older history keeps the reader's position.
   useEffect(() => {
     if (listRef.current) {
       listRef.current.scrollTop = listRef.current.scrollHeight;
     }
-  }, [conversation?.messages.length]);
+  }, [newestMessageId]);
+
+  const loadEarlier = async () => {
+    const oldest = conversation?.messages[0];
+    if (!oldest || loadingEarlier) {
+      return;
+    }
+    setLoadingEarlier(true);
+    const list = listRef.current;
+    const previousHeight = list?.scrollHeight ?? 0;
+    try {
+      const page = await fetchConversationMessages(conversationId, {
+        beforeId: oldest.id,
+        limit: CHAT_HISTORY_PAGE_SIZE,
+      });
+      setConversation((current) => {
+        if (!current) {
+          return current;
+        }
+        const known = new Set(current.messages.map((msg) => msg.id));
+        const earlier = page.messages.filter((msg) => !known.has(msg.id));
+        return {
+          ...current,
+          messages: [...earlier, ...current.messages],
+          has_earlier_messages: page.has_more,
+        };
+      });
+      requestAnimationFrame(() => {
+        if (list) {
+          list.scrollTop += list.scrollHeight - previousHeight;
+        }
+      });
+    } catch (err) {
+      console.error("chat: failed to load earlier messages", err);
+    } finally {
+      setLoadingEarlier(false);
+    }
+  };
 
   const lastUserMessageId = useMemo(() => {
     if (!conversation?.messages.length) {
@@ -323,6 +406,20 @@ const ChatMessages: React.FC<MessagesProps> = ({ conversationId }) => {
       </div>
 
       <div ref={listRef} className="flex-1 space-y-4 overflow-y-auto bg-muted/30 px-4 py-3">
+        {conversation.has_earlier_messages ? (
+          <div className="flex justify-center">
+            <Button
+              type="button"
+              variant="ghost"
+              size="sm"
+              disabled={loadingEarlier}
+              onClick={() => void loadEarlier()}
+            >
+              {loadingEarlier ? "Loading..." : "Load earlier messages"}
+            </Button>
+          </div>
+        ) : null}
+
         {conversation.messages.length === 0 && (
           <div className="py-8 text-center text-xs text-muted-foreground">
             No messages yet. Start the conversation below.
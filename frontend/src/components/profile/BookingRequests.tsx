@@ -426,6 +426,9 @@ export function BookingRequests({ onPendingCountChange }: BookingRequestsProps =
           void reloadRequests();
         }
       },
+      onGap: () => {
+        void reloadRequests();
+      },
     });
 
     return () => {
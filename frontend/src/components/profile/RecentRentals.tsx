@@ -197,6 +197,9 @@ export function RecentRentals() {
           void reloadRecentRentals();
         }
       },
+      onGap: () => {
+        void reloadRecentRentals();
+      },
     });
 
     return () => {
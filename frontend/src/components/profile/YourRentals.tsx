@@ -535,6 +535,9 @@ export function YourRentals({ onUnpaidRentalsChange }: YourRentalsProps = {}) {
           void reloadBookings();
         }
       },
+      onGap: () => {
+        void reloadBookings();
+      },
     });
 
     return () => {
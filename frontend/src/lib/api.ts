@@ -488,6 +488,8 @@ export interface OwnerPayoutHistoryResponse {
   results: OwnerPayoutHistoryRow[];
   count: number;
   next_offset: number | null;
+  next_cursor: string | null;
+  has_next: boolean;
 }
 
 export interface OwnerFeeInvoice {
@@ -1474,6 +1476,7 @@ export const paymentsAPI = {
       kind?: string;
       limit?: number;
       offset?: number;
+      cursor?: string;
       scope?: "owner" | "all";
     } = {},
   ) {
@@ -1481,6 +1484,7 @@ export const paymentsAPI = {
     if (params.kind) search.set("kind", params.kind);
     if (params.limit !== undefined) search.set("limit", String(params.limit));
     if (params.offset !== undefined) search.set("offset", String(params.offset));
+    if (params.cursor !== undefined) search.set("cursor", params.cursor);
     if (params.scope) {
       search.set("scope", params.scope);
     }
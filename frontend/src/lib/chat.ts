@@ -76,6 +76,30 @@ export interface ConversationDetail {
   other_party_avatar_url?: string | null;
   other_party_identity_verified?: boolean;
   messages: ChatMessage[];
+  has_earlier_messages?: boolean;
+}
+
+export interface ChatMessagePage {
+  messages: ChatMessage[];
+  has_more: boolean;
+  other_last_read_message_id: number | null;
+}
+
+export interface ChatHistoryParams {
+  afterId?: number;
+  beforeId?: number;
+  limit?: number;
+}
+
+export const CHAT_HISTORY_PAGE_SIZE = 50;
+
+function chatHistoryQuery(params: ChatHistoryParams): string {
+  const search = new URLSearchParams();
+  if (params.afterId !== undefined) search.set("after_id", String(params.afterId));
+  if (params.beforeId !== undefined) search.set("before_id", String(params.beforeId));
+  if (params.limit !== undefined) search.set("limit", String(params.limit));
+  const query = search.toString();
+  return query ? `?${query}` : "";
 }
 
 export interface ChatEventPayload {
@@ -99,15 +123,27 @@ export async function fetchConversations(): Promise<ConversationSummary[]> {
   return jsonFetch<ConversationSummary[]>("/chats/", { method: "GET" });
 }
 
-// GET /api/chats/{id}/
+// GET /api/chats/{id}/?limit=&before_id=
 export async function fetchConversationDetail(
   conversationId: number,
+  params: Omit<ChatHistoryParams, "afterId"> = {},
 ): Promise<ConversationDetail> {
-  return jsonFetch<ConversationDetail>(`/chats/${conversationId}/`, {
+  return jsonFetch<ConversationDetail>(`/chats/${conversationId}/${chatHistoryQuery(params)}`, {
     method: "GET",
   });
 }
 
+// GET /api/chats/{id}/messages/?after_id= | ?before_id=&limit=
+export async function fetchConversationMessages(
+  conversationId: number,
+  params: ChatHistoryParams = {},
+): Promise<ChatMessagePage> {
+  return jsonFetch<ChatMessagePage>(
+    `/chats/${conversationId}/messages/${chatHistoryQuery(params)}`,
+    { method: "GET" },
+  );
+}
+
 // POST /api/chats/start/
 export async function startConversationForListing(
   listingId: number,
@@ -21,6 +21,8 @@ export interface EventEnvelope<T = any> {
 export interface EventStreamResponse<T = any> {
   cursor: string;
   events: EventEnvelope<T>[];
+  // True when events after the requested cursor were already trimmed server-side.
+  gap?: boolean;
   now?: string;
 }
 
@@ -47,6 +49,8 @@ export interface EventStreamOptions<T = any> {
   cursor?: string | null;
   timeoutSeconds?: number;
   onEvents: (events: EventEnvelope<T>[], cursor: string) => void;
+  // Events were missed and cannot be replayed; refetch whatever state the stream keeps fresh.
+  onGap?: (cursor: string) => void;
   onError?: (error: unknown) => void;
 }
 
@@ -57,7 +61,13 @@ export interface EventStreamHandle {
 function startLongPollStream<T = any>(
   options: EventStreamOptions<T>,
 ): EventStreamHandle {
-  const { onEvents, onError, timeoutSeconds = 25, cursor: initialCursor = null } = options;
+  const {
+    onEvents,
+    onGap,
+    onError,
+    timeoutSeconds = 25,
+    cursor: initialCursor = null,
+  } = options;
 
   let cursor: string | null = initialCursor;
   let stopped = false;
@@ -82,6 +92,9 @@ function startLongPollStream<T = any>(
           controller.signal,
         );
         cursor = response.cursor || cursor;
+        if (response.gap && cursor) {
+          onGap?.(cursor);
+        }
         if (response.events && response.events.length > 0 && cursor) {
           onEvents(response.events, cursor);
         }
@@ -108,6 +121,9 @@ function startLongPollStream<T = any>(
   };
 }
 
+const WS_RECONNECT_BASE_MS = 1000;
+const WS_RECONNECT_MAX_MS = 30000;
+
 export function startEventStream<T = any>(
   options: EventStreamOptions<T>,
 ): EventStreamHandle {
@@ -131,47 +147,87 @@ export function startEventStream<T = any>(
   const loc = window.location;
   const protocol = loc.protocol === "https:" ? "wss:" : "ws:";
   const wsPath = "/ws/events/";
-  const url = `${protocol}//${loc.host}${wsPath}?token=${encodeURIComponent(accessToken)}`;
-
-  let ws: WebSocket | null;
-  try {
-    ws = new WebSocket(url);
-  } catch (err) {
-    notifyError(err);
-    return startLongPollStream(options);
-  }
 
+  // Every frame carries the stream cursor (the first one before any events arrive), so a
+  // reconnect resumes exactly where this socket stopped.
+  let cursor: string | null = options.cursor ?? null;
+  let ws: WebSocket | null = null;
   let closedByClient = false;
+  let attempts = 0;
+  let reconnectTimer: ReturnType<typeof setTimeout> | null = null;
 
-  ws.onmessage = (event: MessageEvent) => {
-    try {
-      const parsed = JSON.parse(event.data as string) as EventStreamResponse<T>;
-      if (!parsed || !Array.isArray(parsed.events) || parsed.events.length === 0) {
-        return;
-      }
-      const nextCursor = parsed.cursor || "";
-      options.onEvents(parsed.events, nextCursor);
-    } catch (err) {
-      notifyError(err);
+  const connect = () => {
+    const params = new URLSearchParams({ token: AuthStore.getAccess() ?? accessToken });
+    if (cursor) {
+      params.set("cursor", cursor);
     }
-  };
+    const socket = new WebSocket(`${protocol}//${loc.host}${wsPath}?${params.toString()}`);
+    ws = socket;
 
-  ws.onerror = (event) => {
-    notifyError(event);
-  };
+    socket.onopen = () => {
+      attempts = 0;
+    };
+
+    socket.onmessage = (event: MessageEvent) => {
+      try {
+        const parsed = JSON.parse(event.data as string) as EventStreamResponse<T>;
+        if (!parsed) {
+          return;
+        }
+        if (parsed.cursor) {
+          cursor = parsed.cursor;
+        }
+        if (parsed.gap) {
+          options.onGap?.(parsed.cursor);
+        }
+        if (!Array.isArray(parsed.events) || parsed.events.length === 0) {
+          return;
+        }
+        options.onEvents(parsed.events, parsed.cursor || "");
+      } catch (err) {
+        notifyError(err);
+      }
+    };
+
+    socket.onerror = (event) => {
+      notifyError(event);
+    };
 
-  ws.onclose = () => {
-    if (!closedByClient) {
+    socket.onclose = () => {
+      if (closedByClient || ws !== socket) {
+        return;
+      }
       notifyError(new Error("events websocket closed"));
-    }
+      const delay = Math.min(WS_RECONNECT_BASE_MS * 2 ** attempts, WS_RECONNECT_MAX_MS);
+      attempts += 1;
+      reconnectTimer = setTimeout(() => {
+        reconnectTimer = null;
+        try {
+          connect();
+        } catch (err) {
+          notifyError(err);
+        }
+      }, delay);
+    };
   };
 
+  try {
+    connect();
+  } catch (err) {
+    notifyError(err);
+    return startLongPollStream(options);
+  }
+
   return {
     stop() {
+      closedByClient = true;
+      if (reconnectTimer) {
+        clearTimeout(reconnectTimer);
+        reconnectTimer = null;
+      }
       if (!ws) {
         return;
       }
-      closedByClient = true;
       if (ws.readyState === WebSocket.OPEN) {
         ws.close(1000, "client stop");
       } else if (ws.readyState === WebSocket.CONNECTING) {
@@ -199,6 +255,10 @@ export function startEventStream<T = any>(
 //       }
 //     }
 //   },
+//   // Reconnects resume from the last cursor; this only fires if events were trimmed meanwhile.
+//   onGap: () => {
+//     // refetch bookings / chat once
+//   },
 // });
 //
 // // later, e.g. in a React useEffect cleanup:
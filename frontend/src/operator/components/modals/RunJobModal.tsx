@@ -47,6 +47,28 @@ const JOB_DEFS: JobDef[] = [
       { key: "limit", label: "Limit", type: "int", default: 500, help: "Max disputes to return." },
     ],
   },
+  {
+    name: "rebuild_user_activity_stats",
+    label: "Rebuild user activity counts",
+    group: "Users",
+    description: "Recounts listings, bookings and disputes per user and repairs drifted activity rows.",
+    params: [
+      { key: "after_id", label: "After user ID", type: "int", default: 0, help: "Resume after this user id." },
+      { key: "limit", label: "Limit", type: "int", default: 10000, help: "Max users to scan." },
+      { key: "dry_run", label: "Dry run", type: "bool", default: true, help: "If enabled, no rows are written." },
+    ],
+  },
+  {
+    name: "rebuild_chat_inbox_state",
+    label: "Rebuild chat inbox state",
+    group: "Chat",
+    description: "Recomputes each conversation's last message and per-participant unread counts.",
+    params: [
+      { key: "after_id", label: "After conversation ID", type: "int", default: 0, help: "Resume after this conversation id." },
+      { key: "limit", label: "Limit", type: "int", default: 5000, help: "Max conversations to scan." },
+      { key: "dry_run", label: "Dry run", type: "bool", default: true, help: "If enabled, no rows are written." },
+    ],
+  },
 ];
 
 type RunJobModalProps = {
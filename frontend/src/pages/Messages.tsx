@@ -157,6 +157,9 @@ export default function MessagesPage() {
           void loadConversations();
         }
       },
+      onGap: () => {
+        void loadConversations();
+      },
     });
     return () => handle.stop();
   }, [currentUserId, loadConversations, selectedConversationId]);
@@ -0,0 +1,107 @@
+"""Hold many idle /ws/events/ connections open against one ASGI worker.
+
+Used to check the per-process event hub (backend/core/event_hub.py): each socket should cost a
+queue and a dict entry on the worker, not a thread or a Redis connection.
+
+    # one worker so every socket lands on the same process
+    gunicorn renter.asgi:application -k uvicorn.workers.UvicornWorker -w 1 -b 0.0.0.0:8000
+
+    # access tokens, one per line, cycled across sockets (a few hundred users is plenty):
+    python manage.py shell -c "from django.contrib.auth import get_user_model; \
+from rest_framework_simplejwt.tokens import AccessToken; \
+[print(AccessToken.for_user(u)) for u in get_user_model().objects.all()[:500]]" > tokens.txt
+
+    python scripts/ws_idle_load.py --url ws://localhost:8000/ws/events/ \
+        --tokens-file tokens.txt --connections 10000 --hold 120
+
+The script exits non-zero unless every socket connected and stayed open for ``--hold``
+seconds. Needs the ``websockets`` package (installed with ``uvicorn[standard]``) and a file
+descriptor limit above the connection count on both ends (``ulimit -n``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import resource
+import statistics
+import sys
+import time
+from collections import Counter
+from itertools import cycle
+
+import websockets
+
+
+async def _hold_socket(url, token, hold_until, stats, connect_times):
+    started = time.monotonic()
+    try:
+        async with websockets.connect(
+            f"{url}?token={token}", open_timeout=30, ping_interval=None
+        ) as ws:
+            connect_times.append(time.monotonic() - started)
+            stats["connected"] += 1
+            remaining = hold_until - time.monotonic()
+            try:
+                await asyncio.wait_for(ws.wait_closed(), timeout=max(remaining, 0))
+            except asyncio.TimeoutError:
+                stats["held"] += 1
+            else:
+                stats[f"closed:{ws.close_code}"] += 1
+    except Exception as exc:  # noqa: BLE001 - tallied, not raised
+        stats[f"failed:{type(exc).__name__}"] += 1
+
+
+async def run(args) -> Counter:
+    tokens = [line.strip() for line in open(args.tokens_file) if line.strip()]
+    if not tokens:
+        raise SystemExit("no tokens in --tokens-file")
+    stats: Counter = Counter()
+    connect_times: list[float] = []
+    ramp_seconds = args.connections / args.rate
+    hold_until = time.monotonic() + ramp_seconds + args.hold
+    tasks = []
+    token_cycle = cycle(tokens)
+    for index in range(args.connections):
+        tasks.append(
+            asyncio.create_task(
+                _hold_socket(args.url, next(token_cycle), hold_until, stats, connect_times)
+            )
+        )
+        if (index + 1) % args.rate == 0:
+            print(f"opened {index + 1}/{args.connections}, connected {stats['connected']}")
+            await asyncio.sleep(1)
+    await asyncio.gather(*tasks)
+    if connect_times:
+        ordered = sorted(connect_times)
+        print(
+            "connect seconds: p50=%.3f p99=%.3f max=%.3f"
+            % (
+                statistics.median(ordered),
+                ordered[int(len(ordered) * 0.99) - 1],
+                ordered[-1],
+            )
+        )
+    return stats
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="ws://localhost:8000/ws/events/")
+    parser.add_argument("--tokens-file", required=True)
+    parser.add_argument("--connections", type=int, default=10_000)
+    parser.add_argument("--rate", type=int, default=500, help="new sockets per second")
+    parser.add_argument("--hold", type=float, default=60.0, help="seconds to hold after ramp")
+    args = parser.parse_args()
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < args.connections + 100 <= hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (args.connections + 100, hard))
+
+    stats = asyncio.run(run(args))
+    print(dict(sorted(stats.items())))
+    return 0 if stats["held"] == args.connections else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())